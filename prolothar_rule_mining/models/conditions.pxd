@@ -17,18 +17,21 @@
 from prolothar_common.models.dataset.instance cimport Instance
 
 cdef class Condition:
+    #structural hash that is computed once at construction
+    cdef object _hash_value
+
     cpdef bint check_instance(self, Instance instance)
     cpdef float compute_mdl(self, int nr_of_attributes)
 
 cdef class AttributeCondition(Condition):
-    cdef public attribute
-    cdef public str operator_symbol
-    cdef public value
+    cdef readonly attribute
+    cdef readonly str operator_symbol
+    cdef readonly value
 
     cdef bint check_value(self, tested_value)
 
 cdef class InRangeCondition(AttributeCondition):
-    cdef public bint lower_bound_inclusive
-    cdef public bint upper_bound_inclusive
+    cdef readonly bint lower_bound_inclusive
+    cdef readonly bint upper_bound_inclusive
 
     cpdef bint check_value(self, tested_value)
\ No newline at end of file
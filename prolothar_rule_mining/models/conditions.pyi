@@ -2,6 +2,7 @@ from typing import Callable, Any
 from prolothar_common.models.dataset.instance import Instance
 from prolothar_common.models.dataset import Dataset
 from prolothar_common.func_tools import identity
+from prolothar_rule_mining.models.dataset_view import DatasetView
 
 class Condition:
 
@@ -13,6 +14,15 @@ class Condition:
         """splits a dataset into matching and non-matching instances"""
         ...
 
+    def divide_dataset_view(self, dataset: Dataset) -> tuple[DatasetView, DatasetView]:
+        """
+        splits a dataset (or a DatasetView) into views on the matching and
+        on the non-matching instances. no instances are copied.
+        use DatasetView.to_dataset if a view must be passed to code that
+        needs the full Dataset API.
+        """
+        ...
+
     def to_html(self) -> str:
         """
         returns a human readable html string representation of this condition
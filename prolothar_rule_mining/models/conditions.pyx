@@ -16,6 +16,7 @@
 '''
 from typing import List, Tuple, Set, Callable, Any
 from collections import defaultdict
+import copyreg
 
 import numpy as np
 from math import log2
@@ -27,6 +28,8 @@ import prolothar_common.mdl_utils as mdl_utils
 from prolothar_common.models.dataset import Dataset
 from prolothar_common.models.dataset.instance cimport Instance
 
+from prolothar_rule_mining.models.dataset_view import DatasetView
+
 #IN,EQUALS
 cdef float CODE_LENGTH_FOR_CATEGORICAL_OPERATOR_CHOICE = log2(2)
 #<,>
@@ -35,7 +38,36 @@ cdef float CODE_LENGTH_FOR_NUMERICAL_OPERATOR_CHOICE = log2(2)
 #NOT,AND,OR,IN,EQUALS,<,>
 cdef float CODE_LENGTH_FOR_CONDITION_TYPE_CHOICE = log2(7)
 
+cdef object _to_hashable(value):
+    """sets and lists of values (e.g. of InCondition) are hashed as frozensets"""
+    if isinstance(value, (set, list)):
+        return frozenset(value)
+    return value
+
+cdef inline bint _have_different_hashes(Condition a, other):
+    """
+    True if other is a condition with another structural hash, i.e. if
+    a and other cannot be equal
+    """
+    return isinstance(other, Condition) and (<Condition>other)._hash_value is not None \
+        and a._hash_value != (<Condition>other)._hash_value
+
 cdef class Condition:
+    """
+    conditions are immutable. their hash is computed once at construction
+    from the hashes of their parts and is used to short-circuit equality
+    checks. the hash is not pickled, because hashes of strings differ
+    between processes.
+    """
+
+    def __reduce__(self):
+        return (copyreg.__newobj__, (type(self),), self.__getstate__())
+
+    def __getstate__(self):
+        raise NotImplementedError()
+
+    def __setstate__(self, state):
+        raise NotImplementedError()
 
     cpdef bint check_instance(self, Instance instance):
         """returns True iff the given instance fullfils this condition"""
@@ -82,6 +114,17 @@ cdef class Condition:
         return (dataset.get_subdataset(if_instances),
                 dataset.get_subdataset(else_instances))
 
+    def divide_dataset_view(self, dataset: Dataset) -> Tuple[DatasetView, DatasetView]:
+        """
+        splits a dataset (or a DatasetView) into views on the matching and
+        on the non-matching instances. no instances are copied.
+        use DatasetView.to_dataset if a view must be passed to code that
+        needs the full Dataset API.
+        """
+        if not isinstance(dataset, DatasetView):
+            dataset = DatasetView(dataset)
+        return dataset.divide(self.check_instance)
+
     def to_html(self) -> str:
         """
         returns a human readable html string representation of this condition
@@ -109,8 +152,17 @@ cdef class AttributeCondition(Condition):
         self.attribute = attribute
         self.operator_symbol = operator_symbol
         self.value = value
+        self._hash_value = hash((attribute.get_name(), operator_symbol, _to_hashable(value)))
+
+    def __getstate__(self):
+        return (self.attribute, self.operator_symbol, self.value)
+
+    def __setstate__(self, state):
+        AttributeCondition.__init__(self, *state)
 
     def __eq__(self, other) -> bool:
+        if _have_different_hashes(self, other):
+            return False
         try:
             return (self.value == other.value and
                     self.operator_symbol == other.operator_symbol and
@@ -119,8 +171,7 @@ cdef class AttributeCondition(Condition):
             return False
 
     def __hash__(self) -> int:
-        return hash((self.attribute.get_name(), self.operator_symbol,
-                     self.value))
+        return self._hash_value
 
     cpdef bint check_instance(self, instance: Instance):
         return self.check_value(instance[self.attribute.get_name()])
@@ -233,6 +284,15 @@ cdef class InRangeCondition(AttributeCondition):
         self.lower_bound_inclusive = lower_bound_inclusive
         self.upper_bound_inclusive = upper_bound_inclusive
 
+    def __getstate__(self):
+        return (self.attribute, self.operator_symbol, self.value,
+                self.lower_bound_inclusive, self.upper_bound_inclusive)
+
+    def __setstate__(self, state):
+        AttributeCondition.__init__(self, *state[:3])
+        self.lower_bound_inclusive = state[3]
+        self.upper_bound_inclusive = state[4]
+
     cpdef bint check_value(self, tested_value):
         return (
             (
@@ -294,13 +354,22 @@ cdef class LessThanCondition(AttributeCondition):
         return tested_value < self.get_value()
 
 cdef class NotCondition(Condition):
-    cdef public Condition condition
+    cdef readonly Condition condition
 
     """negates another condition"""
     def __init__(self, Condition condition):
         self.condition = condition
+        self._hash_value = hash((False, condition))
+
+    def __getstate__(self):
+        return self.condition
+
+    def __setstate__(self, state):
+        NotCondition.__init__(self, state)
 
     def __eq__(self, other) -> bool:
+        if _have_different_hashes(self, other):
+            return False
         try:
             return (isinstance(other, NotCondition) and
                     self.condition == other.condition)
@@ -308,7 +377,7 @@ cdef class NotCondition(Condition):
             return False
 
     def __hash__(self) -> int:
-        return hash((False, self.condition))
+        return self._hash_value
 
     cpdef Condition get_condition(self):
         return self.condition
@@ -342,16 +411,29 @@ cdef class NotCondition(Condition):
 
 cdef class JoinOperatorCondition(Condition):
     """a condition that joins multiple conditions"""
-    cdef public list conditions
-    cdef public str join_operator
+    cdef readonly tuple conditions
+    cdef readonly str join_operator
 
     def __init__(self, conditions: List[Condition], join_operator: str):
         if len(conditions) < 2:
             raise ValueError('at least two conditions must be joined')
-        self.conditions = conditions
+        #the conditions are copied, because the hash is computed only once
+        self.conditions = tuple(conditions)
         self.join_operator = join_operator
+        value = hash(join_operator)
+        for condition in self.conditions:
+            value = value ^ hash(condition)
+        self._hash_value = value
+
+    def __getstate__(self):
+        return (list(self.conditions), self.join_operator)
+
+    def __setstate__(self, state):
+        JoinOperatorCondition.__init__(self, *state)
 
     def __eq__(self, other) -> bool:
+        if _have_different_hashes(self, other):
+            return False
         try:
             if self.join_operator != other.join_operator \
             or len(self.conditions) != len(other.conditions):
@@ -364,13 +446,13 @@ cdef class JoinOperatorCondition(Condition):
             return False
 
     def __hash__(self) -> int:
-        value = hash(self.join_operator)
-        for condition in self.conditions:
-            value = value ^ hash(condition)
-        return value
+        return self._hash_value
 
     def get_conditions(self) -> List[Condition]:
-        return self.conditions
+        """
+        returns a copy of the joined conditions
+        """
+        return list(self.conditions)
 
     cpdef int count_nr_of_terms(self):
         cdef int nr_of_terms = 0
@@ -393,7 +475,7 @@ cdef class JoinOperatorCondition(Condition):
 
     def __repr__(self):
         return '(' + (' ' + self.join_operator + ' ').join(
-            str(c) for c in self.get_conditions()) + ')'
+            str(c) for c in self.conditions) + ')'
 
     def to_html(self) -> str:
         join_operator = '<span cdef class="JoinOperator">%s</span>' % html.escape(
@@ -403,9 +485,9 @@ cdef class JoinOperatorCondition(Condition):
 
     def _group_conditions_by_type_and_attributes(self):
         grouped_conditions = defaultdict(list)
-        for condition in self.get_conditions():
+        for condition in self.conditions:
             if type(condition) is type(self):
-                for subcondition in condition.get_conditions():
+                for subcondition in condition.conditions:
                     compressed_condition = subcondition.compress()
                     grouped_conditions[
                         (type(compressed_condition),
@@ -460,7 +542,7 @@ cdef class AndCondition(JoinOperatorCondition):
         super().__init__(conditions, 'and')
 
     cpdef bint check_instance(self, Instance instance):
-        for condition in self.get_conditions():
+        for condition in self.conditions:
             if not condition.check_instance(instance):
                 return False
         return True
@@ -496,7 +578,7 @@ cdef class AndCondition(JoinOperatorCondition):
             compressed_conditions.append(singleton)
             for composite in list(compressed_conditions):
                 if isinstance(composite, OrCondition) \
-                and singleton in composite.get_conditions():
+                and singleton in composite.conditions:
                     composite_conditions.remove(composite)
         return singleton_conditions + composite_conditions
 
@@ -506,7 +588,7 @@ cdef class OrCondition(JoinOperatorCondition):
         super().__init__(conditions, 'or')
 
     cpdef bint check_instance(self, instance: Instance):
-        for condition in self.get_conditions():
+        for condition in self.conditions:
             if condition.check_instance(instance):
                 return True
         return False
@@ -542,7 +624,7 @@ cdef class OrCondition(JoinOperatorCondition):
             compressed_conditions.append(singleton)
             for composite in list(compressed_conditions):
                 if isinstance(composite, AndCondition) \
-                and singleton in composite.get_conditions():
+                and singleton in composite.conditions:
                     composite_conditions.remove(composite)
         return singleton_conditions + composite_conditions
 
@@ -0,0 +1,215 @@
+'''
+    This file is part of Prolothar-Rule-Mining (More Info: https://github.com/shs-it/prolothar-rule-mining).
+
+    Prolothar-Rule-Mining is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    Prolothar-Rule-Mining is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with Prolothar-Rule-Mining. If not, see <https://www.gnu.org/licenses/>.
+'''
+"""
+read-only views on a subset of the instances of a Dataset. a view stores the
+positions of its instances in the iteration order of the original dataset
+instead of copying the instances into a new dataset. a view on a view is
+again a view on the original dataset, i.e. nested splits are only index
+arithmetic.
+"""
+
+from typing import Callable, Dict, Iterable, Iterator, List, Set, Tuple, Union
+
+from random import Random
+
+import numpy as np
+
+from prolothar_common.models.dataset import Dataset
+from prolothar_common.models.dataset.attributes import Attribute
+from prolothar_common.models.dataset.attributes import CategoricalAttribute
+from prolothar_common.models.dataset.attributes import NumericalAttribute
+from prolothar_common.models.dataset.instance import Instance
+
+class DatasetView:
+    """
+    a subset of the instances of a Dataset that behaves like a read-only
+    dataset: it supports iteration, len, "in", attribute access and for
+    views on a ClassificationDataset class counts. iteration follows the
+    order of the original dataset. attributes only contain the unique values
+    of the instances in the view, like the attributes of Dataset.get_subdataset.
+    attributes and class counts are computed lazily on first access.
+
+    all views on the same dataset share one list of its instances, so the
+    dataset must not be changed while views on it are in use.
+    """
+
+    def __init__(self, base: Union[Dataset, 'DatasetView'],
+                 row_indices: Iterable[int] = None):
+        """
+        Parameters
+        ----------
+        base : Union[Dataset, DatasetView]
+            the dataset or view from which instances are selected
+        row_indices : Iterable[int], optional
+            positions of the selected instances in the iteration order of base.
+            by default None, i.e. all instances of base are selected
+        """
+        if isinstance(base, DatasetView):
+            self.__root = base.__root
+            self.__instances = base.__instances
+            self.__shared_class_codes = base.__shared_class_codes
+            if row_indices is None:
+                self.__row_indices = base.__row_indices
+            else:
+                self.__row_indices = base.__row_indices[
+                    np.asarray(row_indices, dtype=np.int64)]
+        else:
+            self.__root = base
+            self.__instances = list(base)
+            #[class labels, class code per instance] of the root dataset
+            self.__shared_class_codes = []
+            if row_indices is None:
+                self.__row_indices = np.arange(len(self.__instances), dtype=np.int64)
+            else:
+                self.__row_indices = np.array(row_indices, dtype=np.int64)
+        self.__row_indices.flags.writeable = False
+        self.__attributes: Dict[str, Attribute] = None
+        self.__class_counts: Dict[str, int] = None
+        self.__instance_set: Set[Instance] = None
+
+    def get_root_dataset(self) -> Dataset:
+        """
+        returns the original dataset, i.e. never a view
+        """
+        return self.__root
+
+    def get_row_indices(self) -> np.ndarray:
+        """
+        returns the read-only positions of the instances of this view
+        in the iteration order of the original dataset
+        """
+        return self.__row_indices
+
+    def select_rows(self, row_indices: Iterable[int]) -> 'DatasetView':
+        """
+        creates a view on the instances at the given positions in the
+        iteration order of this view
+        """
+        return DatasetView(self, row_indices)
+
+    def divide(self, predicate: Callable[[Instance], bool]) -> Tuple['DatasetView', 'DatasetView']:
+        """
+        splits this view into a view on the instances that fulfill the given
+        predicate and a view on the remaining instances
+        """
+        hold_vector = np.fromiter(
+            (predicate(instance) for instance in self), dtype=bool, count=len(self))
+        return (DatasetView(self, np.flatnonzero(hold_vector)),
+                DatasetView(self, np.flatnonzero(~hold_vector)))
+
+    def split(self, testset_proportion: float,
+              random_seed: int = None) -> Tuple['DatasetView', 'DatasetView']:
+        """
+        splits this view into views on a trainset and a testset. the split is
+        the same as by Dataset.split on a dataset with the same iteration order
+
+        Parameters
+        ----------
+        testset_proportion : float
+            must be between 0 and 1 both exclusively. this determines the
+            minimal size of the testset in percent of the view
+        random_seed : int, optional
+            can be set to a fixed integer to get stable results.
+            The default is None.
+        """
+        if not (0 < testset_proportion < 1):
+            raise ValueError(
+                'testset_proportion must be (0,1) but was %f' % testset_proportion)
+        positions = list(range(len(self)))
+        Random(random_seed).shuffle(positions)
+        split_index = int(len(self) - len(self) * testset_proportion)
+        return (DatasetView(self, positions[:split_index]),
+                DatasetView(self, positions[split_index:]))
+
+    def to_dataset(self) -> Dataset:
+        """
+        copies the instances of this view into a new dataset of the same type
+        as the original dataset
+        """
+        return self.__root.get_subdataset(self)
+
+    def __iter__(self) -> Iterator[Instance]:
+        instances = self.__instances
+        return (instances[i] for i in self.__row_indices.tolist())
+
+    def __len__(self) -> int:
+        return len(self.__row_indices)
+
+    def __contains__(self, instance) -> bool:
+        if self.__instance_set is None:
+            self.__instance_set = set(self)
+        return instance in self.__instance_set
+
+    def get_categorical_attribute_names(self) -> List[str]:
+        return self.__root.get_categorical_attribute_names()
+
+    def get_numerical_attribute_names(self) -> List[str]:
+        return self.__root.get_numerical_attribute_names()
+
+    def get_nr_of_attributes(self) -> int:
+        return self.__root.get_nr_of_attributes()
+
+    def get_attributes(self) -> Iterable[Attribute]:
+        return self.__get_attributes().values()
+
+    def get_attribute_by_name(self, name: str) -> Attribute:
+        return self.__get_attributes()[name]
+
+    def __get_attributes(self) -> Dict[str, Attribute]:
+        if self.__attributes is None:
+            self.__attributes = {}
+            for name in self.get_categorical_attribute_names():
+                self.__attributes[name] = CategoricalAttribute(name, set())
+            for name in self.get_numerical_attribute_names():
+                self.__attributes[name] = NumericalAttribute(name, set())
+            for instance in self:
+                for name, attribute in self.__attributes.items():
+                    attribute.add_value(instance[name])
+        return self.__attributes
+
+    def get_class_count(self, class_label: str) -> int:
+        """
+        returns how many instances of this view have the given class label.
+        only available for views on a ClassificationDataset.
+        """
+        return self.__get_class_counts().get(class_label, 0)
+
+    def get_set_of_classes(self) -> Set[str]:
+        """
+        returns the class labels of the instances of this view.
+        only available for views on a ClassificationDataset.
+        """
+        return self.__get_class_counts().keys()
+
+    def __get_class_counts(self) -> Dict[str, int]:
+        if self.__class_counts is None:
+            if not self.__shared_class_codes:
+                class_label_index = {}
+                class_codes = np.fromiter(
+                    (class_label_index.setdefault(instance.get_class(), len(class_label_index))
+                     for instance in self.__instances),
+                    dtype=np.int64, count=len(self.__instances))
+                self.__shared_class_codes.extend((list(class_label_index), class_codes))
+            class_labels, class_codes = self.__shared_class_codes
+            counts = np.bincount(class_codes[self.__row_indices], minlength=len(class_labels))
+            self.__class_counts = {
+                class_labels[i]: int(counts[i]) for i in np.flatnonzero(counts)
+            }
+        return self.__class_counts
+
+    def __repr__(self) -> str:
+        return 'DatasetView(%d of %d instances)' % (len(self), len(self.__instances))
@@ -20,16 +20,38 @@ import heapq
 from prolothar_rule_mining.models.event_flow_graph import EventFlowGraph, Node
 from prolothar_rule_mining.models.event_flow_graph.alignment.alignment import Alignment
 from prolothar_rule_mining.models.event_flow_graph.alignment.heuristics import Heuristic
+from prolothar_rule_mining.models.event_flow_graph.alignment.heuristics import is_admissible
 from prolothar_rule_mining.models.event_flow_graph.alignment.alignment_finder import AlignmentFinder
 from prolothar_rule_mining.models.event_flow_graph.alignment.partial_alignment import PartialAlignment
+from prolothar_rule_mining.models.event_flow_graph.alignment.divide_and_conquer import DivideAndConquerAligner
 
 class AStar(AlignmentFinder):
 
-    def __init__(self, graph: EventFlowGraph, heuristic: Heuristic):
+    def __init__(self, graph: EventFlowGraph, heuristic: Heuristic,
+                 linear_memory_threshold: int = None):
+        """
+        Parameters
+        ----------
+        graph : EventFlowGraph
+            the graph to which sequences are aligned
+        heuristic : Heuristic
+            admissible estimation of the remaining cost of a partial alignment
+        linear_memory_threshold : int, optional
+            sequences that are longer than this threshold are aligned by
+            DivideAndConquerAligner, which needs memory linear in the length
+            of the sequence and finds an alignment with the same optimal cost.
+            by default None, i.e. A* is used for all sequences.
+        """
         super().__init__(graph)
         self.__heuristic = heuristic
+        self.__linear_memory_threshold = linear_memory_threshold
+        if linear_memory_threshold is not None:
+            self.__linear_memory_aligner = DivideAndConquerAligner(graph)
 
     def compute_alignment(self, sequence: Tuple[str]) -> Alignment:
+        if self.__linear_memory_threshold is not None \
+        and len(sequence) > self.__linear_memory_threshold:
+            return self.__linear_memory_aligner.compute_alignment(sequence)
         openlist = []
         heapq.heappush(openlist, PartialAlignment(
             Alignment(), self.graph.source, 0, 0, len(sequence)+1))
@@ -44,3 +66,10 @@ class AStar(AlignmentFinder):
                 heapq.heappush(openlist, neighbor)
 
         raise NotImplementedError('should never reach this point')
+
+    def get_configuration(self) -> tuple:
+        return (type(self), type(self.__heuristic), self.__linear_memory_threshold)
+
+    def is_optimal(self) -> bool:
+        #A* only finds optimal alignments with an admissible heuristic
+        return is_admissible(self.__heuristic)
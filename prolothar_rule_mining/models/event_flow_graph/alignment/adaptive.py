@@ -0,0 +1,203 @@
+'''
+    This file is part of Prolothar-Rule-Mining (More Info: https://github.com/shs-it/prolothar-rule-mining).
+
+    Prolothar-Rule-Mining is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    Prolothar-Rule-Mining is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with Prolothar-Rule-Mining. If not, see <https://www.gnu.org/licenses/>.
+'''
+from typing import Dict, List, Tuple, Union
+
+import time
+
+from prolothar_rule_mining.models.event_flow_graph import EventFlowGraph
+from prolothar_rule_mining.models.event_flow_graph.alignment.alignment import Alignment
+from prolothar_rule_mining.models.event_flow_graph.alignment.heuristics import Heuristic
+from prolothar_rule_mining.models.event_flow_graph.alignment.alignment_finder import AlignmentFinder
+
+def _compute_cost(alignment: Alignment) -> int:
+    return sum(1 for move in alignment if not move.is_sync_move())
+
+class _FinderStatistics:
+    def __init__(self):
+        self.nr_of_calls = 0
+        self.nr_of_accepted_alignments = 0
+        self.nr_of_errors = 0
+        self.nr_of_timeouts = 0
+        self.nr_of_skips = 0
+        self.nr_of_skips_in_a_row = 0
+        self.total_time_in_seconds = 0.0
+
+    def get_acceptance_rate(self) -> float:
+        return self.nr_of_accepted_alignments / self.nr_of_calls
+
+    def get_mean_time_in_seconds(self) -> float:
+        return self.total_time_in_seconds / self.nr_of_calls
+
+class AdaptiveAlignmentFinder(AlignmentFinder):
+    """
+    tries a list of alignment finders from cheap to expensive for every
+    sequence. the alignment of a finder is accepted if it is provably optimal,
+    i.e. if the finder itself is optimal or if the cost of the alignment is not
+    larger than a lower bound. otherwise the next finder is tried.
+    the last finder is always accepted.
+
+    every finder can get a time limit per sequence. finders that support a
+    time budget (see AlignmentFinder.compute_alignment_until) stop at the
+    limit and return a truncated alignment, which is never accepted. a finder
+    that exceeds its limit counts as a timeout in the statistics.
+
+    the statistics of the finders are used to skip finders that do not pay
+    off: after a warm up phase, a finder is only tried if its mean runtime is
+    smaller than the runtime that it saves in expectation, i.e. its acceptance
+    rate times the expected runtime of the following finders. escalation stops
+    at the first following finder that accepts, so a following finder only
+    adds its mean runtime weighted by the probability that all finders between
+    are rejected. a skipped finder is tried again after nr_of_warm_up_calls
+    skips in a row.
+    """
+
+    def __init__(
+            self, graph: EventFlowGraph, alignment_finders: List[AlignmentFinder],
+            lower_bound: Heuristic = None, nr_of_warm_up_calls: int = 20,
+            time_limits_in_seconds: List[Union[float, None]] = None):
+        """
+        Parameters
+        ----------
+        graph : EventFlowGraph
+            the graph to which sequences are aligned
+        alignment_finders : List[AlignmentFinder]
+            alignment finders ordered from cheap to expensive. all finders
+            must work on the given graph.
+        lower_bound : Heuristic, optional
+            admissible heuristic that is evaluated at the source of the graph to
+            get a lower bound of the cost of an alignment. by default None,
+            i.e. only alignments without errors are provably optimal.
+        nr_of_warm_up_calls : int, optional
+            every finder is called at least this number of times before it can
+            be skipped, by default 20
+        time_limits_in_seconds : List[Union[float, None]], optional
+            maximal time spent by each finder on a single sequence. None entries
+            are unbounded. by default None, i.e. all finders are unbounded.
+        """
+        super().__init__(graph)
+        if not alignment_finders:
+            raise ValueError('alignment_finders must not be empty')
+        for alignment_finder in alignment_finders:
+            if alignment_finder.graph is not graph:
+                raise ValueError('alignment finder %r works on another graph' % alignment_finder)
+        if time_limits_in_seconds is None:
+            time_limits_in_seconds = [None] * len(alignment_finders)
+        elif len(time_limits_in_seconds) != len(alignment_finders):
+            raise ValueError('expected %d time limits but got %d' % (
+                len(alignment_finders), len(time_limits_in_seconds)))
+        self.__alignment_finders = alignment_finders
+        self.__time_limits_in_seconds = time_limits_in_seconds
+        self.__lower_bound = lower_bound
+        self.__nr_of_warm_up_calls = nr_of_warm_up_calls
+        self.__statistics = [_FinderStatistics() for _ in alignment_finders]
+
+    def get_configuration(self) -> tuple:
+        return (type(self), tuple(
+            alignment_finder.get_configuration()
+            for alignment_finder in self.__alignment_finders
+        ), type(self.__lower_bound))
+
+    def is_optimal(self) -> bool:
+        return self.__alignment_finders[-1].is_optimal() \
+            and self.__time_limits_in_seconds[-1] is None
+
+    def compute_alignment(self, sequence: Tuple[str]) -> Alignment:
+        if self.__lower_bound is not None:
+            lower_bound = self.__lower_bound(self.graph.source, 0, sequence)
+        else:
+            lower_bound = 0
+        best_alignment = None
+        best_cost = float('inf')
+        last_index = len(self.__alignment_finders) - 1
+        for i, (alignment_finder, statistics, time_limit) in enumerate(zip(
+                self.__alignment_finders, self.__statistics,
+                self.__time_limits_in_seconds)):
+            if i < last_index and not self.__pays_off(i):
+                statistics.nr_of_skips += 1
+                statistics.nr_of_skips_in_a_row += 1
+                continue
+            statistics.nr_of_skips_in_a_row = 0
+            statistics.nr_of_calls += 1
+            start_time = time.perf_counter()
+            try:
+                if time_limit is None:
+                    alignment = alignment_finder.compute_alignment(sequence)
+                else:
+                    alignment = alignment_finder.compute_alignment_until(
+                        sequence, start_time + time_limit)
+            except Exception:
+                if i == last_index and best_alignment is None:
+                    raise
+                statistics.nr_of_errors += 1
+                continue
+            finally:
+                elapsed_time = time.perf_counter() - start_time
+                statistics.total_time_in_seconds += elapsed_time
+            truncated = alignment.is_truncated()
+            if truncated or (time_limit is not None and elapsed_time > time_limit):
+                statistics.nr_of_timeouts += 1
+            cost = _compute_cost(alignment)
+            if cost < best_cost:
+                best_alignment = alignment
+                best_cost = cost
+            if cost <= lower_bound or (not truncated and (
+                    i == last_index or alignment_finder.is_optimal())):
+                statistics.nr_of_accepted_alignments += 1
+                return alignment
+            if i == last_index and not best_alignment.is_truncated():
+                #the last finder ran out of time, i.e. the best alignment is not
+                #necessarily the one that would be returned without time limits
+                best_alignment = best_alignment.copy()
+                best_alignment.mark_as_truncated()
+        return best_alignment
+
+    def __pays_off(self, i: int) -> bool:
+        statistics = self.__statistics[i]
+        #a skipped finder is tried again from time to time, because its
+        #acceptance rate might change during a run
+        if statistics.nr_of_calls < self.__nr_of_warm_up_calls \
+        or statistics.nr_of_skips_in_a_row >= self.__nr_of_warm_up_calls:
+            return True
+        #expected runtime of the escalation after finder i. a following
+        #finder is only reached if all finders between have been rejected.
+        saved_time = 0.0
+        probability_of_reaching_finder = 1.0
+        for other_statistics in self.__statistics[i+1:]:
+            #runtime of following finders is unknown => expensive
+            if other_statistics.nr_of_calls == 0:
+                return True
+            saved_time += probability_of_reaching_finder * \
+                other_statistics.get_mean_time_in_seconds()
+            probability_of_reaching_finder *= 1 - other_statistics.get_acceptance_rate()
+        return statistics.get_acceptance_rate() * saved_time > statistics.get_mean_time_in_seconds()
+
+    def get_statistics(self) -> List[Dict[str, float]]:
+        """
+        returns for every alignment finder the number of calls, accepted
+        alignments, errors, timeouts and skips and the total runtime in seconds
+        """
+        return [
+            {
+                'nr_of_calls': statistics.nr_of_calls,
+                'nr_of_accepted_alignments': statistics.nr_of_accepted_alignments,
+                'nr_of_errors': statistics.nr_of_errors,
+                'nr_of_timeouts': statistics.nr_of_timeouts,
+                'nr_of_skips': statistics.nr_of_skips,
+                'total_time_in_seconds': statistics.total_time_in_seconds,
+            }
+            for statistics in self.__statistics
+        ]
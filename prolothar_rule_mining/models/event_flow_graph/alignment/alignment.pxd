@@ -26,9 +26,12 @@ cdef class Move:
 
 cdef class Alignment:
     cdef list moves
+    cdef bint truncated
 
     cpdef Alignment copy(self)
     cpdef append_log_move(self, int event_index)
     cpdef append_model_move(self, Node node)
     cpdef append_sync_move(self, Node node, int event_index)
-    cpdef Move get_last_move(self)
\ No newline at end of file
+    cpdef Move get_last_move(self)
+    cpdef bint is_truncated(self)
+    cpdef mark_as_truncated(self)
\ No newline at end of file
@@ -44,6 +44,7 @@ cdef class Alignment:
 
     def __init__(self):
         self.moves = []
+        self.truncated = False
 
     def __eq__(self, other: 'Alignment') -> bool:
         return self is other or self.moves == other.moves
@@ -60,6 +61,18 @@ cdef class Alignment:
     cpdef Move get_last_move(self):
         return self.moves[-1]
 
+    cpdef bint is_truncated(self):
+        """
+        returns True iff the search for this alignment was stopped early,
+        e.g. because a time or expansion budget was exhausted. a truncated
+        alignment is complete, but not necessarily the alignment that the
+        alignment finder would return without a budget.
+        """
+        return self.truncated
+
+    cpdef mark_as_truncated(self):
+        self.truncated = True
+
     def __repr__(self) -> str:
         return str(self.moves)
 
@@ -72,4 +85,5 @@ cdef class Alignment:
     cpdef Alignment copy(self):
         cdef Alignment copy = Alignment()
         copy.moves = list(self.moves)
+        copy.truncated = self.truncated
         return copy
@@ -0,0 +1,252 @@
+'''
+    This file is part of Prolothar-Rule-Mining (More Info: https://github.com/shs-it/prolothar-rule-mining).
+
+    Prolothar-Rule-Mining is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    Prolothar-Rule-Mining is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with Prolothar-Rule-Mining. If not, see <https://www.gnu.org/licenses/>.
+'''
+"""
+cache for alignments that can be shared by all components that align sequences
+on the same EventFlowGraph, e.g. cover computation, oracle routing and
+candidates of the graph miners
+"""
+
+from typing import Dict, Iterable, List, Tuple, Union
+
+from collections import OrderedDict
+
+from prolothar_rule_mining.models.event_flow_graph import EventFlowGraph, Node, Edge
+from prolothar_rule_mining.models.event_flow_graph.alignment.alignment import Alignment
+from prolothar_rule_mining.models.event_flow_graph.alignment.alignment_finder import AlignmentFinder
+
+class AlignmentCache:
+    """
+    caches alignments by (graph version, alignment finder configuration,
+    sequence). truncated alignments (see Alignment.is_truncated) are not
+    cached. the size of the cache is bounded by the total number of moves
+    of all stored alignments. if the cache is full, the least recently used
+    alignments are removed.
+
+    the cache observes the changes of the graphs it is used for. an alignment
+    of an optimal alignment finder is carried over to a new graph version if
+    the changes in between cannot affect it, i.e. if only nodes are added or
+    removed, edges that are not on the path of the alignment are removed or
+    edges are added while the alignment consists only of synchronous moves.
+    """
+
+    def __init__(self, max_nr_of_moves: int = 10_000_000,
+                 max_nr_of_tracked_changes: int = 10_000):
+        """
+        creates a new, empty cache
+
+        Parameters
+        ----------
+        max_nr_of_moves : int, optional
+            memory budget of the cache as total number of moves of all stored
+            alignments, by default 10_000_000
+        max_nr_of_tracked_changes : int, optional
+            number of graph changes that are remembered to carry over
+            alignments to new graph versions, by default 10_000
+        """
+        if max_nr_of_moves < 1:
+            raise ValueError('max_nr_of_moves must be positive but was %d' % max_nr_of_moves)
+        self.__max_nr_of_moves = max_nr_of_moves
+        self.__max_nr_of_tracked_changes = max_nr_of_tracked_changes
+        self.__alignments: OrderedDict[Tuple, Alignment] = OrderedDict()
+        self.__nr_of_moves = 0
+        #new graph version => (old graph version, type of change, node or edge)
+        self.__changes: OrderedDict[Tuple, Tuple[Tuple, str, Union[Node, Edge]]] = OrderedDict()
+        self.__observed_graph_ids = set()
+        self.nr_of_hits = 0
+        self.nr_of_misses = 0
+        self.nr_of_carried_over_alignments = 0
+        self.nr_of_evicted_alignments = 0
+
+    def compute_alignment(
+            self, alignment_finder: AlignmentFinder, sequence: Tuple[str]) -> Alignment:
+        """
+        returns the cached alignment of the sequence on the current version of
+        the graph of the alignment finder or computes and caches it
+        """
+        return self.compute_alignments(alignment_finder, [sequence])[0]
+
+    def compute_alignments(
+            self, alignment_finder: AlignmentFinder,
+            sequences: Iterable[Tuple[str]]) -> List[Alignment]:
+        """
+        returns the alignments of the sequences on the current version of the
+        graph of the alignment finder. the alignments that are not in the cache
+        are computed in one batch by alignment_finder.compute_alignments
+        and added to the cache.
+
+        Returns
+        -------
+        List[Alignment]
+            the i-th alignment belongs to the i-th sequence
+        """
+        graph: EventFlowGraph = alignment_finder.graph
+        self.__observe(graph)
+        version = graph.get_version()
+        configuration = alignment_finder.get_configuration()
+        sequences = [tuple(sequence) for sequence in sequences]
+        alignments: Dict[Tuple[str], Alignment] = {}
+        missing_sequences = []
+        for sequence in sequences:
+            if sequence not in alignments:
+                alignment = self.__lookup(alignment_finder, version, configuration, sequence)
+                alignments[sequence] = alignment
+                if alignment is None:
+                    missing_sequences.append(sequence)
+        if missing_sequences:
+            self.nr_of_misses += len(missing_sequences)
+            for sequence, alignment in zip(
+                    missing_sequences, alignment_finder.compute_alignments(missing_sequences)):
+                alignments[sequence] = alignment
+                #a truncated alignment depends on the budget of the search
+                if not alignment.is_truncated():
+                    self.__put((version, configuration, sequence), alignment)
+        return [alignments[sequence] for sequence in sequences]
+
+    def __lookup(
+            self, alignment_finder: AlignmentFinder, version: Tuple,
+            configuration: Tuple, sequence: Tuple[str]) -> Union[Alignment, None]:
+        key = (version, configuration, sequence)
+        try:
+            alignment = self.__alignments[key]
+            self.__alignments.move_to_end(key)
+            self.nr_of_hits += 1
+            return alignment
+        except KeyError:
+            pass
+        if alignment_finder.is_optimal():
+            alignment = self.__find_carried_over_alignment(
+                version, configuration, sequence, alignment_finder.graph.source)
+            if alignment is not None:
+                self.nr_of_carried_over_alignments += 1
+                self.__put(key, alignment)
+                return alignment
+        return None
+
+    def wrap(self, alignment_finder: AlignmentFinder) -> 'CachedAlignmentFinder':
+        """
+        returns an AlignmentFinder that uses this cache for the given alignment finder
+        """
+        return CachedAlignmentFinder(alignment_finder, self)
+
+    def get_statistics(self) -> Dict[str, int]:
+        """
+        returns the number of hits, misses, carried over and evicted alignments
+        together with the current size of the cache
+        """
+        return {
+            'hits': self.nr_of_hits,
+            'misses': self.nr_of_misses,
+            'carried_over': self.nr_of_carried_over_alignments,
+            'evicted': self.nr_of_evicted_alignments,
+            'alignments': len(self.__alignments),
+            'moves': self.__nr_of_moves,
+        }
+
+    def clear(self):
+        """
+        removes all alignments and tracked graph changes from the cache
+        """
+        self.__alignments.clear()
+        self.__changes.clear()
+        self.__nr_of_moves = 0
+
+    def __len__(self) -> int:
+        return len(self.__alignments)
+
+    def __observe(self, graph: EventFlowGraph):
+        graph_id = graph.get_version()[0]
+        if graph_id not in self.__observed_graph_ids:
+            self.__observed_graph_ids.add(graph_id)
+            graph.add_change_listener(self.__on_graph_change)
+
+    def __on_graph_change(
+            self, old_version: Tuple, new_version: Tuple, change_type: str,
+            element: Union[Node, Edge]):
+        self.__changes[new_version] = (old_version, change_type, element)
+        self.__changes.move_to_end(new_version)
+        if len(self.__changes) > self.__max_nr_of_tracked_changes:
+            self.__changes.popitem(last=False)
+
+    def __put(self, key: Tuple, alignment: Alignment):
+        self.__alignments[key] = alignment
+        self.__nr_of_moves += len(alignment)
+        while self.__nr_of_moves > self.__max_nr_of_moves and len(self.__alignments) > 1:
+            _, evicted_alignment = self.__alignments.popitem(last=False)
+            self.__nr_of_moves -= len(evicted_alignment)
+            self.nr_of_evicted_alignments += 1
+
+    def __find_carried_over_alignment(
+            self, version: Tuple, configuration: Tuple,
+            sequence: Tuple[str], source: Node) -> Union[Alignment, None]:
+        #walk back the history of graph changes until a cached alignment is found
+        changes = []
+        visited_versions = {version}
+        while version in self.__changes:
+            version, change_type, element = self.__changes[version]
+            if version in visited_versions:
+                return None
+            visited_versions.add(version)
+            changes.append((change_type, element))
+            alignment = self.__alignments.get((version, configuration, sequence))
+            if alignment is not None:
+                if all(_is_alignment_unaffected_by_change(
+                        alignment, source, change_type, element)
+                       for change_type, element in changes):
+                    return alignment
+                return None
+        return None
+
+def _is_alignment_unaffected_by_change(
+        alignment: Alignment, source: Node, change_type: str,
+        element: Union[Node, Edge]) -> bool:
+    if change_type == 'add_node' or change_type == 'remove_node':
+        #nodes without edges cannot be part of an alignment
+        return True
+    if change_type == 'add_edge':
+        #an alignment without errors cannot be improved
+        return all(move.is_sync_move() for move in alignment)
+    #an optimal alignment stays optimal if an unused edge is removed
+    last_node = source
+    for move in alignment:
+        if move.node is not None:
+            if last_node == element.from_node and move.node == element.to_node:
+                return False
+            last_node = move.node
+    return True
+
+class CachedAlignmentFinder(AlignmentFinder):
+    """
+    AlignmentFinder that looks up alignments of another AlignmentFinder in an
+    AlignmentCache
+    """
+
+    def __init__(self, alignment_finder: AlignmentFinder, cache: AlignmentCache):
+        super().__init__(alignment_finder.graph)
+        self.__alignment_finder = alignment_finder
+        self.__cache = cache
+
+    def compute_alignment(self, sequence: Tuple[str]) -> Alignment:
+        return self.__cache.compute_alignment(self.__alignment_finder, sequence)
+
+    def compute_alignments(self, sequences: Iterable[Tuple[str]]) -> List[Alignment]:
+        return self.__cache.compute_alignments(self.__alignment_finder, sequences)
+
+    def get_configuration(self) -> tuple:
+        return self.__alignment_finder.get_configuration()
+
+    def is_optimal(self) -> bool:
+        return self.__alignment_finder.is_optimal()
@@ -15,6 +15,8 @@
     along with Prolothar-Rule-Mining. If not, see <https://www.gnu.org/licenses/>.
 '''
 
+from typing import Iterable, List, Tuple
+
 from prolothar_rule_mining.models.event_flow_graph import EventFlowGraph
 from prolothar_rule_mining.models.event_flow_graph.alignment.alignment import Alignment
 
@@ -26,9 +28,59 @@ cdef class AlignmentFinder:
     def __init__(self, graph: EventFlowGraph):
         self.graph = graph
 
-    def compute_alignment(self, sequence: tuple[str]) -> Alignment:
+    def compute_alignment(self, sequence: Tuple[str]) -> Alignment:
         """
         computes an alignment for the given sequence, i.e. a way through the
         graph and the sequence that makes minimal mistakes on both
         """
         raise NotImplementedError()
+
+    def compute_alignment_until(self, sequence: Tuple[str], deadline: float) -> Alignment:
+        """
+        computes an alignment for the given sequence and stops at the given
+        deadline, which is a value of time.perf_counter(). alignment finders
+        that support a time budget return an alignment marked as truncated
+        (see Alignment.is_truncated) if the deadline is reached. by default,
+        the deadline is ignored.
+        """
+        return self.compute_alignment(sequence)
+
+    def compute_alignments(self, sequences: Iterable[Tuple[str]]) -> List[Alignment]:
+        """
+        computes alignments for many sequences. each distinct sequence is
+        aligned only once, i.e. equal sequences share the same Alignment object.
+        subclasses can share work between sequences, e.g. PrefixTrieAligner
+        computes common prefixes only once.
+
+        Returns
+        -------
+        List[Alignment]
+            the i-th alignment belongs to the i-th sequence
+        """
+        alignments = {}
+        result = []
+        for sequence in sequences:
+            sequence = tuple(sequence)
+            try:
+                alignment = alignments[sequence]
+            except KeyError:
+                alignment = self.compute_alignment(sequence)
+                alignments[sequence] = alignment
+            result.append(alignment)
+        return result
+
+    def get_configuration(self) -> tuple:
+        """
+        returns a hashable description of the parameters of this alignment
+        finder. two alignment finders with the same configuration compute the
+        same alignment for the same sequence on the same version of a graph.
+        by default, the configuration is the type of the alignment finder.
+        """
+        return (type(self),)
+
+    def is_optimal(self) -> bool:
+        """
+        returns True iff this alignment finder always computes an alignment
+        with a minimal number of log and model moves
+        """
+        return False
@@ -0,0 +1,236 @@
+'''
+    This file is part of Prolothar-Rule-Mining (More Info: https://github.com/shs-it/prolothar-rule-mining).
+
+    Prolothar-Rule-Mining is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    Prolothar-Rule-Mining is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with Prolothar-Rule-Mining. If not, see <https://www.gnu.org/licenses/>.
+'''
+from typing import Callable, Dict, List, Set, Tuple
+
+import bisect
+from collections import Counter, deque
+
+from prolothar_common.parallel.abstract.computation_engine import ComputationEngine
+from prolothar_common.parallel.single_thread.single_thread import SingleThreadComputationEngine
+
+from prolothar_rule_mining.models.event_flow_graph import EventFlowGraph, Node
+from prolothar_rule_mining.models.event_flow_graph.alignment.alignment import Alignment
+from prolothar_rule_mining.models.event_flow_graph.alignment.alignment_finder import AlignmentFinder
+
+def _align_segment(parameters, segment: Tuple[AlignmentFinder, Tuple[str]]) -> Alignment:
+    alignment_finder, subsequence = segment
+    return alignment_finder.compute_alignment(subsequence)
+
+class _Segment:
+    """
+    the part of the graph between two anchor nodes as a standalone graph.
+    the source of the segment graph represents the first anchor, the sink
+    represents the second anchor.
+    """
+    def __init__(self, alignment_finder: AlignmentFinder, original_nodes: Dict[int, Node]):
+        self.alignment_finder = alignment_finder
+        self.original_nodes = original_nodes
+
+class AnchorDecompositionAligner(AlignmentFinder):
+    """
+    splits an alignment problem at anchors, i.e. events that occur exactly once
+    in the sequence and exactly once in the graph. the node of an anchor must
+    lie on every path from source to sink and must not be part of a cycle.
+    the sequence between two consecutive anchors is aligned independently to
+    the part of the graph between the anchor nodes by an inner alignment finder.
+
+    the result is optimal if the inner alignment finder is optimal and there is
+    an optimal alignment that matches all anchors with synchronous moves.
+    """
+
+    def __init__(
+            self, graph: EventFlowGraph,
+            create_alignment_finder: Callable[[EventFlowGraph], AlignmentFinder],
+            computation_engine: ComputationEngine = SingleThreadComputationEngine()):
+        """
+        Parameters
+        ----------
+        graph : EventFlowGraph
+            the graph to which sequences are aligned
+        create_alignment_finder : Callable[[EventFlowGraph], AlignmentFinder]
+            creates the inner alignment finder for the graph between two anchors
+        computation_engine : ComputationEngine, optional
+            used to align the segments between anchors in parallel. by default
+            SingleThreadComputationEngine()
+        """
+        super().__init__(graph)
+        self.__create_alignment_finder = create_alignment_finder
+        self.__computation_engine = computation_engine
+        self.__graph_version = None
+        self.__alignment_finder: AlignmentFinder = None
+        self.__anchor_nodes: Dict[str, Node] = {}
+        self.__anchor_ranks: Dict[Node, int] = {}
+        self.__segments: Dict[Tuple[Node, Node], _Segment] = {}
+
+    def get_configuration(self) -> tuple:
+        self.__update_graph_index()
+        return (type(self), self.__alignment_finder.get_configuration())
+
+    def compute_alignment(self, sequence: Tuple[str]) -> Alignment:
+        self.__update_graph_index()
+        sequence = tuple(sequence)
+        anchors = self.__find_anchors(sequence)
+        if not anchors:
+            return self.__alignment_finder.compute_alignment(sequence)
+
+        boundaries = [(self.graph.source, -1)] + anchors + [(self.graph.sink, len(sequence))]
+        segments = []
+        for (start_node, start_index), (end_node, end_index) in zip(boundaries, boundaries[1:]):
+            segments.append((
+                self.__get_segment(start_node, end_node),
+                sequence[start_index + 1:end_index], start_index + 1, end_node))
+
+        sub_alignments = self.__computation_engine.create_partitionable_list([
+            (segment.alignment_finder, subsequence)
+            for segment, subsequence, _, _ in segments
+        ]).map(None, _align_segment)
+
+        alignment = Alignment()
+        for (segment, _, offset, end_node), sub_alignment in zip(segments, sub_alignments):
+            self.__append_sub_alignment(alignment, sub_alignment, segment, offset, end_node)
+        return alignment
+
+    def __append_sub_alignment(
+            self, alignment: Alignment, sub_alignment: Alignment, segment: _Segment,
+            offset: int, end_node: Node):
+        for move in sub_alignment:
+            if move.is_log_move():
+                alignment.append_log_move(offset + move.event_index)
+            elif move.is_model_move():
+                alignment.append_model_move(segment.original_nodes[move.node.node_id])
+            elif move.node.node_id in segment.original_nodes:
+                alignment.append_sync_move(
+                    segment.original_nodes[move.node.node_id], offset + move.event_index)
+            else:
+                #sync move with the sink of the segment graph
+                alignment.append_sync_move(end_node, offset + move.event_index)
+
+    def __find_anchors(self, sequence: Tuple[str]) -> List[Tuple[Node, int]]:
+        """
+        returns the anchors as (node, event_index) pairs. the anchors are a
+        longest subsequence of candidate anchors that is ordered both in the
+        sequence and in the graph.
+        """
+        event_counter = Counter(sequence)
+        candidates = [
+            (self.__anchor_nodes[event], i) for i, event in enumerate(sequence)
+            if event_counter[event] == 1 and event in self.__anchor_nodes
+        ]
+        #longest increasing subsequence of the ranks in the graph
+        tails = []
+        tail_indices = []
+        predecessors = []
+        for i, (node, _) in enumerate(candidates):
+            rank = self.__anchor_ranks[node]
+            position = bisect.bisect_left(tails, rank)
+            if position == len(tails):
+                tails.append(rank)
+                tail_indices.append(i)
+            else:
+                tails[position] = rank
+                tail_indices[position] = i
+            predecessors.append(tail_indices[position - 1] if position > 0 else None)
+        anchors = []
+        i = tail_indices[-1] if tail_indices else None
+        while i is not None:
+            anchors.append(candidates[i])
+            i = predecessors[i]
+        anchors.reverse()
+        return anchors
+
+    def __update_graph_index(self):
+        version = self.graph.get_version()
+        if version == self.__graph_version:
+            return
+        self.__graph_version = version
+        self.__alignment_finder = self.__create_alignment_finder(self.graph)
+        self.__segments = {}
+        self.__anchor_nodes = {}
+        self.__anchor_ranks = {}
+        nodes_by_event: Dict[str, List[Node]] = {}
+        for node in self.graph.nodes():
+            nodes_by_event.setdefault(node.event, []).append(node)
+        distances = self.__compute_distances_from_source()
+        for event, nodes in nodes_by_event.items():
+            if len(nodes) == 1 and nodes[0] in distances \
+            and self.__is_on_all_paths(nodes[0]) and not self.__is_on_cycle(nodes[0]):
+                self.__anchor_nodes[event] = nodes[0]
+                #nodes on all paths have strictly increasing distances from source
+                self.__anchor_ranks[nodes[0]] = distances[nodes[0]]
+
+    def __compute_distances_from_source(self) -> Dict[Node, int]:
+        distances = {self.graph.source: 0}
+        open_nodes = deque([self.graph.source])
+        while open_nodes:
+            node = open_nodes.popleft()
+            for child in node.children:
+                if child not in distances:
+                    distances[child] = distances[node] + 1
+                    open_nodes.append(child)
+        return distances
+
+    def __is_on_all_paths(self, node: Node) -> bool:
+        """
+        returns True iff the sink cannot be reached from the source without node
+        """
+        return self.graph.sink not in self.__collect_reachable_nodes(
+            self.graph.source, lambda n: n.children, node)
+
+    def __is_on_cycle(self, node: Node) -> bool:
+        return node in self.__collect_reachable_nodes(
+            node, lambda n: n.children, None)
+
+    def __collect_reachable_nodes(
+            self, start_node: Node, get_neighbors: Callable[[Node], Set[Node]],
+            blocked_node: Node) -> Set[Node]:
+        """
+        returns all nodes that can be reached from start_node by at least one
+        step without passing blocked_node
+        """
+        reachable_nodes = set()
+        open_nodes = [start_node]
+        while open_nodes:
+            node = open_nodes.pop()
+            for neighbor in get_neighbors(node):
+                if neighbor not in reachable_nodes and neighbor is not blocked_node:
+                    reachable_nodes.add(neighbor)
+                    open_nodes.append(neighbor)
+        return reachable_nodes
+
+    def __get_segment(self, start_node: Node, end_node: Node) -> _Segment:
+        try:
+            return self.__segments[(start_node, end_node)]
+        except KeyError:
+            segment = self.__create_segment(start_node, end_node)
+            self.__segments[(start_node, end_node)] = segment
+            return segment
+
+    def __create_segment(self, start_node: Node, end_node: Node) -> _Segment:
+        inner_nodes = self.__collect_reachable_nodes(
+            start_node, lambda n: n.children, end_node).intersection(
+                self.__collect_reachable_nodes(end_node, lambda n: n.parents, start_node))
+        segment_graph = EventFlowGraph()
+        node_mapping = {start_node: segment_graph.source, end_node: segment_graph.sink}
+        for node in inner_nodes:
+            node_mapping[node] = segment_graph.add_node(node.event)
+        for node in [start_node] + list(inner_nodes):
+            for child in node.children:
+                if child in node_mapping and child is not start_node:
+                    segment_graph.add_edge(node_mapping[node], node_mapping[child])
+        return _Segment(
+            self.__create_alignment_finder(segment_graph),
+            {node_mapping[node].node_id: node for node in inner_nodes})
@@ -16,25 +16,87 @@
 '''
 from typing import Tuple
 
+import heapq
+import time
+
 from prolothar_rule_mining.models.event_flow_graph import EventFlowGraph
 from prolothar_rule_mining.models.event_flow_graph.alignment.alignment import Alignment
 from prolothar_rule_mining.models.event_flow_graph.alignment.heuristics import Heuristic
 from prolothar_rule_mining.models.event_flow_graph.alignment.alignment_finder import AlignmentFinder
+from prolothar_rule_mining.models.event_flow_graph.caching import CachedShortestPathToEventFinder
 
 from prolothar_rule_mining.models.event_flow_graph.alignment.partial_alignment import PartialAlignment
 
 class BeamSearch(AlignmentFinder):
+    """
+    keeps the beam_width best partial alignments in each round. the search
+    can be bounded by a number of expansions or by a time limit per sequence.
+    if the budget is exhausted before the sink is reached, the best partial
+    alignment is completed with log moves for the remaining events and model
+    moves on the shortest path to the sink and marked as truncated
+    (see Alignment.is_truncated). the budget does not change alignments that
+    are not truncated.
+    """
 
     def __init__(self, graph: EventFlowGraph, heuristic: Heuristic, beam_width: int,
-                 model_move_cost: int = 1):
+                 model_move_cost: int = 1, max_nr_of_expansions: int = None,
+                 time_limit_in_seconds: float = None,
+                 merge_duplicate_states: bool = False):
+        """
+        Parameters
+        ----------
+        graph : EventFlowGraph
+            the graph to which sequences are aligned
+        heuristic : Heuristic
+            estimates the remaining cost of a partial alignment
+        beam_width : int
+            number of partial alignments that are kept in each round
+        model_move_cost : int, optional
+            cost of a model move, by default 1
+        max_nr_of_expansions : int, optional
+            maximal number of partial alignments that are expanded per
+            sequence. by default None, i.e. unbounded
+        time_limit_in_seconds : float, optional
+            maximal time spent on a single sequence. by default None, i.e.
+            unbounded
+        merge_duplicate_states : bool, optional
+            if True, partial alignments with the same node and event index are
+            merged and only the cheapest is kept. this frees beam slots for
+            other states. by default False
+        """
         super().__init__(graph)
         self.__heuristic = heuristic
         if beam_width < 1:
             raise ValueError('beam_width must not be < 1 but was %d' % beam_width)
         self.__beam_width = beam_width
         self.__model_move_cost = model_move_cost
+        if max_nr_of_expansions is not None and max_nr_of_expansions < 1:
+            raise ValueError('max_nr_of_expansions must not be < 1 but was %d' % (
+                max_nr_of_expansions))
+        self.__max_nr_of_expansions = max_nr_of_expansions
+        self.__time_limit_in_seconds = time_limit_in_seconds
+        self.__merge_duplicate_states = merge_duplicate_states
+        self.__shortest_path_finder = None
+        self.__shortest_path_finder_version = None
+
+    def get_configuration(self) -> tuple:
+        #the budget is not part of the configuration, because an alignment
+        #that is not truncated is the same as without a budget
+        return (type(self), type(self.__heuristic), self.__beam_width,
+                self.__model_move_cost, self.__merge_duplicate_states)
 
     def compute_alignment(self, sequence: Tuple[str]) -> Alignment:
+        return self.__compute_alignment(sequence, None)
+
+    def compute_alignment_until(self, sequence: Tuple[str], deadline: float) -> Alignment:
+        return self.__compute_alignment(sequence, deadline)
+
+    def __compute_alignment(self, sequence: Tuple[str], deadline: float) -> Alignment:
+        if self.__time_limit_in_seconds is not None:
+            own_deadline = time.perf_counter() + self.__time_limit_in_seconds
+            if deadline is None or own_deadline < deadline:
+                deadline = own_deadline
+        nr_of_expansions = 0
         candidates = [PartialAlignment(
             Alignment(), self.graph.source, 0, 0,
             self.__heuristic(self.graph.source, 0, sequence))]
@@ -43,8 +105,55 @@ class BeamSearch(AlignmentFinder):
             for candidate in candidates:
                 if candidate.node is self.graph.sink:
                     return candidate.alignment
+                if (self.__max_nr_of_expansions is not None
+                        and nr_of_expansions >= self.__max_nr_of_expansions) \
+                or (deadline is not None and time.perf_counter() >= deadline):
+                    return self.__complete_alignment(candidates, sequence)
+                nr_of_expansions += 1
                 new_candidates.extend(candidate.yield_neighbors(
                     sequence, self.__heuristic, self.graph.sink,
                     model_move_cost = self.__model_move_cost))
-            new_candidates.sort()
-            candidates = new_candidates[:self.__beam_width]
+            if self.__merge_duplicate_states:
+                new_candidates = self.__merge_duplicates(new_candidates)
+            #equivalent to sorted(new_candidates)[:beam_width]
+            candidates = heapq.nsmallest(self.__beam_width, new_candidates)
+
+    def __merge_duplicates(self, candidates):
+        cheapest_candidates = {}
+        for candidate in candidates:
+            state = (candidate.node, candidate.event_index)
+            other_candidate = cheapest_candidates.get(state)
+            if other_candidate is None or candidate.cost < other_candidate.cost:
+                cheapest_candidates[state] = candidate
+        return list(cheapest_candidates.values())
+
+    def __complete_alignment(self, candidates, sequence: Tuple[str]) -> Alignment:
+        #the best candidate cannot be completed if the sink is not reachable
+        #from its node. then the next best candidate is used.
+        for candidate in sorted(candidates):
+            path = self.__find_shortest_path_to_sink(candidate.node)
+            if path is not None:
+                break
+        else:
+            raise ValueError(
+                'the sink is not reachable from any partial alignment in the beam')
+        alignment = candidate.alignment.copy()
+        for event_index in range(candidate.event_index, len(sequence)):
+            alignment.append_log_move(event_index)
+        for node in path[1:-1]:
+            alignment.append_model_move(node)
+        alignment.append_sync_move(self.graph.sink, len(sequence))
+        alignment.mark_as_truncated()
+        return alignment
+
+    def __find_shortest_path_to_sink(self, node):
+        """
+        returns the shortest path from the given node to the sink or None if
+        there is no such path. the cached paths are discarded if the graph has
+        been changed.
+        """
+        version = self.graph.get_version()
+        if version != self.__shortest_path_finder_version:
+            self.__shortest_path_finder = CachedShortestPathToEventFinder(self.graph)
+            self.__shortest_path_finder_version = version
+        return self.__shortest_path_finder(node, self.graph.sink.event)
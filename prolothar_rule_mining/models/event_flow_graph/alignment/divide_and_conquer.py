@@ -0,0 +1,241 @@
+'''
+    This file is part of Prolothar-Rule-Mining (More Info: https://github.com/shs-it/prolothar-rule-mining).
+
+    Prolothar-Rule-Mining is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    Prolothar-Rule-Mining is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with Prolothar-Rule-Mining. If not, see <https://www.gnu.org/licenses/>.
+'''
+from typing import List, Tuple
+
+import heapq
+import itertools
+
+from prolothar_rule_mining.models.event_flow_graph import EventFlowGraph
+from prolothar_rule_mining.models.event_flow_graph.alignment.alignment import Alignment
+from prolothar_rule_mining.models.event_flow_graph.alignment.alignment_finder import AlignmentFinder
+
+_INFINITY = float('inf')
+
+#moves of the divide and conquer search are tuples (node_index, event_index).
+#a model move has event_index None, a log move has node_index None.
+_Move = Tuple[int, int]
+
+#encoding of the move into a state in the predecessor lists of
+#compute_next_forward_layer and relax_model_moves: a sync move from node p
+#of the previous layer is encoded as p >= 0, a log move as LOG_MOVE and a
+#model move from node p of the same layer as -(p + 2)
+LOG_MOVE = -1
+
+def compute_next_forward_layer(
+        costs: List[float], event: str, events: List[str],
+        children: List[List[int]], sink: int,
+        predecessors: List[int] = None) -> List[float]:
+    """
+    returns the minimal costs of the states (node, event_index + 1) given the
+    minimal costs of the states (node, event_index) of all nodes and the event
+    at event_index. the nodes of the graph are encoded as integers.
+    if a list of predecessors is given, it is filled with the moves into the
+    states of the new layer.
+    """
+    #log moves
+    next_costs = [cost + 1 for cost in costs]
+    if predecessors is not None:
+        predecessors[:] = [LOG_MOVE] * len(costs)
+    #sync moves
+    for node, cost in enumerate(costs):
+        if cost < _INFINITY:
+            for child in children[node]:
+                if events[child] == event and cost < next_costs[child]:
+                    next_costs[child] = cost
+                    if predecessors is not None:
+                        predecessors[child] = node
+    relax_model_moves(next_costs, children, sink, predecessors)
+    return next_costs
+
+def relax_model_moves(
+        costs: List[float], neighbors: List[List[int]], sink: int,
+        predecessors: List[int] = None):
+    """
+    updates the costs in place with model moves within one layer, i.e.
+    Dijkstra with several start nodes and unit edge costs. the sink can
+    neither be entered nor left by a model move.
+    """
+    openlist = [(cost, node) for node, cost in enumerate(costs) if cost < _INFINITY]
+    heapq.heapify(openlist)
+    while openlist:
+        cost, node = heapq.heappop(openlist)
+        if cost > costs[node]:
+            continue
+        for neighbor in neighbors[node]:
+            if node != sink and neighbor != sink and cost + 1 < costs[neighbor]:
+                costs[neighbor] = cost + 1
+                if predecessors is not None:
+                    predecessors[neighbor] = -(node + 2)
+                heapq.heappush(openlist, (cost + 1, neighbor))
+
+class DivideAndConquerAligner(AlignmentFinder):
+    """
+    computes an optimal alignment in memory that is linear in the length of the
+    sequence (Hirschberg's algorithm). the search space is the same as of AStar:
+    states are (node, event_index) pairs and log and model moves cost 1.
+    the costs of all states with the same event_index are computed
+    layer by layer, keeping only one layer in memory. the optimal path crosses
+    the middle layer in a state that minimizes forward plus backward costs.
+    the two halves are solved recursively. short subsequences are solved by
+    Dijkstra's algorithm directly. the graph may contain cycles.
+    """
+
+    def __init__(self, graph: EventFlowGraph, max_subsequence_length: int = 32):
+        """
+        Parameters
+        ----------
+        graph : EventFlowGraph
+            the graph to which sequences are aligned
+        max_subsequence_length : int, optional
+            subsequences up to this length are not split further. by default 32
+        """
+        super().__init__(graph)
+        if max_subsequence_length < 1:
+            raise ValueError('max_subsequence_length must not be < 1 but was %d' % (
+                max_subsequence_length))
+        self.__max_subsequence_length = max_subsequence_length
+
+    def get_configuration(self) -> tuple:
+        return (type(self), self.__max_subsequence_length)
+
+    def is_optimal(self) -> bool:
+        return True
+
+    def compute_alignment(self, sequence: Tuple[str]) -> Alignment:
+        nodes = list(itertools.chain(
+            [self.graph.source], self.graph.nodes(), [self.graph.sink]))
+        node_index = {node: i for i,node in enumerate(nodes)}
+        search = _DivideAndConquerSearch(
+            [node.event for node in nodes],
+            [[node_index[child] for child in node.children] for node in nodes],
+            [[node_index[parent] for parent in node.parents] for node in nodes],
+            len(nodes) - 1,
+            #the sink is entered by a sync move with the end of the sequence
+            tuple(sequence) + (self.graph.sink.event,),
+            self.__max_subsequence_length)
+        alignment = Alignment()
+        for node, event_index in search.solve(0, 0, len(nodes) - 1, len(sequence) + 1):
+            if event_index is None:
+                alignment.append_model_move(nodes[node])
+            elif node is None:
+                alignment.append_log_move(event_index)
+            else:
+                alignment.append_sync_move(nodes[node], event_index)
+        return alignment
+
+class _DivideAndConquerSearch:
+    """
+    the search on an integer encoding of the graph. a model move into the sink
+    is not allowed, because the sink can only be entered by a sync move.
+    """
+
+    def __init__(
+            self, events: List[str], children: List[List[int]],
+            parents: List[List[int]], sink: int, sequence: Tuple[str],
+            max_subsequence_length: int):
+        self.__events = events
+        self.__children = children
+        self.__parents = parents
+        self.__sink = sink
+        self.__sequence = sequence
+        self.__max_subsequence_length = max_subsequence_length
+
+    def solve(self, start_node: int, start_index: int,
+              end_node: int, end_index: int) -> List[_Move]:
+        """
+        returns the moves of an optimal path from state (start_node, start_index)
+        to state (end_node, end_index)
+        """
+        if end_index - start_index <= self.__max_subsequence_length:
+            return self.__solve_with_dijkstra(start_node, start_index, end_node, end_index)
+        middle_index = (start_index + end_index) // 2
+        forward_costs = self.__compute_forward_costs(start_node, start_index, middle_index)
+        backward_costs = self.__compute_backward_costs(end_node, end_index, middle_index)
+        middle_node = min(
+            range(len(forward_costs)),
+            key=lambda node: forward_costs[node] + backward_costs[node])
+        return self.solve(start_node, start_index, middle_node, middle_index) + \
+            self.solve(middle_node, middle_index, end_node, end_index)
+
+    def __compute_forward_costs(
+            self, start_node: int, start_index: int, end_index: int) -> List[float]:
+        costs = [_INFINITY] * len(self.__events)
+        costs[start_node] = 0
+        relax_model_moves(costs, self.__children, self.__sink)
+        for event_index in range(start_index, end_index):
+            costs = compute_next_forward_layer(
+                costs, self.__sequence[event_index], self.__events,
+                self.__children, self.__sink)
+        return costs
+
+    def __compute_backward_costs(
+            self, end_node: int, end_index: int, start_index: int) -> List[float]:
+        costs = [_INFINITY] * len(self.__events)
+        costs[end_node] = 0
+        relax_model_moves(costs, self.__parents, self.__sink)
+        for event_index in range(end_index - 1, start_index - 1, -1):
+            event = self.__sequence[event_index]
+            #log moves
+            previous_costs = [cost + 1 for cost in costs]
+            #sync moves
+            for node, cost in enumerate(costs):
+                if cost < _INFINITY and self.__events[node] == event:
+                    for parent in self.__parents[node]:
+                        if cost < previous_costs[parent]:
+                            previous_costs[parent] = cost
+            relax_model_moves(previous_costs, self.__parents, self.__sink)
+            costs = previous_costs
+        return costs
+
+    def __solve_with_dijkstra(
+            self, start_node: int, start_index: int,
+            end_node: int, end_index: int) -> List[_Move]:
+        start_state = (start_node, start_index)
+        end_state = (end_node, end_index)
+        costs = {start_state: 0}
+        predecessors = {}
+        openlist = [(0, start_node, start_index)]
+        while openlist:
+            cost, node, event_index = heapq.heappop(openlist)
+            state = (node, event_index)
+            if state == end_state:
+                break
+            if cost > costs[state]:
+                continue
+            successors = []
+            if node != self.__sink:
+                for child in self.__children[node]:
+                    if child != self.__sink:
+                        successors.append(((child, event_index), 1, (child, None)))
+            if event_index < end_index:
+                successors.append(((node, event_index + 1), 1, (None, event_index)))
+                event = self.__sequence[event_index]
+                for child in self.__children[node]:
+                    if self.__events[child] == event:
+                        successors.append(((child, event_index + 1), 0, (child, event_index)))
+            for successor, move_cost, move in successors:
+                if cost + move_cost < costs.get(successor, _INFINITY):
+                    costs[successor] = cost + move_cost
+                    predecessors[successor] = (state, move)
+                    heapq.heappush(openlist, (cost + move_cost, successor[0], successor[1]))
+        moves = []
+        state = end_state
+        while state != start_state:
+            state, move = predecessors[state]
+            moves.append(move)
+        moves.reverse()
+        return moves
@@ -16,9 +16,8 @@
 '''
 from typing import Tuple
 
-from depq import DEPQ
-
 from prolothar_rule_mining.models.event_flow_graph import EventFlowGraph
+from prolothar_rule_mining.models.event_flow_graph.min_max_heap import BoundedMinMaxHeap
 from prolothar_rule_mining.models.event_flow_graph.alignment.alignment import Alignment
 from prolothar_rule_mining.models.event_flow_graph.alignment.heuristics import Heuristic
 from prolothar_rule_mining.models.event_flow_graph.alignment.alignment_finder import AlignmentFinder
@@ -38,17 +37,20 @@ class GreedyBeamSearch(AlignmentFinder):
             raise ValueError('beam_width must not be < 1 but was %d' % beam_width)
         self.__beam_width = beam_width
 
+    def get_configuration(self) -> tuple:
+        return (type(self), type(self.__heuristic), self.__beam_width)
+
     def compute_alignment(self, sequence: Tuple[str]) -> Alignment:
-        openlist = DEPQ(maxlen=self.__beam_width)
+        openlist = BoundedMinMaxHeap(self.__beam_width)
         initial_alignment = PartialAlignment(
             Alignment(), self.graph.source, 0, 0, len(sequence)+1)
-        openlist.insert(initial_alignment, -initial_alignment.f_score)
+        openlist.push(initial_alignment, initial_alignment.f_score)
 
         while openlist:
-            current,_ = openlist.popfirst()
+            current = openlist.pop_min()
             if current.node is self.graph.sink \
             and current.event_index >= len(sequence):
                 return current.alignment
             for neighbor in sorted(current.yield_neighbors(
                     sequence, self.__heuristic, self.graph.sink)):
-                openlist.insert(neighbor, -neighbor.f_score)
+                openlist.push(neighbor, neighbor.f_score)
@@ -29,6 +29,9 @@ class GreedyShortestPath(AlignmentFinder):
         self.__heuristic = heuristic
         self.__find_shortest_paths_finder = CachedShortestPathsToEventFinder(graph)
 
+    def get_configuration(self) -> tuple:
+        return (type(self), type(self.__heuristic))
+
     def compute_alignment(self, sequence: Tuple[str]) -> Alignment:
         alignment = Alignment()
         last_node = self.graph.source
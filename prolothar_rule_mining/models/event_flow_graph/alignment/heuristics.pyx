@@ -17,14 +17,28 @@
 from typing import List, Callable, Dict, Set
 
 from collections import deque, defaultdict
+import heapq
 import itertools
 import networkx as nx
+import numpy as np
 
-from prolothar_rule_mining.models.event_flow_graph import EventFlowGraph, Node
+from prolothar_rule_mining.models.event_flow_graph import EventFlowGraph
+from prolothar_rule_mining.models.event_flow_graph.node cimport Node
 from prolothar_rule_mining.models.event_flow_graph.caching import CachedShortestPathToEventFinder
 
 Heuristic = Callable[[Node, int, List[str]], int]
 
+def is_admissible(heuristic: Heuristic) -> bool:
+    """
+    returns True iff the given heuristic never overestimates the remaining cost
+    of a partial alignment. heuristics without an is_admissible() method, e.g.
+    plain functions, are treated as not admissible.
+    """
+    try:
+        return heuristic.is_admissible()
+    except AttributeError:
+        return False
+
 class NullHeuristic:
     """
     Heuristic that always outputs 0 (i.e. A* star reduces to Dijkstra)
@@ -32,6 +46,9 @@ class NullHeuristic:
     def __call__(self, node: Node, event_index: int, sequence: Tuple[str]) -> int:
         return 0
 
+    def is_admissible(self) -> bool:
+        return True
+
 class ReachabilityHeuristic:
     """
     for each remaining event in the sequence add +1 to the heuristic value
@@ -72,21 +89,185 @@ class ReachabilityHeuristic:
                     heuristic += 1
             return heuristic
 
-class ProductNetHeuristic:
+    def is_admissible(self) -> bool:
+        return True
+
+cdef int _UNBOUNDED_EVENT_COUNT = 1 << 24
+
+def _compute_path_lengths_to_sink(graph: EventFlowGraph) -> np.ndarray:
+    """
+    computes the length of the shortest path from each node to the sink by BFS
+    on the reversed graph. the result is indexed by node_id. nodes that cannot
+    reach the sink have length -1.
+    """
+    max_node_id = max(node.node_id for node in itertools.chain(
+        [graph.source, graph.sink], graph.nodes()))
+    path_lengths = np.full(max_node_id + 1, -1, dtype=np.intc)
+    path_lengths[graph.sink.node_id] = 0
+    open_nodes = deque([graph.sink])
+    while open_nodes:
+        node = open_nodes.popleft()
+        for parent in node.parents:
+            if path_lengths[parent.node_id] == -1:
+                path_lengths[parent.node_id] = path_lengths[node.node_id] + 1
+                open_nodes.append(parent)
+    return path_lengths
+
+cdef class EventCountHeuristic:
+    """
+    lower bound of the cost of aligning the rest of the sequence to a path
+    from the current node to the sink. for each node and event, the maximal
+    number of occurrences of the event on a path to the sink is precomputed
+    (unbounded if the event is on a cycle). this bounds the number of
+    synchronous moves, all other events of the sequence need log moves and
+    the shortest path to the sink needs model moves for all nodes that are not
+    synchronized. all tables are numpy arrays, such that a call only depends
+    on the number of different events in the graph. the tables are rebuilt if
+    the version of the graph changes.
+    """
+    cdef object graph
+    cdef object version
+    cdef int[::1] path_lengths
+    cdef int[::1] node_rows
+    cdef int[:, ::1] max_event_counts
+    cdef dict event_columns
+    cdef int sink_id
+    cdef object last_sequence
+    cdef int[:, ::1] suffix_event_counts
+
     def __init__(self, graph: EventFlowGraph):
-        self.__graph = graph.to_networkx()
+        self.graph = graph
+        self.__build_tables()
+
+    cdef __build_tables(self):
+        graph = self.graph
+        self.version = graph.get_version()
+        self.sink_id = graph.sink.node_id
+        self.path_lengths = _compute_path_lengths_to_sink(graph)
+        self.event_columns = {}
+        for node in graph.nodes():
+            self.event_columns.setdefault(node.event, len(self.event_columns))
+        self.node_rows = np.full(len(self.path_lengths), -1, dtype=np.intc)
+        self.max_event_counts = self.__compute_max_event_counts(graph)
+        self.last_sequence = None
+
+    def __compute_max_event_counts(self, graph: EventFlowGraph) -> np.ndarray:
+        nx_graph = graph.to_networkx()
+        condensed_graph = nx.condensation(nx_graph)
+        nr_of_events = len(self.event_columns)
+        #counts of the strongly connected components including their own nodes
+        component_counts = {}
+        max_event_counts = []
+        for component in reversed(list(nx.topological_sort(condensed_graph))):
+            members = condensed_graph.nodes[component]['members']
+            counts_of_successors = np.zeros(nr_of_events, dtype=np.intc)
+            for successor in condensed_graph.successors(component):
+                np.maximum(counts_of_successors, component_counts[successor],
+                           out=counts_of_successors)
+            own_counts = np.zeros(nr_of_events, dtype=np.intc)
+            for node_id in members:
+                event = nx_graph.nodes[node_id]['event']
+                if event in self.event_columns:
+                    own_counts[self.event_columns[event]] += 1
+            is_cycle = len(members) > 1 or any(
+                nx_graph.has_edge(node_id, node_id) for node_id in members)
+            if is_cycle:
+                own_counts[own_counts > 0] = _UNBOUNDED_EVENT_COUNT
+            component_counts[component] = np.minimum(
+                counts_of_successors + own_counts, _UNBOUNDED_EVENT_COUNT)
+            #a node of a cycle can be visited again, a node without cycle not
+            node_counts = component_counts[component] if is_cycle else counts_of_successors
+            for node_id in members:
+                self.node_rows[node_id] = len(max_event_counts)
+                max_event_counts.append(node_counts)
+        if not max_event_counts:
+            return np.zeros((0, nr_of_events), dtype=np.intc)
+        return np.ascontiguousarray(np.vstack(max_event_counts), dtype=np.intc)
+
+    cdef void __update_suffix_event_counts(self, sequence):
+        if sequence is self.last_sequence:
+            return
+        suffix_event_counts = np.zeros(
+            (len(sequence) + 1, len(self.event_columns)), dtype=np.intc)
+        for i in range(len(sequence) - 1, -1, -1):
+            suffix_event_counts[i] = suffix_event_counts[i + 1]
+            column = self.event_columns.get(sequence[i])
+            if column is not None:
+                suffix_event_counts[i, column] += 1
+        self.suffix_event_counts = suffix_event_counts
+        self.last_sequence = sequence
+
+    def __call__(self, Node node, int event_index, sequence: Tuple[str]) -> int:
+        if self.graph.get_version() != self.version:
+            self.__build_tables()
+        cdef int sequence_length = len(sequence)
+        #end of model reached, only log moves possible
+        if node.node_id == self.sink_id:
+            if event_index > sequence_length:
+                return 0
+            return sequence_length + 1 - event_index
+        if event_index > sequence_length:
+            event_index = sequence_length
+        self.__update_suffix_event_counts(sequence)
+        cdef int row = self.node_rows[node.node_id]
+        cdef int max_nr_of_sync_moves = 0
+        cdef int column
+        for column in range(self.max_event_counts.shape[1]):
+            max_nr_of_sync_moves += min(
+                self.suffix_event_counts[event_index, column],
+                self.max_event_counts[row, column])
+        cdef int nr_of_model_moves_on_shortest_path = self.path_lengths[node.node_id] - 1
+        return sequence_length - event_index - max_nr_of_sync_moves + max(
+            nr_of_model_moves_on_shortest_path - max_nr_of_sync_moves, 0)
+
+    def is_admissible(self) -> bool:
+        return True
+
+class ProductNetHeuristic:
+    """
+    shortest path from the current node to the sink in a product net of the
+    graph and the rest of the sequence. the product net is not built
+    explicitly, but its edges are derived during the search from tables of
+    the graph, which are rebuilt if the version of the graph changes. the
+    values of the last sequence are cached by node and event index for up to
+    max_cache_size pairs.
+    at the end of the sequence, the length of the path to the sink includes
+    the current node and the sink, so the heuristic is not admissible.
+    """
+    def __init__(self, graph: EventFlowGraph, max_cache_size: int = 100000):
+        self.__event_flow_graph = graph
+        self.__max_cache_size = max_cache_size
+        self.__build_tables()
+
+    def __build_tables(self):
+        graph = self.__event_flow_graph
+        self.__version = graph.get_version()
         self.__shortest_path_finder = CachedShortestPathToEventFinder(graph)
         self.__source_id = graph.source.node_id
         self.__sink_id = graph.sink.node_id
         self.__sink_event = graph.sink.event
-        for _, nbrsdict in self.__graph.adjacency():
-            for edge_attributes in nbrsdict.values():
-                edge_attributes['weight'] = 1
+        self.__children: Dict[int, List[int]] = {}
+        self.__parents: Dict[int, List[int]] = {}
+        self.__events: Dict[int, str] = {}
+        for node in itertools.chain([graph.source, graph.sink], graph.nodes()):
+            self.__children[node.node_id] = [child.node_id for child in node.children]
+            self.__parents[node.node_id] = [parent.node_id for parent in node.parents]
+            self.__events[node.node_id] = node.event
+        #synchronous moves are possible on all nodes except source and sink.
+        #the rank of a node breaks ties between synchronous moves of the same
+        #event index like the creation order in an explicit product net.
         self.__event_node_index = defaultdict(list)
+        self.__ranks: Dict[int, int] = {}
         for node in graph.nodes():
+            self.__ranks[node.node_id] = len(self.__event_node_index[node.event])
             self.__event_node_index[node.event].append(node.node_id)
+        self.__connected_nodes: Dict[int, Set[int]] = {}
+        self.__last_sequence = None
+        self.__cache: Dict[tuple, int] = {}
 
     def __call__(self, node: Node, event_index: int, sequence: Tuple[str]) -> int:
+        if self.__event_flow_graph.get_version() != self.__version:
+            self.__build_tables()
         if event_index >= len(sequence):
             if node.node_id != self.__sink_id:
                 return len(self.__shortest_path_finder(node, self.__sink_event))
@@ -95,71 +276,153 @@ class ProductNetHeuristic:
         elif node.node_id == self.__sink_id:
             return len(sequence) + 1 - event_index
         else:
-            product_net = self.__create_product_net(node, sequence[event_index:])
-            return nx.algorithms.shortest_paths.weighted.single_source_dijkstra(
-                product_net, node.node_id, target=self.__sink_id
-            )[0]
-
-    def __create_product_net(self, node: Node, sequence: Tuple[str]) -> nx.DiGraph:
-        product_net = self.__graph.copy()
-        connected_nodes = set(nx.descendants(product_net, node.node_id))
-        connected_nodes.update(nx.ancestors(product_net, node.node_id))
-        connected_nodes.add(node.node_id)
-        product_net.remove_nodes_from(set(product_net.nodes()).difference(connected_nodes))
-
-        last_event_node = 'e'
-        product_net.add_node(last_event_node, event=sequence[0])
-        product_net.add_edge(self.__source_id, last_event_node, weight=1)
-        event_nodes = [last_event_node]
-        for i,event in enumerate(sequence[1:]):
-            event_node_id = 'e%d' % i
-            product_net.add_node(event_node_id, event=event)
-            product_net.add_edge(event_nodes[-1], event_node_id, weight=1)
-            event_nodes.append(event_node_id)
-        product_net.add_edge(event_nodes[-1], self.__sink_id, weight=1)
-
-        for event_node, event in zip(event_nodes, sequence):
-            for model_node in self.__event_node_index[event]:
-                if model_node in product_net.nodes:
-                    self.__create_sync_node(event_node, model_node, product_net)
-
-        return product_net
-
-    def __create_sync_node(self, event_node: str, model_node: int, product_net: nx.DiGraph):
-        sync_node_id = event_node + '_' + str(model_node)
-        product_net.add_node(sync_node_id)
-        for predecessor in itertools.chain(product_net.predecessors(event_node),
-                                           product_net.predecessors(model_node)):
-            product_net.add_edge(predecessor, sync_node_id, weight=0)
-
-        for ancestor in itertools.chain(product_net.successors(event_node),
-                                        product_net.successors(model_node)):
-            ancestor_weight = 0 if self.__sink_id == ancestor else 1
-            product_net.add_edge(sync_node_id, ancestor, weight=ancestor_weight)
-
-class ShortestPathToSinkHeuristic:
+            if sequence is not self.__last_sequence:
+                self.__cache.clear()
+                self.__last_sequence = sequence
+            key = (node.node_id, event_index)
+            try:
+                return self.__cache[key]
+            except KeyError:
+                pass
+            heuristic = self.__search_product_net(node.node_id, event_index, sequence)
+            if len(self.__cache) >= self.__max_cache_size:
+                self.__cache.clear()
+            self.__cache[key] = heuristic
+            return heuristic
+
+    def is_admissible(self) -> bool:
+        return False
+
+    def __get_connected_nodes(self, node_id: int) -> Set[int]:
+        try:
+            return self.__connected_nodes[node_id]
+        except KeyError:
+            connected_nodes = {node_id}
+            for neighbors in (self.__children, self.__parents):
+                open_nodes = [node_id]
+                visited_nodes = {node_id}
+                while open_nodes:
+                    for neighbor in neighbors[open_nodes.pop()]:
+                        if neighbor not in visited_nodes:
+                            visited_nodes.add(neighbor)
+                            open_nodes.append(neighbor)
+                connected_nodes.update(visited_nodes)
+            self.__connected_nodes[node_id] = connected_nodes
+            return connected_nodes
+
+    def __search_product_net(self, int start_node_id, int event_index, sequence: Tuple[str]) -> int:
+        """
+        Dijkstra from the start node to the sink in the product net of the
+        nodes connected to the start node and sequence[event_index:].
+        the states of the product net are
+        ('n', node_id): a node of the graph,
+        ('e', i): the i-th event of the sequence,
+        ('s', i, node_id): a synchronous move of the i-th event and the node and
+        ('h', i): connects all synchronous moves of the i-th event with their
+        common predecessors at zero cost.
+        """
+        connected_nodes = self.__get_connected_nodes(start_node_id)
+        cdef int sequence_length = len(sequence)
+        cdef int sink_id = self.__sink_id
+        cdef int cost, i, j, rank, child_rank
+        event_positions = defaultdict(list)
+        for i in range(event_index, sequence_length):
+            event_positions[sequence[i]].append(i)
+
+        costs = {('n', start_node_id): 0}
+        tie_breaker = itertools.count()
+        open_states = [(0, next(tie_breaker), ('n', start_node_id))]
+        while open_states:
+            cost, _, state = heapq.heappop(open_states)
+            if cost > costs[state]:
+                continue
+            if state[0] == 'n' and state[1] == sink_id:
+                return cost
+            next_states = []
+            if state[0] == 'n' or state[0] == 's':
+                node_id = state[-1]
+                if state[0] == 'n':
+                    #an edge into a synchronous move of a child is free
+                    i = -1
+                    rank = -1
+                    if node_id == self.__source_id:
+                        next_states.append((cost + 1, ('e', event_index)))
+                        next_states.append((cost, ('h', event_index)))
+                else:
+                    i = state[1]
+                    rank = self.__ranks[node_id]
+                    if i + 1 < sequence_length:
+                        next_states.append((cost + 1, ('e', i + 1)))
+                        next_states.append((cost, ('h', i + 1)))
+                    else:
+                        next_states.append((cost, ('n', sink_id)))
+                for child_id in self.__children[node_id]:
+                    if child_id not in connected_nodes:
+                        continue
+                    if child_id == sink_id:
+                        if i < 0:
+                            next_states.append((cost + 1, ('n', sink_id)))
+                        else:
+                            next_states.append((cost, ('n', sink_id)))
+                        continue
+                    next_states.append((cost + 1, ('n', child_id)))
+                    child_rank = self.__ranks[child_id]
+                    for j in event_positions.get(self.__events[child_id], ()):
+                        #edges of a synchronous move to earlier created
+                        #synchronous moves of its children cost 1
+                        if i >= 0 and (j < i or (j == i and child_rank < rank)):
+                            next_states.append((cost + 1, ('s', j, child_id)))
+                        else:
+                            next_states.append((cost, ('s', j, child_id)))
+            elif state[0] == 'e':
+                i = state[1]
+                if i + 1 < sequence_length:
+                    next_states.append((cost + 1, ('e', i + 1)))
+                    next_states.append((cost, ('h', i + 1)))
+                else:
+                    next_states.append((cost + 1, ('n', sink_id)))
+            else:
+                i = state[1]
+                for node_id in self.__event_node_index[sequence[i]]:
+                    if node_id in connected_nodes:
+                        next_states.append((cost, ('s', i, node_id)))
+            for next_cost, next_state in next_states:
+                if next_state not in costs or next_cost < costs[next_state]:
+                    costs[next_state] = next_cost
+                    heapq.heappush(open_states, (next_cost, next(tie_breaker), next_state))
+        raise nx.NetworkXNoPath('sink not reachable from %r' % start_node_id)
+
+cdef class ShortestPathToSinkHeuristic:
     """
     if remaining sequence is shorter than the shortest path to the model,
     outputs the difference of lengths between the remaining sequence and
     the shortest path (i.e. nr of necessary model moves). otherwise 0 is returned.
+    the path lengths are recomputed if the version of the graph changes.
     """
+    cdef object graph
+    cdef object version
+    cdef int[::1] path_lengths
+
     def __init__(self, graph: EventFlowGraph):
-        self.__path_lengths = {graph.sink: 0}
-        open_nodes = [graph.sink]
-        while open_nodes:
-            node = open_nodes.pop()
-            for parent in node.parents:
-                current_cost = self.__path_lengths.get(parent, float('inf'))
-                candidate_cost = self.__path_lengths[node] + 1
-                if candidate_cost < current_cost:
-                    self.__path_lengths[parent] = candidate_cost
-                    open_nodes.append(parent)
+        self.graph = graph
+        self.version = graph.get_version()
+        self.path_lengths = _compute_path_lengths_to_sink(graph)
 
-    def __call__(self, node: Node, event_index: int, sequence: Tuple[str]) -> int:
-        length_of_shortest_path_to_sink = self.__path_lengths[node]
-        remaining_sequence_length = len(sequence) + 1 - event_index
+    def __call__(self, Node node, int event_index, sequence: Tuple[str]) -> int:
+        if self.graph.get_version() != self.version:
+            self.version = self.graph.get_version()
+            self.path_lengths = _compute_path_lengths_to_sink(self.graph)
+        cdef int length_of_shortest_path_to_sink = -1
+        if node.node_id < self.path_lengths.shape[0]:
+            length_of_shortest_path_to_sink = self.path_lengths[node.node_id]
+        if length_of_shortest_path_to_sink < 0:
+            raise KeyError(node)
+        cdef int remaining_sequence_length = len(sequence) + 1 - event_index
         return max(length_of_shortest_path_to_sink - remaining_sequence_length, 0)
 
+    def is_admissible(self) -> bool:
+        return True
+
 class MaximumHeuristic:
     """
     outputs the maximum of other heuristics
@@ -171,4 +434,7 @@ class MaximumHeuristic:
         return max(
             heuristic(node, event_index, sequence)
             for heuristic in self.__subheuristics
-        )
\ No newline at end of file
+        )
+
+    def is_admissible(self) -> bool:
+        return all(is_admissible(heuristic) for heuristic in self.__subheuristics)
\ No newline at end of file
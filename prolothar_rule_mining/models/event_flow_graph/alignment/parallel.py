@@ -0,0 +1,142 @@
+'''
+    This file is part of Prolothar-Rule-Mining (More Info: https://github.com/shs-it/prolothar-rule-mining).
+
+    Prolothar-Rule-Mining is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    Prolothar-Rule-Mining is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with Prolothar-Rule-Mining. If not, see <https://www.gnu.org/licenses/>.
+'''
+from typing import Callable, Iterable, List, Tuple
+
+from prolothar_common.parallel.abstract.computation_engine import ComputationEngine
+from prolothar_common.parallel.single_thread.single_thread import SingleThreadComputationEngine
+from prolothar_common.parallel.threading.threading import ThreadingComputationEngine
+
+from prolothar_rule_mining.models.event_flow_graph.graph import EventFlowGraph
+from prolothar_rule_mining.models.event_flow_graph.shared_graph import SharedEventFlowGraph
+from prolothar_rule_mining.models.event_flow_graph.alignment.alignment import Alignment
+from prolothar_rule_mining.models.event_flow_graph.alignment.alignment_finder import AlignmentFinder
+
+#(graph version, factory, alignment finder) of the current worker process.
+#the version identifies the graph of the snapshot, i.e. a worker that aligns
+#several batches on the same version of a graph builds its copy only once
+_worker_alignment_finder: Tuple[Tuple, Callable, AlignmentFinder] = (None, None, None)
+
+def _align_with_shared_graph(parameters, sequence: Tuple[str]) -> Tuple[bool, List[Tuple]]:
+    global _worker_alignment_finder
+    shared_graph: SharedEventFlowGraph = parameters['shared_graph']
+    create_alignment_finder = parameters['create_alignment_finder']
+    version, factory, alignment_finder = _worker_alignment_finder
+    if version != shared_graph.get_version() or factory != create_alignment_finder:
+        alignment_finder = create_alignment_finder(shared_graph.to_event_flow_graph())
+        _worker_alignment_finder = (
+            shared_graph.get_version(), create_alignment_finder, alignment_finder)
+    alignment = alignment_finder.compute_alignment(sequence)
+    #nodes of the worker graph are replaced by their ids
+    return alignment.is_truncated(), [
+        (None if move.is_log_move() else move.node.node_id, move.event_index)
+        for move in alignment
+    ]
+
+def _clear_worker_alignment_finder():
+    """
+    releases the graph copy and the alignment finder of the current process
+    """
+    global _worker_alignment_finder
+    _worker_alignment_finder = (None, None, None)
+
+class ParallelAlignmentFinder(AlignmentFinder):
+    """
+    aligns a batch of sequences in parallel with a ComputationEngine. the
+    graph is given to the workers as a SharedEventFlowGraph, from which every
+    worker process builds its own copy of the graph and its own alignment
+    finder once per version of the graph. single sequences and batches of a
+    SingleThreadComputationEngine are aligned in the calling process with an
+    alignment finder on the graph itself, i.e. without a copy.
+
+    the alignments of the workers are mapped back to the nodes of the graph.
+    ties between alignments with equal cost can be broken differently than in
+    the calling process, because the copy of the graph can iterate the
+    children of a node in another order.
+    """
+
+    def __init__(
+            self, graph: EventFlowGraph,
+            create_alignment_finder: Callable[[EventFlowGraph], AlignmentFinder],
+            computation_engine: ComputationEngine):
+        """
+        Parameters
+        ----------
+        graph : EventFlowGraph
+            the graph to which sequences are aligned
+        create_alignment_finder : Callable[[EventFlowGraph], AlignmentFinder]
+            creates the alignment finder for a graph. must be picklable,
+            e.g. the class of an alignment finder or a module level function
+        computation_engine : ComputationEngine
+            distributes the sequences of a batch to the workers
+        """
+        super().__init__(graph)
+        self.__create_alignment_finder = create_alignment_finder
+        self.__computation_engine = computation_engine
+        self.__alignment_finder = create_alignment_finder(graph)
+
+    def get_configuration(self) -> tuple:
+        #the workers compute the same alignments as the wrapped finder, so
+        #both can share the entries of an AlignmentCache
+        return self.__alignment_finder.get_configuration()
+
+    def is_optimal(self) -> bool:
+        return self.__alignment_finder.is_optimal()
+
+    def compute_alignment(self, sequence: Tuple[str]) -> Alignment:
+        return self.__alignment_finder.compute_alignment(sequence)
+
+    def compute_alignments(self, sequences: Iterable[Tuple[str]]) -> List[Alignment]:
+        sequences = [tuple(sequence) for sequence in sequences]
+        distinct_sequences = list(dict.fromkeys(sequences))
+        if len(distinct_sequences) <= 1 \
+        or isinstance(self.__computation_engine, SingleThreadComputationEngine):
+            return super().compute_alignments(sequences)
+        try:
+            with SharedEventFlowGraph.create(self.graph) as shared_graph:
+                encoded_alignments = self.__computation_engine.create_partitionable_list(
+                    distinct_sequences).map({
+                        'shared_graph': shared_graph,
+                        'create_alignment_finder': self.__create_alignment_finder
+                    }, _align_with_shared_graph)
+        finally:
+            #threads of the calling process must not keep the copy of the
+            #graph alive after the batch
+            if isinstance(self.__computation_engine, ThreadingComputationEngine):
+                _clear_worker_alignment_finder()
+        alignments = {
+            sequence: self.__decode_alignment(truncated, moves)
+            for sequence, (truncated, moves) in zip(distinct_sequences, encoded_alignments)
+        }
+        return [alignments[sequence] for sequence in sequences]
+
+    def __decode_alignment(self, truncated: bool, moves: List[Tuple]) -> Alignment:
+        alignment = Alignment()
+        for node_id, event_index in moves:
+            if node_id is None:
+                alignment.append_log_move(event_index)
+                continue
+            if node_id == self.graph.sink.node_id:
+                node = self.graph.sink
+            else:
+                node = self.graph.get_node_by_id(node_id)
+            if event_index is None:
+                alignment.append_model_move(node)
+            else:
+                alignment.append_sync_move(node, event_index)
+        if truncated:
+            alignment.mark_as_truncated()
+        return alignment
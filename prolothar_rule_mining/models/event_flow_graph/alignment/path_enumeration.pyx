@@ -60,6 +60,9 @@ cdef class PathEnumeration(AlignmentFinder):
                     except StopIteration:
                         break
 
+    def is_optimal(self) -> bool:
+        return True
+
     def compute_alignment(self, sequence: Tuple[str]) -> Alignment:
         cdef int best_cost = INT_MAX
         cdef int[:,:] best_cost_matrix
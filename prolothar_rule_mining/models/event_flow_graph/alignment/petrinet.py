@@ -29,6 +29,9 @@ class PetrinetAligner(AlignmentFinder):
     converts the EventFlowGraph to a petrinet and uses existing alignment algorithms
     """
 
+    def is_optimal(self) -> bool:
+        return True
+
     def compute_alignment(self, sequence: Union[List[str], Tuple[str]]) -> Alignment:
         trace = Pm4PyTrace([Pm4PyEvent({'concept:name': event}) for event in sequence])
 
@@ -0,0 +1,152 @@
+'''
+    This file is part of Prolothar-Rule-Mining (More Info: https://github.com/shs-it/prolothar-rule-mining).
+
+    Prolothar-Rule-Mining is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    Prolothar-Rule-Mining is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with Prolothar-Rule-Mining. If not, see <https://www.gnu.org/licenses/>.
+'''
+from typing import Dict, Iterable, List, Tuple
+
+import itertools
+
+from prolothar_rule_mining.models.event_flow_graph import EventFlowGraph
+from prolothar_rule_mining.models.event_flow_graph.alignment.alignment import Alignment
+from prolothar_rule_mining.models.event_flow_graph.alignment.alignment_finder import AlignmentFinder
+from prolothar_rule_mining.models.event_flow_graph.alignment.divide_and_conquer import LOG_MOVE
+from prolothar_rule_mining.models.event_flow_graph.alignment.divide_and_conquer import compute_next_forward_layer
+from prolothar_rule_mining.models.event_flow_graph.alignment.divide_and_conquer import relax_model_moves
+
+_INFINITY = float('inf')
+
+class _TrieNode:
+    """
+    a prefix of at least one sequence. is_end is True iff the prefix is a
+    complete sequence.
+    """
+    def __init__(self):
+        self.children: Dict[str, '_TrieNode'] = {}
+        self.is_end = False
+
+class PrefixTrieAligner(AlignmentFinder):
+    """
+    computes optimal alignments for batches of sequences with shared prefixes.
+    the search space is the same as of AStar and DivideAndConquerAligner:
+    states are (node, event_index) pairs and log and model moves cost 1.
+
+    without a heuristic, the minimal cost of a state (node, event_index) only
+    depends on the first event_index events of the sequence. compute_alignments
+    therefore builds a trie of the distinct sequences and computes the costs of
+    all states with the same event_index layer by layer along the trie, i.e.
+    the layer of a prefix is computed once for all sequences with this prefix.
+    the search only branches where sequences diverge. the trie is traversed
+    depth first and only the layers of the current prefix are kept in memory.
+
+    the alignments have the same cost as the alignments of AStar with an
+    admissible heuristic, but ties can be broken differently.
+    """
+
+    def __init__(self, graph: EventFlowGraph):
+        super().__init__(graph)
+
+    def is_optimal(self) -> bool:
+        return True
+
+    def compute_alignment(self, sequence: Tuple[str]) -> Alignment:
+        return self.compute_alignments([sequence])[0]
+
+    def compute_alignments(self, sequences: Iterable[Tuple[str]]) -> List[Alignment]:
+        """
+        computes alignments for many sequences, sharing the computation for
+        common prefixes. equal sequences share the same Alignment object.
+
+        Returns
+        -------
+        List[Alignment]
+            the i-th alignment belongs to the i-th sequence
+        """
+        sequences = [tuple(sequence) for sequence in sequences]
+        if not sequences:
+            return []
+        nodes = list(itertools.chain(
+            [self.graph.source], self.graph.nodes(), [self.graph.sink]))
+        node_index = {node: i for i,node in enumerate(nodes)}
+        events = [node.event for node in nodes]
+        children = [[node_index[child] for child in node.children] for node in nodes]
+        sink = len(nodes) - 1
+        sink_parents = [node_index[parent] for parent in self.graph.sink.parents]
+
+        root = _TrieNode()
+        for sequence in sequences:
+            trie_node = root
+            for event in sequence:
+                trie_node = trie_node.children.setdefault(event, _TrieNode())
+            trie_node.is_end = True
+
+        costs = [_INFINITY] * len(nodes)
+        costs[0] = 0
+        predecessors = [LOG_MOVE] * len(nodes)
+        relax_model_moves(costs, children, sink, predecessors)
+        #cost and predecessor layers of the current prefix
+        cost_layers = [costs]
+        predecessor_layers = [predecessors]
+        prefix = []
+        alignments: Dict[Tuple[str], Alignment] = {}
+        open_trie_nodes = [(root, 0, None)]
+        while open_trie_nodes:
+            trie_node, prefix_length, event = open_trie_nodes.pop()
+            if prefix_length > 0:
+                del cost_layers[prefix_length:]
+                del predecessor_layers[prefix_length:]
+                del prefix[prefix_length - 1:]
+                prefix.append(event)
+                predecessors = []
+                cost_layers.append(compute_next_forward_layer(
+                    cost_layers[-1], event, events, children, sink, predecessors))
+                predecessor_layers.append(predecessors)
+            if trie_node.is_end:
+                alignments[tuple(prefix)] = self.__create_alignment(
+                    nodes, cost_layers[-1], predecessor_layers, sink_parents, len(prefix))
+            for child_event, child in trie_node.children.items():
+                open_trie_nodes.append((child, prefix_length + 1, child_event))
+        return [alignments[sequence] for sequence in sequences]
+
+    def __create_alignment(
+            self, nodes: List, last_costs: List[float],
+            predecessor_layers: List[List[int]], sink_parents: List[int],
+            sequence_length: int) -> Alignment:
+        #the sink is entered by a sync move with the end of the sequence
+        node = min(sink_parents, key=lambda parent: last_costs[parent], default=None)
+        if node is None or last_costs[node] == _INFINITY:
+            raise ValueError('the sink cannot be reached from the source')
+        moves = [(len(nodes) - 1, sequence_length)]
+        event_index = sequence_length
+        while event_index > 0 or node != 0:
+            predecessor = predecessor_layers[event_index][node]
+            if predecessor == LOG_MOVE:
+                event_index -= 1
+                moves.append((None, event_index))
+            elif predecessor >= 0:
+                event_index -= 1
+                moves.append((node, event_index))
+                node = predecessor
+            else:
+                moves.append((node, None))
+                node = -predecessor - 2
+        alignment = Alignment()
+        for node, event_index in reversed(moves):
+            if event_index is None:
+                alignment.append_model_move(nodes[node])
+            elif node is None:
+                alignment.append_log_move(event_index)
+            else:
+                alignment.append_sync_move(nodes[node], event_index)
+        return alignment
@@ -14,9 +14,11 @@
     You should have received a copy of the GNU General Public License
     along with Prolothar-Rule-Mining. If not, see <https://www.gnu.org/licenses/>.
 '''
-from typing import Tuple
+from typing import Tuple, Dict, List
 
-from prolothar_rule_mining.models.event_flow_graph import EventFlowGraph
+import itertools
+
+from prolothar_rule_mining.models.event_flow_graph import EventFlowGraph, Node
 from prolothar_rule_mining.models.event_flow_graph.alignment.alignment import Alignment
 from prolothar_rule_mining.models.event_flow_graph.alignment.alignment_finder import AlignmentFinder
 
@@ -31,40 +33,62 @@ class SyncOrLogOnly(AlignmentFinder):
         super().__init__(graph)
         if graph.sink not in graph.source.children:
             raise ValueError('source and sink must have a direct edge')
+        self.__transition_index: Dict[Node, Dict[str, List[Node]]] = None
+        self.__transition_index_version = None
 
     def compute_alignment(self, sequence: Tuple[str]) -> Alignment:
-        candidates = [Alignment()]
-        event_index = 0
-        while candidates:
-            if event_index <= len(sequence):
-                try:
-                    event = sequence[event_index]
-                except IndexError:
-                    event = self.graph.sink.event
-                new_candidates = []
-                for candidate in candidates:
-                    new_candidates.extend(self.__extend_candidate(
-                        candidate, event_index, event))
-                candidates = new_candidates
-                event_index += 1
-            else:
-                return candidates.pop()
+        #the graph is simulated as an automaton on the set of reachable nodes.
+        #for each event, the predecessor of each reachable node is stored.
+        #if a node can be reached from more than one predecessor, the predecessor
+        #that has been reached last wins.
+        transition_index = self.__get_transition_index()
+        reachable_nodes = {self.graph.source: None}
+        predecessors: List[Dict[Node, Node]] = []
+        for event_index in range(len(sequence) + 1):
+            try:
+                event = sequence[event_index]
+            except IndexError:
+                event = self.graph.sink.event
+            next_reachable_nodes = {}
+            for node in reachable_nodes:
+                for next_node in transition_index[node].get(event, ()):
+                    next_reachable_nodes.pop(next_node, None)
+                    next_reachable_nodes[next_node] = node
+            if not next_reachable_nodes:
+                return self.__compute_log_only_alignment(sequence)
+            predecessors.append(next_reachable_nodes)
+            reachable_nodes = next_reachable_nodes
 
-        #no perfect synchronous alignment could be found => use log moves only
+        path = []
+        node = next(reversed(reachable_nodes))
+        for next_reachable_nodes in reversed(predecessors):
+            path.append(node)
+            node = next_reachable_nodes[node]
+        alignment = Alignment()
+        for event_index, node in enumerate(reversed(path)):
+            alignment.append_sync_move(node, event_index)
+        return alignment
+
+    def __compute_log_only_alignment(self, sequence: Tuple[str]) -> Alignment:
         alignment = Alignment()
         for i,_ in enumerate(sequence):
             alignment.append_log_move(i)
         alignment.append_sync_move(self.graph.sink, len(sequence))
         return alignment
 
-    def __extend_candidate(self, candidate: Alignment, event_index: int, event: str):
-        if len(candidate) == 0:
-            node = self.graph.source
-        else:
-            node = candidate.get_last_move().node
-
-        for next_node in node.children:
-            if next_node.event == event:
-                extencded_candidate = candidate.copy()
-                extencded_candidate.append_sync_move(next_node, event_index)
-                yield extencded_candidate
+    def __get_transition_index(self) -> Dict[Node, Dict[str, List[Node]]]:
+        """
+        returns a mapping from node and event to the children of the node with
+        this event. the index is recomputed if the graph has been changed.
+        """
+        version = self.graph.get_version()
+        if version != self.__transition_index_version:
+            self.__transition_index = {}
+            for node in itertools.chain(
+                    [self.graph.source, self.graph.sink], self.graph.nodes()):
+                transitions = {}
+                for child in node.children:
+                    transitions.setdefault(child.event, []).append(child)
+                self.__transition_index[node] = transitions
+            self.__transition_index_version = version
+        return self.__transition_index
@@ -23,18 +23,23 @@ from prolothar_common.models.dataset.instance import TargetSequenceInstance
 from prolothar_rule_mining.models.event_flow_graph.graph import EventFlowGraph
 from prolothar_rule_mining.models.event_flow_graph.node import Node
 from prolothar_rule_mining.models.event_flow_graph.cover.cover import Cover
+from prolothar_rule_mining.models.event_flow_graph.alignment.alignment import Alignment
 from prolothar_rule_mining.models.event_flow_graph.alignment.alignment_finder import AlignmentFinder
 from prolothar_rule_mining.models.event_flow_graph.alignment.petrinet import PetrinetAligner
+from prolothar_rule_mining.models.event_flow_graph.alignment.alignment_cache import AlignmentCache
 
 class CoverComputer:
     def __init__(
             self, graph: EventFlowGraph, assign_instances_to_edges: bool = False,
-            alignment_finder: AlignmentFinder = None):
+            alignment_finder: AlignmentFinder = None,
+            alignment_cache: AlignmentCache = None):
         self.__graph: EventFlowGraph = graph
         if alignment_finder is None:
             self.__aligner = PetrinetAligner(graph)
         else:
             self.__aligner = alignment_finder
+        if alignment_cache is not None:
+            self.__aligner = alignment_cache.wrap(self.__aligner)
         self.__assign_instances_to_edges = assign_instances_to_edges
 
     def compute_cover(self, dataset: Dataset) -> Cover:
@@ -46,8 +51,18 @@ class CoverComputer:
         cover = Cover(dataset.get_set_of_sequence_symbols(),
                       self.__graph.sink.event)
 
+        #the alignments of all distinct sequences are computed in one batch,
+        #e.g. PrefixTrieAligner aligns common prefixes only once
+        sequences = list({
+            instance.get_target_sequence(): None for instance in dataset})
+        alignments = dict(zip(sequences, self.__aligner.compute_alignments(sequences)))
+
         for instance in dataset:
-            self.extend_cover(cover, instance)
+            try:
+                self.__extend_cover_for_known_sequence(cover, instance)
+            except KeyError:
+                self.__extend_cover_for_unseen_sequence(
+                    cover, instance, alignments[instance.get_target_sequence()])
 
         return cover
 
@@ -55,7 +70,9 @@ class CoverComputer:
         try:
             self.__extend_cover_for_known_sequence(cover, instance)
         except KeyError:
-            self.__extend_cover_for_unseen_sequence(cover, instance)
+            self.__extend_cover_for_unseen_sequence(
+                cover, instance,
+                self.__aligner.compute_alignment(instance.get_target_sequence()))
 
     def __extend_cover_for_known_sequence(
             self, cover: Cover, instance: TargetSequenceInstance):
@@ -69,10 +86,9 @@ class CoverComputer:
         self.__add_instance_to_edge(instance, node, self.__graph.sink)
 
     def __extend_cover_for_unseen_sequence(
-            self, cover: Cover, instance: TargetSequenceInstance):
+            self, cover: Cover, instance: TargetSequenceInstance, alignment: Alignment):
         sequence = instance.get_target_sequence()
         cover.start_recording_for_sequence(sequence)
-        alignment = self.__aligner.compute_alignment(sequence)
         node = self.__graph.source
 
         for move in alignment:
@@ -97,8 +113,9 @@ class CoverComputer:
 
 def compute_cover(dataset: Dataset, graph: EventFlowGraph,
                   assign_instances_to_edges: bool = False,
-                  alignment_finder: AlignmentFinder = None) -> Cover:
+                  alignment_finder: AlignmentFinder = None,
+                  alignment_cache: AlignmentCache = None) -> Cover:
     return CoverComputer(
         graph, assign_instances_to_edges=assign_instances_to_edges,
-        alignment_finder=alignment_finder
+        alignment_finder=alignment_finder, alignment_cache=alignment_cache
     ).compute_cover(dataset)
@@ -35,18 +35,78 @@ from prolothar_common import gviz_utils
 from prolothar_rule_mining.models.event_flow_graph.node import Node
 from prolothar_rule_mining.models.event_flow_graph.edge import Edge
 
+def _hash_node(node: Node) -> int:
+    return hash(('node', node.node_id, node.event))
+
+def _hash_edge(edge: Edge) -> int:
+    return hash(('edge', edge.from_node.node_id, edge.to_node.node_id))
+
 class EventFlowGraph:
     """
     an event flow graph, i.e. a directed graph whose nodes are events with two
     special nodes (source and sink).
     """
 
+    __graph_id_generator = itertools.count()
+
     def __init__(self):
         self.__node_id_generator: Generator[int,None,None] = iter(range(100000))
         self.source = Node(next(self.__node_id_generator), 'ε')
         self.sink = Node(next(self.__node_id_generator), 'ω')
         self.__nodes: Dict[int, Node] = {}
         self.__edges: Dict[Tuple[Node,Node], Edge] = {}
+        #the version of the graph consists of a unique id of the graph and an
+        #order independent hash of its nodes and edges (XOR of element hashes),
+        #which can be updated in constant time for every change
+        self.__graph_id = next(EventFlowGraph.__graph_id_generator)
+        self.__structure_hash = 0
+        self.__change_listeners: List[Callable[[Tuple, Tuple, str, Union[Node, Edge]], None]] = []
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        #listeners are bound to the process that created them
+        state['_EventFlowGraph__change_listeners'] = []
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.__graph_id = next(EventFlowGraph.__graph_id_generator)
+
+    def get_version(self) -> Tuple[int, int, int, int]:
+        """
+        returns a hashable version of the current structure of this graph.
+        the version changes with every added or removed node or edge. if a
+        change is reverted, the graph returns to its former version. results
+        that only depend on the structure of the graph, e.g. alignments, can
+        therefore be cached by version.
+        """
+        return (self.__graph_id, self.__structure_hash, len(self.__nodes), len(self.__edges))
+
+    def add_change_listener(
+            self, listener: Callable[[Tuple, Tuple, str, Union[Node, Edge]], None]):
+        """
+        registers a listener that is called after every structural change of
+        this graph with the version before the change, the version after
+        the change, the type of the change ("add_node", "remove_node",
+        "add_edge" or "remove_edge") and the added or removed node or edge
+        """
+        self.__change_listeners.append(listener)
+
+    def remove_change_listener(
+            self, listener: Callable[[Tuple, Tuple, str, Union[Node, Edge]], None]):
+        """
+        unregisters a listener that has been added by add_change_listener
+        """
+        self.__change_listeners.remove(listener)
+
+    def __update_version(
+            self, old_version: Tuple, element_hash: int, change_type: str,
+            element: Union[Node, Edge]):
+        self.__structure_hash ^= element_hash
+        if self.__change_listeners:
+            new_version = self.get_version()
+            for listener in self.__change_listeners:
+                listener(old_version, new_version, change_type, element)
 
     def get_nr_of_nodes(self) -> int:
         """
@@ -73,7 +133,9 @@ class EventFlowGraph:
             the created node
         """
         node = Node(next(self.__node_id_generator), event)
+        old_version = self.get_version()
         self.__nodes[node.node_id] = node
+        self.__update_version(old_version, _hash_node(node), 'add_node', node)
         return node
 
     def contains_node(self, node: Node) -> bool:
@@ -106,7 +168,12 @@ class EventFlowGraph:
         """
         if node.parents or node.children:
             raise ValueError('The node is not allowed to have any edges')
-        self.__nodes[node.node_id] = node
+        if node.node_id not in self.__nodes:
+            old_version = self.get_version()
+            self.__nodes[node.node_id] = node
+            self.__update_version(old_version, _hash_node(node), 'add_node', node)
+        else:
+            self.__nodes[node.node_id] = node
         return node
 
     def remove_node(self, node: Node):
@@ -117,7 +184,9 @@ class EventFlowGraph:
             self.remove_edge(Edge(parent, node))
         for child in list(node.children):
             self.remove_edge(Edge(node, child))
+        old_version = self.get_version()
         self.__nodes.pop(node.node_id)
+        self.__update_version(old_version, _hash_node(node), 'remove_node', node)
 
     def add_edge(self, from_node: Node, to_node: Node) -> Edge:
         """
@@ -140,18 +209,24 @@ class EventFlowGraph:
         if from_node == self.sink:
             raise ValueError('connections from the sink node are not allowed')
         edge = Edge(from_node, to_node)
-        from_node.children.add(to_node)
-        to_node.parents.add(from_node)
-        self.__edges[(edge.from_node, edge.to_node)] = edge
+        self.__put_edge(edge)
         return edge
 
     def add_removed_edge(self, edge: Edge):
         """
         re-adds an edge that formerly has been removed
         """
+        self.__put_edge(edge)
+
+    def __put_edge(self, edge: Edge):
         edge.from_node.children.add(edge.to_node)
         edge.to_node.parents.add(edge.from_node)
-        self.__edges[(edge.from_node, edge.to_node)] = edge
+        if (edge.from_node, edge.to_node) not in self.__edges:
+            old_version = self.get_version()
+            self.__edges[(edge.from_node, edge.to_node)] = edge
+            self.__update_version(old_version, _hash_edge(edge), 'add_edge', edge)
+        else:
+            self.__edges[(edge.from_node, edge.to_node)] = edge
 
     def remove_edge(self, edge: Edge):
         """
@@ -159,7 +234,9 @@ class EventFlowGraph:
         """
         edge.from_node.children.remove(edge.to_node)
         edge.to_node.parents.remove(edge.from_node)
-        self.__edges.pop((edge.from_node, edge.to_node))
+        old_version = self.get_version()
+        edge = self.__edges.pop((edge.from_node, edge.to_node))
+        self.__update_version(old_version, _hash_edge(edge), 'remove_edge', edge)
 
     def nodes(self) -> Generator[Node,None,None]:
         """
@@ -0,0 +1,216 @@
+'''
+    This file is part of Prolothar-Rule-Mining (More Info: https://github.com/shs-it/prolothar-rule-mining).
+
+    Prolothar-Rule-Mining is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    Prolothar-Rule-Mining is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with Prolothar-Rule-Mining. If not, see <https://www.gnu.org/licenses/>.
+'''
+"""
+double ended priority queue with an optional capacity, implemented as a
+min-max heap (Atkinson et al. 1986). priorities are floats and all comparisons
+are done in C. items with equal priority are ordered by insertion, i.e. the
+item inserted first is the smallest.
+"""
+
+from libcpp.vector cimport vector
+
+cdef struct HeapEntry:
+    double priority
+    long long insertion_index
+    Py_ssize_t payload_index
+
+cdef inline bint is_less(HeapEntry a, HeapEntry b):
+    return a.priority < b.priority or (
+        a.priority == b.priority and a.insertion_index < b.insertion_index)
+
+cdef inline bint is_min_level(Py_ssize_t i):
+    cdef int level = 0
+    i += 1
+    while i > 1:
+        i >>= 1
+        level += 1
+    return level % 2 == 0
+
+cdef class BoundedMinMaxHeap:
+    """
+    priority queue that supports push, pop_min and pop_max in O(log n). if
+    a max_size is given, pushing into a full heap removes the item with
+    the largest priority.
+    """
+    cdef vector[HeapEntry] entries
+    cdef list payloads
+    cdef list free_payload_slots
+    cdef Py_ssize_t max_size
+    cdef long long next_insertion_index
+
+    def __init__(self, max_size: int = None):
+        """
+        Parameters
+        ----------
+        max_size : int, optional
+            maximal number of items in the heap. by default None, i.e. unbounded
+        """
+        if max_size is not None and max_size < 1:
+            raise ValueError('max_size must not be < 1 but was %d' % max_size)
+        self.max_size = -1 if max_size is None else max_size
+        self.payloads = []
+        self.free_payload_slots = []
+        self.next_insertion_index = 0
+
+    def __len__(self) -> int:
+        return self.entries.size()
+
+    def push(self, payload, double priority):
+        """
+        adds an item to the heap
+
+        Returns
+        -------
+        object
+            None if the capacity of the heap is not exceeded. otherwise the
+            item with the largest priority, which has been removed from the heap.
+            this can be the pushed item itself.
+        """
+        cdef HeapEntry entry
+        entry.priority = priority
+        entry.insertion_index = self.next_insertion_index
+        self.next_insertion_index += 1
+        if self.free_payload_slots:
+            entry.payload_index = self.free_payload_slots.pop()
+            self.payloads[entry.payload_index] = payload
+        else:
+            entry.payload_index = len(self.payloads)
+            self.payloads.append(payload)
+        self.entries.push_back(entry)
+        self.__push_up(self.entries.size() - 1)
+        if self.max_size >= 0 and <Py_ssize_t>self.entries.size() > self.max_size:
+            return self.pop_max()
+        return None
+
+    def pop_min(self):
+        """
+        removes and returns the item with the smallest priority
+
+        Raises
+        ------
+        IndexError
+            if the heap is empty
+        """
+        if self.entries.empty():
+            raise IndexError('pop from empty heap')
+        return self.__remove(0)
+
+    def pop_max(self):
+        """
+        removes and returns the item with the largest priority
+
+        Raises
+        ------
+        IndexError
+            if the heap is empty
+        """
+        cdef Py_ssize_t size = self.entries.size()
+        if size == 0:
+            raise IndexError('pop from empty heap')
+        if size <= 2:
+            return self.__remove(size - 1)
+        if is_less(self.entries[1], self.entries[2]):
+            return self.__remove(2)
+        return self.__remove(1)
+
+    def peek_min_priority(self) -> float:
+        """
+        returns the smallest priority in the heap
+
+        Raises
+        ------
+        IndexError
+            if the heap is empty
+        """
+        if self.entries.empty():
+            raise IndexError('peek into empty heap')
+        return self.entries[0].priority
+
+    cdef object __remove(self, Py_ssize_t i):
+        cdef Py_ssize_t payload_index = self.entries[i].payload_index
+        payload = self.payloads[payload_index]
+        self.payloads[payload_index] = None
+        self.free_payload_slots.append(payload_index)
+        self.entries[i] = self.entries.back()
+        self.entries.pop_back()
+        if i < <Py_ssize_t>self.entries.size():
+            self.__push_down(i)
+        return payload
+
+    cdef inline void __swap(self, Py_ssize_t i, Py_ssize_t j):
+        cdef HeapEntry tmp = self.entries[i]
+        self.entries[i] = self.entries[j]
+        self.entries[j] = tmp
+
+    cdef inline bint __is_better(self, Py_ssize_t i, Py_ssize_t j, bint min_level):
+        #on min levels, smaller entries are better. on max levels, larger ones.
+        if min_level:
+            return is_less(self.entries[i], self.entries[j])
+        return is_less(self.entries[j], self.entries[i])
+
+    cdef void __push_up(self, Py_ssize_t i):
+        if i == 0:
+            return
+        cdef Py_ssize_t parent = (i - 1) // 2
+        if is_min_level(i):
+            if is_less(self.entries[parent], self.entries[i]):
+                self.__swap(i, parent)
+                self.__push_up_along_grandparents(parent, False)
+            else:
+                self.__push_up_along_grandparents(i, True)
+        else:
+            if is_less(self.entries[i], self.entries[parent]):
+                self.__swap(i, parent)
+                self.__push_up_along_grandparents(parent, True)
+            else:
+                self.__push_up_along_grandparents(i, False)
+
+    cdef void __push_up_along_grandparents(self, Py_ssize_t i, bint min_level):
+        cdef Py_ssize_t grandparent
+        while i > 2:
+            grandparent = ((i - 1) // 2 - 1) // 2
+            if self.__is_better(i, grandparent, min_level):
+                self.__swap(i, grandparent)
+                i = grandparent
+            else:
+                return
+
+    cdef void __push_down(self, Py_ssize_t i):
+        cdef bint min_level = is_min_level(i)
+        cdef Py_ssize_t size = self.entries.size()
+        cdef Py_ssize_t m, candidate, first_child, parent
+        while True:
+            #find the smallest (largest) entry among children and grandchildren
+            first_child = 2 * i + 1
+            if first_child >= size:
+                return
+            m = first_child
+            if first_child + 1 < size and self.__is_better(first_child + 1, m, min_level):
+                m = first_child + 1
+            for candidate in range(2 * first_child + 1, 2 * first_child + 5):
+                if candidate < size and self.__is_better(candidate, m, min_level):
+                    m = candidate
+            if not self.__is_better(m, i, min_level):
+                return
+            self.__swap(i, m)
+            if m <= first_child + 1:
+                #m is a child of i
+                return
+            parent = (m - 1) // 2
+            if self.__is_better(parent, m, min_level):
+                self.__swap(m, parent)
+            i = m
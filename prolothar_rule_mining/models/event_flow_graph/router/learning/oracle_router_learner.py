@@ -17,29 +17,23 @@
 from typing import Dict
 
 from prolothar_common.models.dataset import Dataset
-from prolothar_common.models.dataset.instance import ClassificationInstance
 from prolothar_rule_mining.models.event_flow_graph import EventFlowGraph
 from prolothar_rule_mining.models.event_flow_graph import Node
 from prolothar_rule_mining.models.event_flow_graph.router.router import Router
 from prolothar_rule_mining.models.event_flow_graph.router.oracle_router import GlobalOracleRouter
 from prolothar_rule_mining.models.event_flow_graph.router.oracle_router import LocalOracleRouter
+from prolothar_rule_mining.models.event_flow_graph.alignment.alignment_cache import AlignmentCache
 
 class OracleRouterLearner():
 
-    def __init__(self):
+    def __init__(self, alignment_cache: AlignmentCache = None):
         self.__global_router_dict: Dict[int, GlobalOracleRouter] = {}
+        self.__alignment_cache = alignment_cache
 
     def __call__(self, node: Node, event_flow_graph: EventFlowGraph,
                  dataset: Dataset) -> Router:
-        decision_dataset = Dataset(
-            categorical_attribute_names=dataset.get_categorical_attribute_names(),
-            numerical_attribute_names=dataset.get_numerical_attribute_names())
-        for child in node.children:
-            for instance in event_flow_graph.get_edge(node, child).attributes['instances']:
-                decision_dataset.add_instance(ClassificationInstance(
-                    instance.get_id(), instance.get_features_dict(), str(child.node_id)
-                ))
-
+        #the oracle routers look up the sequences of instances, i.e. there is
+        #no need to copy the instances at the node into a decision dataset
         return LocalOracleRouter(self.__get_global_router(event_flow_graph), node)
 
     def __get_global_router(self, event_flow_graph: EventFlowGraph) -> GlobalOracleRouter:
@@ -47,6 +41,7 @@ class OracleRouterLearner():
         try:
             return self.__global_router_dict[graph_id]
         except KeyError:
-            router = GlobalOracleRouter(event_flow_graph)
+            router = GlobalOracleRouter(
+                event_flow_graph, alignment_cache=self.__alignment_cache)
             self.__global_router_dict[graph_id] = router
             return router
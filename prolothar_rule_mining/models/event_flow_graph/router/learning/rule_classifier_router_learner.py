@@ -24,30 +24,54 @@ from prolothar_rule_mining.models.event_flow_graph.router.ruled_router import Ru
 
 class RuleClassifierRouterLearner():
 
-    def __init__(self, rule_miner):
+    def __init__(self, rule_miner, collapse_duplicate_instances: bool = False):
         """
         Parameters
         ----------
         rule_miner
             a classification rule miner
+        collapse_duplicate_instances : bool, optional
+            if True, instances with the same attribute values and the same
+            next node are collapsed into one instance before mining. the
+            number of collapsed instances is passed as instance_weights to
+            mine_rules of the rule miner, which must support this parameter
+            (e.g. ReliableRuleMiner). by default False
         """
         self.__rule_miner = rule_miner
+        self.__collapse_duplicate_instances = collapse_duplicate_instances
 
     def __call__(self, node: Node, event_flow_graph: EventFlowGraph,
                  dataset: Dataset) -> Router:
         decision_dataset = ClassificationDataset(
             categorical_attribute_names=dataset.get_categorical_attribute_names(),
             numerical_attribute_names=dataset.get_numerical_attribute_names())
+        attribute_names = [attribute.get_name() for attribute in decision_dataset.get_attributes()]
+        #maps (attribute values, class label) to the id of the instance that
+        #represents all instances with these values
+        collapsed_instance_ids = {}
+        instance_weights = {}
         for child in node.children:
+            class_label = str(child.node_id)
             for instance in event_flow_graph.get_edge(node, child).attributes['instances']:
+                features = instance.get_features_dict()
+                if self.__collapse_duplicate_instances:
+                    key = (tuple(features.get(name) for name in attribute_names), class_label)
+                    instance_id = collapsed_instance_ids.setdefault(key, instance.get_id())
+                    if instance_id in instance_weights:
+                        instance_weights[instance_id] += 1
+                        continue
+                    instance_weights[instance_id] = 1
                 decision_dataset.add_instance(ClassificationInstance(
-                    instance.get_id(), instance.get_features_dict(), str(child.node_id)
+                    instance.get_id(), features, class_label
                 ))
 
         if len(decision_dataset.get_set_of_classes()) == 1:
             rule = ReturnClassRule(next(iter(decision_dataset.get_set_of_classes())))
         elif not decision_dataset.get_set_of_classes():
             rule = ReturnClassRule(str(next(iter(node.children)).node_id))
+        elif self.__collapse_duplicate_instances:
+            rule = self.__rule_miner.mine_rules(
+                decision_dataset, instance_weights=instance_weights)
         else:
             rule = self.__rule_miner.mine_rules(decision_dataset)
 
@@ -57,4 +81,5 @@ class RuleClassifierRouterLearner():
         )
 
     def __repr__(self) -> str:
-        return 'RuleClassifierRouterLearner(%r)' % self.__rule_miner
+        return 'RuleClassifierRouterLearner(%r, collapse_duplicate_instances=%r)' % (
+            self.__rule_miner, self.__collapse_duplicate_instances)
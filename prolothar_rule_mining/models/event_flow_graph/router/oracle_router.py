@@ -19,10 +19,13 @@ from typing import Dict, Set
 from prolothar_common.models.dataset.instance import TargetSequenceInstance
 from prolothar_rule_mining.models.event_flow_graph import EventFlowGraph, Node
 from prolothar_rule_mining.models.event_flow_graph.alignment.petrinet import PetrinetAligner
+from prolothar_rule_mining.models.event_flow_graph.alignment.alignment_cache import AlignmentCache
 
 class GlobalOracleRouter():
-    def __init__(self, graph: EventFlowGraph):
+    def __init__(self, graph: EventFlowGraph, alignment_cache: AlignmentCache = None):
         self.__alignment_finder = PetrinetAligner(graph)
+        if alignment_cache is not None:
+            self.__alignment_finder = alignment_cache.wrap(self.__alignment_finder)
         self.__instance_routing_table: Dict[TargetSequenceInstance, Dict[Node, Node]] = {}
         self.__graph = graph
 
@@ -0,0 +1,322 @@
+'''
+    This file is part of Prolothar-Rule-Mining (More Info: https://github.com/shs-it/prolothar-rule-mining).
+
+    Prolothar-Rule-Mining is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    Prolothar-Rule-Mining is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with Prolothar-Rule-Mining. If not, see <https://www.gnu.org/licenses/>.
+'''
+"""
+read-only snapshot of an EventFlowGraph in a single block of shared memory.
+worker processes attach to the block by its name without copying or
+unpickling the graph.
+"""
+
+from typing import Dict, List, Tuple
+
+import itertools
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+
+from prolothar_rule_mining.models.event_flow_graph.graph import EventFlowGraph
+from prolothar_rule_mining.models.event_flow_graph.node import Node
+
+_MAGIC_NUMBER = 0x45464753
+_FORMAT_VERSION = 1
+
+#positions in the header of the shared memory block
+_HEADER_SIZE = 16
+_MAGIC = 0
+_FORMAT = 1
+_NR_OF_NODES = 2
+_NR_OF_EDGES = 3
+_NR_OF_EVENTS = 4
+_EVENT_BYTES = 5
+_MAX_NODE_ID = 6
+_GRAPH_VERSION = 7
+
+def _compute_layout(header: np.ndarray) -> Tuple[List[Tuple[str, np.dtype, int, int]], int]:
+    """
+    returns (name, dtype, length, offset in bytes) of all arrays in the block
+    and the total size of the block in bytes. every array starts at a multiple
+    of 8 bytes.
+    """
+    nr_of_nodes = int(header[_NR_OF_NODES])
+    nr_of_edges = int(header[_NR_OF_EDGES])
+    nr_of_events = int(header[_NR_OF_EVENTS])
+    arrays = [
+        ('header', np.int64, _HEADER_SIZE),
+        ('node_ids', np.int64, nr_of_nodes),
+        ('node_events', np.int32, nr_of_nodes),
+        ('node_index_by_id', np.int32, int(header[_MAX_NODE_ID]) + 1),
+        ('children_offsets', np.int64, nr_of_nodes + 1),
+        ('children', np.int32, nr_of_edges),
+        ('parents_offsets', np.int64, nr_of_nodes + 1),
+        ('parents', np.int32, nr_of_edges),
+        ('event_offsets', np.int64, nr_of_events + 1),
+        ('event_bytes', np.uint8, int(header[_EVENT_BYTES])),
+    ]
+    layout = []
+    offset = 0
+    for name, dtype, length in arrays:
+        layout.append((name, dtype, length, offset))
+        offset += -(-length * np.dtype(dtype).itemsize // 8) * 8
+    return layout, offset
+
+def _to_adjacency_arrays(
+        neighbor_lists: List[List[int]]) -> Tuple[np.ndarray, np.ndarray]:
+    offsets = np.zeros(len(neighbor_lists) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(neighbors) for neighbors in neighbor_lists])
+    neighbors = np.fromiter(
+        itertools.chain.from_iterable(neighbor_lists), dtype=np.int32, count=offsets[-1])
+    return offsets, neighbors
+
+class SharedEventFlowGraph:
+    """
+    snapshot of the structure of an EventFlowGraph (nodes, events and edges)
+    in shared memory. nodes are identified by their index in the snapshot.
+    the source has index 0, the sink has index 1. children and parents of a
+    node are returned as read-only numpy arrays of node indices that point
+    directly into the shared memory.
+
+    a snapshot is created by SharedEventFlowGraph.create() and must be closed
+    and unlinked by its creator if it is not needed anymore. pickling a
+    snapshot only pickles the name of the shared memory block, i.e. worker
+    processes attach to the block when they unpickle it. the attributes of
+    nodes and edges are not part of the snapshot. later changes of the graph
+    are not visible in the snapshot. see ParallelAlignmentFinder for a user of
+    snapshots.
+    """
+
+    def __init__(self, shared_memory: SharedMemory, is_owner: bool):
+        """
+        use SharedEventFlowGraph.create() or SharedEventFlowGraph.attach()
+        """
+        self.__shared_memory = shared_memory
+        self.__is_owner = is_owner
+        header = np.ndarray((_HEADER_SIZE,), dtype=np.int64, buffer=shared_memory.buf)
+        if header[_MAGIC] != _MAGIC_NUMBER or header[_FORMAT] != _FORMAT_VERSION:
+            raise ValueError('shared memory block %r does not contain an event flow graph' % (
+                shared_memory.name))
+        self.__arrays: Dict[str, np.ndarray] = {}
+        for name, dtype, length, offset in _compute_layout(header)[0]:
+            array = np.ndarray((length,), dtype=dtype, buffer=shared_memory.buf, offset=offset)
+            array.flags.writeable = False
+            self.__arrays[name] = array
+        self.__node_ids = self.__arrays['node_ids']
+        self.__node_events = self.__arrays['node_events']
+        self.__node_index_by_id = self.__arrays['node_index_by_id']
+        self.__children_offsets = self.__arrays['children_offsets']
+        self.__children = self.__arrays['children']
+        self.__parents_offsets = self.__arrays['parents_offsets']
+        self.__parents = self.__arrays['parents']
+        self.__event_offsets = self.__arrays['event_offsets']
+        self.__event_bytes = self.__arrays['event_bytes']
+        self.__events: Dict[int, str] = {}
+
+    @staticmethod
+    def create(graph: EventFlowGraph, name: str = None) -> 'SharedEventFlowGraph':
+        """
+        writes the current structure of the given graph into a new shared
+        memory block
+
+        Parameters
+        ----------
+        graph : EventFlowGraph
+            the graph that is written into shared memory
+        name : str, optional
+            name of the shared memory block. by default None, i.e. a
+            unique name is chosen
+
+        Returns
+        -------
+        SharedEventFlowGraph
+            the snapshot. the caller is responsible to call close() and unlink()
+        """
+        nodes = [graph.source, graph.sink] + list(graph.nodes())
+        node_index = {node: i for i,node in enumerate(nodes)}
+        event_index: Dict[str, int] = {}
+        for node in nodes:
+            event_index.setdefault(node.event, len(event_index))
+        encoded_events = [event.encode('utf-8') for event in event_index]
+        children_offsets, children = _to_adjacency_arrays(
+            [[node_index[child] for child in node.children] for node in nodes])
+        parents_offsets, parents = _to_adjacency_arrays(
+            [[node_index[parent] for parent in node.parents] for node in nodes])
+
+        header = np.zeros(_HEADER_SIZE, dtype=np.int64)
+        header[_MAGIC] = _MAGIC_NUMBER
+        header[_FORMAT] = _FORMAT_VERSION
+        header[_NR_OF_NODES] = len(nodes)
+        header[_NR_OF_EDGES] = len(children)
+        header[_NR_OF_EVENTS] = len(encoded_events)
+        header[_EVENT_BYTES] = sum(len(event) for event in encoded_events)
+        header[_MAX_NODE_ID] = max(node.node_id for node in nodes)
+        for i, value in enumerate(graph.get_version()):
+            header[_GRAPH_VERSION + i] = value
+
+        node_index_by_id = np.full(header[_MAX_NODE_ID] + 1, -1, dtype=np.int32)
+        node_ids = np.array([node.node_id for node in nodes], dtype=np.int64)
+        node_index_by_id[node_ids] = np.arange(len(nodes), dtype=np.int32)
+        event_offsets = np.zeros(len(encoded_events) + 1, dtype=np.int64)
+        event_offsets[1:] = np.cumsum([len(event) for event in encoded_events])
+        content = {
+            'header': header,
+            'node_ids': node_ids,
+            'node_events': np.array(
+                [event_index[node.event] for node in nodes], dtype=np.int32),
+            'node_index_by_id': node_index_by_id,
+            'children_offsets': children_offsets,
+            'children': children,
+            'parents_offsets': parents_offsets,
+            'parents': parents,
+            'event_offsets': event_offsets,
+            'event_bytes': np.frombuffer(b''.join(encoded_events), dtype=np.uint8),
+        }
+
+        layout, size = _compute_layout(header)
+        shared_memory = SharedMemory(name=name, create=True, size=size)
+        try:
+            for array_name, dtype, length, offset in layout:
+                np.ndarray((length,), dtype=dtype, buffer=shared_memory.buf,
+                           offset=offset)[:] = content[array_name]
+            return SharedEventFlowGraph(shared_memory, True)
+        except Exception:
+            shared_memory.close()
+            shared_memory.unlink()
+            raise
+
+    @staticmethod
+    def attach(name: str) -> 'SharedEventFlowGraph':
+        """
+        attaches to the snapshot in the shared memory block with the given name.
+        no data is copied, i.e. the runtime does not depend on the size of
+        the graph.
+        """
+        return SharedEventFlowGraph(SharedMemory(name=name), False)
+
+    def __reduce__(self):
+        return (SharedEventFlowGraph.attach, (self.get_name(),))
+
+    def __enter__(self) -> 'SharedEventFlowGraph':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        if self.__is_owner:
+            self.unlink()
+
+    def get_name(self) -> str:
+        """
+        returns the name of the shared memory block
+        """
+        return self.__shared_memory.name
+
+    def get_version(self) -> Tuple[int, int, int, int]:
+        """
+        returns the version of the graph when the snapshot was created.
+        see EventFlowGraph.get_version()
+        """
+        return tuple(int(value) for value in self.__arrays['header'][_GRAPH_VERSION:_GRAPH_VERSION+4])
+
+    def get_nr_of_nodes(self) -> int:
+        """
+        returns the number of nodes in the snapshot including source and sink
+        """
+        return len(self.__node_ids)
+
+    def get_nr_of_edges(self) -> int:
+        return len(self.__children)
+
+    def get_node_id(self, node_index: int) -> int:
+        """
+        returns the id of the node with the given index in the original graph
+        """
+        return int(self.__node_ids[node_index])
+
+    def get_node_index(self, node_id: int) -> int:
+        """
+        returns the index of the node with the given id in the original graph.
+        if no such node exists, a KeyError is raised
+        """
+        if 0 <= node_id < len(self.__node_index_by_id):
+            node_index = self.__node_index_by_id[node_id]
+            if node_index >= 0:
+                return int(node_index)
+        raise KeyError(node_id)
+
+    def get_event(self, node_index: int) -> str:
+        """
+        returns the event of the node with the given index
+        """
+        event_index = int(self.__node_events[node_index])
+        try:
+            return self.__events[event_index]
+        except KeyError:
+            event = bytes(self.__event_bytes[
+                self.__event_offsets[event_index]:self.__event_offsets[event_index+1]
+            ]).decode('utf-8')
+            self.__events[event_index] = event
+            return event
+
+    def get_children(self, node_index: int) -> np.ndarray:
+        """
+        returns the indices of the children of the node with the given index
+        """
+        return self.__children[
+            self.__children_offsets[node_index]:self.__children_offsets[node_index+1]]
+
+    def get_parents(self, node_index: int) -> np.ndarray:
+        """
+        returns the indices of the parents of the node with the given index
+        """
+        return self.__parents[
+            self.__parents_offsets[node_index]:self.__parents_offsets[node_index+1]]
+
+    def to_event_flow_graph(self) -> EventFlowGraph:
+        """
+        creates an EventFlowGraph with the nodes, node ids and edges of this
+        snapshot. the runtime is linear in the size of the graph.
+        """
+        graph = EventFlowGraph()
+        nodes = [graph.source, graph.sink]
+        for node_index in range(2, self.get_nr_of_nodes()):
+            nodes.append(graph.add_removed_node(Node(
+                self.get_node_id(node_index), self.get_event(node_index))))
+        for node_index, node in enumerate(nodes):
+            for child in self.get_children(node_index):
+                graph.add_edge(node, nodes[child])
+        return graph
+
+    def close(self):
+        """
+        detaches from the shared memory block. the arrays returned by this
+        snapshot must not be used afterwards.
+        """
+        self.__arrays = {}
+        self.__node_ids = None
+        self.__node_events = None
+        self.__node_index_by_id = None
+        self.__children_offsets = None
+        self.__children = None
+        self.__parents_offsets = None
+        self.__parents = None
+        self.__event_offsets = None
+        self.__event_bytes = None
+        self.__shared_memory.close()
+
+    def unlink(self):
+        """
+        destroys the shared memory block. should be called once by the creator
+        of the snapshot after all processes have closed it.
+        """
+        self.__shared_memory.unlink()
@@ -14,4 +14,6 @@
     You should have received a copy of the GNU General Public License
     along with Prolothar-Rule-Mining. If not, see <https://www.gnu.org/licenses/>.
 '''
-from prolothar_rule_mining.rule_miner.classification.knn.knn import KnnClassifier
\ No newline at end of file
+from prolothar_rule_mining.rule_miner.classification.knn.knn import KnnClassifier
+from prolothar_rule_mining.rule_miner.classification.knn.knn import TrainedKnnClassifier
+from prolothar_rule_mining.rule_miner.classification.knn.sparse_encoding import SparseOneHotEncoding
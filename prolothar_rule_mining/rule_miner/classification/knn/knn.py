@@ -18,42 +18,128 @@
 K nearest neighbor classifier
 """
 
-from sklearn.preprocessing import MinMaxScaler
+from typing import Dict, Iterable, List
+
+from scipy.sparse import spmatrix
 from sklearn.preprocessing import LabelEncoder
 from sklearn.neighbors import KNeighborsClassifier
+from sklearn.random_projection import SparseRandomProjection
 
 from prolothar_common.models.dataset import ClassificationDataset
-from prolothar_common.models.dataset.transformer.one_hot_encoding import OneHotEncoding
+from prolothar_common.models.dataset.instance import Instance
 
+from prolothar_rule_mining.rule_miner.classification.knn.sparse_encoding import SparseOneHotEncoding
 from prolothar_rule_mining.rule_miner.classification.rules.sklearn import TrainedSklearnClassifier
 
+class TrainedKnnClassifier(TrainedSklearnClassifier):
+    """
+    a fitted KNeighborsClassifier on a SparseOneHotEncoding of the instances,
+    optionally on a random projection of the encoding. instances are
+    predicted in batches of a fixed size, such that the memory for encodings
+    and distances does not grow with the number of instances to predict.
+    """
+
+    def __init__(
+            self, numerical_attribute_names: List[str],
+            categorical_attribute_names: List[str],
+            knn: KNeighborsClassifier, label_encoder: LabelEncoder,
+            encoding: SparseOneHotEncoding, projection: SparseRandomProjection = None,
+            batch_size: int = 10000):
+        """
+        Parameters
+        ----------
+        projection : SparseRandomProjection, optional
+            fitted projection of the encoding before the neighbors are searched.
+            by default None, i.e. the neighbors are searched on the encoding
+        batch_size : int, optional
+            maximal number of instances that are predicted at once, by default 10000
+        """
+        super().__init__(
+            numerical_attribute_names, categorical_attribute_names,
+            knn, label_encoder, dataset_transformers = [], preprocessors = [])
+        self.__encoding = encoding
+        self.__projection = projection
+        self.__batch_size = batch_size
+
+    def transform_instances(self, instances: List[Instance]) -> spmatrix:
+        X = self.__encoding.transform(instances)
+        if self.__projection is not None:
+            X = self.__projection.transform(X)
+        return X
+
+    def predict_many(self, instances: Iterable[Instance]) -> List[str]:
+        instances = list(instances)
+        predictions = []
+        for start in range(0, len(instances), self.__batch_size):
+            predictions.extend(super().predict_many(
+                instances[start:start + self.__batch_size]))
+        return predictions
+
+    def predict_proba_many(self, instances: Iterable[Instance]) -> List[Dict[str, float]]:
+        instances = list(instances)
+        predictions = []
+        for start in range(0, len(instances), self.__batch_size):
+            predictions.extend(super().predict_proba_many(
+                instances[start:start + self.__batch_size]))
+        return predictions
+
 class KnnClassifier():
     """
     Interface to the K nearest neighbor classifier of sklearn
     """
 
-    def __init__(self, k: int = 5, nr_of_jobs: int = -1, knn_algorithm: str = 'auto'):
+    def __init__(self, k: int = 5, nr_of_jobs: int = -1, knn_algorithm: str = 'auto',
+                 nr_of_projected_dimensions: int = None, random_seed: int = None,
+                 batch_size: int = 10000):
+        """
+        configures the learning parameters for this KnnClassifier
+
+        Parameters
+        ----------
+        k : int, optional
+            number of neighbors, by default 5
+        nr_of_jobs : int, optional
+            number of parallel jobs of sklearn, by default -1
+        knn_algorithm : str, optional
+            algorithm of KNeighborsClassifier, by default 'auto'. sklearn
+            always uses 'brute' on the sparse encoding, i.e. tree based
+            algorithms only apply if nr_of_projected_dimensions is set.
+        nr_of_projected_dimensions : int, optional
+            if set, the sparse encoding is mapped by a sparse random projection
+            to a dense space with this number of dimensions and the neighbors
+            are searched in this space. distances are only preserved
+            approximately, but memory and query time of the neighbor index
+            do not grow with the total number of categories anymore.
+            by default None, i.e. exact neighbors on the encoding
+        random_seed : int, optional
+            seed of the random projection, by default None
+        batch_size : int, optional
+            maximal number of instances that are predicted at once, by default 10000
+        """
         self.__k = k
         self.__nr_of_jobs = nr_of_jobs
         self.__knn_algorithm = knn_algorithm
+        self.__nr_of_projected_dimensions = nr_of_projected_dimensions
+        self.__random_seed = random_seed
+        self.__batch_size = batch_size
 
-    def mine_rules(self, dataset: ClassificationDataset) -> TrainedSklearnClassifier:
+    def mine_rules(self, dataset: ClassificationDataset) -> TrainedKnnClassifier:
         """
         trains and returns a KNN classifier on the given dataset.
         """
-        one_hot_encoder = OneHotEncoding({
-            attribute.get_name(): attribute.get_unique_values()
-            for attribute in dataset.get_attributes()
-            if attribute.is_categorical()
-        })
+        instances = list(dataset)
+        encoding = SparseOneHotEncoding().fit(dataset)
+        X = encoding.transform(instances)
 
-        X = one_hot_encoder.transform(dataset).to_dataframe().values
-        scaler = MinMaxScaler()
-        X = scaler.fit_transform(X)
+        projection = None
+        if self.__nr_of_projected_dimensions is not None:
+            projection = SparseRandomProjection(
+                n_components=self.__nr_of_projected_dimensions,
+                dense_output=True, random_state=self.__random_seed)
+            X = projection.fit_transform(X)
 
         label_encoder = LabelEncoder()
-        y = [instance.get_class() for instance in dataset]
-        y = label_encoder.fit_transform(y)
+        y = label_encoder.fit_transform([instance.get_class() for instance in instances])
 
         knn = KNeighborsClassifier(
             n_neighbors=self.__k, n_jobs=self.__nr_of_jobs,
@@ -61,13 +147,11 @@ class KnnClassifier():
         )
         knn.fit(X, y)
 
-        return TrainedSklearnClassifier(
+        return TrainedKnnClassifier(
             dataset.get_numerical_attribute_names(),
             dataset.get_categorical_attribute_names(),
-            knn,
-            label_encoder,
-            dataset_transformers = [one_hot_encoder],
-            preprocessors = [scaler]
+            knn, label_encoder, encoding, projection=projection,
+            batch_size=self.__batch_size
         )
 
     def __repr__(self) -> str:
@@ -0,0 +1,117 @@
+'''
+    This file is part of Prolothar-Rule-Mining (More Info: https://github.com/shs-it/prolothar-rule-mining).
+
+    Prolothar-Rule-Mining is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    Prolothar-Rule-Mining is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with Prolothar-Rule-Mining. If not, see <https://www.gnu.org/licenses/>.
+'''
+"""
+sparse one hot encoding of instances for distance based classifiers
+"""
+
+from typing import Dict, Hashable, List
+
+import numpy as np
+from scipy.sparse import csr_matrix
+
+from prolothar_common.models.dataset import Dataset
+from prolothar_common.models.dataset.instance import Instance
+
+class SparseOneHotEncoding:
+    """
+    encodes instances into a sparse CSR matrix. every categorical attribute is
+    one hot encoded, i.e. a value is mapped to the code of its column and
+    only one entry per attribute and instance is stored. attributes with the
+    values 0 and 1 get a single column like in OneHotEncoding. numerical
+    attributes are min-max scaled to [0,1] with the minimum and maximum of the
+    dataset given to fit(). unknown categorical values are encoded as a row
+    without an entry for the attribute.
+
+    the euclidean distances between encoded instances are the same as after
+    OneHotEncoding followed by sklearn's MinMaxScaler, but the memory does not
+    grow with the total number of categories.
+    """
+
+    def __init__(self):
+        self.__column_codes: Dict[str, Dict[Hashable, int]] = {}
+        self.__numerical_columns: Dict[str, int] = {}
+        self.__minimums: Dict[str, float] = {}
+        self.__scales: Dict[str, float] = {}
+        self.__nr_of_columns = 0
+
+    def fit(self, dataset: Dataset) -> 'SparseOneHotEncoding':
+        """
+        learns the columns of the categorical values and the scaling of the
+        numerical attributes from the given dataset
+        """
+        self.__column_codes = {}
+        self.__numerical_columns = {}
+        self.__minimums = {}
+        self.__scales = {}
+        nr_of_columns = 0
+        for attribute in dataset.get_attributes():
+            if attribute.is_categorical():
+                possible_values = sorted(attribute.get_unique_values())
+                #do not transform already 0-1 encoded attributes
+                if len(possible_values) == 2 and possible_values[0] == 0 and possible_values[1] == 1:
+                    possible_values = [1]
+                self.__column_codes[attribute.get_name()] = {
+                    value: nr_of_columns + i for i, value in enumerate(possible_values)
+                }
+                nr_of_columns += len(possible_values)
+        for attribute in dataset.get_attributes():
+            if attribute.is_numerical():
+                values = list(attribute.get_unique_values())
+                minimum = min(values) if values else 0
+                value_range = max(values) - minimum if values else 0
+                self.__numerical_columns[attribute.get_name()] = nr_of_columns
+                self.__minimums[attribute.get_name()] = minimum
+                #constant attributes are not scaled as in MinMaxScaler
+                self.__scales[attribute.get_name()] = 1 / value_range if value_range else 1
+                nr_of_columns += 1
+        self.__nr_of_columns = nr_of_columns
+        return self
+
+    def get_nr_of_columns(self) -> int:
+        return self.__nr_of_columns
+
+    def transform(self, instances: List[Instance]) -> csr_matrix:
+        """
+        returns a CSR matrix with one row per instance
+        """
+        nr_of_rows = len(instances)
+        row_indices = np.arange(nr_of_rows, dtype=np.int64)
+        rows = []
+        columns = []
+        data = []
+        for attribute_name, column_codes in self.__column_codes.items():
+            codes = np.fromiter(
+                (column_codes.get(instance[attribute_name], -1) for instance in instances),
+                dtype=np.int64, count=nr_of_rows)
+            known = codes >= 0
+            rows.append(row_indices[known])
+            columns.append(codes[known])
+            data.append(np.ones(np.count_nonzero(known)))
+        for attribute_name, column in self.__numerical_columns.items():
+            values = np.fromiter(
+                (instance[attribute_name] for instance in instances),
+                dtype=float, count=nr_of_rows)
+            values = (values - self.__minimums[attribute_name]) * self.__scales[attribute_name]
+            nonzero = values != 0
+            rows.append(row_indices[nonzero])
+            columns.append(np.full(np.count_nonzero(nonzero), column, dtype=np.int64))
+            data.append(values[nonzero])
+        if not data:
+            return csr_matrix((nr_of_rows, self.__nr_of_columns))
+        return csr_matrix(
+            (np.concatenate(data), (np.concatenate(rows), np.concatenate(columns))),
+            shape=(nr_of_rows, self.__nr_of_columns))
@@ -15,4 +15,6 @@
     along with Prolothar-Rule-Mining. If not, see <https://www.gnu.org/licenses/>.
 '''
 from prolothar_rule_mining.rule_miner.classification.naive_bayes.mixed_naive_bayes import MixedNaiveBayesClassifier
-from prolothar_rule_mining.rule_miner.classification.naive_bayes.categorical_naive_bayes import CategoricalNaiveBayesClassifier
\ No newline at end of file
+from prolothar_rule_mining.rule_miner.classification.naive_bayes.categorical_naive_bayes import CategoricalNaiveBayesClassifier
+from prolothar_rule_mining.rule_miner.classification.naive_bayes.mixed_naive_bayes import TrainedMixedNaiveBayes
+from prolothar_rule_mining.rule_miner.classification.naive_bayes.categorical_naive_bayes import TrainedCategoricalNaiveBayes
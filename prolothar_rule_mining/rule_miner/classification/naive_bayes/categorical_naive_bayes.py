@@ -18,7 +18,10 @@
 naive bayes classifier
 """
 
+from typing import Dict, List, Set
+
 import numpy as np
+import pandas as pd
 from sklearn.preprocessing import LabelEncoder
 
 from sklearn.naive_bayes import CategoricalNB
@@ -26,10 +29,153 @@ from sklearn.naive_bayes import CategoricalNB
 from prolothar_common.models.dataset import ClassificationDataset
 from prolothar_common.models.dataset.transformer.label_encoding import LabelEncoding
 from prolothar_common.models.dataset.transformer import TrainableQuantileBasedDiscretization
-from prolothar_common.models.dataset.transformer import RemoveAttributesWithOneUniqueValue
 
 from prolothar_rule_mining.rule_miner.classification.rules.sklearn import TrainedSklearnClassifier
 
+class TrainedCategoricalNaiveBayes(TrainedSklearnClassifier):
+    """
+    a trained CategoricalNB together with its encoders. the count tables of
+    the model can be updated with new data (partial_fit) or combined with the
+    count tables of a model that has been trained on other data (merge).
+    the encoders, i.e. the bins of numerical attributes, the categories and the
+    class labels, are fixed when the model is mined and are shared by all
+    models created by create_empty_copy.
+
+    a dataset can be fitted in parallel by calling create_empty_copy().partial_fit
+    for every partition and merging the results.
+    """
+
+    def __init__(
+            self, categorical_attribute_names: List[str],
+            numerical_attribute_names: List[str],
+            naive_bayes: CategoricalNB, label_encoder: LabelEncoder,
+            numerical_encoder: TrainableQuantileBasedDiscretization,
+            categorical_encoder: LabelEncoding):
+        super().__init__(
+            numerical_attribute_names,
+            categorical_attribute_names,
+            naive_bayes,
+            label_encoder,
+            dataset_transformers = [numerical_encoder, categorical_encoder],
+            preprocessors = []
+        )
+        self.__categorical_attribute_names = categorical_attribute_names
+        self.__numerical_attribute_names = numerical_attribute_names
+        self.__naive_bayes = naive_bayes
+        self.__label_encoder = label_encoder
+        self.__numerical_encoder = numerical_encoder
+        self.__categorical_encoder = categorical_encoder
+
+    def partial_fit(self, batch: ClassificationDataset) -> 'TrainedCategoricalNaiveBayes':
+        """
+        adds the counts of the given instances to the model
+
+        Raises
+        ------
+        ValueError
+            if the batch contains a class label that is unknown to the model
+        KeyError
+            if the batch contains a category that is unknown to the model
+
+        Returns
+        -------
+        TrainedCategoricalNaiveBayes
+            this model
+        """
+        instances = list(batch)
+        if not instances:
+            return self
+        X = self.transform_instances(instances).astype(np.int64)
+        if X.shape[1] == 0:
+            X = np.ones((len(instances), 1), dtype=np.int64)
+        y = self.__label_encoder.transform([instance.get_class() for instance in instances])
+        self.__naive_bayes.partial_fit(
+            X, y, classes=np.arange(len(self.__label_encoder.classes_)))
+        return self
+
+    def merge(self, other: 'TrainedCategoricalNaiveBayes') -> 'TrainedCategoricalNaiveBayes':
+        """
+        adds the count tables of the other model to the count tables of this
+        model. both models must share the same encoders, i.e. other must have
+        been created by create_empty_copy of this model or of the same model.
+
+        Raises
+        ------
+        ValueError
+            if the models have different class labels or features
+
+        Returns
+        -------
+        TrainedCategoricalNaiveBayes
+            this model
+        """
+        if not _is_fitted(other.__naive_bayes):
+            return self
+        if list(self.__label_encoder.classes_) != list(other.__label_encoder.classes_):
+            raise ValueError('cannot merge models with different class labels: %r != %r' % (
+                self.__label_encoder.classes_, other.__label_encoder.classes_))
+        naive_bayes = self.__naive_bayes
+        if not _is_fitted(naive_bayes):
+            naive_bayes.classes_ = other.__naive_bayes.classes_.copy()
+            naive_bayes.n_features_in_ = other.__naive_bayes.n_features_in_
+            naive_bayes.class_count_ = np.zeros_like(other.__naive_bayes.class_count_)
+            naive_bayes.category_count_ = [
+                np.zeros((len(naive_bayes.classes_), 0))
+                for _ in range(naive_bayes.n_features_in_)
+            ]
+        elif naive_bayes.n_features_in_ != other.__naive_bayes.n_features_in_:
+            raise ValueError('cannot merge models with %d and %d features' % (
+                naive_bayes.n_features_in_, other.__naive_bayes.n_features_in_))
+        naive_bayes.class_count_ = naive_bayes.class_count_ + other.__naive_bayes.class_count_
+        naive_bayes.category_count_ = [
+            _add_padded(counts, other_counts) for counts, other_counts
+            in zip(naive_bayes.category_count_, other.__naive_bayes.category_count_)
+        ]
+        naive_bayes.n_categories_ = np.array(
+            [counts.shape[1] for counts in naive_bayes.category_count_], dtype=np.int64)
+        self.__update_log_probabilities()
+        return self
+
+    def __update_log_probabilities(self):
+        #the same as CategoricalNB after partial_fit with fit_prior=True
+        naive_bayes = self.__naive_bayes
+        with np.errstate(divide='ignore'):
+            naive_bayes.class_log_prior_ = np.log(naive_bayes.class_count_) - np.log(
+                naive_bayes.class_count_.sum())
+        feature_log_prob = []
+        for counts in naive_bayes.category_count_:
+            smoothed_counts = counts + naive_bayes.alpha
+            feature_log_prob.append(
+                np.log(smoothed_counts) - np.log(smoothed_counts.sum(axis=1, keepdims=True)))
+        naive_bayes.feature_log_prob_ = feature_log_prob
+
+    def create_empty_copy(self) -> 'TrainedCategoricalNaiveBayes':
+        """
+        creates a model with the same encoders and empty count tables, e.g.
+        for partial_fit on a partition of a dataset
+        """
+        if _is_fitted(self.__naive_bayes):
+            min_categories = np.array(
+                [counts.shape[1] for counts in self.__naive_bayes.category_count_],
+                dtype=np.int64)
+        else:
+            min_categories = self.__naive_bayes.min_categories
+        return TrainedCategoricalNaiveBayes(
+            self.__categorical_attribute_names, self.__numerical_attribute_names,
+            CategoricalNB(alpha=self.__naive_bayes.alpha, min_categories=min_categories),
+            self.__label_encoder, self.__numerical_encoder, self.__categorical_encoder)
+
+def _is_fitted(naive_bayes: CategoricalNB) -> bool:
+    return hasattr(naive_bayes, 'class_count_')
+
+def _add_padded(counts: np.ndarray, other_counts: np.ndarray) -> np.ndarray:
+    """adds two count tables with possibly different numbers of categories"""
+    nr_of_categories = max(counts.shape[1], other_counts.shape[1])
+    result = np.zeros((counts.shape[0], nr_of_categories))
+    result[:, :counts.shape[1]] += counts
+    result[:, :other_counts.shape[1]] += other_counts
+    return result
+
 class CategoricalNaiveBayesClassifier():
     """
     Interface to a naive bayes classifier for categorical data
@@ -40,46 +186,41 @@ class CategoricalNaiveBayesClassifier():
     def __init__(self, nr_of_bins: int = 5):
         self.__nr_of_bins = nr_of_bins
 
-    def mine_rules(self, dataset: ClassificationDataset) -> TrainedSklearnClassifier:
+    def mine_rules(self, dataset: ClassificationDataset) -> TrainedCategoricalNaiveBayes:
         """
         trains and returns a trained classifier on the given dataset.
+        attributes with only one unique value are ignored. the dataset is
+        not copied.
         """
-        transformed_dataset = dataset.copy()
-
-        RemoveAttributesWithOneUniqueValue().transform(transformed_dataset, inplace=True)
-        categorical_feature_names = dataset.get_categorical_attribute_names()
-        numerical_feature_names = dataset.get_numerical_attribute_names()
-
-        numerical_encoder = TrainableQuantileBasedDiscretization.train(
-            transformed_dataset, self.__nr_of_bins)
-        numerical_encoder.transform(transformed_dataset, inplace=True)
-
-        categorical_encoder = LabelEncoding({
-            attribute.get_name(): attribute.get_unique_values()
-            for attribute in transformed_dataset.get_attributes()
-            if attribute.is_categorical()
-        })
-        categorical_encoder.transform(transformed_dataset, inplace=True)
-
-        X = transformed_dataset.to_dataframe().values
+        categorical_attribute_names = []
+        numerical_attribute_names = []
+        possible_attribute_values: Dict[str, Set] = {}
+        attribute_bins_dict = {}
+        for attribute in dataset.get_attributes():
+            if attribute.get_nr_of_unique_values() == 1:
+                continue
+            attribute_name = attribute.get_name()
+            if attribute.is_categorical():
+                categorical_attribute_names.append(attribute_name)
+                possible_attribute_values[attribute_name] = attribute.get_unique_values()
+            else:
+                numerical_attribute_names.append(attribute_name)
+                bins = pd.qcut(
+                    [instance[attribute_name] for instance in dataset],
+                    self.__nr_of_bins, duplicates='drop')
+                attribute_bins_dict[attribute_name] = bins.categories
+                possible_attribute_values[attribute_name] = set(
+                    str(bins.categories[code]) for code in np.unique(bins.codes))
 
         label_encoder = LabelEncoder()
-        y = [instance.get_class() for instance in transformed_dataset]
-        y = label_encoder.fit_transform(y)
-
-        if transformed_dataset.get_nr_of_attributes() == 0:
-            X = np.ones((len(y), 1))
-        naive_bayes = CategoricalNB()
-        naive_bayes.fit(X, y)
-
-        return TrainedSklearnClassifier(
-            numerical_feature_names,
-            categorical_feature_names,
-            naive_bayes,
-            label_encoder,
-            dataset_transformers = [numerical_encoder, categorical_encoder],
-            preprocessors = []
-        )
+        label_encoder.fit([instance.get_class() for instance in dataset])
+
+        model = TrainedCategoricalNaiveBayes(
+            categorical_attribute_names, numerical_attribute_names,
+            CategoricalNB(), label_encoder,
+            TrainableQuantileBasedDiscretization(attribute_bins_dict),
+            LabelEncoding(possible_attribute_values))
+        return model.partial_fit(dataset)
 
     def __repr__(self) -> str:
         return 'CategoricalNaiveBayesClassifier()'
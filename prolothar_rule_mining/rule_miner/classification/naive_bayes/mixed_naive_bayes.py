@@ -18,6 +18,9 @@
 naive bayes classifier
 """
 
+from typing import List, Tuple
+
+import numpy as np
 from sklearn.preprocessing import LabelEncoder
 
 from mixed_naive_bayes import MixedNB
@@ -27,6 +30,230 @@ from prolothar_common.models.dataset.transformer.label_encoding import LabelEnco
 
 from prolothar_rule_mining.rule_miner.classification.rules.sklearn import TrainedSklearnClassifier
 
+def _merge_moments(
+        count: np.ndarray, mean: np.ndarray, m2: np.ndarray,
+        other_count: np.ndarray, other_mean: np.ndarray,
+        other_m2: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    combines counts, means and sums of squared deviations from the mean of
+    two disjoint samples (Chan et al. 1979). counts are given per row of
+    the mean and m2 matrices.
+    """
+    merged_count = count + other_count
+    with np.errstate(divide='ignore', invalid='ignore'):
+        other_ratio = np.where(merged_count > 0, other_count / merged_count, 0)
+        weight = np.where(merged_count > 0, count * other_count / merged_count, 0)
+    delta = other_mean - mean
+    merged_mean = mean + delta * other_ratio[..., np.newaxis]
+    merged_m2 = m2 + other_m2 + delta**2 * weight[..., np.newaxis]
+    return merged_count, merged_mean, merged_m2
+
+class _SufficientStatistics:
+    """
+    counts of classes and categories per class, means and sums of squared
+    deviations of the gaussian features per class and of all features (for
+    the variance smoothing of MixedNB)
+    """
+
+    def __init__(self, nr_of_categories: List[int], nr_of_classes: int, nr_of_features: int):
+        nr_of_gaussian_features = nr_of_features - len(nr_of_categories)
+        self.class_counts = np.zeros(nr_of_classes)
+        self.category_counts = [
+            np.zeros((nr_of_classes, nr_of_categories_of_feature))
+            for nr_of_categories_of_feature in nr_of_categories
+        ]
+        self.gaussian_means = np.zeros((nr_of_classes, nr_of_gaussian_features))
+        self.gaussian_m2 = np.zeros((nr_of_classes, nr_of_gaussian_features))
+        self.column_count = np.zeros(1)
+        self.column_means = np.zeros((1, nr_of_features))
+        self.column_m2 = np.zeros((1, nr_of_features))
+
+    @staticmethod
+    def compute(X: np.ndarray, y: np.ndarray, nr_of_categories: List[int],
+                nr_of_classes: int) -> '_SufficientStatistics':
+        statistics = _SufficientStatistics(nr_of_categories, nr_of_classes, X.shape[1])
+        nr_of_categorical_features = len(nr_of_categories)
+        statistics.class_counts = np.bincount(y, minlength=nr_of_classes).astype(float)
+        for i in range(nr_of_categorical_features):
+            codes = X[:, i].astype(np.int64)
+            nr_of_categories_of_feature = max(nr_of_categories[i], int(codes.max()) + 1)
+            statistics.category_counts[i] = np.bincount(
+                y * nr_of_categories_of_feature + codes,
+                minlength=nr_of_classes * nr_of_categories_of_feature
+            ).reshape(nr_of_classes, nr_of_categories_of_feature).astype(float)
+        gaussian_X = X[:, nr_of_categorical_features:]
+        for class_code in np.flatnonzero(statistics.class_counts):
+            x = gaussian_X[y == class_code]
+            statistics.gaussian_means[class_code] = x.mean(axis=0)
+            statistics.gaussian_m2[class_code] = ((x - x.mean(axis=0))**2).sum(axis=0)
+        statistics.column_count[0] = len(X)
+        statistics.column_means[0] = X.mean(axis=0)
+        statistics.column_m2[0] = ((X - X.mean(axis=0))**2).sum(axis=0)
+        return statistics
+
+    def merge(self, other: '_SufficientStatistics'):
+        """adds the statistics of a disjoint sample to these statistics"""
+        _, self.gaussian_means, self.gaussian_m2 = _merge_moments(
+            self.class_counts, self.gaussian_means, self.gaussian_m2,
+            other.class_counts, other.gaussian_means, other.gaussian_m2)
+        self.column_count, self.column_means, self.column_m2 = _merge_moments(
+            self.column_count, self.column_means, self.column_m2,
+            other.column_count, other.column_means, other.column_m2)
+        self.class_counts = self.class_counts + other.class_counts
+        for i, other_counts in enumerate(other.category_counts):
+            counts = self.category_counts[i]
+            if other_counts.shape[1] > counts.shape[1]:
+                counts, other_counts = other_counts, counts
+            counts = counts.copy()
+            counts[:, :other_counts.shape[1]] += other_counts
+            self.category_counts[i] = counts
+
+class TrainedMixedNaiveBayes(TrainedSklearnClassifier):
+    """
+    a trained MixedNB together with its encoders. the model keeps the
+    sufficient statistics of its training data, i.e. the counts of classes and
+    categories and the means and variances of numerical attributes per class.
+    the model can be updated with new data (partial_fit) or combined with a
+    model that has been trained on other data (merge). the encoders, i.e. the
+    categories and the class labels, are fixed when the model is mined and are
+    shared by all models created by create_empty_copy.
+
+    a dataset can be fitted in parallel by calling create_empty_copy().partial_fit
+    for every partition and merging the results.
+    """
+
+    def __init__(
+            self, categorical_attribute_names: List[str],
+            numerical_attribute_names: List[str],
+            naive_bayes: MixedNB, label_encoder: LabelEncoder,
+            categorical_encoder: LabelEncoding, nr_of_categories: List[int]):
+        """
+        Parameters
+        ----------
+        nr_of_categories : List[int]
+            number of categories of each categorical attribute after label encoding
+        """
+        super().__init__(
+            numerical_attribute_names,
+            categorical_attribute_names,
+            naive_bayes,
+            label_encoder,
+            dataset_transformers = [categorical_encoder],
+            preprocessors = []
+        )
+        self.__categorical_attribute_names = categorical_attribute_names
+        self.__numerical_attribute_names = numerical_attribute_names
+        self.__naive_bayes = naive_bayes
+        self.__label_encoder = label_encoder
+        self.__categorical_encoder = categorical_encoder
+        self.__nr_of_categories = nr_of_categories
+        self.__statistics = _SufficientStatistics(
+            nr_of_categories, len(label_encoder.classes_),
+            len(categorical_attribute_names) + len(numerical_attribute_names))
+
+    def partial_fit(self, batch: ClassificationDataset) -> 'TrainedMixedNaiveBayes':
+        """
+        adds the statistics of the given instances to the model
+
+        Raises
+        ------
+        ValueError
+            if the batch contains a class label that is unknown to the model
+        KeyError
+            if the batch contains a category that is unknown to the model
+
+        Returns
+        -------
+        TrainedMixedNaiveBayes
+            this model
+        """
+        instances = list(batch)
+        if not instances:
+            return self
+        X = self.transform_instances(instances).astype(float)
+        y = self.__label_encoder.transform([instance.get_class() for instance in instances])
+        self.__statistics.merge(_SufficientStatistics.compute(
+            X, y, self.__nr_of_categories, len(self.__label_encoder.classes_)))
+        self.__update_naive_bayes()
+        return self
+
+    def merge(self, other: 'TrainedMixedNaiveBayes') -> 'TrainedMixedNaiveBayes':
+        """
+        adds the statistics of the other model to the statistics of this
+        model. both models must share the same encoders, i.e. other must have
+        been created by create_empty_copy of this model or of the same model.
+
+        Raises
+        ------
+        ValueError
+            if the models have different class labels or attributes
+
+        Returns
+        -------
+        TrainedMixedNaiveBayes
+            this model
+        """
+        if list(self.__label_encoder.classes_) != list(other.__label_encoder.classes_):
+            raise ValueError('cannot merge models with different class labels: %r != %r' % (
+                self.__label_encoder.classes_, other.__label_encoder.classes_))
+        if self.__categorical_attribute_names != other.__categorical_attribute_names \
+        or self.__numerical_attribute_names != other.__numerical_attribute_names:
+            raise ValueError('cannot merge models with different attributes')
+        self.__statistics.merge(other.__statistics)
+        self.__update_naive_bayes()
+        return self
+
+    def create_empty_copy(self) -> 'TrainedMixedNaiveBayes':
+        """
+        creates a model with the same encoders and empty statistics, e.g.
+        for partial_fit on a partition of a dataset
+        """
+        return TrainedMixedNaiveBayes(
+            self.__categorical_attribute_names, self.__numerical_attribute_names,
+            MixedNB(
+                categorical_features=self.__naive_bayes.categorical_features,
+                alpha=self.__naive_bayes.alpha,
+                var_smoothing=self.__naive_bayes.var_smoothing),
+            self.__label_encoder, self.__categorical_encoder,
+            [counts.shape[1] for counts in self.__statistics.category_counts])
+
+    def __update_naive_bayes(self):
+        """
+        sets the parameters of MixedNB as MixedNB.fit would compute them on
+        all data seen so far
+        """
+        #MixedNB has no partial_fit, so its internal attributes (e.g. theta,
+        #sigma, categorical_posteriors, epsilon and _is_fitted) are set
+        #directly. their names and meaning are those of mixed-naive-bayes==0.0.1,
+        #which is pinned in requirements.txt. check this method before
+        #upgrading that package.
+        statistics = self.__statistics
+        naive_bayes = self.__naive_bayes
+        nr_of_categorical_features = len(statistics.category_counts)
+        nr_of_features = statistics.column_means.shape[1]
+        naive_bayes.num_features = nr_of_features
+        naive_bayes.categorical_features = np.arange(nr_of_categorical_features)
+        naive_bayes.gaussian_features = np.arange(nr_of_categorical_features, nr_of_features)
+        naive_bayes.max_categories = np.array(
+            [counts.shape[1] for counts in statistics.category_counts], dtype=int)
+        naive_bayes.priors = statistics.class_counts / statistics.class_counts.sum()
+        if naive_bayes.gaussian_features.size != 0:
+            naive_bayes.theta = statistics.gaussian_means.copy()
+            with np.errstate(divide='ignore', invalid='ignore'):
+                naive_bayes.sigma = np.where(
+                    statistics.class_counts[:, np.newaxis] > 0,
+                    statistics.gaussian_m2 / statistics.class_counts[:, np.newaxis], 0)
+        if nr_of_categorical_features != 0:
+            naive_bayes.categorical_posteriors = [
+                (counts + naive_bayes.alpha) / (counts + naive_bayes.alpha).sum(
+                    axis=1, keepdims=True)
+                for counts in statistics.category_counts
+            ]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            naive_bayes.epsilon = naive_bayes.var_smoothing * (
+                statistics.column_m2[0] / (statistics.column_count[0] - 1)).max()
+        naive_bayes._is_fitted = True
+
 class MixedNaiveBayesClassifier():
     """
     Interface to a naive bayes classifier for mixed data
@@ -44,35 +271,31 @@ class MixedNaiveBayesClassifier():
         """
         self.__alpha = alpha
 
-    def mine_rules(self, dataset: ClassificationDataset) -> TrainedSklearnClassifier:
+    def mine_rules(self, dataset: ClassificationDataset) -> TrainedMixedNaiveBayes:
         """
         trains and returns a trained classifier on the given dataset.
+        the dataset is not copied.
         """
-        categorical_encoder = LabelEncoding({
+        possible_attribute_values = {
             attribute.get_name(): attribute.get_unique_values()
             for attribute in dataset.get_attributes()
             if attribute.is_categorical()
-        })
-
-        X = categorical_encoder.transform(dataset).to_dataframe().values
+        }
+        categorical_attribute_names = list(dataset.get_categorical_attribute_names())
 
         label_encoder = LabelEncoder()
-        y = [instance.get_class() for instance in dataset]
-        y = label_encoder.fit_transform(y)
+        label_encoder.fit([instance.get_class() for instance in dataset])
 
-        naive_bayes = MixedNB(
-            categorical_features=list(range(len(dataset.get_categorical_attribute_names()))),
-            alpha=self.__alpha)
-        naive_bayes.fit(X, y)
-
-        return TrainedSklearnClassifier(
-            dataset.get_numerical_attribute_names(),
-            dataset.get_categorical_attribute_names(),
-            naive_bayes,
+        model = TrainedMixedNaiveBayes(
+            categorical_attribute_names,
+            list(dataset.get_numerical_attribute_names()),
+            MixedNB(
+                categorical_features=list(range(len(categorical_attribute_names))),
+                alpha=self.__alpha),
             label_encoder,
-            dataset_transformers = [categorical_encoder],
-            preprocessors = []
-        )
+            LabelEncoding(possible_attribute_values),
+            [len(possible_attribute_values[name]) for name in categorical_attribute_names])
+        return model.partial_fit(dataset)
 
     def __repr__(self) -> str:
         return 'MixedNaiveBayesClassifier()'
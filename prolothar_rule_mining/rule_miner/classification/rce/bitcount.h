@@ -0,0 +1,73 @@
+/*
+    This file is part of Prolothar-Rule-Mining (More Info: https://github.com/shs-it/prolothar-rule-mining).
+
+    Prolothar-Rule-Mining is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    Prolothar-Rule-Mining is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with Prolothar-Rule-Mining. If not, see <https://www.gnu.org/licenses/>.
+*/
+/*
+ * portable popcount and count of trailing zeros of 64 bit words for
+ * bitvector.pyx. uses compiler intrinsics of GCC, Clang and MSVC (x64) and
+ * falls back to plain C on other compilers and platforms.
+ */
+#ifndef PROLOTHAR_RCE_BITCOUNT_H
+#define PROLOTHAR_RCE_BITCOUNT_H
+
+#include <stdint.h>
+
+#if defined(__GNUC__) || defined(__clang__)
+
+static inline int bitcount_popcount64(uint64_t x) {
+    return __builtin_popcountll(x);
+}
+
+/* x must not be 0 */
+static inline int bitcount_ctz64(uint64_t x) {
+    return __builtin_ctzll(x);
+}
+
+#elif defined(_MSC_VER) && (defined(_M_X64) || defined(_M_ARM64))
+
+#include <intrin.h>
+
+static inline int bitcount_popcount64(uint64_t x) {
+#if defined(_M_X64)
+    return (int)__popcnt64(x);
+#else
+    return (int)_CountOneBits64(x);
+#endif
+}
+
+/* x must not be 0 */
+static inline int bitcount_ctz64(uint64_t x) {
+    unsigned long index;
+    _BitScanForward64(&index, x);
+    return (int)index;
+}
+
+#else
+
+static inline int bitcount_popcount64(uint64_t x) {
+    x = x - ((x >> 1) & 0x5555555555555555ULL);
+    x = (x & 0x3333333333333333ULL) + ((x >> 2) & 0x3333333333333333ULL);
+    x = (x + (x >> 4)) & 0x0F0F0F0F0F0F0F0FULL;
+    return (int)((x * 0x0101010101010101ULL) >> 56);
+}
+
+/* x must not be 0 */
+static inline int bitcount_ctz64(uint64_t x) {
+    return bitcount_popcount64((x & (0 - x)) - 1);
+}
+
+#endif
+
+#endif
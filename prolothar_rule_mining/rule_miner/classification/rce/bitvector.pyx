@@ -0,0 +1,261 @@
+'''
+    This file is part of Prolothar-Rule-Mining (More Info: https://github.com/shs-it/prolothar-rule-mining).
+
+    Prolothar-Rule-Mining is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    Prolothar-Rule-Mining is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with Prolothar-Rule-Mining. If not, see <https://www.gnu.org/licenses/>.
+'''
+"""
+bit-packed boolean vectors for the candidate search of RCE. a vector of n
+booleans is stored in ceil(n / 64) unsigned 64 bit integers, where bit j of
+word i belongs to row 64 * i + j. unused bits of the last word are always 0.
+this reduces memory by a factor of 8 compared to numpy bool arrays and allows
+to count the rows of combined vectors without allocating the combination.
+the weighted_popcount functions sum up integer weights of the rows instead of
+counting them.
+"""
+
+import numpy as np
+cimport cython
+from libc.stdint cimport uint64_t, int64_t
+
+cdef extern from "bitcount.h":
+    int bitcount_popcount64(uint64_t x) nogil
+    int bitcount_ctz64(uint64_t x) nogil
+
+cdef inline long long sum_weights_of_bits(
+        uint64_t word, const int64_t* weights) nogil:
+    #weights points to the weight of the row of the lowest bit of word
+    cdef long long weight_sum = 0
+    while word:
+        weight_sum += weights[bitcount_ctz64(word)]
+        word &= word - 1
+    return weight_sum
+
+cdef int check_nr_of_words(
+        const uint64_t[::1] a, const uint64_t[::1] b) except -1:
+    #the kernels do not check bounds
+    if a.shape[0] != b.shape[0]:
+        raise ValueError('bit vectors must have the same length, but got %d and %d words' % (
+            a.shape[0], b.shape[0]))
+    return 0
+
+cdef int check_nr_of_weights(
+        const uint64_t[::1] a, const int64_t[::1] weights) except -1:
+    #unused bits of the last word are 0, i.e. they never index into weights
+    if a.shape[0] != (weights.shape[0] + 63) // 64:
+        raise ValueError('expected one weight per row of %d words, but got %d weights' % (
+            a.shape[0], weights.shape[0]))
+    return 0
+
+def pack(bool_vector) -> np.ndarray:
+    """
+    converts a numpy bool vector into a bit-packed uint64 vector
+    """
+    packed_bytes = np.packbits(np.asarray(bool_vector, dtype=bool), bitorder='little')
+    padded_bytes = np.zeros(8 * ((len(packed_bytes) + 7) // 8), dtype=np.uint8)
+    padded_bytes[:len(packed_bytes)] = packed_bytes
+    return padded_bytes.view('<u8').astype(np.uint64, copy=False)
+
+def unpack(packed_vector, int length) -> np.ndarray:
+    """
+    converts a bit-packed uint64 vector with the given number of rows back
+    into a numpy bool vector
+    """
+    packed_bytes = np.ascontiguousarray(packed_vector, dtype='<u8').view(np.uint8)
+    return np.unpackbits(packed_bytes, count=length, bitorder='little').astype(bool)
+
+def bitwise_and(a, b) -> np.ndarray:
+    return np.bitwise_and(a, b)
+
+def bitwise_or(a, b) -> np.ndarray:
+    return np.bitwise_or(a, b)
+
+def bitwise_andnot(a, b) -> np.ndarray:
+    """
+    returns a & ~b. unlike ~b alone, this keeps the unused bits 0
+    """
+    return np.bitwise_and(a, np.invert(b))
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def popcount(const uint64_t[::1] a) -> int:
+    """
+    number of rows that are True in a
+    """
+    cdef Py_ssize_t i
+    cdef long long count = 0
+    with nogil:
+        for i in range(a.shape[0]):
+            count += bitcount_popcount64(a[i])
+    return count
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def popcount_and(const uint64_t[::1] a, const uint64_t[::1] b) -> int:
+    """
+    number of rows that are True in a & b
+    """
+    check_nr_of_words(a, b)
+    cdef Py_ssize_t i
+    cdef long long count = 0
+    with nogil:
+        for i in range(a.shape[0]):
+            count += bitcount_popcount64(a[i] & b[i])
+    return count
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def popcount_or(const uint64_t[::1] a, const uint64_t[::1] b) -> int:
+    """
+    number of rows that are True in a | b
+    """
+    check_nr_of_words(a, b)
+    cdef Py_ssize_t i
+    cdef long long count = 0
+    with nogil:
+        for i in range(a.shape[0]):
+            count += bitcount_popcount64(a[i] | b[i])
+    return count
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def popcount_andnot(const uint64_t[::1] a, const uint64_t[::1] b) -> int:
+    """
+    number of rows that are True in a & ~b
+    """
+    check_nr_of_words(a, b)
+    cdef Py_ssize_t i
+    cdef long long count = 0
+    with nogil:
+        for i in range(a.shape[0]):
+            count += bitcount_popcount64(a[i] & ~b[i])
+    return count
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def popcount_and_and(
+        const uint64_t[::1] a, const uint64_t[::1] b, const uint64_t[::1] c) -> int:
+    """
+    number of rows that are True in a & b & c
+    """
+    check_nr_of_words(a, b)
+    check_nr_of_words(a, c)
+    cdef Py_ssize_t i
+    cdef long long count = 0
+    with nogil:
+        for i in range(a.shape[0]):
+            count += bitcount_popcount64(a[i] & b[i] & c[i])
+    return count
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def popcount_or_and(
+        const uint64_t[::1] a, const uint64_t[::1] b, const uint64_t[::1] c) -> int:
+    """
+    number of rows that are True in (a | b) & c
+    """
+    check_nr_of_words(a, b)
+    check_nr_of_words(a, c)
+    cdef Py_ssize_t i
+    cdef long long count = 0
+    with nogil:
+        for i in range(a.shape[0]):
+            count += bitcount_popcount64((a[i] | b[i]) & c[i])
+    return count
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def weighted_popcount(const uint64_t[::1] a, const int64_t[::1] weights) -> int:
+    """
+    sum of the weights of the rows that are True in a
+    """
+    check_nr_of_weights(a, weights)
+    cdef Py_ssize_t i
+    cdef long long weight_sum = 0
+    with nogil:
+        for i in range(a.shape[0]):
+            if a[i]:
+                weight_sum += sum_weights_of_bits(a[i], &weights[64 * i])
+    return weight_sum
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def weighted_popcount_and(
+        const uint64_t[::1] a, const uint64_t[::1] b, const int64_t[::1] weights) -> int:
+    """
+    sum of the weights of the rows that are True in a & b
+    """
+    check_nr_of_words(a, b)
+    check_nr_of_weights(a, weights)
+    cdef Py_ssize_t i
+    cdef long long weight_sum = 0
+    with nogil:
+        for i in range(a.shape[0]):
+            if a[i] & b[i]:
+                weight_sum += sum_weights_of_bits(a[i] & b[i], &weights[64 * i])
+    return weight_sum
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def weighted_popcount_or(
+        const uint64_t[::1] a, const uint64_t[::1] b, const int64_t[::1] weights) -> int:
+    """
+    sum of the weights of the rows that are True in a | b
+    """
+    check_nr_of_words(a, b)
+    check_nr_of_weights(a, weights)
+    cdef Py_ssize_t i
+    cdef long long weight_sum = 0
+    with nogil:
+        for i in range(a.shape[0]):
+            if a[i] | b[i]:
+                weight_sum += sum_weights_of_bits(a[i] | b[i], &weights[64 * i])
+    return weight_sum
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def weighted_popcount_and_and(
+        const uint64_t[::1] a, const uint64_t[::1] b, const uint64_t[::1] c,
+        const int64_t[::1] weights) -> int:
+    """
+    sum of the weights of the rows that are True in a & b & c
+    """
+    check_nr_of_words(a, b)
+    check_nr_of_words(a, c)
+    check_nr_of_weights(a, weights)
+    cdef Py_ssize_t i
+    cdef long long weight_sum = 0
+    with nogil:
+        for i in range(a.shape[0]):
+            if a[i] & b[i] & c[i]:
+                weight_sum += sum_weights_of_bits(a[i] & b[i] & c[i], &weights[64 * i])
+    return weight_sum
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def weighted_popcount_or_and(
+        const uint64_t[::1] a, const uint64_t[::1] b, const uint64_t[::1] c,
+        const int64_t[::1] weights) -> int:
+    """
+    sum of the weights of the rows that are True in (a | b) & c
+    """
+    check_nr_of_words(a, b)
+    check_nr_of_words(a, c)
+    check_nr_of_weights(a, weights)
+    cdef Py_ssize_t i
+    cdef long long weight_sum = 0
+    with nogil:
+        for i in range(a.shape[0]):
+            if (a[i] | b[i]) & c[i]:
+                weight_sum += sum_weights_of_bits((a[i] | b[i]) & c[i], &weights[64 * i])
+    return weight_sum
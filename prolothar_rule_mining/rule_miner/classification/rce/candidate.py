@@ -14,11 +14,8 @@
     You should have received a copy of the GNU General Public License
     along with Prolothar-Rule-Mining. If not, see <https://www.gnu.org/licenses/>.
 '''
-import numpy as np
-
-from prolothar_common.models.dataset import ClassificationDataset
-
 from prolothar_rule_mining.models.conditions import Condition
+from prolothar_rule_mining.rule_miner.classification.rce.columnar_dataset import ColumnarDataset
 
 class CandidateCondition:
     def __init__(self, condition: Condition, class_label: str, causal_effect: float):
@@ -36,6 +33,9 @@ class CandidateCondition:
         return str(self)
 
 class VectorCandidateCondition(CandidateCondition):
+    """
+    candidate condition with bit-packed hold vectors (see bitvector module)
+    """
     def __init__(
             self, condition: Condition, condition_hold_vector,
             class_label: str, class_label_hold_vector, causal_effect: float):
@@ -44,18 +44,61 @@ class VectorCandidateCondition(CandidateCondition):
         self.class_label_hold_vector = class_label_hold_vector
 
 class LazyVectorCandidateCondition(CandidateCondition):
+    """
+    candidate condition whose packed hold vector is only computed if it is
+    requested. use_cache is passed to
+    ColumnarDataset.compute_packed_condition_hold_vector.
+    """
+    def __init__(
+            self, condition: Condition, columnar_dataset: ColumnarDataset,
+            class_label: str, class_label_hold_vector, causal_effect: float,
+            use_cache: bool = False):
+        super().__init__(condition, class_label, causal_effect)
+        self.__columnar_dataset = columnar_dataset
+        self.class_label_hold_vector = class_label_hold_vector
+        self.__use_cache = use_cache
+        self.__condition_hold_vector = None
+
+    def __getstate__(self):
+        #the columnar dataset is not pickled, e.g. if the candidate is sent
+        #back from a worker process. the hold vector is computed instead.
+        state = self.__dict__.copy()
+        state['_LazyVectorCandidateCondition__condition_hold_vector'] = self.condition_hold_vector
+        state['_LazyVectorCandidateCondition__columnar_dataset'] = None
+        return state
+
+    @property
+    def condition_hold_vector(self):
+        if self.__condition_hold_vector is None:
+            self.__condition_hold_vector = \
+                self.__columnar_dataset.compute_packed_condition_hold_vector(
+                    self.condition, use_cache=self.__use_cache)
+        return self.__condition_hold_vector
+
+class CombinedVectorCandidateCondition(CandidateCondition):
+    """
+    candidate condition that is the combination of two other vector candidates.
+    the packed hold vector is only computed if it is requested, because most
+    of the extensions during search are scored but then discarded.
+    """
     def __init__(
-            self, condition: Condition, dataset: ClassificationDataset,
+            self, condition: Condition, combine_function,
+            first_candidate: CandidateCondition, second_candidate: CandidateCondition,
             class_label: str, class_label_hold_vector, causal_effect: float):
         super().__init__(condition, class_label, causal_effect)
-        self.__dataset = dataset
+        self.__combine_function = combine_function
+        self.__first_candidate = first_candidate
+        self.__second_candidate = second_candidate
         self.class_label_hold_vector = class_label_hold_vector
         self.__condition_hold_vector = None
 
     @property
     def condition_hold_vector(self):
         if self.__condition_hold_vector is None:
-            self.__condition_hold_vector = np.array([
-                self.condition.check_instance(instance) for instance in self.__dataset
-            ], dtype=bool)
+            self.__condition_hold_vector = self.__combine_function(
+                self.__first_candidate.condition_hold_vector,
+                self.__second_candidate.condition_hold_vector)
+            #the parents are not needed anymore
+            self.__first_candidate = None
+            self.__second_candidate = None
         return self.__condition_hold_vector
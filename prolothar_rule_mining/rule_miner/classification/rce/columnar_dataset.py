@@ -0,0 +1,453 @@
+'''
+    This file is part of Prolothar-Rule-Mining (More Info: https://github.com/shs-it/prolothar-rule-mining).
+
+    Prolothar-Rule-Mining is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    Prolothar-Rule-Mining is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with Prolothar-Rule-Mining. If not, see <https://www.gnu.org/licenses/>.
+'''
+"""
+columnar representation of a ClassificationDataset. the candidate search of
+RCE evaluates a large number of conditions on the same dataset. instead of
+calling Condition.check_instance for every instance and every condition, the
+dataset is converted once into numpy arrays and conditions are evaluated with
+vectorized comparisons. the columns are never changed. instances that are
+covered by mined rules are removed by a row mask.
+
+instances can have integer weights, e.g. the number of identical instances
+that a row represents. all counts (class counts, contingency tables and the
+count methods) are then sums of weights, i.e. they are the same as on the
+dataset where every row is repeated according to its weight.
+"""
+
+from typing import Any, Dict, List
+
+import numpy as np
+
+from prolothar_common.models.dataset import ClassificationDataset
+
+from prolothar_rule_mining.models.conditions import Condition
+from prolothar_rule_mining.models.conditions import EqualsCondition
+from prolothar_rule_mining.models.conditions import InCondition
+from prolothar_rule_mining.models.conditions import InRangeCondition
+from prolothar_rule_mining.models.conditions import GreaterOrEqualCondition
+from prolothar_rule_mining.models.conditions import GreaterThanCondition
+from prolothar_rule_mining.models.conditions import LessOrEqualCondition
+from prolothar_rule_mining.models.conditions import LessThanCondition
+from prolothar_rule_mining.models.conditions import NotCondition
+from prolothar_rule_mining.models.conditions import AndCondition
+from prolothar_rule_mining.models.conditions import OrCondition
+from prolothar_rule_mining.rule_miner.classification.rce import bitvector
+
+class ColumnarDataset:
+    """
+    stores the attribute values and class labels of a ClassificationDataset
+    column by column. the i-th entry of every column and of every computed
+    hold vector belongs to the i-th instance in iteration order of the dataset.
+
+    a ColumnarDataset is an immutable view on a subset of the rows, which is
+    given by a row mask. hold vectors always have one entry per row of the
+    original dataset and are False for all rows outside of the view.
+    select_rows creates a smaller view that shares the columns, sort orders
+    and cached hold vectors with this view.
+    """
+
+    def __init__(self, dataset: ClassificationDataset,
+                 max_cache_size_in_bytes: int = 2**28,
+                 instance_weights: Dict[Any, int] = None):
+        """
+        Parameters
+        ----------
+        dataset : ClassificationDataset
+            the dataset that is converted into columns
+        max_cache_size_in_bytes : int, optional
+            maximal memory for the packed hold vectors that are cached by
+            compute_packed_condition_hold_vector. by default 2**28 (256 MB)
+        instance_weights : Dict[Any, int], optional
+            positive integer weights of the instances by their ids. instances
+            that are not in the dictionary have weight 1. by default None,
+            i.e. every instance has weight 1
+
+        Raises
+        ------
+        ValueError
+            if a weight is not a positive integer
+        """
+        self.dataset = dataset
+        self.instances = list(dataset)
+        self.__instance_weights = self.__create_instance_weights(instance_weights)
+        self.__class_labels = sorted(dataset.get_set_of_classes())
+        self.__class_label_index = {label: i for i,label in enumerate(self.__class_labels)}
+        self.class_codes = np.fromiter(
+            (self.__class_label_index[instance.get_class()] for instance in self.instances),
+            dtype=np.int64, count=len(self.instances))
+        self.class_codes.flags.writeable = False
+
+        #categorical values are stored as integer codes
+        self.__category_index: Dict[str, Dict] = {}
+        self.__categories: Dict[str, List] = {}
+        self.__columns: Dict[str, np.ndarray] = {}
+        for attribute in dataset.get_attributes():
+            if attribute.is_categorical():
+                self.__add_categorical_column(attribute.get_name())
+            else:
+                self.__add_numerical_column(attribute.get_name())
+            self.__columns[attribute.get_name()].flags.writeable = False
+
+        #caches that are shared by all views on the dataset
+        #row indices of numerical columns in ascending order of their values
+        self.__sorted_row_indices: Dict[str, np.ndarray] = {}
+        self.__packed_hold_vector_cache: Dict[Condition, np.ndarray] = {}
+        self.__packed_class_label_hold_vectors: Dict[str, np.ndarray] = {}
+        #[current size, maximal size] in a list to share it between views
+        self.__cache_size_in_bytes = [0, max_cache_size_in_bytes]
+
+        self.__set_row_mask(np.ones(len(self.instances), dtype=bool))
+
+    def __set_row_mask(self, row_mask: np.ndarray):
+        row_mask.flags.writeable = False
+        self.__row_mask = row_mask
+        self.__packed_row_mask = bitvector.pack(row_mask)
+        self.__nr_of_rows = int(np.count_nonzero(row_mask))
+        self.__class_counts = self.__bincount(self.class_codes, len(self.__class_labels))
+        self.__total_weight = int(self.__class_counts.sum())
+        #caches that depend on the row mask
+        self.__selected_sorted_row_indices: Dict[str, np.ndarray] = {}
+
+    def __create_instance_weights(self, instance_weights: Dict[Any, int]) -> np.ndarray:
+        if instance_weights is None:
+            return None
+        for weight in instance_weights.values():
+            if not isinstance(weight, (int, np.integer)) or weight < 1:
+                raise ValueError('instance weights must be positive integers, but got %r' % (
+                    weight,))
+        instance_weights = np.fromiter(
+            (instance_weights.get(instance.get_id(), 1) for instance in self.instances),
+            dtype=np.int64, count=len(self.instances))
+        instance_weights.flags.writeable = False
+        return instance_weights
+
+    def __bincount(self, codes: np.ndarray, minlength: int) -> np.ndarray:
+        """
+        counts the codes of the rows in this view. if the instances have
+        weights, their weights are summed up instead.
+        """
+        weights = self.__instance_weights
+        if self.__nr_of_rows < len(self.instances):
+            codes = codes[self.__row_mask]
+            if weights is not None:
+                weights = weights[self.__row_mask]
+        if weights is None:
+            return np.bincount(codes, minlength=minlength)
+        #the sums of integer weights are exact in double precision
+        return np.bincount(codes, weights=weights, minlength=minlength).astype(np.int64)
+
+    def __add_categorical_column(self, attribute_name: str):
+        category_index = {}
+        codes = np.empty(len(self.instances), dtype=np.int64)
+        for i, instance in enumerate(self.instances):
+            codes[i] = category_index.setdefault(
+                instance[attribute_name], len(category_index))
+        self.__category_index[attribute_name] = category_index
+        self.__categories[attribute_name] = list(category_index)
+        self.__columns[attribute_name] = codes
+
+    def __add_numerical_column(self, attribute_name: str):
+        self.__columns[attribute_name] = np.fromiter(
+            (instance[attribute_name] for instance in self.instances),
+            dtype=float, count=len(self.instances))
+
+    def __len__(self) -> int:
+        """
+        returns the number of rows in this view
+        """
+        return self.__nr_of_rows
+
+    def get_total_weight(self) -> int:
+        """
+        returns the sum of the weights of the rows in this view. this is the
+        number of rows if the instances have no weights.
+        """
+        return self.__total_weight
+
+    def get_instance_weights(self) -> np.ndarray:
+        """
+        returns the read-only weights of all rows of the original dataset
+        or None if the instances have no weights
+        """
+        return self.__instance_weights
+
+    def get_row_mask(self) -> np.ndarray:
+        """
+        returns a read-only boolean vector that is True for the rows in this view
+        """
+        return self.__row_mask
+
+    def get_column(self, attribute_name: str) -> np.ndarray:
+        """
+        returns the values of a numerical attribute or the integer codes of a
+        categorical attribute for all rows of the original dataset
+        """
+        return self.__columns[attribute_name]
+
+    def get_sorted_row_indices(self, attribute_name: str) -> np.ndarray:
+        """
+        returns the indices of the rows in this view in ascending order of the
+        given numerical attribute. the column is sorted only once and the
+        sorting is shared by all views on the same dataset.
+        """
+        try:
+            return self.__selected_sorted_row_indices[attribute_name]
+        except KeyError:
+            pass
+        try:
+            sorted_row_indices = self.__sorted_row_indices[attribute_name]
+        except KeyError:
+            sorted_row_indices = np.argsort(self.__columns[attribute_name], kind='stable')
+            self.__sorted_row_indices[attribute_name] = sorted_row_indices
+        if self.__nr_of_rows < len(self.instances):
+            sorted_row_indices = sorted_row_indices[self.__row_mask[sorted_row_indices]]
+        self.__selected_sorted_row_indices[attribute_name] = sorted_row_indices
+        return sorted_row_indices
+
+    def select_rows(self, row_mask: np.ndarray) -> 'ColumnarDataset':
+        """
+        creates a view that only contains the rows of this view where
+        row_mask is True. no column is copied.
+
+        Parameters
+        ----------
+        row_mask : np.ndarray
+            boolean vector with one entry per row of the original dataset
+
+        Returns
+        -------
+        ColumnarDataset
+            a new view that shares columns and caches with this view
+        """
+        selected_dataset = ColumnarDataset.__new__(ColumnarDataset)
+        selected_dataset.__dict__.update(self.__dict__)
+        selected_dataset.__set_row_mask(self.__row_mask & row_mask)
+        return selected_dataset
+
+    def get_categories(self, attribute_name: str) -> List:
+        """
+        returns the values of a categorical attribute. the position of a value
+        in the list is its code in the column of the attribute
+        """
+        return self.__categories[attribute_name]
+
+    def get_class_labels(self) -> List[str]:
+        """
+        returns the sorted list of class labels of the original dataset. the
+        position of a label in the list is its code in class_codes
+        """
+        return self.__class_labels
+
+    def get_set_of_classes(self) -> List[str]:
+        """
+        returns the sorted list of class labels that occur in this view
+        """
+        return [
+            class_label for class_label, count in zip(self.__class_labels, self.__class_counts)
+            if count > 0
+        ]
+
+    def get_class_count(self, class_label: str) -> int:
+        """
+        returns the total weight of the rows in this view with the given
+        class label, i.e. their number if the instances have no weights
+        """
+        try:
+            return int(self.__class_counts[self.__class_label_index[class_label]])
+        except KeyError:
+            return 0
+
+    def get_unique_values(self, attribute_name: str) -> List:
+        """
+        returns the values of the given attribute that occur in this view.
+        categorical values are returned in the order of their codes,
+        numerical values in ascending order.
+        """
+        column = self.__columns[attribute_name][self.__row_mask]
+        try:
+            categories = self.__categories[attribute_name]
+        except KeyError:
+            return np.unique(column).tolist()
+        return [
+            categories[code] for code in np.flatnonzero(
+                np.bincount(column, minlength=len(categories)))
+        ]
+
+    def compute_contingency_table(self, attribute_name: str) -> np.ndarray:
+        """
+        returns a matrix with one row per value of the given categorical
+        attribute (see get_categories) and one column per class label (see
+        get_class_labels). the entries are the number of rows in this view
+        with the value and the class label (or their total weight).
+        """
+        nr_of_categories = len(self.__categories[attribute_name])
+        nr_of_class_labels = len(self.__class_labels)
+        return self.__bincount(
+            self.__columns[attribute_name] * nr_of_class_labels + self.class_codes,
+            nr_of_categories * nr_of_class_labels
+        ).reshape(nr_of_categories, nr_of_class_labels)
+
+    def count(self, a) -> int:
+        """
+        returns the number of rows (or their total weight) that are True in
+        the bit-packed vector a
+        """
+        if self.__instance_weights is None:
+            return bitvector.popcount(a)
+        return bitvector.weighted_popcount(a, self.__instance_weights)
+
+    def count_and(self, a, b) -> int:
+        """
+        returns the number of rows (or their total weight) that are True in a & b
+        """
+        if self.__instance_weights is None:
+            return bitvector.popcount_and(a, b)
+        return bitvector.weighted_popcount_and(a, b, self.__instance_weights)
+
+    def count_or(self, a, b) -> int:
+        """
+        returns the number of rows (or their total weight) that are True in a | b
+        """
+        if self.__instance_weights is None:
+            return bitvector.popcount_or(a, b)
+        return bitvector.weighted_popcount_or(a, b, self.__instance_weights)
+
+    def count_and_and(self, a, b, c) -> int:
+        """
+        returns the number of rows (or their total weight) that are True in
+        a & b & c
+        """
+        if self.__instance_weights is None:
+            return bitvector.popcount_and_and(a, b, c)
+        return bitvector.weighted_popcount_and_and(a, b, c, self.__instance_weights)
+
+    def count_or_and(self, a, b, c) -> int:
+        """
+        returns the number of rows (or their total weight) that are True in
+        (a | b) & c
+        """
+        if self.__instance_weights is None:
+            return bitvector.popcount_or_and(a, b, c)
+        return bitvector.weighted_popcount_or_and(a, b, c, self.__instance_weights)
+
+    def compute_class_label_hold_vector(self, class_label: str) -> np.ndarray:
+        """
+        returns a boolean vector that is True iff an instance of this view has
+        the given label
+        """
+        try:
+            return (self.class_codes == self.__class_label_index[class_label]) & self.__row_mask
+        except KeyError:
+            return np.zeros(len(self.instances), dtype=bool)
+
+    def compute_packed_class_label_hold_vector(self, class_label: str):
+        """
+        returns compute_class_label_hold_vector as bit-packed vector. the
+        vector of the original dataset is computed only once.
+        """
+        try:
+            packed_hold_vector = self.__packed_class_label_hold_vectors[class_label]
+        except KeyError:
+            packed_hold_vector = bitvector.pack(self.class_codes == self.__class_label_index.get(
+                class_label, -1))
+            self.__packed_class_label_hold_vectors[class_label] = packed_hold_vector
+        return bitvector.bitwise_and(packed_hold_vector, self.__packed_row_mask)
+
+    def compute_condition_hold_vector(self, condition: Condition) -> np.ndarray:
+        """
+        returns a boolean vector that is True iff an instance of this view
+        fulfills the given condition
+        """
+        hold_vector = self.__compute_hold_vector_on_all_rows(condition)
+        if self.__nr_of_rows < len(self.instances):
+            hold_vector &= self.__row_mask
+        return hold_vector
+
+    def compute_packed_condition_hold_vector(
+            self, condition: Condition, use_cache: bool = False):
+        """
+        returns compute_condition_hold_vector as bit-packed vector
+
+        Parameters
+        ----------
+        condition : Condition
+            the condition that is evaluated
+        use_cache : bool, optional
+            if True, the hold vector on the original dataset is cached and
+            shared by all views, i.e. it is computed only once and ANDed
+            with the row mask of the view. should be used for conditions that
+            are evaluated again after rows have been removed.
+            by default False
+        """
+        if not use_cache:
+            return bitvector.pack(self.compute_condition_hold_vector(condition))
+        try:
+            packed_hold_vector = self.__packed_hold_vector_cache[condition]
+        except KeyError:
+            packed_hold_vector = bitvector.pack(self.__compute_hold_vector_on_all_rows(condition))
+            cache_size = self.__cache_size_in_bytes
+            if cache_size[0] + packed_hold_vector.nbytes <= cache_size[1]:
+                cache_size[0] += packed_hold_vector.nbytes
+                self.__packed_hold_vector_cache[condition] = packed_hold_vector
+        return bitvector.bitwise_and(packed_hold_vector, self.__packed_row_mask)
+
+    def __compute_hold_vector_on_all_rows(self, condition: Condition) -> np.ndarray:
+        if isinstance(condition, EqualsCondition):
+            code = self.__category_index[condition.attribute.get_name()].get(condition.value)
+            if code is None:
+                return np.zeros(len(self.instances), dtype=bool)
+            return self.__columns[condition.attribute.get_name()] == code
+        if isinstance(condition, InCondition):
+            category_index = self.__category_index[condition.attribute.get_name()]
+            codes = [category_index[value] for value in condition.value
+                     if value in category_index]
+            return np.isin(self.__columns[condition.attribute.get_name()], codes)
+        if isinstance(condition, InRangeCondition):
+            column = self.__columns[condition.attribute.get_name()]
+            lower_bound, upper_bound = condition.value
+            if condition.lower_bound_inclusive:
+                hold_vector = column >= lower_bound
+            else:
+                hold_vector = column > lower_bound
+            if condition.upper_bound_inclusive:
+                hold_vector &= column <= upper_bound
+            else:
+                hold_vector &= column < upper_bound
+            return hold_vector
+        if isinstance(condition, GreaterOrEqualCondition):
+            return self.__columns[condition.attribute.get_name()] >= condition.value
+        if isinstance(condition, GreaterThanCondition):
+            return self.__columns[condition.attribute.get_name()] > condition.value
+        if isinstance(condition, LessOrEqualCondition):
+            return self.__columns[condition.attribute.get_name()] <= condition.value
+        if isinstance(condition, LessThanCondition):
+            return self.__columns[condition.attribute.get_name()] < condition.value
+        if isinstance(condition, NotCondition):
+            return ~self.__compute_hold_vector_on_all_rows(condition.condition)
+        if isinstance(condition, AndCondition):
+            hold_vector = np.ones(len(self.instances), dtype=bool)
+            for subcondition in condition.get_conditions():
+                hold_vector &= self.__compute_hold_vector_on_all_rows(subcondition)
+            return hold_vector
+        if isinstance(condition, OrCondition):
+            hold_vector = np.zeros(len(self.instances), dtype=bool)
+            for subcondition in condition.get_conditions():
+                hold_vector |= self.__compute_hold_vector_on_all_rows(subcondition)
+            return hold_vector
+        return np.fromiter(
+            (condition.check_instance(instance) for instance in self.instances),
+            dtype=bool, count=len(self.instances))
@@ -19,9 +19,7 @@ based on
     https://eda.mmci.uni-saarland.de/pubs/2021/dice-budhathoki,boley,vreeken.pdf
 """
 
-from typing import Callable
-
-from collections import defaultdict
+from typing import Any, Callable, Dict
 
 from prolothar_common.models.dataset import ClassificationDataset
 from prolothar_common.func_tools import do_nothing
@@ -31,6 +29,7 @@ from prolothar_rule_mining.rule_miner.classification.rules import IfThenElseRule
 from prolothar_rule_mining.rule_miner.classification.rules import ReturnClassRule
 from prolothar_rule_mining.rule_miner.classification.rules import FirstFiringRuleModel
 
+from prolothar_rule_mining.rule_miner.classification.rce.columnar_dataset import ColumnarDataset
 from prolothar_rule_mining.rule_miner.classification.rce.strategy.abstract import CandidateSearchStrategy
 from prolothar_rule_mining.rule_miner.classification.rce.strategy.best_first import BestFirstCandidateSearch
 from prolothar_rule_mining.models.conditions import OrCondition
@@ -49,11 +48,35 @@ class ReliableRuleMiner():
         self.__logger = logger
         search_strategy.set_logger(logger)
 
-    def mine_rules(self, dataset: ClassificationDataset) -> FirstFiringRuleModel:
+    def mine_rules(self, dataset: ClassificationDataset,
+                   instance_weights: Dict[Any, int] = None) -> FirstFiringRuleModel:
+        """
+        mines a list of classification rules
+
+        Parameters
+        ----------
+        dataset : ClassificationDataset
+            the training data
+        instance_weights : Dict[Any, int], optional
+            positive integer weights of the instances by their ids. an instance
+            with weight k is treated like k copies of the instance, i.e. the
+            mined rules are the same as on the dataset with repeated instances.
+            instances that are not in the dictionary have weight 1.
+            by default None, i.e. every instance has weight 1
+
+        Returns
+        -------
+        FirstFiringRuleModel
+            the mined rules
+        """
         rules = ListOfRules()
+        #the columnar view is created once. covered instances are removed
+        #by a row mask, which keeps sort orders and cached hold vectors valid
+        columnar_dataset = ColumnarDataset(dataset, instance_weights=instance_weights)
 
-        while len(dataset) > 1:
-            best_candidate = self.__search_strategy.create_next_condition(dataset)
+        while columnar_dataset.get_total_weight() > 1:
+            best_candidate = self.__search_strategy.create_next_condition(
+                dataset, columnar_dataset=columnar_dataset)
             if best_candidate is None:
                 break
             rules.append_rule(IfThenElseRule(
@@ -63,23 +86,21 @@ class ReliableRuleMiner():
                 ])
             ))
 
-            old_length = len(dataset)
-            dataset = best_candidate.condition.divide_dataset(dataset)[1]
-            if len(dataset) == old_length:
+            remaining_dataset = columnar_dataset.select_rows(
+                ~columnar_dataset.compute_condition_hold_vector(best_candidate.condition))
+            if len(remaining_dataset) == len(columnar_dataset):
                 break
+            columnar_dataset = remaining_dataset
 
-        if len(dataset) > 0:
-            majority_class = self.__get_majority_class(dataset)
+        if len(columnar_dataset) > 0:
+            majority_class = self.__get_majority_class(columnar_dataset)
             self.__logger('append majority class rule "%s"' % majority_class)
             rules.append_rule(ReturnClassRule(majority_class))
 
         return FirstFiringRuleModel(self.__postprocess_rules(rules))
 
-    def __get_majority_class(self, dataset: ClassificationDataset) -> str:
-        counter = defaultdict(int)
-        for instance in dataset:
-            counter[instance.get_class()] += 1
-        return max(counter, key=counter.get)
+    def __get_majority_class(self, columnar_dataset: ColumnarDataset) -> str:
+        return max(columnar_dataset.get_set_of_classes(), key=columnar_dataset.get_class_count)
 
     def __postprocess_rules(self, rules: ListOfRules) -> ListOfRules:
         # remove unnecessary conditions at the end of rule list
@@ -16,6 +16,7 @@
 '''
 from typing import List, Callable, Generator
 
+import itertools
 from math import sqrt
 import more_itertools
 import pandas as pd
@@ -23,27 +24,40 @@ import numpy as np
 
 from prolothar_common.models.dataset import ClassificationDataset
 from prolothar_common.models.dataset.attributes import Attribute
+from prolothar_common.parallel.abstract.computation_engine import ComputationEngine
+from prolothar_common.parallel.single_thread.single_thread import SingleThreadComputationEngine
 
 from prolothar_rule_mining.rule_miner.classification.rce.candidate import CandidateCondition
 from prolothar_rule_mining.rule_miner.classification.rce.candidate import VectorCandidateCondition
 from prolothar_rule_mining.rule_miner.classification.rce.candidate import LazyVectorCandidateCondition
+from prolothar_rule_mining.rule_miner.classification.rce.columnar_dataset import ColumnarDataset
 from prolothar_rule_mining.models.conditions import Condition
 from prolothar_rule_mining.models.conditions import EqualsCondition
 from prolothar_rule_mining.models.conditions import LessThanCondition
 from prolothar_rule_mining.models.conditions import LessOrEqualCondition
 from prolothar_rule_mining.models.conditions import GreaterThanCondition
 
+#the vectorized effects are computed in double precision, the effects of the
+#candidates in single precision
+_EFFECT_TOLERANCE = 1e-5
+
+def _generate_candidates_for_attribute(parameters, attribute: Attribute) -> List[CandidateCondition]:
+    strategy, columnar_dataset, class_label_vector_map = parameters
+    return strategy._generate_candidates(columnar_dataset, attribute, class_label_vector_map)
+
 cdef class CandidateSearchStrategy():
     """
     template for any strategy that searches for a classification rule given
     a dataset
     """
     cdef float __beta
-    cdef int __n_bins
+    cdef object __n_bins
     cdef int __max_nr_of_base_candidates
+    cdef object __computation_engine
 
-    def __init__(self, beta: float = 2.0, n_bins: int = 10,
-                 max_nr_of_base_candidates: int = -1):
+    def __init__(self, beta: float = 2.0, n_bins: int = None,
+                 max_nr_of_base_candidates: int = -1,
+                 computation_engine: ComputationEngine = SingleThreadComputationEngine()):
         """
         configuration of the condition search
 
@@ -58,21 +72,30 @@ cdef class CandidateSearchStrategy():
             number of bins for discretization of numerical features. this reduces
             the search space for "greater" and "less than" conditions with the
             cost of accuracy. a higher number leads to a higher accuracy with
-            the cost of additional runtime. by default 10
+            the cost of additional runtime. by default None, which means
+            that all thresholds are evaluated on the sorted values of the
+            attribute and the best "greater" and "less than" condition per
+            attribute and class label is kept.
         max_nr_of_base_candidates : int, optional
             the number of base candidates to keep for extension during search.
             default means no limitation. the limitation is useful, if some
             categorical attributes have many different values such as an ID.
+        computation_engine : ComputationEngine, optional
+            used to generate the candidates of the attributes in parallel.
+            by default SingleThreadComputationEngine()
         """
         self.__beta = beta
         self.__n_bins = n_bins
         self._logger = print
         self.__max_nr_of_base_candidates = max_nr_of_base_candidates
+        self.__computation_engine = computation_engine
 
     def set_logger(self, logger: Callable[[str], None]):
         self._logger = logger
 
-    def create_next_condition(self, dataset: ClassificationDataset) -> CandidateCondition:
+    def create_next_condition(
+            self, dataset: ClassificationDataset,
+            columnar_dataset: ColumnarDataset = None) -> CandidateCondition:
         """
         searches for the next best condition used for classification
 
@@ -80,6 +103,12 @@ cdef class CandidateSearchStrategy():
         ----------
         dataset : ClassificationDataset
             a dataset with attributes and labels.
+        columnar_dataset : ColumnarDataset, optional
+            columnar view on the rows that are used for the search. can be
+            given to reuse sort orders and hold vectors between subsequent
+            calls on views created by ColumnarDataset.select_rows. only the
+            attributes are taken from dataset then. by default None,
+            i.e. the columnar view is created from the dataset
 
         Returns
         -------
@@ -89,22 +118,16 @@ cdef class CandidateSearchStrategy():
             (e.g. the search strategy may decide that the condition has not
             enough evidence), None is returned.
         """
-        class_label_vector_map: dict = self.__create_class_label_vector_map(dataset)
-
-        conditions = []
-        for attribute in dataset.get_attributes():
-            conditions.extend(self.__yield_condition_candidates(attribute))
-
-        candidates = []
-        for condition in conditions:
-            if isinstance(condition, EqualsCondition):
-                candidate_generator = self.__generate_equals_candidates
-            else:
-                candidate_generator = self.__generate_numeric_candidates
-            for candidate in candidate_generator(dataset, condition, class_label_vector_map):
-                if candidate.causal_effect > 0:
-                    candidates.append(candidate)
-
+        if columnar_dataset is None:
+            columnar_dataset = ColumnarDataset(dataset)
+        class_label_vector_map: dict = self.__create_class_label_vector_map(columnar_dataset)
+
+        candidates = list(itertools.chain.from_iterable(
+            self.__computation_engine.create_partitionable_list(
+                list(dataset.get_attributes())
+            ).map(
+                (self, columnar_dataset, class_label_vector_map),
+                _generate_candidates_for_attribute)))
         candidates.sort(reverse=True)
 
         if not candidates:
@@ -113,32 +136,134 @@ cdef class CandidateSearchStrategy():
         if self.__max_nr_of_base_candidates is not None \
         and self.__max_nr_of_base_candidates > 0:
             candidates = candidates[:self.__max_nr_of_base_candidates]
-        return self._search_condition(candidates, dataset)
+        return self._search_condition(candidates, columnar_dataset)
+
+    def _generate_candidates(
+            self, columnar_dataset: ColumnarDataset, attribute: Attribute,
+            class_label_vector_map) -> List[CandidateCondition]:
+        """
+        returns the candidates with a positive effect on the given attribute,
+        sorted by effect. if the number of base candidates is limited, only
+        this number of candidates is returned.
+        """
+        if attribute.is_categorical():
+            generated_candidates = self.__generate_equals_candidates(
+                columnar_dataset, attribute, class_label_vector_map)
+        elif self.__n_bins is None:
+            generated_candidates = self.__generate_threshold_candidates(
+                columnar_dataset, attribute, class_label_vector_map)
+        else:
+            generated_candidates = self.__generate_candidates_from_conditions(
+                columnar_dataset, attribute, class_label_vector_map)
+        candidates = [
+            candidate for candidate in generated_candidates
+            if candidate.causal_effect > 0
+        ]
+        candidates.sort(reverse=True)
+        if self.__max_nr_of_base_candidates is not None \
+        and self.__max_nr_of_base_candidates > 0:
+            candidates = candidates[:self.__max_nr_of_base_candidates]
+        return candidates
+
+    def __generate_candidates_from_conditions(
+            self, columnar_dataset: ColumnarDataset, attribute: Attribute,
+            class_label_vector_map) -> Generator[CandidateCondition, None, None]:
+        for condition in self.__yield_condition_candidates(columnar_dataset, attribute):
+            #the same conditions are generated again after rows have been
+            #removed, i.e. their hold vectors are cached
+            condition_holds_vector = columnar_dataset.compute_packed_condition_hold_vector(
+                condition, use_cache=True)
+            for class_label in columnar_dataset.get_set_of_classes():
+                effect = self._estimate_causal_effect_with_numpy(
+                    condition_holds_vector, class_label_vector_map[class_label],
+                    columnar_dataset, class_label)
+                yield VectorCandidateCondition(
+                    condition, condition_holds_vector, class_label,
+                    class_label_vector_map[class_label], effect)
 
     def __generate_equals_candidates(
-            self, dataset: ClassificationDataset, condition: EqualsCondition,
+            self, columnar_dataset: ColumnarDataset, attribute: Attribute,
             class_label_vector_map) -> Generator[CandidateCondition, None, None]:
-        for class_label in dataset.get_set_of_classes():
-            effect = self.__compute_causal_effect_on_equals_condition(
-                condition, class_label, dataset)
+        #all (value, class label) pairs are scored at once from the contingency
+        #table. only the pairs with a positive effect are turned into
+        #candidates, whose effect is computed again exactly as for the
+        #other candidates
+        contingency_table = columnar_dataset.compute_contingency_table(attribute.get_name())
+        n_true = contingency_table.sum(axis=1)
+        class_counts = contingency_table.sum(axis=0)
+        causal_effects = self.__compute_causal_effects(
+            n_true[:, np.newaxis], contingency_table, columnar_dataset.get_total_weight(),
+            class_counts[np.newaxis, :])
+        causal_effects[n_true == 0, :] = -np.inf
+        causal_effects[:, class_counts == 0] = -np.inf
+        categories = columnar_dataset.get_categories(attribute.get_name())
+        class_labels = columnar_dataset.get_class_labels()
+        for value_code, class_index in np.argwhere(causal_effects > -_EFFECT_TOLERANCE):
+            class_label = class_labels[class_index]
             yield LazyVectorCandidateCondition(
-                condition, dataset, class_label, class_label_vector_map[class_label], effect)
-
-    def __generate_numeric_candidates(
-            self, dataset: ClassificationDataset, condition: EqualsCondition,
+                EqualsCondition(attribute, categories[value_code]), columnar_dataset,
+                class_label, class_label_vector_map[class_label],
+                self._estimate_causal_effect_from_counts(
+                    n_true[value_code], contingency_table[value_code, class_index],
+                    columnar_dataset, class_label),
+                use_cache=True)
+
+    def __generate_threshold_candidates(
+            self, columnar_dataset: ColumnarDataset, attribute: Attribute,
             class_label_vector_map) -> Generator[CandidateCondition, None, None]:
-        condition_holds_vector = self.__compute_condition_holds_vector(
-            dataset, condition)
-        for class_label in dataset.get_set_of_classes():
-            effect = self._estimate_causal_effect_with_numpy(
-                condition_holds_vector, class_label_vector_map[class_label],
-                dataset, class_label)
-            yield VectorCandidateCondition(
-                condition, condition_holds_vector, class_label,
-                class_label_vector_map[class_label], effect)
+        sorted_row_indices = columnar_dataset.get_sorted_row_indices(attribute.get_name())
+        sorted_values = columnar_dataset.get_column(attribute.get_name())[sorted_row_indices]
+        #a threshold can be placed after each position where the value changes
+        split_positions = np.flatnonzero(sorted_values[1:] != sorted_values[:-1])
+        if len(split_positions) == 0:
+            return
+        thresholds = (sorted_values[split_positions] + sorted_values[split_positions + 1]) / 2
+        cdef int n = columnar_dataset.get_total_weight()
+        instance_weights = columnar_dataset.get_instance_weights()
+        if instance_weights is None:
+            n_less = split_positions + 1
+        else:
+            sorted_weights = instance_weights[sorted_row_indices]
+            n_less = np.cumsum(sorted_weights)[split_positions]
+        for class_label in columnar_dataset.get_set_of_classes():
+            class_count = columnar_dataset.get_class_count(class_label)
+            class_hold_vector = columnar_dataset.compute_class_label_hold_vector(
+                class_label)[sorted_row_indices]
+            if instance_weights is None:
+                n_less_and_class = np.cumsum(class_hold_vector)[split_positions]
+            else:
+                n_less_and_class = np.cumsum(
+                    np.where(class_hold_vector, sorted_weights, 0))[split_positions]
+            for condition_type, n_true, n_true_and_class in [
+                    (LessThanCondition, n_less, n_less_and_class),
+                    (GreaterThanCondition, n - n_less, class_count - n_less_and_class)]:
+                best_threshold_index = np.argmax(self.__compute_causal_effects(
+                    n_true, n_true_and_class, n, class_count))
+                yield LazyVectorCandidateCondition(
+                    condition_type(attribute, float(thresholds[best_threshold_index])),
+                    columnar_dataset, class_label, class_label_vector_map[class_label],
+                    self._estimate_causal_effect_from_counts(
+                        n_true[best_threshold_index],
+                        n_true_and_class[best_threshold_index],
+                        columnar_dataset, class_label))
+
+    def __compute_causal_effects(
+            self, n_condition_is_true: np.ndarray,
+            n_condition_is_true_and_target_is_true: np.ndarray,
+            int n, class_count) -> np.ndarray:
+        #vectorized version of __compute_causal_effect. class_count can be an
+        #array that is broadcasted against the counts
+        n_condition_is_false = n - n_condition_is_true
+        causal_effects = (n_condition_is_true_and_target_is_true + 1) \
+                       / (n_condition_is_true + 2)
+        causal_effects -= (class_count - n_condition_is_true_and_target_is_true + 1) \
+                        / (n_condition_is_false + 2)
+        causal_effects -= 0.5 * self.__beta / np.sqrt(n_condition_is_true + 2)
+        causal_effects -= 0.5 * self.__beta / np.sqrt(n_condition_is_false + 2)
+        return causal_effects
 
     def _search_condition(self, base_candidates: List[VectorCandidateCondition],
-                          dataset: ClassificationDataset) -> CandidateCondition:
+                          columnar_dataset: ColumnarDataset) -> CandidateCondition:
         """
         uses the list of ranked candidates as a base for search of the best condition
         to distinguish class labels in the dataset
@@ -148,8 +273,8 @@ cdef class CandidateSearchStrategy():
         base_candidates : List[VectorCandidateCondition]
             ranked and non-empty list of candidate conditions. the first condition
             has the highest effect on its label
-        dataset : ClassificationDataset
-            a dataset with attributes and labels.
+        columnar_dataset : ColumnarDataset
+            the rows of the dataset on which the candidates are evaluated
 
         Returns
         -------
@@ -159,104 +284,87 @@ cdef class CandidateSearchStrategy():
         """
         raise NotImplementedError()
 
-    def __yield_condition_candidates(self, attribute: Attribute):
-        if attribute.is_categorical():
-            for value in attribute.get_unique_values():
-                yield EqualsCondition(attribute, value)
-        elif attribute.get_nr_of_unique_values() <= self.__n_bins:
-            for a,b in more_itertools.pairwise(sorted(attribute.get_unique_values())):
+    def __yield_condition_candidates(
+            self, columnar_dataset: ColumnarDataset, attribute: Attribute):
+        unique_values = columnar_dataset.get_unique_values(attribute.get_name())
+        if len(unique_values) <= self.__n_bins:
+            for a,b in more_itertools.pairwise(unique_values):
                 yield LessThanCondition(attribute, (a+b)/2)
                 yield GreaterThanCondition(attribute, (a+b)/2)
         else:
-            interval_list = sorted(set(pd.qcut([v for v in attribute.get_unique_values()],
-                                   self.__n_bins, duplicates='drop')))
+            interval_list = sorted(set(pd.qcut(unique_values, self.__n_bins, duplicates='drop')))
             for interval in interval_list[:-1]:
                 yield GreaterThanCondition(attribute, interval.right)
                 yield LessOrEqualCondition(attribute, interval.right)
                 #compensate for bad discretization
                 yield LessOrEqualCondition(attribute, interval.mid)
 
-    def _estimate_causal_effect(
-            self, condition: Condition, class_label: str,
-            dataset: ClassificationDataset) -> float:
+    def _estimate_causal_effect_with_numpy(
+            self, condition_holds_vector, class_holds_vector,
+            columnar_dataset: ColumnarDataset, class_label: str) -> float:
         """
-        estimates the effect of the condition on the given class_label in the
-        given dataset
-
-        Parameters
-        ----------
-        condition : Condition
-            [description]
-        class_label : str
-            [description]
-        dataset : ClassificationDataset
-            [description]
-
-        Returns
-        -------
-        float
-            will be a number between -1 and 1
-            -1 is the highest possible negative effect on the class label,
-                i.e. instances with this condition do not have the label
-            1 is the highest possible positive effect on the class label,
-                i.e. instances with this condition have the label
+        estimates the effect of a condition on the given class label from
+        the bit-packed hold vectors of the condition and the class label
+        """
+        return self._estimate_causal_effect_from_counts(
+            columnar_dataset.count(condition_holds_vector),
+            columnar_dataset.count_and(condition_holds_vector, class_holds_vector),
+            columnar_dataset, class_label)
+
+    def _estimate_causal_effect_from_counts(
+            self, int n_condition_is_true, int n_condition_is_true_and_target_is_true,
+            columnar_dataset: ColumnarDataset, class_label: str) -> float:
+        """
+        estimates the effect of a condition on the given class label from
+        the number of instances that fulfill the condition and the number
+        of instances that fulfill the condition and have the class label.
+        if the instances have weights, the numbers are sums of weights.
         """
-
-        if isinstance(condition, EqualsCondition):
-            return self.__compute_causal_effect_on_equals_condition(
-                condition, class_label, dataset)
-        else:
-            return self.__compute_causal_effect_by_counting_when_condition_holds(
-                condition, class_label, dataset)
-
-    def __compute_causal_effect_by_counting_when_condition_holds(
-            self, condition: Condition, class_label: str,
-            dataset: ClassificationDataset) -> float:
-        cdef int n_condition_is_true = 0
-        cdef int n_condition_is_false = 0
-        cdef int n_condition_is_true_and_target_is_true = 0
-        cdef int n_condition_is_false_and_target_is_true = 0
-
-        for instance in dataset:
-            if condition.check_instance(instance):
-                n_condition_is_true += 1
-                if instance.get_class() == class_label:
-                    n_condition_is_true_and_target_is_true += 1
-            else:
-                n_condition_is_false += 1
-                if instance.get_class() == class_label:
-                    n_condition_is_false_and_target_is_true += 1
-
-        return self.__compute_causal_effect(
-            n_condition_is_true, n_condition_is_false,
-            n_condition_is_true_and_target_is_true,
-            n_condition_is_false_and_target_is_true)
-
-    def __compute_causal_effect_on_equals_condition(
-            self, condition: Condition, class_label: str,
-            dataset: ClassificationDataset) -> float:
-        attribute_name = condition.get_attribute().get_name()
-        n_condition_is_true = dataset.get_count_for_category(
-            attribute_name, condition.get_value())
-        n_condition_is_true_and_target_is_true = dataset.get_count_for_category_and_class(
-            attribute_name, condition.get_value(), class_label)
         return self.__compute_causal_effect(
             n_condition_is_true,
-            len(dataset) - n_condition_is_true,
+            columnar_dataset.get_total_weight() - n_condition_is_true,
             n_condition_is_true_and_target_is_true,
-            dataset.get_class_count(class_label) - n_condition_is_true_and_target_is_true)
+            columnar_dataset.get_class_count(class_label) - n_condition_is_true_and_target_is_true)
 
-    def _estimate_causal_effect_with_numpy(
-            self, condition_holds_vector, class_holds_vector,
-            dataset: ClassificationDataset, class_label: str) -> float:
-        cdef int n_condition_is_true = np.count_nonzero(condition_holds_vector)
-        cdef int n_condition_is_true_and_target_is_true = np.count_nonzero(
-            condition_holds_vector & class_holds_vector)
-        return self.__compute_causal_effect(
-            n_condition_is_true,
-            len(dataset) - n_condition_is_true,
-            n_condition_is_true_and_target_is_true,
-            dataset.get_class_count(class_label) - n_condition_is_true_and_target_is_true)
+    def _estimate_causal_effects_from_counts(
+            self, n_condition_is_true: np.ndarray,
+            n_condition_is_true_and_target_is_true: np.ndarray,
+            columnar_dataset: ColumnarDataset, class_count) -> np.ndarray:
+        """
+        vectorized version of _estimate_causal_effect_from_counts in double
+        precision. class_count is the count of the class label (or an array
+        of counts that is broadcasted against the other counts). the effects
+        can differ from the single precision effects of the candidates by
+        rounding errors.
+        """
+        return self.__compute_causal_effects(
+            n_condition_is_true, n_condition_is_true_and_target_is_true,
+            columnar_dataset.get_total_weight(), class_count)
+
+    def _estimate_causal_effect_upper_bound(
+            self, int min_nr_of_class_rows, int max_nr_of_class_rows,
+            int min_nr_of_other_rows, int max_nr_of_other_rows,
+            columnar_dataset: ColumnarDataset, class_label: str) -> float:
+        """
+        returns an upper bound of the effect of any condition on the given
+        class label that holds for a number of rows with the class label
+        and a number of rows with another class label within the given ranges.
+        the effect increases with the number of rows with the class label
+        and decreases with the number of other rows, except for the two
+        correction terms, which are bounded separately.
+        """
+        cdef int n = columnar_dataset.get_total_weight()
+        cdef int class_count = columnar_dataset.get_class_count(class_label)
+        cdef float upper_bound
+        upper_bound = (max_nr_of_class_rows + 1) \
+                    / (max_nr_of_class_rows + min_nr_of_other_rows + 2)
+        upper_bound -= (class_count - max_nr_of_class_rows + 1) \
+                     / (n - max_nr_of_class_rows - min_nr_of_other_rows + 2)
+        upper_bound -= 0.5 * self.__beta \
+                     / sqrt(max_nr_of_class_rows + max_nr_of_other_rows + 2)
+        upper_bound -= 0.5 * self.__beta \
+                     / sqrt(n - min_nr_of_class_rows - min_nr_of_other_rows + 2)
+        return upper_bound
 
     cdef float __compute_causal_effect(
             self, n_condition_is_true: int, n_condition_is_false: int,
@@ -273,14 +381,8 @@ cdef class CandidateSearchStrategy():
                        / sqrt(n_condition_is_false + 2)
         return causal_effect
 
-    def __create_class_label_vector_map(self, dataset: ClassificationDataset) -> dict:
-        label_vector_map = {}
-        for label in dataset.get_set_of_classes():
-            label_vector_map[label] = np.array(
-                [instance.get_class() == label for instance in dataset], dtype=bool)
-        return label_vector_map
-
-    def __compute_condition_holds_vector(
-            self, dataset: ClassificationDataset, condition: Condition):
-        return np.array(
-            [condition.check_instance(instance) for instance in dataset], dtype=bool)
+    def __create_class_label_vector_map(self, columnar_dataset: ColumnarDataset) -> dict:
+        return {
+            label: columnar_dataset.compute_packed_class_label_hold_vector(label)
+            for label in columnar_dataset.get_set_of_classes()
+        }
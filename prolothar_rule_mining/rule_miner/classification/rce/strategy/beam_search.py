@@ -14,17 +14,32 @@
     You should have received a copy of the GNU General Public License
     along with Prolothar-Rule-Mining. If not, see <https://www.gnu.org/licenses/>.
 '''
-from typing import List
+from typing import Dict, List, Tuple
 
-from prolothar_common.models.dataset import ClassificationDataset
+import heapq
+
+import numpy as np
+from scipy.sparse import csc_matrix
+
+from prolothar_common.parallel.abstract.computation_engine import ComputationEngine
+from prolothar_common.parallel.single_thread.single_thread import SingleThreadComputationEngine
 
 from prolothar_rule_mining.rule_miner.classification.rce.strategy.abstract import CandidateSearchStrategy
+from prolothar_rule_mining.rule_miner.classification.rce.columnar_dataset import ColumnarDataset
 from prolothar_rule_mining.rule_miner.classification.rce.candidate import CandidateCondition
 from prolothar_rule_mining.rule_miner.classification.rce.candidate import VectorCandidateCondition
+from prolothar_rule_mining.rule_miner.classification.rce.candidate import CombinedVectorCandidateCondition
+from prolothar_rule_mining.rule_miner.classification.rce import bitvector
 
 from prolothar_rule_mining.models.conditions import AndCondition
 from prolothar_rule_mining.models.conditions import OrCondition
 
+#the effects are computed in single precision, i.e. an upper bound can be
+#slightly smaller than an effect that reaches it
+_BOUND_TOLERANCE = 1e-5
+#the vectorized effects of the extensions are computed in double precision
+_EFFECT_TOLERANCE = 1e-5
+
 class BeamSearch(CandidateSearchStrategy):
     """
     greedy search for conditions where only the top-k most promising candidate
@@ -32,8 +47,10 @@ class BeamSearch(CandidateSearchStrategy):
     """
 
     def __init__(
-            self, beta: float = 2.0, n_bins: int = 10, beam_width: int = 5,
-            max_nr_of_base_candidates: int = -1):
+            self, beta: float = 2.0, n_bins: int = None, beam_width: int = 5,
+            max_nr_of_base_candidates: int = -1,
+            computation_engine: ComputationEngine = SingleThreadComputationEngine(),
+            use_sparse_matrix_products: bool = False):
         """
         configuration of the condition search
 
@@ -48,7 +65,10 @@ class BeamSearch(CandidateSearchStrategy):
             number of bins for discretization of numerical features. this reduces
             the search space for "greater" and "less than" conditions with the
             cost of accuracy. a higher number leads to a higher accuracy with
-            the cost of additional runtime. by default 10
+            the cost of additional runtime. by default None, which means
+            that all thresholds are evaluated on the sorted values of the
+            attribute and the best "greater" and "less than" condition per
+            attribute and class label is kept.
         beam_width : int, optional
             width parameter of the beam search. the higher, the more runtime
             is needed but there is less danger to miss better candidates in
@@ -57,86 +77,248 @@ class BeamSearch(CandidateSearchStrategy):
             the number of base candidates to keep for extension during search.
             default means no limitation. the limitation is useful, if some
             categorical attributes have many different values such as an ID.
+        computation_engine : ComputationEngine, optional
+            used to generate the candidates of the attributes in parallel.
+            by default SingleThreadComputationEngine()
+        use_sparse_matrix_products : bool, optional
+            if True, the supports of all extensions of the current candidates
+            are computed at once by products of sparse hold matrices instead
+            of one popcount per extension and bound-based pruning. this pays
+            off for many base candidates. the result is the same.
+            by default False
         """
         super().__init__(beta=beta, n_bins=n_bins,
-                         max_nr_of_base_candidates=max_nr_of_base_candidates)
+                         max_nr_of_base_candidates=max_nr_of_base_candidates,
+                         computation_engine=computation_engine)
         self.__beam_width = beam_width
+        self.__use_sparse_matrix_products = use_sparse_matrix_products
 
     def _search_condition(self, base_candidates: List[CandidateCondition],
-                          dataset: ClassificationDataset) -> CandidateCondition:
+                          columnar_dataset: ColumnarDataset) -> CandidateCondition:
+        support_counts = {}
+        if self.__use_sparse_matrix_products:
+            base_hold_matrix = self.__create_hold_matrix(
+                [candidate.condition_hold_vector for candidate in base_candidates],
+                columnar_dataset, use_instance_weights=True)
         current_candidates = base_candidates[:self.__beam_width]
         while True:
             self._logger('current candidates:')
             for candidate in current_candidates:
                 self._logger(repr(candidate))
-            extended_candidates = self.__extend_candidates(
-                current_candidates, base_candidates, dataset)
-            next_candidates = []
-            for candidate in extended_candidates:
-                if len(next_candidates) < self.__beam_width \
-                and candidate.causal_effect > current_candidates[0].causal_effect:
-                    next_candidates.append(candidate)
-                else:
-                    break
+            if self.__use_sparse_matrix_products:
+                next_candidates = self.__extend_candidates_by_matrix_products(
+                    current_candidates, base_candidates, base_hold_matrix,
+                    columnar_dataset, support_counts)
+            else:
+                next_candidates = self.__extend_candidates(
+                    current_candidates, base_candidates, columnar_dataset, support_counts)
             if not next_candidates:
                 self._logger('return candidate %r' % current_candidates[0])
                 return current_candidates[0]
             current_candidates = next_candidates
-            current_candidates.sort(reverse=True)
 
     def __extend_candidates(
             self, current_candidates: List[VectorCandidateCondition],
             base_candidates: List[VectorCandidateCondition],
-            dataset: ClassificationDataset) -> List[CandidateCondition]:
+            columnar_dataset: ColumnarDataset,
+            support_counts: Dict[int, Tuple[int, int]]) -> List[CandidateCondition]:
+        """
+        returns the beam_width best extensions that have a larger effect than
+        the best current candidate, sorted by effect. extensions whose
+        optimistic effect cannot exceed the best current candidate or the
+        worst candidate in a full beam are pruned without scoring them.
+        """
         extended_candidates = []
-
+        #effects of the best extensions so far, min-heap of size <= beam_width
+        best_effects = []
+        nr_of_extensions = 0
+        nr_of_pruned_extensions = 0
         for candidate in current_candidates:
+            nr_of_rows, nr_of_class_rows = self.__get_support_counts(
+                candidate, columnar_dataset, support_counts)
+            nr_of_other_rows = nr_of_rows - nr_of_class_rows
             for base_candidate in base_candidates:
                 if candidate is not base_candidate \
                 and candidate.class_label == base_candidate.class_label:
-                    and_condition = AndCondition([
-                        candidate.condition, base_candidate.condition
-                    ])
-                    condition_hold_vector = (
-                        candidate.condition_hold_vector &
-                        base_candidate.condition_hold_vector)
-                    extended_candidates.append(
-                        VectorCandidateCondition(
-                            and_condition,
-                            condition_hold_vector,
+                    base_nr_of_rows, base_nr_of_class_rows = self.__get_support_counts(
+                        base_candidate, columnar_dataset, support_counts)
+                    base_nr_of_other_rows = base_nr_of_rows - base_nr_of_class_rows
+                    class_count = columnar_dataset.get_class_count(candidate.class_label)
+                    other_count = columnar_dataset.get_total_weight() - class_count
+                    for condition_type, combine_function, count_function, \
+                            count_with_label_function, support_bounds in [
+                            (AndCondition, bitvector.bitwise_and,
+                             columnar_dataset.count_and, columnar_dataset.count_and_and, (
+                                max(0, nr_of_class_rows + base_nr_of_class_rows - class_count),
+                                min(nr_of_class_rows, base_nr_of_class_rows),
+                                max(0, nr_of_other_rows + base_nr_of_other_rows - other_count),
+                                min(nr_of_other_rows, base_nr_of_other_rows))),
+                            (OrCondition, bitvector.bitwise_or,
+                             columnar_dataset.count_or, columnar_dataset.count_or_and, (
+                                max(nr_of_class_rows, base_nr_of_class_rows),
+                                min(class_count, nr_of_class_rows + base_nr_of_class_rows),
+                                max(nr_of_other_rows, base_nr_of_other_rows),
+                                min(other_count, nr_of_other_rows + base_nr_of_other_rows)))]:
+                        nr_of_extensions += 1
+                        threshold = current_candidates[0].causal_effect
+                        if len(best_effects) == self.__beam_width:
+                            threshold = max(threshold, best_effects[0])
+                        if self._estimate_causal_effect_upper_bound(
+                                *support_bounds, columnar_dataset, candidate.class_label) \
+                                + _BOUND_TOLERANCE <= threshold:
+                            nr_of_pruned_extensions += 1
+                            continue
+                        causal_effect = self._estimate_causal_effect_from_counts(
+                            count_function(
+                                candidate.condition_hold_vector,
+                                base_candidate.condition_hold_vector),
+                            count_with_label_function(
+                                candidate.condition_hold_vector,
+                                base_candidate.condition_hold_vector,
+                                candidate.class_label_hold_vector),
+                            columnar_dataset, candidate.class_label)
+                        if causal_effect <= threshold:
+                            continue
+                        extended_candidates.append(CombinedVectorCandidateCondition(
+                            condition_type([candidate.condition, base_candidate.condition]),
+                            combine_function, candidate, base_candidate,
                             candidate.class_label,
                             candidate.class_label_hold_vector,
-                            self._estimate_causal_effect_with_numpy(
-                                condition_hold_vector,
-                                candidate.class_label_hold_vector,
-                                dataset,
-                                candidate.class_label
-                            )
-                        )
-                    )
-
-                    or_condition = OrCondition([
-                        candidate.condition, base_candidate.condition
-                    ])
-                    condition_hold_vector = (
-                        candidate.condition_hold_vector |
-                        base_candidate.condition_hold_vector)
-                    extended_candidates.append(
-                        VectorCandidateCondition(
-                            or_condition,
-                            condition_hold_vector,
-                            candidate.class_label,
-                            candidate.class_label_hold_vector,
-                            self._estimate_causal_effect_with_numpy(
-                                condition_hold_vector,
-                                candidate.class_label_hold_vector,
-                                dataset,
-                                candidate.class_label
-                            )
-                        )
-                    )
-
-        return extended_candidates
+                            causal_effect))
+                        if len(best_effects) < self.__beam_width:
+                            heapq.heappush(best_effects, causal_effect)
+                        else:
+                            heapq.heapreplace(best_effects, causal_effect)
+        self._logger('pruned %d of %d extensions' % (nr_of_pruned_extensions, nr_of_extensions))
+        extended_candidates.sort(reverse=True)
+        return extended_candidates[:self.__beam_width]
+
+    def __extend_candidates_by_matrix_products(
+            self, current_candidates: List[VectorCandidateCondition],
+            base_candidates: List[VectorCandidateCondition],
+            base_hold_matrix: csc_matrix, columnar_dataset: ColumnarDataset,
+            support_counts: Dict[int, Tuple[int, int]]) -> List[CandidateCondition]:
+        """
+        same as __extend_candidates, but the supports of the And extensions
+        of all pairs are the entries of (B^T W C)^T, where the columns of C and B
+        are the hold vectors of the current and base candidates and W contains
+        the instance weights on the diagonal. the supports with the class
+        label use C restricted to the rows with the class label of the
+        candidate. the supports of the Or extensions follow by
+        inclusion-exclusion.
+        """
+        current_hold_matrix = self.__create_hold_matrix(
+            [candidate.condition_hold_vector for candidate in current_candidates],
+            columnar_dataset)
+        current_class_hold_matrix = self.__create_hold_matrix(
+            [bitvector.bitwise_and(
+                candidate.condition_hold_vector, candidate.class_label_hold_vector)
+             for candidate in current_candidates],
+            columnar_dataset)
+        #B^T is row-major without a copy. only the small matrix C is converted.
+        and_counts = np.rint(
+            (base_hold_matrix.T @ current_hold_matrix).T.toarray()).astype(np.int64)
+        and_class_counts = np.rint(
+            (base_hold_matrix.T @ current_class_hold_matrix).T.toarray()).astype(np.int64)
+
+        current_counts = np.array([
+            self.__get_support_counts(candidate, columnar_dataset, support_counts)
+            for candidate in current_candidates], dtype=np.int64).reshape(-1, 2)
+        base_counts = np.array([
+            self.__get_support_counts(candidate, columnar_dataset, support_counts)
+            for candidate in base_candidates], dtype=np.int64).reshape(-1, 2)
+        or_counts = current_counts[:, 0:1] + base_counts[:, 0] - and_counts
+        or_class_counts = current_counts[:, 1:2] + base_counts[:, 1] - and_class_counts
+
+        #only pairs of different candidates with the same class label are extended
+        base_class_labels = np.array([candidate.class_label for candidate in base_candidates])
+        is_extendable = np.array([
+            base_class_labels == candidate.class_label for candidate in current_candidates
+        ]).reshape(len(current_candidates), len(base_candidates))
+        base_candidate_index = {id(candidate): i for i,candidate in enumerate(base_candidates)}
+        for i, candidate in enumerate(current_candidates):
+            if id(candidate) in base_candidate_index:
+                is_extendable[i, base_candidate_index[id(candidate)]] = False
+
+        class_counts = np.array([
+            columnar_dataset.get_class_count(candidate.class_label)
+            for candidate in current_candidates])[:, np.newaxis]
+        threshold = current_candidates[0].causal_effect
+        extension_types = [
+            (AndCondition, bitvector.bitwise_and, and_counts, and_class_counts),
+            (OrCondition, bitvector.bitwise_or, or_counts, or_class_counts)]
+        is_improving = []
+        for _, _, counts, class_counts_of_extensions in extension_types:
+            is_improving.append(is_extendable & (self._estimate_causal_effects_from_counts(
+                counts, class_counts_of_extensions, columnar_dataset, class_counts)
+                > threshold - _EFFECT_TOLERANCE))
+
+        #the effects of the promising extensions are computed again exactly as
+        #in __extend_candidates, which also keeps the order of equal effects
+        extended_candidates = []
+        for i, j in np.argwhere(np.logical_or(*is_improving)):
+            candidate = current_candidates[i]
+            base_candidate = base_candidates[j]
+            for (condition_type, combine_function, counts, class_counts_of_extensions), \
+                    is_improving_type in zip(extension_types, is_improving):
+                if not is_improving_type[i, j]:
+                    continue
+                causal_effect = self._estimate_causal_effect_from_counts(
+                    counts[i, j], class_counts_of_extensions[i, j],
+                    columnar_dataset, candidate.class_label)
+                if causal_effect > threshold:
+                    extended_candidates.append(CombinedVectorCandidateCondition(
+                        condition_type([candidate.condition, base_candidate.condition]),
+                        combine_function, candidate, base_candidate,
+                        candidate.class_label,
+                        candidate.class_label_hold_vector,
+                        causal_effect))
+        self._logger('scored %d extensions by matrix products' % (
+            2 * np.count_nonzero(is_extendable)))
+        extended_candidates.sort(reverse=True)
+        return extended_candidates[:self.__beam_width]
+
+    def __create_hold_matrix(
+            self, hold_vectors: list, columnar_dataset: ColumnarDataset,
+            use_instance_weights: bool = False) -> csc_matrix:
+        """
+        returns a sparse matrix with one row per row of the original dataset
+        and the given bit-packed hold vectors as columns. the entries are the
+        instance weights or 1.
+        """
+        nr_of_rows = len(columnar_dataset.get_row_mask())
+        row_indices = [
+            np.flatnonzero(bitvector.unpack(hold_vector, nr_of_rows))
+            for hold_vector in hold_vectors
+        ]
+        column_offsets = np.zeros(len(hold_vectors) + 1, dtype=np.int64)
+        column_offsets[1:] = np.cumsum([len(indices) for indices in row_indices])
+        row_indices = np.concatenate(row_indices) if row_indices else np.zeros(0, dtype=np.int64)
+        instance_weights = columnar_dataset.get_instance_weights()
+        if use_instance_weights and instance_weights is not None:
+            values = instance_weights[row_indices].astype(float)
+        else:
+            values = np.ones(len(row_indices))
+        return csc_matrix(
+            (values, row_indices, column_offsets), shape=(nr_of_rows, len(hold_vectors)))
+
+    def __get_support_counts(
+            self, candidate: VectorCandidateCondition, columnar_dataset: ColumnarDataset,
+            support_counts: Dict[int, Tuple[int, int]]) -> Tuple[int, int]:
+        """
+        returns the number of rows and the number of rows with the class label
+        for which the condition of the candidate holds (or their total weight)
+        """
+        try:
+            return support_counts[id(candidate)][1]
+        except KeyError:
+            counts = (
+                columnar_dataset.count(candidate.condition_hold_vector),
+                columnar_dataset.count_and(
+                    candidate.condition_hold_vector, candidate.class_label_hold_vector))
+            #the candidate is stored to keep its id unique
+            support_counts[id(candidate)] = (candidate, counts)
+            return counts
 
     def __repr__(self) -> str:
         return 'BeamSearch(%d)' % self.__beam_width
\ No newline at end of file
@@ -17,10 +17,14 @@
 from typing import List
 import sys
 
-from prolothar_common.models.dataset import ClassificationDataset
+from prolothar_common.parallel.abstract.computation_engine import ComputationEngine
+from prolothar_common.parallel.single_thread.single_thread import SingleThreadComputationEngine
 
 from prolothar_rule_mining.rule_miner.classification.rce.strategy.abstract import CandidateSearchStrategy
+from prolothar_rule_mining.rule_miner.classification.rce.columnar_dataset import ColumnarDataset
 from prolothar_rule_mining.rule_miner.classification.rce.candidate import CandidateCondition
+from prolothar_rule_mining.rule_miner.classification.rce.candidate import VectorCandidateCondition
+from prolothar_rule_mining.rule_miner.classification.rce import bitvector
 
 from prolothar_rule_mining.models.conditions import AndCondition
 from prolothar_rule_mining.models.conditions import OrCondition
@@ -32,8 +36,9 @@ class BestFirstCandidateSearch(CandidateSearchStrategy):
     """
 
     def __init__(
-            self, beta: float = 2.0, n_bins: int = 10,
-            max_nr_of_candidates_for_extension: int = sys.maxsize):
+            self, beta: float = 2.0, n_bins: int = None,
+            max_nr_of_candidates_for_extension: int = sys.maxsize,
+            computation_engine: ComputationEngine = SingleThreadComputationEngine()):
         """
         configuration of the condition search
 
@@ -48,43 +53,63 @@ class BestFirstCandidateSearch(CandidateSearchStrategy):
             number of bins for discretization of numerical features. this reduces
             the search space for "greater" and "less than" conditions with the
             cost of accuracy. a higher number leads to a higher accuracy with
-            the cost of additional runtime. by default 10
+            the cost of additional runtime. by default None, which means
+            that all thresholds are evaluated on the sorted values of the
+            attribute and the best "greater" and "less than" condition per
+            attribute and class label is kept.
         max_nr_of_candidates_for_extension : int, optional
             truncates the search space by reducing the number of candidates
             for extension of the current highest ranked condition.
             by default sys.maxsize
+        computation_engine : ComputationEngine, optional
+            used to generate the candidates of the attributes in parallel.
+            by default SingleThreadComputationEngine()
         """
-        super().__init__(beta=beta, n_bins=n_bins)
+        super().__init__(beta=beta, n_bins=n_bins, computation_engine=computation_engine)
         self.__max_nr_of_candidates_for_extension = max_nr_of_candidates_for_extension
 
-    def _search_condition(self, base_candidates: List[CandidateCondition],
-                          dataset: ClassificationDataset) -> CandidateCondition:
+    def _search_condition(self, base_candidates: List[VectorCandidateCondition],
+                          columnar_dataset: ColumnarDataset) -> CandidateCondition:
         best_candidate = base_candidates[0]
         remaining_candidates = [
             candidate for candidate in base_candidates[1:]
             if candidate.class_label == best_candidate.class_label
         ][:self.__max_nr_of_candidates_for_extension]
 
-        return self.__extend_condition(best_candidate, remaining_candidates, dataset)
+        return self.__extend_condition(best_candidate, remaining_candidates, columnar_dataset)
 
     def __extend_condition(
-            self, candidate: CandidateCondition,
-            remaining_candidates: List[CandidateCondition],
-            dataset: ClassificationDataset) -> CandidateCondition:
+            self, candidate: VectorCandidateCondition,
+            remaining_candidates: List[VectorCandidateCondition],
+            columnar_dataset: ColumnarDataset) -> CandidateCondition:
         self._logger('extend candidate %r' % candidate)
         for i,other_candidate in enumerate(remaining_candidates):
-            for new_condition in [
-                    AndCondition([candidate.condition, other_candidate.condition]),
-                    OrCondition([candidate.condition, other_candidate.condition])]:
-                causal_effect = self._estimate_causal_effect(
-                    new_condition, candidate.class_label, dataset)
+            for condition_type, combine_function, count_function, count_with_label_function in [
+                    (AndCondition, bitvector.bitwise_and,
+                     columnar_dataset.count_and, columnar_dataset.count_and_and),
+                    (OrCondition, bitvector.bitwise_or,
+                     columnar_dataset.count_or, columnar_dataset.count_or_and)]:
+                causal_effect = self._estimate_causal_effect_from_counts(
+                    count_function(
+                        candidate.condition_hold_vector,
+                        other_candidate.condition_hold_vector),
+                    count_with_label_function(
+                        candidate.condition_hold_vector,
+                        other_candidate.condition_hold_vector,
+                        candidate.class_label_hold_vector),
+                    columnar_dataset, candidate.class_label)
                 if causal_effect > candidate.causal_effect:
                     return self.__extend_condition(
-                        CandidateCondition(new_condition,
-                                           candidate.class_label,
-                                           causal_effect),
+                        VectorCandidateCondition(
+                            condition_type([candidate.condition, other_candidate.condition]),
+                            combine_function(
+                                candidate.condition_hold_vector,
+                                other_candidate.condition_hold_vector),
+                            candidate.class_label,
+                            candidate.class_label_hold_vector,
+                            causal_effect),
                         remaining_candidates[i+1:],
-                        dataset
+                        columnar_dataset
                     )
 
         return candidate
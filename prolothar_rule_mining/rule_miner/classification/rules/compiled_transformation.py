@@ -0,0 +1,243 @@
+'''
+    This file is part of Prolothar-Rule-Mining (More Info: https://github.com/shs-it/prolothar-rule-mining).
+
+    Prolothar-Rule-Mining is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    Prolothar-Rule-Mining is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with Prolothar-Rule-Mining. If not, see <https://www.gnu.org/licenses/>.
+'''
+"""
+column-wise numpy replacements of the DatasetTransformer pipeline used by
+TrainedSklearnClassifier. the transformers of prolothar_common operate on a
+Dataset of Instance objects. at prediction time, this means that a dummy
+Dataset has to be built and transformed for every single instance. the classes
+in this module replay the same transformation on numpy columns instead.
+"""
+
+from typing import List, Dict, Iterable, Union
+
+import numpy as np
+
+from prolothar_common.models.dataset.instance import Instance
+from prolothar_common.models.dataset.transformer.dataset_transformer import DatasetTransformer
+from prolothar_common.models.dataset.transformer.one_hot_encoding import OneHotEncoding
+from prolothar_common.models.dataset.transformer.label_encoding import LabelEncoding
+from prolothar_common.models.dataset.transformer import TrainableQuantileBasedDiscretization
+
+def _get_private_field(transformer: DatasetTransformer, field_name: str):
+    #the transformers of prolothar_common do not expose their learned parameters
+    return getattr(transformer, '_%s__%s' % (type(transformer).__name__, field_name))
+
+class _ColumnEncoder:
+    """
+    replays the transformation of one attribute. the output columns of the
+    encoder replace the input column.
+    """
+
+    def encode(self, column: np.ndarray) -> List[np.ndarray]:
+        raise NotImplementedError()
+
+class _OneHotColumnEncoder(_ColumnEncoder):
+    def __init__(self, possible_values: List):
+        self.__value_index = {value: i for i,value in enumerate(possible_values)}
+        self.__nr_of_values = len(possible_values)
+
+    def encode(self, column: np.ndarray) -> List[np.ndarray]:
+        codes = np.fromiter(
+            (self.__value_index.get(value, -1) for value in column),
+            dtype=np.int64, count=len(column))
+        one_hot_matrix = (
+            codes[:, np.newaxis] == np.arange(self.__nr_of_values)).astype(np.int64)
+        return list(one_hot_matrix.T)
+
+class _LabelColumnEncoder(_ColumnEncoder):
+    def __init__(self, possible_values: List):
+        self.__value_map = {value: i for i,value in enumerate(possible_values)}
+
+    def encode(self, column: np.ndarray) -> List[np.ndarray]:
+        #unknown values raise a KeyError as LabelEncoding does
+        return [np.fromiter(
+            (self.__value_map[value] for value in column),
+            dtype=np.int64, count=len(column))]
+
+class _DiscretizationColumnEncoder(_ColumnEncoder):
+    def __init__(self, bins):
+        self.__bins = bins
+        self.__bin_labels = np.array([str(b) for b in bins], dtype=object)
+
+    def encode(self, column: np.ndarray) -> List[np.ndarray]:
+        bin_indices = self.__bins.get_indexer(column.astype(float))
+        #values outside of all bins are put into the last bin
+        bin_indices[bin_indices == -1] = len(self.__bin_labels) - 1
+        return [self.__bin_labels[bin_indices]]
+
+class _CompiledStep:
+    """
+    the encoders of one DatasetTransformer together with the resulting
+    categorical and numerical attribute names
+    """
+    def __init__(self, encoders: Dict[str, _ColumnEncoder],
+                 output_names: Dict[str, List[str]]):
+        self.encoders = encoders
+        self.output_names = output_names
+
+class CompiledTransformation:
+    """
+    replays a list of DatasetTransformer on numpy columns. the result is
+    the same matrix that Dataset.to_dataframe().values returns after the
+    transformers have been applied on a Dataset of the same instances.
+    """
+
+    def __init__(
+            self, categorical_attribute_names: List[str],
+            numerical_attribute_names: List[str],
+            steps: List[_CompiledStep],
+            output_attribute_names: List[str]):
+        self.__input_attribute_names = list(categorical_attribute_names) + list(
+            numerical_attribute_names)
+        self.__steps = steps
+        self.__output_attribute_names = output_attribute_names
+
+    def transform(self, instances: List[Instance]) -> np.ndarray:
+        """
+        transforms the given list of instances into a feature matrix with one
+        row per instance
+        """
+        columns = {}
+        for attribute_name in self.__input_attribute_names:
+            column = np.empty(len(instances), dtype=object)
+            column[:] = [instance[attribute_name] for instance in instances]
+            columns[attribute_name] = column
+        for step in self.__steps:
+            for attribute_name, encoder in step.encoders.items():
+                encoded_columns = encoder.encode(columns.pop(attribute_name))
+                for output_name, encoded_column in zip(
+                        step.output_names[attribute_name], encoded_columns):
+                    columns[output_name] = encoded_column
+        if not self.__output_attribute_names:
+            return np.empty((len(instances), 0))
+        return np.column_stack([
+            self.__convert_column(columns[attribute_name])
+            for attribute_name in self.__output_attribute_names
+        ])
+
+    def __convert_column(self, column: np.ndarray) -> np.ndarray:
+        if column.dtype == object:
+            try:
+                return column.astype(float)
+            except (TypeError, ValueError):
+                return column
+        return column
+
+def compile_transformation(
+        categorical_attribute_names: List[str],
+        numerical_attribute_names: List[str],
+        dataset_transformers: Iterable[DatasetTransformer]) -> Union[CompiledTransformation, None]:
+    """
+    tries to compile the given list of dataset transformers into a
+    CompiledTransformation. supported are OneHotEncoding and LabelEncoding with
+    predefined possible attribute values and TrainableQuantileBasedDiscretization.
+
+    Returns
+    -------
+    Union[CompiledTransformation, None]
+        None if there is at least one transformer that cannot be compiled
+    """
+    categorical_attribute_names = list(categorical_attribute_names)
+    numerical_attribute_names = list(numerical_attribute_names)
+    input_categorical_attribute_names = list(categorical_attribute_names)
+    input_numerical_attribute_names = list(numerical_attribute_names)
+    steps = []
+    try:
+        for transformer in dataset_transformers:
+            if isinstance(transformer, OneHotEncoding):
+                step = _compile_one_hot_encoding(
+                    transformer, categorical_attribute_names, numerical_attribute_names)
+            elif isinstance(transformer, LabelEncoding):
+                step = _compile_label_encoding(
+                    transformer, categorical_attribute_names, numerical_attribute_names)
+            elif isinstance(transformer, TrainableQuantileBasedDiscretization):
+                step = _compile_discretization(
+                    transformer, categorical_attribute_names, numerical_attribute_names)
+            else:
+                return None
+            if step is None:
+                return None
+            steps.append(step)
+    except KeyError:
+        #the transformer does not know all attributes => it would fail anyway
+        return None
+    return CompiledTransformation(
+        input_categorical_attribute_names, input_numerical_attribute_names,
+        steps, categorical_attribute_names + numerical_attribute_names)
+
+def _iterate_attribute_names(
+        categorical_attribute_names: List[str],
+        numerical_attribute_names: List[str]):
+    for attribute_name in list(categorical_attribute_names):
+        yield attribute_name, True
+    for attribute_name in list(numerical_attribute_names):
+        yield attribute_name, False
+
+def _compile_one_hot_encoding(
+        transformer: OneHotEncoding, categorical_attribute_names: List[str],
+        numerical_attribute_names: List[str]) -> Union[_CompiledStep, None]:
+    possible_attribute_values = _get_private_field(transformer, 'possible_attribute_values')
+    if possible_attribute_values is None:
+        #possible values depend on the transformed dataset
+        return None
+    join_character = _get_private_field(transformer, 'attribute_value_join_character')
+    encoders = {}
+    output_names = {}
+    for attribute_name in list(categorical_attribute_names):
+        possible_values = sorted(possible_attribute_values[attribute_name])
+        if len(possible_values) == 2 and possible_values[0] == 0 and possible_values[1] == 1:
+            continue
+        encoders[attribute_name] = _OneHotColumnEncoder(possible_values)
+        output_names[attribute_name] = [
+            attribute_name + join_character + str(value) for value in possible_values]
+        categorical_attribute_names.extend(output_names[attribute_name])
+        categorical_attribute_names.remove(attribute_name)
+    return _CompiledStep(encoders, output_names)
+
+def _compile_label_encoding(
+        transformer: LabelEncoding, categorical_attribute_names: List[str],
+        numerical_attribute_names: List[str]) -> Union[_CompiledStep, None]:
+    possible_attribute_values = _get_private_field(transformer, 'possible_attribute_values')
+    if possible_attribute_values is None:
+        return None
+    encoders = {}
+    output_names = {}
+    for attribute_name in list(categorical_attribute_names):
+        possible_values = sorted(possible_attribute_values[attribute_name])
+        if possible_values and possible_values == list(range(len(possible_values))) \
+        and not isinstance(possible_values[0], bool):
+            continue
+        encoders[attribute_name] = _LabelColumnEncoder(possible_values)
+        output_names[attribute_name] = [attribute_name]
+        categorical_attribute_names.remove(attribute_name)
+        categorical_attribute_names.append(attribute_name)
+    return _CompiledStep(encoders, output_names)
+
+def _compile_discretization(
+        transformer: TrainableQuantileBasedDiscretization,
+        categorical_attribute_names: List[str],
+        numerical_attribute_names: List[str]) -> Union[_CompiledStep, None]:
+    attribute_bins_dict = _get_private_field(transformer, 'attribute_bins_dict')
+    encoders = {}
+    output_names = {}
+    for attribute_name in list(numerical_attribute_names):
+        encoders[attribute_name] = _DiscretizationColumnEncoder(
+            attribute_bins_dict[attribute_name])
+        output_names[attribute_name] = [attribute_name]
+        numerical_attribute_names.remove(attribute_name)
+        categorical_attribute_names.append(attribute_name)
+    return _CompiledStep(encoders, output_names)
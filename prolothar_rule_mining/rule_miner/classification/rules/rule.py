@@ -22,6 +22,9 @@ from prolothar_common.models.dataset.instance import Instance
 class Rule(ABC):
     """interface of a classification rule"""
 
+    #cached result of __hash__
+    _hash_value = None
+
     @abstractmethod
     def predict(self, instance: Instance) -> str:
         """predicts a class for the given instance as input"""
@@ -51,4 +54,22 @@ class Rule(ABC):
         return self.to_string()
 
     def __hash__(self) -> int:
-        return hash(self.to_string())
+        #rendering the rule is expensive, so the hash is computed only once.
+        #subclasses that change their string representation after construction
+        #must call _invalidate_hash()
+        if self._hash_value is None:
+            self._hash_value = hash(self.to_string())
+        return self._hash_value
+
+    def _invalidate_hash(self):
+        """
+        resets the cached hash value. must be called after every change of
+        the string representation of this rule
+        """
+        self._hash_value = None
+
+    def __getstate__(self) -> dict:
+        #string hashes are salted per process and must not be pickled
+        state = self.__dict__.copy()
+        state.pop('_hash_value', None)
+        return state
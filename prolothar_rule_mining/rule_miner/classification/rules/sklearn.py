@@ -14,10 +14,12 @@
     You should have received a copy of the GNU General Public License
     along with Prolothar-Rule-Mining. If not, see <https://www.gnu.org/licenses/>.
 '''
-from typing import List, Set, Dict
+from typing import List, Set, Dict, Iterable
 
 import itertools
 
+import numpy as np
+
 from sklearn.preprocessing import LabelEncoder
 from sklearn.base import TransformerMixin, ClassifierMixin
 
@@ -26,6 +28,7 @@ from prolothar_common.models.dataset.instance import Instance
 from prolothar_common.models.dataset.transformer.dataset_transformer import DatasetTransformer
 
 from prolothar_rule_mining.rule_miner.classification.rules.rule import Rule
+from prolothar_rule_mining.rule_miner.classification.rules.compiled_transformation import compile_transformation
 
 
 class TrainedSklearnClassifier(Rule):
@@ -69,29 +72,54 @@ class TrainedSklearnClassifier(Rule):
         self.__label_encoder = label_encoder
         self.__dataset_transformers = dataset_transformers
         self.__preprocessors = preprocessors
+        self.__compiled_transformation = compile_transformation(
+            categorical_attribute_names, numerical_attribute_names,
+            dataset_transformers)
 
     def predict(self, instance: Instance) -> str:
         """predicts a class for the given instance as input"""
-        X = self.__transform_instance(instance)
-        return self.__label_encoder.inverse_transform(self.__classifier.predict(X))[0]
-
-    def __transform_instance(self, instance: Instance):
-        instance = Instance(instance.get_id(), {
-            attribute_name: instance[attribute_name]
-            for attribute_name in itertools.chain(
-                self.__categorical_attribute_names,
-                self.__numerical_attribute_names
-            )
-        })
+        return self.predict_many([instance])[0]
+
+    def predict_many(self, instances: Iterable[Instance]) -> List[str]:
+        """
+        predicts a class for each of the given instances. the transformation
+        of the instances is done for the whole batch at once, which is much
+        faster than calling predict() for each instance
+        """
+        instances = list(instances)
+        if not instances:
+            return []
+        X = self.transform_instances(instances)
+        return list(self.__label_encoder.inverse_transform(self.__classifier.predict(X)))
+
+    def transform_instances(self, instances: List[Instance]) -> np.ndarray:
+        """
+        returns the feature matrix of the given instances as it is passed to
+        the sklearn classifier, i.e. after all transformers and preprocessors
+        """
+        if self.__compiled_transformation is not None:
+            X = self.__compiled_transformation.transform(instances)
+        else:
+            X = self.__transform_instances_with_dummy_dataset(instances)
+        for preprocessor in self.__preprocessors:
+            X = preprocessor.transform(X)
+        return X
+
+    def __transform_instances_with_dummy_dataset(self, instances: List[Instance]):
         dummy_dataset = Dataset(
             self.__categorical_attribute_names, self.__numerical_attribute_names)
-        dummy_dataset.add_instance(instance)
+        #ids of the instances are not necessarily unique in a batch
+        for i, instance in enumerate(instances):
+            dummy_dataset.add_instance(Instance(i, {
+                attribute_name: instance[attribute_name]
+                for attribute_name in itertools.chain(
+                    self.__categorical_attribute_names,
+                    self.__numerical_attribute_names
+                )
+            }))
         for transformer in self.__dataset_transformers:
             transformer.transform(dummy_dataset, inplace=True)
-        X = dummy_dataset.to_dataframe().values
-        for preprocessor in self.__preprocessors:
-            X = preprocessor.transform(X)
-        return X
+        return dummy_dataset.to_dataframe().sort_index().values
 
     def predict_proba(self, instance: Instance) -> Dict[str, float]:
         """
@@ -99,11 +127,23 @@ class TrainedSklearnClassifier(Rule):
         throws an Error if the underlying sklearn classifier does not support
         probabilistic predictions
         """
-        X = self.__transform_instance(instance)
-        return {
-            self.__label_encoder.inverse_transform([i])[0]: probability
-            for i, probability in enumerate(self.__classifier.predict_proba(X)[0])
-        }
+        return self.predict_proba_many([instance])[0]
+
+    def predict_proba_many(self, instances: Iterable[Instance]) -> List[Dict[str, float]]:
+        """
+        predicts a probability per class for each of the given instances.
+        throws an Error if the underlying sklearn classifier does not support
+        probabilistic predictions
+        """
+        instances = list(instances)
+        if not instances:
+            return []
+        X = self.transform_instances(instances)
+        classes = self.__label_encoder.classes_
+        return [
+            dict(zip(classes, probabilities))
+            for probabilities in self.__classifier.predict_proba(X)
+        ]
 
     def to_string(self, prefix='') -> str:
         """returns a human readable string representation of this rule
@@ -18,6 +18,7 @@ from typing import Tuple
 
 from prolothar_rule_mining.models.event_flow_graph import EventFlowGraph
 from prolothar_rule_mining.models.event_flow_graph.alignment.alignment_finder import AlignmentFinder
+from prolothar_rule_mining.models.event_flow_graph.alignment.alignment_cache import AlignmentCache
 from prolothar_rule_mining.models.event_flow_graph.alignment.greedy_shortest_path import GreedyShortestPath
 from prolothar_rule_mining.models.event_flow_graph.alignment.heuristics import ReachabilityHeuristic
 
@@ -28,13 +29,16 @@ class AddSequencePathCandidate(Candidate):
     adds a path to the graph to match a given sequence
     """
     def __init__(self, graph: EventFlowGraph, sequence: Tuple[str],
-                 alignment_finder: AlignmentFinder = None):
+                 alignment_finder: AlignmentFinder = None,
+                 alignment_cache: AlignmentCache = None):
         super().__init__(graph, None)
         if alignment_finder is None:
             self.__alignment_finder = GreedyShortestPath(
                 graph, ReachabilityHeuristic(graph))
         else:
             self.__alignment_finder = alignment_finder
+        if alignment_cache is not None:
+            self.__alignment_finder = alignment_cache.wrap(self.__alignment_finder)
 
         self.__sequence = sequence
         self.__graph = graph
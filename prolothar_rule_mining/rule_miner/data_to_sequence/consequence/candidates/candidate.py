@@ -14,7 +14,7 @@
     You should have received a copy of the GNU General Public License
     along with Prolothar-Rule-Mining. If not, see <https://www.gnu.org/licenses/>.
 '''
-from typing import Tuple, Set, List, Generator
+from typing import Set, List, Generator, Union
 
 from abc import ABC, abstractmethod
 
@@ -27,8 +27,19 @@ class Candidate(ABC):
     EventFlowGraph given a Dataset (set of sequences)
     """
 
-    def __init__(self, graph: EventFlowGraph, priority: Tuple):
+    def __init__(self, graph: EventFlowGraph, priority: Union[float, None]):
+        """
+        Parameters
+        ----------
+        graph : EventFlowGraph
+            the graph that is changed by this candidate
+        priority : Union[float, None]
+            candidates with a smaller priority are processed first by a
+            CandidateQueue. None if the candidate is not meant to be queued
+        """
         self.__graph = graph
+        if priority is not None:
+            priority = float(priority)
         self.__priority = priority
         self.__applied = False
         self.__added_edges: Set[Edge] = set()
@@ -170,5 +181,19 @@ class Candidate(ABC):
         """
         pass
 
+    def get_priority_value(self) -> float:
+        """
+        returns the priority of this candidate. candidates with a smaller
+        value are processed first.
+
+        Raises
+        ------
+        ValueError
+            if the candidate has no priority, i.e. cannot be queued
+        """
+        if self.__priority is None:
+            raise ValueError('%r has no priority and cannot be queued' % self)
+        return self.__priority
+
     def __lt__(self, other: 'Candidate'):
-        return self.__priority < other.__priority
\ No newline at end of file
+        return self.get_priority_value() < other.get_priority_value()
@@ -14,38 +14,36 @@
     You should have received a copy of the GNU General Public License
     along with Prolothar-Rule-Mining. If not, see <https://www.gnu.org/licenses/>.
 '''
-from typing import List
-
-import heapq
-
+from prolothar_rule_mining.models.event_flow_graph.min_max_heap import BoundedMinMaxHeap
 from prolothar_rule_mining.rule_miner.data_to_sequence.consequence.candidates.candidate import Candidate
 
 
 class CandidateQueue:
     """
-    a priority queue of the candidates
+    a priority queue of the candidates. candidates with equal priority are
+    popped in the order in which they have been added.
     """
 
     def __init__(self):
-        self.__queue: List[Candidate] = []
+        self.__queue = BoundedMinMaxHeap()
 
     def add(self, candidate: Candidate):
         """
         adds the candidate to this queue
         """
-        heapq.heappush(self.__queue, candidate)
+        self.__queue.push(candidate, candidate.get_priority_value())
 
     def pop(self) -> Candidate:
         """
         pops the candidate with the lowest priority
         """
-        return heapq.heappop(self.__queue)
+        return self.__queue.pop_min()
 
     def is_not_empty(self) -> bool:
         """
         returns True if there are still elements in this queue, otherwise False
         """
-        return bool(self.__queue)
+        return len(self.__queue) > 0
 
     def __len__(self) -> int:
         """
@@ -36,7 +36,7 @@ class RemoveChainCandidate(Candidate):
             )
         else:
             frequency = graph.get_edge(nodes[0], nodes[1]).attributes['nr_of_instances']
-        super().__init__(graph, (frequency,))
+        super().__init__(graph, frequency)
         self.__nodes = nodes
         self.__parents_of_chain: Union[Set[Node], None] = None
         self.__children_of_chain: Union[Set[Node], None] = None
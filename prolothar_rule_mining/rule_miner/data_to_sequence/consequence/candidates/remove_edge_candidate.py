@@ -29,7 +29,7 @@ class RemoveEdgeCandidate(Candidate):
 
     def __init__(
             self, graph: EventFlowGraph, edge: Edge):
-        super().__init__(graph, (edge.attributes['nr_of_instances'],))
+        super().__init__(graph, edge.attributes['nr_of_instances'])
         self.__edge = edge
 
     def _apply(self):
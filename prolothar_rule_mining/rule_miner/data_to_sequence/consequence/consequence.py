@@ -31,6 +31,8 @@ from prolothar_rule_mining.models.event_flow_graph import EventFlowGraph
 from prolothar_rule_mining.models.event_flow_graph import Node
 from prolothar_rule_mining.models.event_flow_graph.router.learning import RuleClassifierRouterLearner
 from prolothar_rule_mining.models.event_flow_graph.alignment.petrinet import PetrinetAligner
+from prolothar_rule_mining.models.event_flow_graph.alignment.parallel import ParallelAlignmentFinder
+from prolothar_rule_mining.models.event_flow_graph.alignment.alignment_cache import AlignmentCache
 
 from prolothar_rule_mining.rule_miner.classification.rce import ReliableRuleMiner
 
@@ -57,7 +59,8 @@ class ConSequence():
     def __init__(self, logger: Callable[[str], None] = print,
                  event_flow_graph_miner: EventFlowGraphMiner = None,
                  router_learner: Callable[[Node, EventFlowGraph, Dataset], Router] = None,
-                 computation_engine: ComputationEngine = None):
+                 computation_engine: ComputationEngine = None,
+                 alignment_cache: AlignmentCache = None):
         """
         constructor with multiple options how to run the algorithm
 
@@ -69,20 +72,32 @@ class ConSequence():
         event_flow_graph_miner : EventFlowGraphMiner, optional
             by default None
         router_learner : Callable[[Node, EventFlowGraph, Dataset], Router], optional
-            by default None
+            by default None, i.e. a RuleClassifierRouterLearner with a
+            ReliableRuleMiner that collapses duplicate instances
         computation_engine : ComputationEngine, optional
             can be used to parallelize computations, by default None (means single thread execution)
+        alignment_cache : AlignmentCache, optional
+            shared by the default event_flow_graph_miner and the cover
+            computation. by default None, i.e. a new cache is created that is
+            cleared after each call of mine_rules
         """
+        self.__owns_alignment_cache = alignment_cache is None
+        if alignment_cache is None:
+            self.__alignment_cache = AlignmentCache()
+        else:
+            self.__alignment_cache = alignment_cache
         if event_flow_graph_miner is not None:
             self.__event_flow_graph_miner = event_flow_graph_miner
         else:
             self.__event_flow_graph_miner = SequenceBottomUpEventFlowGraphMiner(
                 logger=logger, patience=10,
-                alignment_finder_factory_model_extension=PetrinetAligner)
+                alignment_finder_factory_model_extension=PetrinetAligner,
+                alignment_cache=self.__alignment_cache)
         if router_learner is not None:
             self.__router_learner = router_learner
         else:
-            self.__router_learner = RuleClassifierRouterLearner(ReliableRuleMiner(logger=logger))
+            self.__router_learner = RuleClassifierRouterLearner(
+                ReliableRuleMiner(logger=logger), collapse_duplicate_instances=True)
         self.__logger = logger
         if computation_engine is None:
             self.__computation_engine = SingleThreadComputationEngine()
@@ -90,13 +105,24 @@ class ConSequence():
             self.__computation_engine = computation_engine
 
     def mine_rules(self, dataset: Dataset) -> Rule:
-        event_flow_graph = self.__event_flow_graph_miner.mine_event_flow_graph(dataset)
-        return self.infer_rules_from_event_flow_graph(event_flow_graph, dataset)
+        try:
+            event_flow_graph = self.__event_flow_graph_miner.mine_event_flow_graph(dataset)
+            return self.infer_rules_from_event_flow_graph(event_flow_graph, dataset)
+        finally:
+            #the cached alignments belong to the graphs of this run
+            if self.__owns_alignment_cache:
+                self.__alignment_cache.clear()
 
     def infer_rules_from_event_flow_graph(
             self, event_flow_graph: EventFlowGraph, dataset: Dataset):
+        if isinstance(self.__computation_engine, SingleThreadComputationEngine):
+            alignment_finder = PetrinetAligner(event_flow_graph)
+        else:
+            alignment_finder = ParallelAlignmentFinder(
+                event_flow_graph, PetrinetAligner, self.__computation_engine)
         compute_cover(dataset, event_flow_graph, assign_instances_to_edges=True,
-                      alignment_finder=PetrinetAligner(event_flow_graph))
+                      alignment_finder=alignment_finder,
+                      alignment_cache=self.__alignment_cache)
 
         #it might be that the event flow graph was mined with a greedy alignment
         #which differs from the optimal alignment. hence, it can happen, that
@@ -26,6 +26,7 @@ from prolothar_common.func_tools import do_nothing
 
 from prolothar_rule_mining.models.event_flow_graph import EventFlowGraph
 from prolothar_rule_mining.models.event_flow_graph.alignment.petrinet import PetrinetAligner
+from prolothar_rule_mining.models.event_flow_graph.alignment.alignment_cache import AlignmentCache
 
 from prolothar_rule_mining.rule_miner.data_to_sequence.consequence.event_flow_graph_miner.abstract import EventFlowGraphMiner
 from prolothar_rule_mining.rule_miner.data_to_sequence.consequence.candidates import AddSequencePathCandidate
@@ -36,11 +37,21 @@ class SequenceAlignmentNoMdl(EventFlowGraphMiner):
     decide when to stop
     """
 
-    def __init__(self, logger: Callable[[str], None] = print):
+    def __init__(self, logger: Callable[[str], None] = print,
+                 alignment_cache: AlignmentCache = None):
         """
         creates a new EventFlowGraphMiner
+
+        Parameters
+        ----------
+        logger : Callable[[str], None], optional
+            used to log the progress of the search, by default print
+        alignment_cache : AlignmentCache, optional
+            if given, alignments are looked up in and stored to this cache,
+            by default None
         """
         self.__logger = logger if logger is not None else do_nothing
+        self.__alignment_cache = alignment_cache
 
     def mine_event_flow_graph(self, dataset: TargetSequenceDataset) -> EventFlowGraphMiner:
         graph = EventFlowGraph()
@@ -49,7 +60,8 @@ class SequenceAlignmentNoMdl(EventFlowGraphMiner):
         for i,sequence in enumerate(reversed(all_sequences)):
             self.__logger(f'extend model for sequence {i+1} of {len(all_sequences)}')
             AddSequencePathCandidate(
-                graph, sequence, alignment_finder=PetrinetAligner(graph)).apply()
+                graph, sequence, alignment_finder=PetrinetAligner(graph),
+                alignment_cache=self.__alignment_cache).apply()
 
         graph.merge_redundant_nodes()
 
@@ -31,6 +31,7 @@ from prolothar_rule_mining.models.event_flow_graph.alignment.alignment_finder im
 from prolothar_rule_mining.models.event_flow_graph.alignment.greedy_shortest_path import GreedyShortestPath
 from prolothar_rule_mining.models.event_flow_graph.alignment.heuristics import ReachabilityHeuristic
 from prolothar_rule_mining.models.event_flow_graph.cover import CoverComputer
+from prolothar_rule_mining.models.event_flow_graph.alignment.alignment_cache import AlignmentCache
 
 from prolothar_rule_mining.rule_miner.data_to_sequence.consequence.event_flow_graph_miner.abstract import EventFlowGraphMiner
 from prolothar_rule_mining.rule_miner.data_to_sequence.consequence.candidates import AddSequencePathCandidate
@@ -47,11 +48,14 @@ class SequenceBottomUpEventFlowGraphMiner(EventFlowGraphMiner):
                  alignment_finder_factory_score: Callable[[EventFlowGraph], AlignmentFinder] = None,
                  add_edge_from_source_to_sink: bool = False,
                  discard_failed_candidates: bool = False,
-                 patience: int = sys.maxsize):
+                 patience: int = sys.maxsize,
+                 alignment_cache: AlignmentCache = None):
         """
-        creates a new EventFlowGraphMiner
+        creates a new EventFlowGraphMiner. if an alignment_cache is given,
+        alignments are shared between model extension and cover computation.
         """
         self.__logger = logger if logger is not None else do_nothing
+        self.__alignment_cache = alignment_cache
         if alignment_finder_factory_model_extension is None:
             self.__alignment_finder_factory_model_extension = lambda graph: GreedyShortestPath(
                 graph, ReachabilityHeuristic(graph))
@@ -74,7 +78,8 @@ class SequenceBottomUpEventFlowGraphMiner(EventFlowGraphMiner):
         for sequence in reversed(dataset.get_sequences_ordered_by_frequency()):
             candidate_transformation = AddSequencePathCandidate(
                 graph, sequence,
-                alignment_finder=self.__alignment_finder_factory_model_extension(graph))
+                alignment_finder=self.__alignment_finder_factory_model_extension(graph),
+                alignment_cache=self.__alignment_cache)
             candidate_transformation.apply()
 
             candidate_mdl = self.__compute_mdl(graph, dataset)
@@ -116,7 +121,8 @@ class SequenceBottomUpEventFlowGraphMiner(EventFlowGraphMiner):
             self, graph: EventFlowGraph, dataset: TargetSequenceDataset) -> float:
         mdl_of_model = graph.compute_mdl(dataset.get_set_of_sequence_symbols())
         cover = CoverComputer(
-            graph, alignment_finder=self.__alignment_finder_factory_score(graph)
+            graph, alignment_finder=self.__alignment_finder_factory_score(graph),
+            alignment_cache=self.__alignment_cache
         ).compute_cover(dataset)
         self.__logger(cover.count_model_codes())
         mdl_of_data = cover.compute_mdl()
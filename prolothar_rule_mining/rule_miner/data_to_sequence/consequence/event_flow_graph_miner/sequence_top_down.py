@@ -34,6 +34,7 @@ from prolothar_rule_mining.models.event_flow_graph.cover import compute_cover
 from prolothar_rule_mining.models.event_flow_graph.cover import CoverComputer
 from prolothar_rule_mining.models.event_flow_graph.alignment.alignment_finder import AlignmentFinder
 from prolothar_rule_mining.models.event_flow_graph.alignment.petrinet import PetrinetAligner
+from prolothar_rule_mining.models.event_flow_graph.alignment.alignment_cache import AlignmentCache
 
 from prolothar_rule_mining.rule_miner.data_to_sequence.consequence.event_flow_graph_miner.abstract import EventFlowGraphMiner
 from prolothar_rule_mining.rule_miner.data_to_sequence.consequence.event_flow_graph_miner.sequence_alignment_no_mdl import SequenceAlignmentNoMdl
@@ -53,12 +54,15 @@ class SequenceTopDownEventFlowGraphMiner(EventFlowGraphMiner):
     def __init__(
         self, logger: Callable[[str],None] = print, exact_mdl: bool = True,
         alignment_finder_factory_score: Callable[[EventFlowGraph], AlignmentFinder] = None,
-        patience: int = sys.maxsize):
+        patience: int = sys.maxsize, alignment_cache: AlignmentCache = None):
         """
-        creates a new EventFlowGraphMiner
+        creates a new EventFlowGraphMiner. if an alignment_cache is given,
+        alignments are shared between the initial graph construction and all
+        cover computations during pruning.
         """
         self.__logger = logger if logger is not None else do_nothing
         self.__exact_mdl = exact_mdl
+        self.__alignment_cache = alignment_cache
 
         if alignment_finder_factory_score is None:
             self.__alignment_finder_factory_score = PetrinetAligner
@@ -68,7 +72,9 @@ class SequenceTopDownEventFlowGraphMiner(EventFlowGraphMiner):
         self.__patience = patience
 
     def mine_event_flow_graph(self, dataset: TargetSequenceDataset) -> EventFlowGraphMiner:
-        graph = SequenceAlignmentNoMdl(logger=self.__logger).mine_event_flow_graph(dataset)
+        graph = SequenceAlignmentNoMdl(
+            logger=self.__logger, alignment_cache=self.__alignment_cache
+        ).mine_event_flow_graph(dataset)
 
         current_mdl, cover = self.__compute_mdl(graph, dataset)
         self.__logger('start pruning with MDL %.2f' % current_mdl)
@@ -156,7 +162,8 @@ class SequenceTopDownEventFlowGraphMiner(EventFlowGraphMiner):
 
         cover_computer = CoverComputer(
             graph, assign_instances_to_edges=True,
-            alignment_finder=self.__alignment_finder_factory_score(graph))
+            alignment_finder=self.__alignment_finder_factory_score(graph),
+            alignment_cache=self.__alignment_cache)
 
         for instance in invalidated_instances:
             cover_computer.extend_cover(cover, instance)
@@ -186,7 +193,9 @@ class SequenceTopDownEventFlowGraphMiner(EventFlowGraphMiner):
         for sequence, steps in cached_cover_steps.items():
             cover.set_steps_for_sequence(steps, sequence)
 
-        cover_computer = CoverComputer(graph, assign_instances_to_edges=True)
+        cover_computer = CoverComputer(
+            graph, assign_instances_to_edges=True,
+            alignment_cache=self.__alignment_cache)
 
         for instance in invalidated_instances:
             cover_computer.extend_cover(cover, instance)
@@ -203,7 +212,8 @@ class SequenceTopDownEventFlowGraphMiner(EventFlowGraphMiner):
         mdl_of_model = graph.compute_mdl(dataset.get_set_of_sequence_symbols())
         cover = compute_cover(dataset, graph,
                               assign_instances_to_edges=assign_instances_to_edges,
-                              alignment_finder=self.__alignment_finder_factory_score(graph))
+                              alignment_finder=self.__alignment_finder_factory_score(graph),
+                              alignment_cache=self.__alignment_cache)
         mdl_of_data = cover.compute_mdl()
         if verbose:
             print((mdl_of_model, mdl_of_data))
@@ -22,7 +22,7 @@ by Polato et al.
 https://andrea.burattin.net/public-files/publications/2018-computing.pdf
 """
 
-from typing import Callable, Tuple, Dict, List, Hashable
+from typing import Callable, Tuple, Dict, Iterable, List, Hashable
 from math import log2
 from collections import defaultdict
 import itertools
@@ -60,13 +60,24 @@ class DatsRule:
         """
         generates an event sequence based on the attributes of the given instance
         """
-        transition_probabilities = self.__compute_transition_probabilities(instance)
-        state_graph = self.__build_state_graph_with_costs(transition_probabilities)
-        shortest_path = nx.dijkstra_path(
-            state_graph,
-            str(next(iter(self.__transition_system.get_start_states()))),
-            '_END_')[:-1]
-        return [state_graph[s1][s2]['event'] for s1,s2 in pairwise(shortest_path)]
+        return self.execute_many([instance])[0]
+
+    def execute_many(self, instances: Iterable[Instance]) -> List[List[str]]:
+        """
+        generates an event sequence for each of the given instances. the
+        classifier of each state predicts all instances in one batch, which is
+        much faster than calling execute() for each instance
+        """
+        instances = list(instances)
+        sequences = []
+        for transition_probabilities in self.__compute_transition_probabilities(instances):
+            state_graph = self.__build_state_graph_with_costs(transition_probabilities)
+            shortest_path = nx.dijkstra_path(
+                state_graph,
+                str(next(iter(self.__transition_system.get_start_states()))),
+                '_END_')[:-1]
+            sequences.append([state_graph[s1][s2]['event'] for s1,s2 in pairwise(shortest_path)])
+        return sequences
 
     def __build_state_graph_with_costs(self, transition_probabilities) -> nx.DiGraph:
         edges = [
@@ -90,23 +101,39 @@ class DatsRule:
     def get_nr_of_nodes(self) -> int:
         return self.__transition_system.get_nr_of_states()
 
-    def __compute_transition_probabilities(self, instance: Instance) -> Dict[Transition, float]:
-        transition_probabilities = {}
+    def __compute_transition_probabilities(
+            self, instances: List[Instance]) -> List[Dict[Transition, float]]:
+        transition_probabilities = [{} for _ in instances]
         for state in self.__transition_system.get_states():
+            transitions = list(self.__transition_system.yield_outgoing_transitions(state))
             if state in self.__state_classifier_dict:
-                try:
-                    predicted_probability = self.__state_classifier_dict[state].predict_proba(instance)
-                except KeyError:
-                    #the instance has a categorical value that has never been seen at this state
-                    predicted_probability = defaultdict(lambda: 1 / ilen(
-                        self.__transition_system.yield_outgoing_transitions(state)))
-                for transition in self.__transition_system.yield_outgoing_transitions(state):
-                    transition_probabilities[transition] = predicted_probability[str(transition[1])]
+                predicted_probabilities = self.__predict_proba_many(state, instances)
+                for probabilities_of_instance, predicted_probability in zip(
+                        transition_probabilities, predicted_probabilities):
+                    for transition in transitions:
+                        probabilities_of_instance[transition] = predicted_probability[str(transition[1])]
             else:
-                for transition in self.__transition_system.yield_outgoing_transitions(state):
-                    transition_probabilities[transition] = 1
+                for probabilities_of_instance in transition_probabilities:
+                    for transition in transitions:
+                        probabilities_of_instance[transition] = 1
         return transition_probabilities
 
+    def __predict_proba_many(self, state: State, instances: List[Instance]) -> List[Dict[str, float]]:
+        classifier = self.__state_classifier_dict[state]
+        try:
+            return classifier.predict_proba_many(instances)
+        except KeyError:
+            #at least one instance has a categorical value that has never been
+            #seen at this state => predict instance by instance
+            predicted_probabilities = []
+            for instance in instances:
+                try:
+                    predicted_probabilities.append(classifier.predict_proba(instance))
+                except KeyError:
+                    predicted_probabilities.append(defaultdict(lambda: 1 / ilen(
+                        self.__transition_system.yield_outgoing_transitions(state))))
+            return predicted_probabilities
+
     def get_transition_system(self) -> LabeledTransitionSystem:
         return self.__transition_system
 
@@ -220,15 +220,7 @@ class IfThenElseRule(Rule):
             subdataset: Dataset) -> 'IfThenElseRule':
         candidate = IfThenElseRule(condition)
         candidate.get_if_branch().append_rule(literal)
-        if_instances = []
-        else_instances = []
-        for instance in subdataset:
-            if condition.check_instance(instance):
-                if_instances.append(instance)
-            else:
-                else_instances.append(instance)
-        candidate.get_if_branch().set_subdataset_supplier(
-                lambda: subdataset.get_subdataset(if_instances))
-        candidate.get_else_branch().set_subdataset_supplier(
-                lambda: subdataset.get_subdataset(else_instances))
+        if_view, else_view = condition.divide_dataset_view(subdataset)
+        candidate.get_if_branch().set_subdataset_supplier(if_view.to_dataset)
+        candidate.get_else_branch().set_subdataset_supplier(else_view.to_dataset)
         return candidate
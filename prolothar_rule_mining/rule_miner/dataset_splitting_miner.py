@@ -17,6 +17,7 @@
 from typing import Union, Callable
 
 from prolothar_common.models.dataset import Dataset
+from prolothar_rule_mining.models.dataset_view import DatasetView
 from prolothar_rule_mining.rule_miner.classification.rules import Rule as ClassificationRule
 from prolothar_rule_mining.rule_miner.data_to_sequence.rules import Rule as DataToSequenceRule
 from prolothar_rule_mining.rule_miner.multilabel.rules import Rule as MultilabelRule
@@ -30,12 +31,30 @@ class DatasetSplittingMiner:
 
     def __init__(
             self, training_function: Callable[[Dataset, Dataset], Rule],
-            hold_out_set_ratio: float = 0.2, random_seed: Union[int, None] = None):
+            hold_out_set_ratio: float = 0.2, random_seed: Union[int, None] = None,
+            use_dataset_views: bool = False):
+        """
+        Parameters
+        ----------
+        training_function : Callable[[Dataset, Dataset], Rule]
+            mines a rule given a trainset and a hold out set
+        hold_out_set_ratio : float, optional
+            proportion of the dataset that is held out, by default 0.2
+        random_seed : Union[int, None], optional
+            seed of the random split, by default None
+        use_dataset_views : bool, optional
+            if True, trainset and hold out set are DatasetViews on the dataset
+            instead of copies. the split is the same. the training function
+            must only read the datasets. by default False
+        """
         self.__hold_out_set_ratio = hold_out_set_ratio
         self.__random_seed = random_seed
         self.__training_function = training_function
+        self.__use_dataset_views = use_dataset_views
 
     def mine_rules(self, dataset: Dataset) -> Rule:
+        if self.__use_dataset_views and not isinstance(dataset, DatasetView):
+            dataset = DatasetView(dataset)
         trainset, testset = dataset.split(
             self.__hold_out_set_ratio, random_seed=self.__random_seed)
         return self.__training_function(trainset, testset)
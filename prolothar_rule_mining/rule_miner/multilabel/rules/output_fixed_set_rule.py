@@ -11,7 +11,8 @@ class OutputFixedSetRule(Rule):
     """
 
     def __init__(self, output: Set[str]):
-        self.__output = output
+        #the set is copied, because the hash is computed only once
+        self.__output = set(output)
 
     def predict(self, instance: Instance) -> Set[str]:
         return self.__output
@@ -24,6 +25,3 @@ class OutputFixedSetRule(Rule):
 
     def __repr__(self) -> str:
         return self.to_string()
-
-    def __hash__(self) -> int:
-        return hash(self.to_string())
@@ -19,8 +19,12 @@ import unittest
 from prolothar_rule_mining.models.event_flow_graph import EventFlowGraph
 from prolothar_rule_mining.models.event_flow_graph.alignment.a_star import AStar
 from prolothar_rule_mining.models.event_flow_graph.alignment.alignment import Alignment
+from prolothar_rule_mining.models.event_flow_graph.alignment.heuristics import NullHeuristic
 from prolothar_rule_mining.models.event_flow_graph.alignment.heuristics import ReachabilityHeuristic
 from prolothar_rule_mining.models.event_flow_graph.alignment.heuristics import ProductNetHeuristic
+from prolothar_rule_mining.models.event_flow_graph.alignment.heuristics import EventCountHeuristic
+from prolothar_rule_mining.models.event_flow_graph.alignment.heuristics import ShortestPathToSinkHeuristic
+from prolothar_rule_mining.models.event_flow_graph.alignment.heuristics import MaximumHeuristic
 
 class TestAStar(unittest.TestCase):
 
@@ -63,6 +67,10 @@ class TestAStar(unittest.TestCase):
         actual_alignment = alignment_finder.compute_alignment(['B', 'A', 'C'])
         self.assertEqual(expected_alignment, actual_alignment)
 
+        alignment_finder = AStar(self.graph, EventCountHeuristic(self.graph))
+        actual_alignment = alignment_finder.compute_alignment(['B', 'A', 'C'])
+        self.assertEqual(expected_alignment, actual_alignment)
+
     def test_compute_alignment_empty_sequence(self):
         alignment_finder = AStar(self.graph, ReachabilityHeuristic(self.graph))
         actual_alignment = alignment_finder.compute_alignment([])
@@ -127,5 +135,29 @@ class TestAStar(unittest.TestCase):
 
         self.assertEqual(expected_alignment, actual_alignment)
 
+    def test_compute_alignments(self):
+        alignment_finder = AStar(self.graph, ReachabilityHeuristic(self.graph))
+        sequences = [['B', 'A', 'C'], [], ('B', 'A', 'C'), ['B', 'C', 'A']]
+        alignments = alignment_finder.compute_alignments(sequences)
+        self.assertEqual(len(sequences), len(alignments))
+        for sequence, alignment in zip(sequences, alignments):
+            self.assertEqual(alignment_finder.compute_alignment(sequence), alignment)
+        self.assertIs(alignments[0], alignments[2])
+
+    def test_is_optimal_only_with_admissible_heuristic(self):
+        for heuristic in [NullHeuristic(), ReachabilityHeuristic(self.graph),
+                          EventCountHeuristic(self.graph),
+                          ShortestPathToSinkHeuristic(self.graph),
+                          MaximumHeuristic([
+                              ReachabilityHeuristic(self.graph),
+                              ShortestPathToSinkHeuristic(self.graph)])]:
+            self.assertTrue(AStar(self.graph, heuristic).is_optimal())
+        for heuristic in [ProductNetHeuristic(self.graph),
+                          lambda node, event_index, sequence: 0,
+                          MaximumHeuristic([
+                              ReachabilityHeuristic(self.graph),
+                              ProductNetHeuristic(self.graph)])]:
+            self.assertFalse(AStar(self.graph, heuristic).is_optimal())
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,114 @@
+'''
+    This file is part of Prolothar-Rule-Mining (More Info: https://github.com/shs-it/prolothar-rule-mining).
+
+    Prolothar-Rule-Mining is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    Prolothar-Rule-Mining is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with Prolothar-Rule-Mining. If not, see <https://www.gnu.org/licenses/>.
+'''
+import unittest
+
+from prolothar_rule_mining.models.event_flow_graph import EventFlowGraph
+from prolothar_rule_mining.models.event_flow_graph.alignment.adaptive import AdaptiveAlignmentFinder
+from prolothar_rule_mining.models.event_flow_graph.alignment.a_star import AStar
+from prolothar_rule_mining.models.event_flow_graph.alignment.beam_search import BeamSearch
+from prolothar_rule_mining.models.event_flow_graph.alignment.sync_or_log_only import SyncOrLogOnly
+from prolothar_rule_mining.models.event_flow_graph.alignment.greedy_shortest_path import GreedyShortestPath
+from prolothar_rule_mining.models.event_flow_graph.alignment.heuristics import ReachabilityHeuristic
+
+class TestAdaptiveAlignmentFinder(unittest.TestCase):
+
+    def setUp(self):
+        self.graph = EventFlowGraph()
+        self.node_a = self.graph.add_node('A')
+        self.node_b = self.graph.add_node('B')
+        self.node_c = self.graph.add_node('C')
+        self.graph.add_edge(self.graph.source, self.graph.sink)
+        self.graph.add_edge(self.graph.source, self.node_a)
+        self.graph.add_edge(self.node_a, self.node_b)
+        self.graph.add_edge(self.node_a, self.node_c)
+        self.graph.add_edge(self.node_b, self.graph.sink)
+        self.graph.add_edge(self.node_c, self.graph.sink)
+        self.heuristic = ReachabilityHeuristic(self.graph)
+        self.alignment_finder = AdaptiveAlignmentFinder(self.graph, [
+            SyncOrLogOnly(self.graph),
+            GreedyShortestPath(self.graph, self.heuristic),
+            AStar(self.graph, self.heuristic)
+        ], lower_bound=self.heuristic, nr_of_warm_up_calls=2)
+
+    def test_compute_alignment(self):
+        #no finder is skipped during the warm-up, i.e. the statistics do not
+        #depend on the measured runtimes
+        sequences = [('A', 'B'), ('A', 'C'), ('A',), ('B', 'A'), ('D',)]
+        alignment_finder = AdaptiveAlignmentFinder(self.graph, [
+            SyncOrLogOnly(self.graph),
+            GreedyShortestPath(self.graph, self.heuristic),
+            AStar(self.graph, self.heuristic)
+        ], lower_bound=self.heuristic, nr_of_warm_up_calls=len(sequences))
+        a_star = AStar(self.graph, self.heuristic)
+        for sequence in sequences:
+            self.assertEqual(
+                a_star.compute_alignment(sequence),
+                alignment_finder.compute_alignment(sequence))
+        statistics = alignment_finder.get_statistics()
+        self.assertEqual(5, statistics[0]['nr_of_calls'])
+        #('D',) can only be aligned with log moves, which the lower bound proves
+        self.assertEqual(3, statistics[0]['nr_of_accepted_alignments'])
+        self.assertEqual(
+            5, sum(s['nr_of_accepted_alignments'] for s in statistics))
+        self.assertTrue(alignment_finder.is_optimal())
+
+    def test_skip_finder_that_does_not_pay_off(self):
+        for _ in range(2):
+            self.alignment_finder.compute_alignment(('B', 'A'))
+        statistics = self.alignment_finder.get_statistics()
+        self.assertEqual(0, statistics[0]['nr_of_accepted_alignments'])
+        self.alignment_finder.compute_alignment(('B', 'A'))
+        statistics = self.alignment_finder.get_statistics()
+        self.assertEqual(2, statistics[0]['nr_of_calls'])
+        self.assertEqual(1, statistics[0]['nr_of_skips'])
+
+    def test_truncated_alignment_is_not_accepted(self):
+        alignment_finder = AdaptiveAlignmentFinder(self.graph, [
+            BeamSearch(self.graph, self.heuristic, 1),
+            AStar(self.graph, self.heuristic)
+        ], lower_bound=self.heuristic, time_limits_in_seconds=[0.0, None])
+        alignment = alignment_finder.compute_alignment(('A', 'B'))
+        self.assertEqual(AStar(self.graph, self.heuristic).compute_alignment(('A', 'B')), alignment)
+        self.assertFalse(alignment.is_truncated())
+        statistics = alignment_finder.get_statistics()
+        self.assertEqual(1, statistics[0]['nr_of_timeouts'])
+        self.assertEqual(0, statistics[0]['nr_of_accepted_alignments'])
+        self.assertEqual(0, statistics[1]['nr_of_timeouts'])
+        self.assertEqual(1, statistics[1]['nr_of_accepted_alignments'])
+        self.assertTrue(alignment_finder.is_optimal())
+
+    def test_timeout_of_last_finder(self):
+        alignment_finder = AdaptiveAlignmentFinder(self.graph, [
+            SyncOrLogOnly(self.graph),
+            BeamSearch(self.graph, self.heuristic, 1)
+        ], lower_bound=self.heuristic, time_limits_in_seconds=[None, 0.0])
+        self.assertFalse(alignment_finder.is_optimal())
+        alignment = alignment_finder.compute_alignment(('B', 'A'))
+        self.assertTrue(alignment.is_truncated())
+        statistics = alignment_finder.get_statistics()
+        self.assertEqual(1, statistics[1]['nr_of_timeouts'])
+        self.assertEqual(0, sum(s['nr_of_accepted_alignments'] for s in statistics))
+        self.assertRaises(ValueError, AdaptiveAlignmentFinder, self.graph, [
+            SyncOrLogOnly(self.graph)], time_limits_in_seconds=[None, 0.0])
+
+    def test_finders_must_work_on_same_graph(self):
+        self.assertRaises(ValueError, AdaptiveAlignmentFinder, self.graph, [])
+        self.assertRaises(ValueError, AdaptiveAlignmentFinder, self.graph, [
+            AStar(EventFlowGraph(), self.heuristic)])
+
+if __name__ == '__main__':
+    unittest.main()
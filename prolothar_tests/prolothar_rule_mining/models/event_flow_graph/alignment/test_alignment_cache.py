@@ -0,0 +1,120 @@
+'''
+    This file is part of Prolothar-Rule-Mining (More Info: https://github.com/shs-it/prolothar-rule-mining).
+
+    Prolothar-Rule-Mining is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    Prolothar-Rule-Mining is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with Prolothar-Rule-Mining. If not, see <https://www.gnu.org/licenses/>.
+'''
+import unittest
+
+from prolothar_rule_mining.models.event_flow_graph import EventFlowGraph
+from prolothar_rule_mining.models.event_flow_graph.alignment.a_star import AStar
+from prolothar_rule_mining.models.event_flow_graph.alignment.greedy_shortest_path import GreedyShortestPath
+from prolothar_rule_mining.models.event_flow_graph.alignment.alignment_cache import AlignmentCache
+from prolothar_rule_mining.models.event_flow_graph.alignment.prefix_trie import PrefixTrieAligner
+from prolothar_rule_mining.models.event_flow_graph.alignment.heuristics import ReachabilityHeuristic
+
+class TestAlignmentCache(unittest.TestCase):
+
+    def setUp(self):
+        self.graph = EventFlowGraph()
+        self.node_a = self.graph.add_node('A')
+        self.node_b = self.graph.add_node('B')
+        self.node_c = self.graph.add_node('C')
+        self.graph.add_edge(self.graph.source, self.node_a)
+        self.graph.add_edge(self.node_a, self.node_b)
+        self.graph.add_edge(self.node_b, self.graph.sink)
+        self.graph.add_edge(self.graph.source, self.node_c)
+        self.graph.add_edge(self.node_c, self.graph.sink)
+
+    def create_a_star(self) -> AStar:
+        return AStar(self.graph, ReachabilityHeuristic(self.graph))
+
+    def test_compute_alignment_hit_and_miss(self):
+        cache = AlignmentCache()
+        alignment = cache.compute_alignment(self.create_a_star(), ('A', 'B'))
+        self.assertEqual(self.create_a_star().compute_alignment(('A', 'B')), alignment)
+        self.assertIs(alignment, cache.wrap(self.create_a_star()).compute_alignment(['A', 'B']))
+        self.assertEqual(1, cache.nr_of_hits)
+        self.assertEqual(1, cache.nr_of_misses)
+
+        #different configuration
+        cache.compute_alignment(
+            GreedyShortestPath(self.graph, ReachabilityHeuristic(self.graph)), ('A', 'B'))
+        self.assertEqual(2, cache.nr_of_misses)
+
+    def test_compute_alignments_computes_misses_in_one_batch(self):
+        cache = AlignmentCache()
+        cached_alignment = cache.compute_alignment(self.create_a_star(), ('A', 'B'))
+        batches = []
+        class _BatchRecorder(PrefixTrieAligner):
+            def compute_alignments(self, sequences):
+                batches.append(list(sequences))
+                return super().compute_alignments(sequences)
+        alignment_finder = _BatchRecorder(self.graph)
+        alignments = cache.wrap(alignment_finder).compute_alignments(
+            [('A', 'B'), ('C',), ('A', 'C'), ('C',)])
+        self.assertListEqual([[('A', 'B'), ('C',), ('A', 'C')]], batches)
+        self.assertIs(alignments[1], alignments[3])
+        self.assertIs(alignments[2], cache.compute_alignment(alignment_finder, ['A', 'C']))
+        self.assertEqual(4, cache.nr_of_misses)
+        self.assertEqual(1, cache.nr_of_hits)
+        self.assertIsNotNone(cached_alignment)
+
+    def test_reverted_change_leads_to_hit(self):
+        cache = AlignmentCache()
+        cache.compute_alignment(self.create_a_star(), ('A', 'C'))
+        edge = self.graph.add_edge(self.node_a, self.node_c)
+        cache.compute_alignment(self.create_a_star(), ('A', 'C'))
+        self.graph.remove_edge(edge)
+        cache.compute_alignment(self.create_a_star(), ('A', 'C'))
+        self.assertEqual(1, cache.nr_of_hits)
+        self.assertEqual(2, cache.nr_of_misses)
+        self.assertEqual(0, cache.nr_of_carried_over_alignments)
+
+    def test_carry_over_unaffected_alignments(self):
+        cache = AlignmentCache()
+        alignment_ab = cache.compute_alignment(self.create_a_star(), ('A', 'B'))
+        alignment_ac = cache.compute_alignment(self.create_a_star(), ('A', 'C'))
+        alignment_c = cache.compute_alignment(self.create_a_star(), ('C',))
+
+        #the new edge can only improve the alignment of "AC"
+        self.graph.add_edge(self.node_a, self.node_c)
+        self.assertIs(alignment_ab, cache.compute_alignment(self.create_a_star(), ('A', 'B')))
+        self.assertIsNot(alignment_ac, cache.compute_alignment(self.create_a_star(), ('A', 'C')))
+        self.assertEqual(1, cache.nr_of_carried_over_alignments)
+
+        #the removed edge is only used by "C"
+        self.graph.remove_edge(self.graph.get_edge(self.graph.source, self.node_c))
+        self.assertIs(alignment_ab, cache.compute_alignment(self.create_a_star(), ('A', 'B')))
+        self.assertIsNot(alignment_c, cache.compute_alignment(self.create_a_star(), ('C',)))
+        self.assertEqual(2, cache.nr_of_carried_over_alignments)
+
+        #greedy alignments are never carried over
+        cache.compute_alignment(
+            GreedyShortestPath(self.graph, ReachabilityHeuristic(self.graph)), ('A', 'B'))
+        self.graph.add_node('D')
+        cache.compute_alignment(
+            GreedyShortestPath(self.graph, ReachabilityHeuristic(self.graph)), ('A', 'B'))
+        self.assertEqual(2, cache.nr_of_carried_over_alignments)
+
+    def test_memory_budget(self):
+        cache = AlignmentCache(max_nr_of_moves=6)
+        cache.compute_alignment(self.create_a_star(), ('A', 'B'))
+        cache.compute_alignment(self.create_a_star(), ('C',))
+        self.assertEqual(2, len(cache))
+        cache.compute_alignment(self.create_a_star(), ('A', 'C'))
+        self.assertEqual(1, cache.nr_of_evicted_alignments)
+        self.assertLessEqual(cache.get_statistics()['moves'], 6)
+
+if __name__ == '__main__':
+    unittest.main()
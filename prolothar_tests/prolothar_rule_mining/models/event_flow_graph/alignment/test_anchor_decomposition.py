@@ -0,0 +1,93 @@
+'''
+    This file is part of Prolothar-Rule-Mining (More Info: https://github.com/shs-it/prolothar-rule-mining).
+
+    Prolothar-Rule-Mining is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    Prolothar-Rule-Mining is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with Prolothar-Rule-Mining. If not, see <https://www.gnu.org/licenses/>.
+'''
+import unittest
+
+from prolothar_rule_mining.models.event_flow_graph import EventFlowGraph
+from prolothar_rule_mining.models.event_flow_graph.alignment.a_star import AStar
+from prolothar_rule_mining.models.event_flow_graph.alignment.anchor_decomposition import AnchorDecompositionAligner
+from prolothar_rule_mining.models.event_flow_graph.alignment.alignment import Alignment
+from prolothar_rule_mining.models.event_flow_graph.alignment.heuristics import ReachabilityHeuristic
+
+class TestAnchorDecompositionAligner(unittest.TestCase):
+
+    def setUp(self):
+        #source -> A -> (B|C) -> D -> (E -> F|F) -> sink
+        self.graph = EventFlowGraph()
+        self.node_a = self.graph.add_node('A')
+        self.node_b = self.graph.add_node('B')
+        self.node_c = self.graph.add_node('C')
+        self.node_d = self.graph.add_node('D')
+        self.node_e = self.graph.add_node('E')
+        self.node_f = self.graph.add_node('F')
+        self.node_f_2 = self.graph.add_node('F')
+
+        self.graph.add_edge(self.graph.source, self.node_a)
+        self.graph.add_edge(self.node_a, self.node_b)
+        self.graph.add_edge(self.node_a, self.node_c)
+        self.graph.add_edge(self.node_b, self.node_d)
+        self.graph.add_edge(self.node_c, self.node_d)
+        self.graph.add_edge(self.node_d, self.node_e)
+        self.graph.add_edge(self.node_e, self.node_f)
+        self.graph.add_edge(self.node_d, self.node_f_2)
+        self.graph.add_edge(self.node_f, self.graph.sink)
+        self.graph.add_edge(self.node_f_2, self.graph.sink)
+
+        self.alignment_finder = AnchorDecompositionAligner(
+            self.graph, lambda graph: AStar(graph, ReachabilityHeuristic(graph)))
+
+    def test_compute_alignment(self):
+        expected_alignment = Alignment()
+        expected_alignment.append_sync_move(self.node_a, 0)
+        expected_alignment.append_log_move(1)
+        expected_alignment.append_sync_move(self.node_c, 2)
+        expected_alignment.append_sync_move(self.node_d, 3)
+        expected_alignment.append_sync_move(self.node_e, 4)
+        expected_alignment.append_sync_move(self.node_f, 5)
+        expected_alignment.append_sync_move(self.graph.sink, 6)
+        self.assertEqual(
+            expected_alignment,
+            self.alignment_finder.compute_alignment(['A', 'X', 'C', 'D', 'E', 'F']))
+
+    def test_compute_alignment_with_missing_anchor(self):
+        expected_alignment = Alignment()
+        expected_alignment.append_sync_move(self.node_a, 0)
+        expected_alignment.append_sync_move(self.node_b, 1)
+        expected_alignment.append_model_move(self.node_d)
+        expected_alignment.append_sync_move(self.node_f_2, 2)
+        expected_alignment.append_sync_move(self.graph.sink, 3)
+        self.assertEqual(
+            expected_alignment,
+            self.alignment_finder.compute_alignment(['A', 'B', 'F']))
+
+    def test_same_cost_as_a_star_without_decomposition(self):
+        a_star = AStar(self.graph, ReachabilityHeuristic(self.graph))
+        for sequence in [[], ['D'], ['D', 'A'], ['A', 'D', 'D', 'F'], ['E', 'F', 'A', 'B']]:
+            self.assertEqual(
+                self.__compute_cost(a_star.compute_alignment(sequence)),
+                self.__compute_cost(self.alignment_finder.compute_alignment(sequence)))
+
+    def test_graph_change_updates_anchors(self):
+        self.graph.add_edge(self.node_a, self.node_e)
+        #D is no longer on all paths from source to sink
+        alignment = self.alignment_finder.compute_alignment(['A', 'E', 'F'])
+        self.assertEqual(0, self.__compute_cost(alignment))
+
+    def __compute_cost(self, alignment: Alignment) -> int:
+        return sum(1 for move in alignment if not move.is_sync_move())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -18,7 +18,9 @@ import unittest
 
 from prolothar_rule_mining.models.event_flow_graph import EventFlowGraph
 from prolothar_rule_mining.models.event_flow_graph.alignment.beam_search import BeamSearch
+from prolothar_rule_mining.models.event_flow_graph.alignment.alignment_cache import AlignmentCache
 from prolothar_rule_mining.models.event_flow_graph.alignment.alignment import Alignment
+from prolothar_rule_mining.models.event_flow_graph.alignment.heuristics import NullHeuristic
 from prolothar_rule_mining.models.event_flow_graph.alignment.heuristics import ReachabilityHeuristic
 from prolothar_rule_mining.models.event_flow_graph.alignment.heuristics import ShortestPathToSinkHeuristic
 from prolothar_rule_mining.models.event_flow_graph.alignment.heuristics import MaximumHeuristic
@@ -182,5 +184,87 @@ class TestBeamSearch(unittest.TestCase):
 
         self.assertEqual(expected_alignment, actual_alignment)
 
+    def test_compute_alignment_with_merged_duplicate_states(self):
+        alignment_finder = BeamSearch(
+            self.graph, ReachabilityHeuristic(self.graph), 3,
+            merge_duplicate_states=True)
+        expected_alignment = Alignment()
+        expected_alignment.append_sync_move(self.node_b_2, 0)
+        expected_alignment.append_sync_move(self.node_a_3, 1)
+        expected_alignment.append_sync_move(self.node_c_2, 2)
+        expected_alignment.append_sync_move(self.graph.sink, 3)
+        alignment = alignment_finder.compute_alignment(['B', 'A', 'C'])
+        self.assertEqual(expected_alignment, alignment)
+        self.assertFalse(alignment.is_truncated())
+
+    def test_compute_alignment_with_exhausted_budget(self):
+        alignment_finder = BeamSearch(
+            self.graph, ReachabilityHeuristic(self.graph), 3,
+            max_nr_of_expansions=2)
+        alignment = alignment_finder.compute_alignment(['B', 'A', 'C', 'D'])
+        self.assertTrue(alignment.is_truncated())
+        #the alignment must be complete, i.e. cover all events and end in sink
+        self.assertEqual(
+            [0, 1, 2, 3, 4],
+            [move.event_index for move in alignment if not move.is_model_move()])
+        self.assertIs(self.graph.sink, alignment.get_last_move().node)
+        node = self.graph.source
+        for move in alignment:
+            if move.node is not None:
+                self.assertIn(move.node, node.children)
+                node = move.node
+
+        alignment_finder = BeamSearch(
+            self.graph, ReachabilityHeuristic(self.graph), 3,
+            time_limit_in_seconds=0)
+        alignment = alignment_finder.compute_alignment(['B', 'A'])
+        self.assertTrue(alignment.is_truncated())
+        self.assertIs(self.graph.sink, alignment.get_last_move().node)
+
+        #truncated alignments are not cached
+        cache = AlignmentCache()
+        self.assertTrue(cache.compute_alignment(alignment_finder, ['B', 'A']).is_truncated())
+        self.assertEqual(0, len(cache))
+        unbounded_alignment = cache.compute_alignment(BeamSearch(
+            self.graph, ReachabilityHeuristic(self.graph), 3), ['B', 'A'])
+        self.assertFalse(unbounded_alignment.is_truncated())
+        self.assertIsNot(unbounded_alignment, alignment_finder.compute_alignment(['B', 'A']))
+
+    def test_truncated_alignment_after_graph_change(self):
+        alignment_finder = BeamSearch(
+            self.graph, ReachabilityHeuristic(self.graph), 3,
+            time_limit_in_seconds=0)
+        expected_alignment = Alignment()
+        expected_alignment.append_model_move(self.node_b)
+        expected_alignment.append_model_move(self.node_a_1)
+        expected_alignment.append_sync_move(self.graph.sink, 0)
+        self.assertEqual(expected_alignment, alignment_finder.compute_alignment([]))
+
+        self.graph.add_edge(self.graph.source, self.graph.sink)
+        expected_alignment = Alignment()
+        expected_alignment.append_sync_move(self.graph.sink, 0)
+        self.assertEqual(expected_alignment, alignment_finder.compute_alignment([]))
+
+    def test_truncated_alignment_with_unreachable_sink(self):
+        graph = EventFlowGraph()
+        dead_end = graph.add_node('X')
+        node_y = graph.add_node('Y')
+        graph.add_edge(graph.source, dead_end)
+        graph.add_edge(graph.source, node_y)
+        graph.add_edge(node_y, graph.sink)
+
+        #the best candidate is the sync move on the dead end
+        alignment_finder = BeamSearch(
+            graph, NullHeuristic(), 3, max_nr_of_expansions=1)
+        alignment = alignment_finder.compute_alignment(['X'])
+        self.assertTrue(alignment.is_truncated())
+        self.assertIs(graph.sink, alignment.get_last_move().node)
+        self.assertNotIn(dead_end, [move.node for move in alignment])
+
+        alignment_finder = BeamSearch(
+            graph, NullHeuristic(), 1, max_nr_of_expansions=1)
+        with self.assertRaises(ValueError):
+            alignment_finder.compute_alignment(['X'])
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,99 @@
+'''
+    This file is part of Prolothar-Rule-Mining (More Info: https://github.com/shs-it/prolothar-rule-mining).
+
+    Prolothar-Rule-Mining is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    Prolothar-Rule-Mining is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with Prolothar-Rule-Mining. If not, see <https://www.gnu.org/licenses/>.
+'''
+import unittest
+
+from random import Random
+
+from prolothar_rule_mining.models.event_flow_graph import EventFlowGraph
+from prolothar_rule_mining.models.event_flow_graph.alignment.a_star import AStar
+from prolothar_rule_mining.models.event_flow_graph.alignment.divide_and_conquer import DivideAndConquerAligner
+from prolothar_rule_mining.models.event_flow_graph.alignment.alignment import Alignment
+from prolothar_rule_mining.models.event_flow_graph.alignment.heuristics import ReachabilityHeuristic
+
+class TestDivideAndConquerAligner(unittest.TestCase):
+
+    def setUp(self):
+        self.graph = EventFlowGraph()
+
+        self.node_a_1 = self.graph.add_node('A')
+        self.node_a_2 = self.graph.add_node('A')
+        self.node_a_3 = self.graph.add_node('A')
+        self.node_b = self.graph.add_node('B')
+        self.node_b_2 = self.graph.add_node('B')
+        self.node_c = self.graph.add_node('C')
+        self.node_c_2 = self.graph.add_node('C')
+        self.node_d = self.graph.add_node('D')
+
+        self.graph.add_edge(self.graph.source, self.node_b)
+        self.graph.add_edge(self.graph.source, self.node_c)
+        self.graph.add_edge(self.graph.source, self.node_b_2)
+        self.graph.add_edge(self.node_b, self.node_a_1)
+        self.graph.add_edge(self.node_b_2, self.node_a_3)
+        self.graph.add_edge(self.node_c, self.node_d)
+        self.graph.add_edge(self.node_d, self.node_a_2)
+        self.graph.add_edge(self.node_a_1, self.graph.sink)
+        self.graph.add_edge(self.node_a_2, self.graph.sink)
+        self.graph.add_edge(self.node_a_3, self.node_c_2)
+        self.graph.add_edge(self.node_c_2, self.graph.sink)
+
+    def test_compute_alignment_bac(self):
+        expected_alignment = Alignment()
+        expected_alignment.append_sync_move(self.node_b_2, 0)
+        expected_alignment.append_sync_move(self.node_a_3, 1)
+        expected_alignment.append_sync_move(self.node_c_2, 2)
+        expected_alignment.append_sync_move(self.graph.sink, 3)
+
+        for max_subsequence_length in [1, 2, 32]:
+            alignment_finder = DivideAndConquerAligner(
+                self.graph, max_subsequence_length=max_subsequence_length)
+            actual_alignment = alignment_finder.compute_alignment(['B', 'A', 'C'])
+            self.assertEqual(expected_alignment, actual_alignment)
+
+    def test_compute_alignment_empty_sequence(self):
+        alignment_finder = DivideAndConquerAligner(self.graph)
+        actual_alignment = alignment_finder.compute_alignment([])
+        self.assertEqual(3, len(actual_alignment))
+        self.assertEqual(2, sum(1 for move in actual_alignment if move.is_model_move()))
+        self.assertEqual(self.graph.sink, actual_alignment.get_last_move().node)
+
+    def test_same_cost_as_a_star(self):
+        random = Random(42)
+        a_star = AStar(self.graph, ReachabilityHeuristic(self.graph))
+        a_star_with_threshold = AStar(
+            self.graph, ReachabilityHeuristic(self.graph), linear_memory_threshold=2)
+        alignment_finder = DivideAndConquerAligner(self.graph, max_subsequence_length=2)
+        for _ in range(50):
+            sequence = [random.choice('ABCD') for _ in range(random.randint(0, 8))]
+            expected_cost = self.__compute_cost(a_star.compute_alignment(sequence))
+            self.assertEqual(expected_cost, self.__compute_cost(
+                alignment_finder.compute_alignment(sequence)))
+            self.assertEqual(expected_cost, self.__compute_cost(
+                a_star_with_threshold.compute_alignment(sequence)))
+
+    def test_alignment_on_cyclic_graph(self):
+        self.graph.add_edge(self.node_a_1, self.node_b)
+        alignment_finder = DivideAndConquerAligner(self.graph, max_subsequence_length=2)
+        sequence = ['B', 'A'] * 20
+        alignment = alignment_finder.compute_alignment(sequence)
+        self.assertEqual(0, self.__compute_cost(alignment))
+        self.assertEqual(len(sequence) + 1, len(alignment))
+
+    def __compute_cost(self, alignment: Alignment) -> int:
+        return sum(1 for move in alignment if not move.is_sync_move())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,224 @@
+'''
+    This file is part of Prolothar-Rule-Mining (More Info: https://github.com/shs-it/prolothar-rule-mining).
+
+    Prolothar-Rule-Mining is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    Prolothar-Rule-Mining is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with Prolothar-Rule-Mining. If not, see <https://www.gnu.org/licenses/>.
+'''
+import unittest
+
+import heapq
+import itertools
+from random import Random
+
+import networkx as nx
+
+from prolothar_rule_mining.models.event_flow_graph import EventFlowGraph
+from prolothar_rule_mining.models.event_flow_graph.alignment.heuristics import EventCountHeuristic
+from prolothar_rule_mining.models.event_flow_graph.alignment.heuristics import ProductNetHeuristic
+from prolothar_rule_mining.models.event_flow_graph.alignment.heuristics import ShortestPathToSinkHeuristic
+
+def _create_random_graph(random: Random, nr_of_nodes: int, nr_of_extra_edges: int) -> EventFlowGraph:
+    graph = EventFlowGraph()
+    nodes = [graph.add_node(random.choice('ABCD')) for _ in range(nr_of_nodes)]
+    #a chain makes sure that every node can reach the sink
+    for from_node, to_node in zip([graph.source] + nodes, nodes + [graph.sink]):
+        graph.add_edge(from_node, to_node)
+    for _ in range(nr_of_extra_edges):
+        graph.add_edge(random.choice([graph.source] + nodes),
+                       random.choice(nodes + [graph.sink]))
+    return graph
+
+def _create_random_sequence(random: Random):
+    return tuple(random.choice('ABCDE') for _ in range(random.randint(0, 6)))
+
+def _compute_optimal_remaining_cost(
+        graph: EventFlowGraph, node, event_index: int, sequence) -> int:
+    """
+    Dijkstra on the states (node, event_index) of the search space of an
+    alignment from the given state to the sink
+    """
+    target = (graph.sink, len(sequence) + 1)
+    costs = {(node, event_index): 0}
+    tie_breaker = itertools.count()
+    open_states = [(0, next(tie_breaker), node, event_index)]
+    while open_states:
+        cost, _, node, event_index = heapq.heappop(open_states)
+        if (node, event_index) == target:
+            return cost
+        if cost > costs[(node, event_index)] or node is graph.sink:
+            continue
+        next_event = sequence[event_index] if event_index < len(sequence) else graph.sink.event
+        next_states = []
+        if event_index < len(sequence):
+            next_states.append((cost + 1, node, event_index + 1))
+        for child in node.children:
+            if child is not graph.sink:
+                next_states.append((cost + 1, child, event_index))
+            if child.event == next_event and event_index <= len(sequence):
+                next_states.append((cost, child, event_index + 1))
+        for next_cost, next_node, next_event_index in next_states:
+            if next_cost < costs.get((next_node, next_event_index), float('inf')):
+                costs[(next_node, next_event_index)] = next_cost
+                heapq.heappush(open_states, (
+                    next_cost, next(tie_breaker), next_node, next_event_index))
+    return float('inf')
+
+def _compute_path_lengths_to_sink_by_relaxation(graph: EventFlowGraph):
+    """
+    the former implementation of ShortestPathToSinkHeuristic
+    """
+    path_lengths = {graph.sink: 0}
+    open_nodes = [graph.sink]
+    while open_nodes:
+        node = open_nodes.pop()
+        for parent in node.parents:
+            current_cost = path_lengths.get(parent, float('inf'))
+            candidate_cost = path_lengths[node] + 1
+            if candidate_cost < current_cost:
+                path_lengths[parent] = candidate_cost
+                open_nodes.append(parent)
+    return path_lengths
+
+def _compute_product_net_heuristic_with_networkx(
+        graph: EventFlowGraph, node, sequence) -> int:
+    """
+    the former implementation of ProductNetHeuristic, which builds the product
+    net of the graph and the rest of the sequence explicitly
+    """
+    sink_id = graph.sink.node_id
+    product_net = graph.to_networkx()
+    for _, nbrsdict in product_net.adjacency():
+        for edge_attributes in nbrsdict.values():
+            edge_attributes['weight'] = 1
+    connected_nodes = set(nx.descendants(product_net, node.node_id))
+    connected_nodes.update(nx.ancestors(product_net, node.node_id))
+    connected_nodes.add(node.node_id)
+    product_net.remove_nodes_from(set(product_net.nodes()).difference(connected_nodes))
+
+    event_nodes = ['e%d' % i for i in range(len(sequence))]
+    product_net.add_edge(graph.source.node_id, event_nodes[0], weight=1)
+    for event_node, next_event_node in zip(event_nodes, event_nodes[1:]):
+        product_net.add_edge(event_node, next_event_node, weight=1)
+    product_net.add_edge(event_nodes[-1], sink_id, weight=1)
+
+    for event_node, event in zip(event_nodes, sequence):
+        for model_node in graph.nodes():
+            if model_node.event == event and model_node.node_id in product_net.nodes:
+                sync_node = event_node + '_' + str(model_node.node_id)
+                for predecessor in list(itertools.chain(
+                        product_net.predecessors(event_node),
+                        product_net.predecessors(model_node.node_id))):
+                    product_net.add_edge(predecessor, sync_node, weight=0)
+                for successor in list(itertools.chain(
+                        product_net.successors(event_node),
+                        product_net.successors(model_node.node_id))):
+                    product_net.add_edge(
+                        sync_node, successor, weight=0 if successor == sink_id else 1)
+
+    return nx.single_source_dijkstra(product_net, node.node_id, target=sink_id)[0]
+
+class TestHeuristics(unittest.TestCase):
+
+    def test_event_count_heuristic_is_admissible(self):
+        random = Random(42)
+        for _ in range(30):
+            graph = _create_random_graph(random, random.randint(1, 8), random.randint(0, 6))
+            heuristic = EventCountHeuristic(graph)
+            for _ in range(5):
+                sequence = _create_random_sequence(random)
+                for node in itertools.chain([graph.source], graph.nodes()):
+                    for event_index in range(len(sequence) + 1):
+                        self.assertLessEqual(
+                            heuristic(node, event_index, sequence),
+                            _compute_optimal_remaining_cost(graph, node, event_index, sequence),
+                            msg='%r %d %r' % (node, event_index, sequence))
+                self.assertEqual(0, heuristic(graph.sink, len(sequence) + 1, sequence))
+
+    def test_shortest_path_to_sink_heuristic_equals_relaxation(self):
+        random = Random(42)
+        for _ in range(30):
+            graph = _create_random_graph(random, random.randint(1, 8), random.randint(0, 6))
+            heuristic = ShortestPathToSinkHeuristic(graph)
+            for _ in range(2):
+                path_lengths = _compute_path_lengths_to_sink_by_relaxation(graph)
+                for node, path_length in path_lengths.items():
+                    for event_index in range(5):
+                        sequence = ('A',) * random.randint(0, 5)
+                        self.assertEqual(
+                            max(path_length - (len(sequence) + 1 - event_index), 0),
+                            heuristic(node, event_index, sequence))
+                #the heuristic must follow changes of the graph
+                nodes = list(graph.nodes())
+                graph.add_edge(random.choice(nodes), graph.sink)
+
+    def test_product_net_heuristic_cache(self):
+        random = Random(42)
+        for _ in range(10):
+            graph = _create_random_graph(random, random.randint(1, 6), random.randint(0, 4))
+            cached_heuristic = ProductNetHeuristic(graph, max_cache_size=10)
+            nodes = list(itertools.chain([graph.source], graph.nodes()))
+            sequences = [_create_random_sequence(random) for _ in range(3)]
+            for _ in range(40):
+                node = random.choice(nodes)
+                sequence = random.choice(sequences)
+                event_index = random.randint(0, len(sequence))
+                self.assertEqual(
+                    ProductNetHeuristic(graph)(node, event_index, sequence),
+                    cached_heuristic(node, event_index, sequence))
+
+    def test_product_net_heuristic_equals_explicit_product_net(self):
+        random = Random(42)
+        for _ in range(20):
+            graph = _create_random_graph(random, random.randint(1, 6), random.randint(0, 6))
+            heuristic = ProductNetHeuristic(graph)
+            for _ in range(3):
+                sequence = _create_random_sequence(random)
+                for node in itertools.chain([graph.source], graph.nodes()):
+                    for event_index in range(len(sequence)):
+                        self.assertEqual(
+                            _compute_product_net_heuristic_with_networkx(
+                                graph, node, sequence[event_index:]),
+                            heuristic(node, event_index, sequence),
+                            msg='%r %d %r' % (node, event_index, sequence))
+
+    def test_tables_are_rebuilt_after_graph_change(self):
+        graph = EventFlowGraph()
+        node_a = graph.add_node('A')
+        node_b = graph.add_node('B')
+        graph.add_edge(graph.source, node_a)
+        graph.add_edge(node_a, node_b)
+        graph.add_edge(node_b, graph.sink)
+        sequence = ('A', 'B', 'B', 'B')
+        heuristics = [
+            EventCountHeuristic(graph), ProductNetHeuristic(graph),
+            ShortestPathToSinkHeuristic(graph)
+        ]
+        self.assertListEqual([3, 1, 0], [h(node_b, 1, sequence) for h in heuristics])
+        graph.add_edge(node_b, node_b)
+        self.assertListEqual([0, 0, 0], [h(node_b, 1, sequence) for h in heuristics])
+        graph.remove_edge(graph.get_edge(node_b, node_b))
+        node_c = graph.add_node('C')
+        graph.add_edge(graph.source, node_c)
+        graph.add_edge(node_c, graph.sink)
+        new_heuristics = [
+            EventCountHeuristic(graph), ProductNetHeuristic(graph),
+            ShortestPathToSinkHeuristic(graph)
+        ]
+        for node in [graph.source, node_a, node_b, node_c]:
+            for event_index in range(len(sequence) + 1):
+                self.assertListEqual(
+                    [h(node, event_index, sequence) for h in new_heuristics],
+                    [h(node, event_index, sequence) for h in heuristics])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,119 @@
+'''
+    This file is part of Prolothar-Rule-Mining (More Info: https://github.com/shs-it/prolothar-rule-mining).
+
+    Prolothar-Rule-Mining is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    Prolothar-Rule-Mining is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with Prolothar-Rule-Mining. If not, see <https://www.gnu.org/licenses/>.
+'''
+import unittest
+
+from random import Random
+
+from prolothar_common.parallel.multiprocess import MultiprocessComputationEngine
+from prolothar_common.parallel.single_thread.single_thread import SingleThreadComputationEngine
+from prolothar_common.parallel.threading.threading import ThreadingComputationEngine
+
+from prolothar_rule_mining.models.event_flow_graph import EventFlowGraph
+from prolothar_rule_mining.models.event_flow_graph.shared_graph import SharedEventFlowGraph
+from prolothar_rule_mining.models.event_flow_graph.alignment import parallel
+from prolothar_rule_mining.models.event_flow_graph.alignment.parallel import ParallelAlignmentFinder
+from prolothar_rule_mining.models.event_flow_graph.alignment.divide_and_conquer import DivideAndConquerAligner
+from prolothar_rule_mining.models.event_flow_graph.alignment.alignment import Alignment
+
+class TestParallelAlignmentFinder(unittest.TestCase):
+
+    def setUp(self):
+        self.graph = EventFlowGraph()
+        node_a = self.graph.add_node('A')
+        node_b = self.graph.add_node('B')
+        node_c = self.graph.add_node('C')
+        self.graph.add_edge(self.graph.source, node_a)
+        self.graph.add_edge(node_a, node_b)
+        self.graph.add_edge(node_a, node_c)
+        self.graph.add_edge(node_b, node_a)
+        self.graph.add_edge(node_b, self.graph.sink)
+        self.graph.add_edge(node_c, self.graph.sink)
+        random = Random(42)
+        self.sequences = [
+            tuple(random.choice('ABCD') for _ in range(random.randint(0, 8)))
+            for _ in range(20)
+        ]
+        self.sequences.extend(self.sequences[:5])
+
+    def test_compute_alignments_in_worker_processes(self):
+        self.__test_compute_alignments(MultiprocessComputationEngine(nr_of_workers=2))
+
+    def test_compute_alignments_single_thread(self):
+        self.__test_compute_alignments(SingleThreadComputationEngine())
+
+    def test_compute_alignments_with_threads(self):
+        self.__test_compute_alignments(ThreadingComputationEngine(nr_of_workers=2))
+
+    def test_no_graph_copy_is_kept_in_calling_process(self):
+        for computation_engine in [SingleThreadComputationEngine(),
+                                   ThreadingComputationEngine(nr_of_workers=2)]:
+            ParallelAlignmentFinder(
+                self.graph, DivideAndConquerAligner, computation_engine
+            ).compute_alignments(self.sequences)
+            self.assertEqual((None, None, None), parallel._worker_alignment_finder)
+
+    def test_worker_builds_alignment_finder_once_per_graph_version(self):
+        created_finders = []
+        def create_alignment_finder(graph):
+            created_finders.append(DivideAndConquerAligner(graph))
+            return created_finders[-1]
+        try:
+            for _ in range(2):
+                with SharedEventFlowGraph.create(self.graph) as shared_graph:
+                    for sequence in self.sequences[:3]:
+                        parallel._align_with_shared_graph({
+                            'shared_graph': shared_graph,
+                            'create_alignment_finder': create_alignment_finder
+                        }, sequence)
+            self.assertEqual(1, len(created_finders))
+            self.graph.add_edge(self.graph.source, self.graph.sink)
+            with SharedEventFlowGraph.create(self.graph) as shared_graph:
+                parallel._align_with_shared_graph({
+                    'shared_graph': shared_graph,
+                    'create_alignment_finder': create_alignment_finder
+                }, self.sequences[0])
+            self.assertEqual(2, len(created_finders))
+        finally:
+            parallel._clear_worker_alignment_finder()
+
+    def __test_compute_alignments(self, computation_engine):
+        alignment_finder = ParallelAlignmentFinder(
+            self.graph, DivideAndConquerAligner, computation_engine)
+        self.assertTrue(alignment_finder.is_optimal())
+        reference = DivideAndConquerAligner(self.graph)
+        alignments = alignment_finder.compute_alignments(self.sequences)
+        self.assertEqual(len(self.sequences), len(alignments))
+        for sequence, alignment in zip(self.sequences, alignments):
+            self.assertEqual(
+                self.__compute_cost(reference.compute_alignment(sequence)),
+                self.__compute_cost(alignment))
+            self.assertEqual(
+                list(range(len(sequence) + 1)),
+                [move.event_index for move in alignment if not move.is_model_move()])
+            #moves must refer to the nodes of the graph and not to copies
+            for move in list(alignment)[:-1]:
+                if not move.is_log_move():
+                    self.assertIs(self.graph.get_node_by_id(move.node.node_id), move.node)
+            self.assertIs(self.graph.sink, alignment.get_last_move().node)
+        for i in range(5):
+            self.assertIs(alignments[i], alignments[-5 + i])
+
+    def __compute_cost(self, alignment: Alignment) -> int:
+        return sum(1 for move in alignment if not move.is_sync_move())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+'''
+    This file is part of Prolothar-Rule-Mining (More Info: https://github.com/shs-it/prolothar-rule-mining).
+
+    Prolothar-Rule-Mining is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    Prolothar-Rule-Mining is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with Prolothar-Rule-Mining. If not, see <https://www.gnu.org/licenses/>.
+'''
+import unittest
+
+from random import Random
+
+from prolothar_rule_mining.models.event_flow_graph import EventFlowGraph
+from prolothar_rule_mining.models.event_flow_graph.alignment.a_star import AStar
+from prolothar_rule_mining.models.event_flow_graph.alignment.prefix_trie import PrefixTrieAligner
+from prolothar_rule_mining.models.event_flow_graph.alignment.alignment import Alignment
+from prolothar_rule_mining.models.event_flow_graph.alignment.heuristics import ReachabilityHeuristic
+
+class TestPrefixTrieAligner(unittest.TestCase):
+
+    def setUp(self):
+        self.graph = EventFlowGraph()
+
+        self.node_a_1 = self.graph.add_node('A')
+        self.node_a_2 = self.graph.add_node('A')
+        self.node_a_3 = self.graph.add_node('A')
+        self.node_b = self.graph.add_node('B')
+        self.node_b_2 = self.graph.add_node('B')
+        self.node_c = self.graph.add_node('C')
+        self.node_c_2 = self.graph.add_node('C')
+        self.node_d = self.graph.add_node('D')
+
+        self.graph.add_edge(self.graph.source, self.node_b)
+        self.graph.add_edge(self.graph.source, self.node_c)
+        self.graph.add_edge(self.graph.source, self.node_b_2)
+        self.graph.add_edge(self.node_b, self.node_a_1)
+        self.graph.add_edge(self.node_b_2, self.node_a_3)
+        self.graph.add_edge(self.node_c, self.node_d)
+        self.graph.add_edge(self.node_d, self.node_a_2)
+        self.graph.add_edge(self.node_a_1, self.graph.sink)
+        self.graph.add_edge(self.node_a_2, self.graph.sink)
+        self.graph.add_edge(self.node_a_3, self.node_c_2)
+        self.graph.add_edge(self.node_c_2, self.graph.sink)
+
+    def test_compute_alignment_bac(self):
+        expected_alignment = Alignment()
+        expected_alignment.append_sync_move(self.node_b_2, 0)
+        expected_alignment.append_sync_move(self.node_a_3, 1)
+        expected_alignment.append_sync_move(self.node_c_2, 2)
+        expected_alignment.append_sync_move(self.graph.sink, 3)
+        alignment_finder = PrefixTrieAligner(self.graph)
+        self.assertEqual(expected_alignment, alignment_finder.compute_alignment(['B', 'A', 'C']))
+
+    def test_compute_alignments_with_shared_prefixes(self):
+        random = Random(42)
+        a_star = AStar(self.graph, ReachabilityHeuristic(self.graph))
+        alignment_finder = PrefixTrieAligner(self.graph)
+        sequences = [
+            tuple(random.choice('ABCD') for _ in range(random.randint(0, 8)))
+            for _ in range(30)
+        ]
+        #prefixes of other sequences and duplicates
+        sequences.extend(sequence[:len(sequence) // 2] for sequence in sequences[:10])
+        sequences.extend(sequences[:5])
+        alignments = alignment_finder.compute_alignments(sequences)
+        self.assertEqual(len(sequences), len(alignments))
+        for sequence, alignment in zip(sequences, alignments):
+            self.assertEqual(
+                self.__compute_cost(a_star.compute_alignment(sequence)),
+                self.__compute_cost(alignment))
+            self.assertEqual(
+                list(range(len(sequence) + 1)),
+                [move.event_index for move in alignment if not move.is_model_move()])
+            self.assertEqual(self.graph.sink, alignment.get_last_move().node)
+        for i in range(5):
+            self.assertIs(alignments[i], alignments[-5 + i])
+        self.assertListEqual([], alignment_finder.compute_alignments([]))
+
+    def test_alignment_on_cyclic_graph(self):
+        self.graph.add_edge(self.node_a_1, self.node_b)
+        alignment_finder = PrefixTrieAligner(self.graph)
+        sequences = [('B', 'A') * 20, ('B', 'A') * 10 + ('C',)]
+        alignments = alignment_finder.compute_alignments(sequences)
+        self.assertEqual(0, self.__compute_cost(alignments[0]))
+        self.assertEqual(len(sequences[0]) + 1, len(alignments[0]))
+        self.assertEqual(1, self.__compute_cost(alignments[1]))
+
+    def __compute_cost(self, alignment: Alignment) -> int:
+        return sum(1 for move in alignment if not move.is_sync_move())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -68,5 +68,19 @@ class TestBeamSearch(unittest.TestCase):
         expected_alignment.append_sync_move(self.graph.sink, 3)
         self.assertEqual(expected_alignment, actual_alignment)
 
+    def test_compute_alignment_after_graph_change(self):
+        alignment_finder = SyncOrLogOnly(self.graph)
+        self.assertTrue(alignment_finder.compute_alignment(['B', 'C', 'A'])
+                        .get_last_move().node is self.graph.sink)
+        self.graph.add_edge(self.node_b, self.node_c_2)
+        self.graph.add_edge(self.node_c_2, self.node_a_2)
+        actual_alignment = alignment_finder.compute_alignment(['B', 'C', 'A'])
+        expected_alignment = Alignment()
+        expected_alignment.append_sync_move(self.node_b, 0)
+        expected_alignment.append_sync_move(self.node_c_2, 1)
+        expected_alignment.append_sync_move(self.node_a_2, 2)
+        expected_alignment.append_sync_move(self.graph.sink, 3)
+        self.assertEqual(expected_alignment, actual_alignment)
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -20,6 +20,8 @@ from random import Random
 
 from prolothar_rule_mining.models.event_flow_graph import EventFlowGraph
 from prolothar_rule_mining.models.event_flow_graph.cover import compute_cover
+from prolothar_rule_mining.models.event_flow_graph.alignment.divide_and_conquer import DivideAndConquerAligner
+from prolothar_rule_mining.models.event_flow_graph.alignment.prefix_trie import PrefixTrieAligner
 from prolothar_rule_mining.models.dataset_generator import TargetSequenceDatasetGenerator as DatasetGenerator
 
 class TestCoverComputation(unittest.TestCase):
@@ -44,6 +46,33 @@ class TestCoverComputation(unittest.TestCase):
         self.assertEqual(0, model_counts.redundant_events)
         self.assertEqual(120, model_counts.matched_events)
         self.assertGreater(model_counts.missed_events, 0)
+    def test_compute_cover_with_batch_alignment(self):
+        generator = DatasetGenerator(nr_of_categorical_features=2,
+                                     nr_of_numerical_features=0,
+                                     nr_of_categories=5,
+                                     nr_of_instances=120,
+                                     random=Random(42),
+                                     max_rule_depth=2,
+                                     nr_of_sequence_symbols=8)
+        dataset, _ = generator.generate()
+
+        event_flow_graph = EventFlowGraph()
+        last_node = event_flow_graph.source
+        for event in next(iter(dataset)).get_target_sequence():
+            node = event_flow_graph.add_node(event)
+            event_flow_graph.add_edge(last_node, node)
+            last_node = node
+        event_flow_graph.add_edge(last_node, event_flow_graph.sink)
+
+        expected_counts = compute_cover(
+            dataset, event_flow_graph,
+            alignment_finder=DivideAndConquerAligner(event_flow_graph)).count_model_codes()
+        model_counts = compute_cover(
+            dataset, event_flow_graph,
+            alignment_finder=PrefixTrieAligner(event_flow_graph)).count_model_codes()
+        self.assertEqual(
+            expected_counts.missed_events + expected_counts.redundant_events,
+            model_counts.missed_events + model_counts.redundant_events)
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -219,5 +219,31 @@ class TestEventFlowGraph(unittest.TestCase):
 
         self.assertEqual(expected_graph, graph)
 
+    def test_get_version(self):
+        graph = EventFlowGraph()
+        initial_version = graph.get_version()
+        changes = []
+        graph.add_change_listener(lambda old, new, change_type, element: changes.append(
+            (old, new, change_type)))
+
+        node_a = graph.add_node('A')
+        version_with_node = graph.get_version()
+        self.assertNotEqual(initial_version, version_with_node)
+        edge = graph.add_edge(graph.source, node_a)
+        graph.add_edge(graph.source, node_a)
+        self.assertNotEqual(version_with_node, graph.get_version())
+        graph.remove_edge(edge)
+        self.assertEqual(version_with_node, graph.get_version())
+        graph.remove_node(node_a)
+        self.assertEqual(initial_version, graph.get_version())
+
+        self.assertListEqual(
+            ['add_node', 'add_edge', 'remove_edge', 'remove_node'],
+            [change_type for _, _, change_type in changes])
+        self.assertEqual(initial_version, changes[0][0])
+        self.assertEqual(initial_version, changes[-1][1])
+
+        self.assertNotEqual(graph.get_version(), EventFlowGraph().get_version())
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,76 @@
+'''
+    This file is part of Prolothar-Rule-Mining (More Info: https://github.com/shs-it/prolothar-rule-mining).
+
+    Prolothar-Rule-Mining is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    Prolothar-Rule-Mining is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with Prolothar-Rule-Mining. If not, see <https://www.gnu.org/licenses/>.
+'''
+import unittest
+
+from random import Random
+
+from prolothar_rule_mining.models.event_flow_graph.min_max_heap import BoundedMinMaxHeap
+
+class TestBoundedMinMaxHeap(unittest.TestCase):
+
+    def test_pop_min_and_pop_max(self):
+        heap = BoundedMinMaxHeap()
+        for value in [5, 3, 8, 1, 9, 2, 7]:
+            heap.push(str(value), value)
+        self.assertEqual(7, len(heap))
+        self.assertEqual(1, heap.peek_min_priority())
+        self.assertEqual('1', heap.pop_min())
+        self.assertEqual('9', heap.pop_max())
+        self.assertEqual('2', heap.pop_min())
+        self.assertEqual('8', heap.pop_max())
+        self.assertEqual(['3', '5', '7'], [heap.pop_min() for _ in range(3)])
+        self.assertFalse(heap)
+        self.assertRaises(IndexError, heap.pop_min)
+        self.assertRaises(IndexError, heap.pop_max)
+
+    def test_equal_priorities_are_ordered_by_insertion(self):
+        heap = BoundedMinMaxHeap()
+        for payload in 'abcd':
+            heap.push(payload, 1.0)
+        self.assertEqual('a', heap.pop_min())
+        self.assertEqual('d', heap.pop_max())
+        self.assertEqual('b', heap.pop_min())
+
+    def test_max_size(self):
+        heap = BoundedMinMaxHeap(3)
+        self.assertIsNone(heap.push('a', 2))
+        self.assertIsNone(heap.push('b', 4))
+        self.assertIsNone(heap.push('c', 3))
+        self.assertEqual('b', heap.push('d', 1))
+        self.assertEqual('e', heap.push('e', 5))
+        self.assertEqual(['d', 'a', 'c'], [heap.pop_min() for _ in range(3)])
+        self.assertRaises(ValueError, BoundedMinMaxHeap, 0)
+
+    def test_against_sorted_list(self):
+        random = Random(42)
+        heap = BoundedMinMaxHeap()
+        expected = []
+        for i in range(2000):
+            if expected and random.random() < 0.4:
+                if random.random() < 0.5:
+                    self.assertEqual(expected.pop(0)[1], heap.pop_min())
+                else:
+                    self.assertEqual(expected.pop()[1], heap.pop_max())
+            else:
+                priority = random.randint(0, 20)
+                heap.push(i, priority)
+                expected.append((priority, i))
+                expected.sort()
+            self.assertEqual(len(expected), len(heap))
+
+if __name__ == '__main__':
+    unittest.main()
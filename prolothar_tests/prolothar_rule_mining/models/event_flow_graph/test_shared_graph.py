@@ -0,0 +1,90 @@
+'''
+    This file is part of Prolothar-Rule-Mining (More Info: https://github.com/shs-it/prolothar-rule-mining).
+
+    Prolothar-Rule-Mining is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    Prolothar-Rule-Mining is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with Prolothar-Rule-Mining. If not, see <https://www.gnu.org/licenses/>.
+'''
+import unittest
+
+import pickle
+
+from prolothar_common.parallel.multiprocess import MultiprocessComputationEngine
+
+from prolothar_rule_mining.models.event_flow_graph import EventFlowGraph
+from prolothar_rule_mining.models.event_flow_graph.shared_graph import SharedEventFlowGraph
+
+def _get_child_events(shared_graph: SharedEventFlowGraph, node_index: int):
+    return sorted(shared_graph.get_event(child) for child in shared_graph.get_children(node_index))
+
+class TestSharedEventFlowGraph(unittest.TestCase):
+
+    def setUp(self):
+        self.graph = EventFlowGraph()
+        node_a = self.graph.add_node('A')
+        node_b = self.graph.add_node('B')
+        node_c = self.graph.add_node('Ç')
+        self.removed_node = self.graph.add_node('A')
+        self.graph.add_edge(self.graph.source, node_a)
+        self.graph.add_edge(self.graph.source, node_b)
+        self.graph.add_edge(node_a, node_c)
+        self.graph.add_edge(node_b, node_c)
+        self.graph.add_edge(node_c, node_a)
+        self.graph.add_edge(node_c, self.graph.sink)
+        self.graph.remove_node(self.removed_node)
+        self.shared_graph = SharedEventFlowGraph.create(self.graph)
+
+    def tearDown(self):
+        self.shared_graph.close()
+        self.shared_graph.unlink()
+
+    def test_structure(self):
+        self.assertEqual(5, self.shared_graph.get_nr_of_nodes())
+        self.assertEqual(6, self.shared_graph.get_nr_of_edges())
+        self.assertEqual(self.graph.get_version(), self.shared_graph.get_version())
+        self.assertEqual('ε', self.shared_graph.get_event(0))
+        self.assertEqual('ω', self.shared_graph.get_event(1))
+        for node in self.graph.nodes():
+            node_index = self.shared_graph.get_node_index(node.node_id)
+            self.assertEqual(node.node_id, self.shared_graph.get_node_id(node_index))
+            self.assertEqual(node.event, self.shared_graph.get_event(node_index))
+            self.assertEqual(
+                sorted(child.event for child in node.children),
+                _get_child_events(self.shared_graph, node_index))
+            self.assertEqual(
+                sorted(parent.event for parent in node.parents),
+                sorted(self.shared_graph.get_event(parent)
+                       for parent in self.shared_graph.get_parents(node_index)))
+        self.assertRaises(KeyError, self.shared_graph.get_node_index, self.removed_node.node_id)
+        self.assertRaises(KeyError, self.shared_graph.get_node_index, 1000)
+        self.assertEqual(self.graph, self.shared_graph.to_event_flow_graph())
+
+    def test_arrays_are_read_only(self):
+        with self.assertRaises(ValueError):
+            self.shared_graph.get_children(0)[0] = 1
+
+    def test_pickle_attaches_to_shared_memory(self):
+        attached_graph = pickle.loads(pickle.dumps(self.shared_graph))
+        self.assertEqual(self.shared_graph.get_name(), attached_graph.get_name())
+        self.assertEqual(self.graph, attached_graph.to_event_flow_graph())
+        attached_graph.close()
+
+    def test_worker_processes(self):
+        computation_engine = MultiprocessComputationEngine(nr_of_workers=2)
+        node_indices = list(range(self.shared_graph.get_nr_of_nodes()))
+        self.assertEqual(
+            [_get_child_events(self.shared_graph, i) for i in node_indices],
+            computation_engine.create_partitionable_list(node_indices).map(
+                self.shared_graph, _get_child_events))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -15,6 +15,7 @@
     along with Prolothar-Rule-Mining. If not, see <https://www.gnu.org/licenses/>.
 '''
 import unittest
+import pickle
 
 from prolothar_common.models.dataset.instance import Instance
 from prolothar_common.models.dataset.attributes import CategoricalAttribute
@@ -27,6 +28,7 @@ from prolothar_rule_mining.models.conditions import NotCondition
 from prolothar_rule_mining.models.conditions import AndCondition
 from prolothar_rule_mining.models.conditions import OrCondition
 from prolothar_rule_mining.models.conditions import InCondition
+from prolothar_rule_mining.models.conditions import InRangeCondition
 
 class TestConditions(unittest.TestCase):
 
@@ -167,5 +169,73 @@ class TestConditions(unittest.TestCase):
             expected_compressed_condition.get_conditions(),
             actual_compressed_condition.get_conditions())
 
+    def test_hash_and_equality(self):
+        condition = OrCondition([
+            NotCondition(InCondition(self.color_attribute, {'red', 'green'})),
+            AndCondition([
+                GreaterThanCondition(self.size_attribute, 150),
+                LessOrEqualCondition(self.weight_attribute, 20)
+            ])
+        ])
+        same_condition = OrCondition([
+            NotCondition(InCondition(self.color_attribute, {'green', 'red'})),
+            AndCondition([
+                GreaterThanCondition(self.size_attribute, 150),
+                LessOrEqualCondition(self.weight_attribute, 20)
+            ])
+        ])
+        other_condition = OrCondition([
+            NotCondition(InCondition(self.color_attribute, {'red'})),
+            AndCondition([
+                GreaterThanCondition(self.size_attribute, 150),
+                LessOrEqualCondition(self.weight_attribute, 20)
+            ])
+        ])
+        self.assertEqual(condition, same_condition)
+        self.assertEqual(hash(condition), hash(same_condition))
+        self.assertNotEqual(condition, other_condition)
+        self.assertNotEqual(condition, condition.get_conditions()[1])
+        self.assertNotEqual(condition, 'not a condition')
+        self.assertEqual(1, len({condition, same_condition}))
+
+        unpickled_condition = pickle.loads(pickle.dumps(condition))
+        self.assertEqual(condition, unpickled_condition)
+        self.assertEqual(hash(condition), hash(unpickled_condition))
+
+    def test_attribute_conditions_are_immutable(self):
+        condition = EqualsCondition(self.color_attribute, 'red')
+        for name, value in [('attribute', self.size_attribute),
+                            ('operator_symbol', '!='), ('value', 'green')]:
+            with self.assertRaises(AttributeError):
+                setattr(condition, name, value)
+        self.assertEqual(EqualsCondition(self.color_attribute, 'red'), condition)
+        self.assertEqual(hash(EqualsCondition(self.color_attribute, 'red')), hash(condition))
+        condition = InRangeCondition(self.size_attribute, 150, 160)
+        with self.assertRaises(AttributeError):
+            condition.lower_bound_inclusive = True
+        self.assertFalse(condition.lower_bound_inclusive)
+
+    def test_composite_conditions_are_immutable(self):
+        c1 = EqualsCondition(self.color_attribute, 'red')
+        c2 = GreaterThanCondition(self.size_attribute, 150)
+        c3 = LessThanCondition(self.weight_attribute, 20)
+        conditions = [c1, c2]
+        x = AndCondition(conditions)
+        y = AndCondition([c1, c3])
+        hash_value = hash(x)
+        conditions[1] = c3
+        x.get_conditions()[1] = c3
+        self.assertEqual([c1, c2], x.get_conditions())
+        self.assertEqual(hash_value, hash(x))
+        self.assertEqual(AndCondition([c1, c2]), x)
+        self.assertNotEqual(x, y)
+        for name, value in [('conditions', (c1, c3)), ('join_operator', 'OR')]:
+            with self.assertRaises(AttributeError):
+                setattr(x, name, value)
+        condition = NotCondition(c1)
+        with self.assertRaises(AttributeError):
+            condition.condition = c2
+        self.assertEqual(NotCondition(c1), condition)
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
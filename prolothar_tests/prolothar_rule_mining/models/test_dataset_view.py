@@ -0,0 +1,92 @@
+'''
+    This file is part of Prolothar-Rule-Mining (More Info: https://github.com/shs-it/prolothar-rule-mining).
+
+    Prolothar-Rule-Mining is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    Prolothar-Rule-Mining is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with Prolothar-Rule-Mining. If not, see <https://www.gnu.org/licenses/>.
+'''
+import unittest
+
+from prolothar_common.models.dataset import ClassificationDataset
+from prolothar_common.models.dataset.instance import ClassificationInstance
+
+from prolothar_rule_mining.models.conditions import EqualsCondition
+from prolothar_rule_mining.models.conditions import GreaterThanCondition
+from prolothar_rule_mining.models.dataset_view import DatasetView
+
+class TestDatasetView(unittest.TestCase):
+
+    def setUp(self):
+        self.dataset = ClassificationDataset(['Color'], ['Size'])
+        for i,(color, size, label) in enumerate([
+                ('red', 1, 'a'), ('red', 5, 'b'), ('blue', 3, 'a'),
+                ('green', 7, 'b'), ('blue', 9, 'b'), ('red', 2, 'a')]):
+            self.dataset.add_instance(ClassificationInstance(
+                i, {'Color': color, 'Size': size}, label))
+
+    def test_divide_dataset_returns_datasets(self):
+        condition = EqualsCondition(
+            self.dataset.get_attribute_by_name('Color'), 'red')
+        red, other = condition.divide_dataset(self.dataset)
+        for dataset, view in zip((red, other), condition.divide_dataset_view(self.dataset)):
+            self.assertIsInstance(dataset, ClassificationDataset)
+            self.assertEqual(set(view), set(dataset))
+        self.assertEqual({0, 1, 5}, {instance.get_id() for instance in red})
+
+    def test_divide_dataset_view_matches_subdataset(self):
+        condition = EqualsCondition(
+            self.dataset.get_attribute_by_name('Color'), 'red')
+        for view in condition.divide_dataset_view(self.dataset):
+            self.assertIsInstance(view, DatasetView)
+            expected = self.dataset.get_subdataset(view)
+            self.assertEqual(set(expected), set(view))
+            self.assertEqual(len(expected), len(view))
+            self.assertEqual(set(expected.get_set_of_classes()),
+                             set(view.get_set_of_classes()))
+            for class_label in ['a', 'b', 'c']:
+                self.assertEqual(expected.get_class_count(class_label),
+                                 view.get_class_count(class_label))
+            for attribute in expected.get_attributes():
+                self.assertEqual(
+                    attribute.get_unique_values(),
+                    view.get_attribute_by_name(attribute.get_name()).get_unique_values())
+            self.assertEqual(
+                [a.get_name() for a in expected.get_attributes()],
+                [a.get_name() for a in view.get_attributes()])
+
+    def test_nested_views_share_root(self):
+        red, other = EqualsCondition(
+            self.dataset.get_attribute_by_name('Color'), 'red').divide_dataset_view(self.dataset)
+        large_red, small_red = GreaterThanCondition(
+            self.dataset.get_attribute_by_name('Size'), 1.5).divide_dataset_view(red)
+        self.assertIs(self.dataset, large_red.get_root_dataset())
+        self.assertEqual({2, 5}, {instance['Size'] for instance in large_red})
+        self.assertEqual({1}, {instance['Size'] for instance in small_red})
+        self.assertTrue(set(large_red.get_row_indices()).issubset(red.get_row_indices()))
+        self.assertEqual(3, len(other))
+        for instance in other:
+            self.assertIn(instance, other)
+            self.assertNotIn(instance, red)
+        self.assertEqual(0, large_red.get_class_count('c'))
+
+        materialized = large_red.to_dataset()
+        self.assertIsInstance(materialized, ClassificationDataset)
+        self.assertEqual(set(large_red), set(materialized))
+
+    def test_split_is_the_same_as_dataset_split(self):
+        trainset, testset = self.dataset.split(0.3, random_seed=42)
+        train_view, test_view = DatasetView(self.dataset).split(0.3, random_seed=42)
+        self.assertEqual(set(trainset), set(train_view))
+        self.assertEqual(set(testset), set(test_view))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+'''
+    This file is part of Prolothar-Rule-Mining (More Info: https://github.com/shs-it/prolothar-rule-mining).
+
+    Prolothar-Rule-Mining is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    Prolothar-Rule-Mining is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with Prolothar-Rule-Mining. If not, see <https://www.gnu.org/licenses/>.
+'''
+"""
+datasets and checks that are shared by the tests of the naive bayes classifiers
+"""
+
+from typing import Iterable
+import unittest
+
+import pickle
+
+from prolothar_common.models.dataset import ClassificationDataset
+from prolothar_common.models.dataset.instance import ClassificationInstance
+
+def create_three_simple_classes_dataset() -> ClassificationDataset:
+    """
+    three categories, one of them is split into two classes by its size
+    """
+    dataset = ClassificationDataset(['category'], ['size'])
+    for i in range(25):
+        dataset.add_instance(ClassificationInstance(
+            'A%d' % i, {'category': 'A', 'size': 5}, 'A'))
+    for i in range(50):
+        dataset.add_instance(ClassificationInstance(
+            'B%d' % i, {'category': 'B', 'size': 17}, 'B'))
+    for i in range(21):
+        dataset.add_instance(ClassificationInstance(
+            'Csmall%d' % i, {'category': 'C', 'size': 7}, 'CS'))
+    for i in range(20):
+        dataset.add_instance(ClassificationInstance(
+            'Clarge%d' % i, {'category': 'C', 'size': 21}, 'CL'))
+    return dataset
+
+def create_noisy_dataset(nr_of_instances: int = 60) -> ClassificationDataset:
+    """
+    dataset in which classes, categories and sizes are mixed deterministically
+    """
+    dataset = ClassificationDataset(['category'], ['size'])
+    for i in range(nr_of_instances):
+        dataset.add_instance(ClassificationInstance(
+            i, {'category': 'ABC'[i % 3], 'size': (i * 7) % 23}, 'xyz'[(i * 5) % 7 % 3]))
+    return dataset
+
+def assert_equal_probabilities(
+        test_case: unittest.TestCase, expected_model, models: Iterable,
+        instances: Iterable[ClassificationInstance]):
+    models = list(models)
+    for instance in instances:
+        expected = expected_model.predict_proba(instance)
+        for model in models:
+            probabilities = model.predict_proba(instance)
+            test_case.assertSetEqual(set(expected.keys()), set(probabilities.keys()))
+            for class_label, probability in probabilities.items():
+                test_case.assertAlmostEqual(expected[class_label], probability)
+
+def check_mine_rules_differentiate_three_simple_classes(
+        test_case: unittest.TestCase, miner):
+    dataset = create_three_simple_classes_dataset()
+    rule = miner.mine_rules(dataset)
+    test_case.assertTrue(rule is not None)
+
+    for instance in dataset:
+        predicted_class = rule.predict(instance)
+        test_case.assertEqual(instance.get_class(), predicted_class)
+        predicted_class = max(rule.predict_proba(instance).items(), key=lambda x: x[1])[0]
+        test_case.assertEqual(instance.get_class(), predicted_class)
+
+def check_partial_fit_and_merge_equal_mine_rules(test_case: unittest.TestCase, miner):
+    dataset = create_noisy_dataset()
+    instances = list(dataset)
+
+    rule = miner.mine_rules(dataset)
+    first_part = rule.create_empty_copy().partial_fit(
+        dataset.get_subdataset(instances[:25]))
+    second_part = rule.create_empty_copy().partial_fit(
+        dataset.get_subdataset(instances[25:]))
+    merged = first_part.merge(pickle.loads(pickle.dumps(second_part)))
+    incremental = rule.create_empty_copy()
+    for i in range(0, len(instances), 10):
+        incremental.partial_fit(dataset.get_subdataset(instances[i:i+10]))
+    assert_equal_probabilities(test_case, rule, [merged, incremental], dataset)
+
+    unknown_label = ClassificationDataset(['category'], ['size'])
+    unknown_label.add_instance(ClassificationInstance(
+        'unknown', {'category': 'A', 'size': 1}, 'unknown'))
+    test_case.assertRaises(ValueError, rule.create_empty_copy().partial_fit, unknown_label)
@@ -16,36 +16,56 @@
 '''
 import unittest
 
-from prolothar_common.models.dataset import ClassificationDataset
-from prolothar_common.models.dataset.instance import ClassificationInstance
+import pandas as pd
+from sklearn.naive_bayes import CategoricalNB
+from sklearn.preprocessing import LabelEncoder
+
+from prolothar_common.models.dataset.transformer import TrainableQuantileBasedDiscretization
+from prolothar_common.models.dataset.transformer.label_encoding import LabelEncoding
 from prolothar_rule_mining.rule_miner.classification.naive_bayes import CategoricalNaiveBayesClassifier
+from prolothar_rule_mining.rule_miner.classification.naive_bayes import TrainedCategoricalNaiveBayes
+
+from prolothar_tests.prolothar_rule_mining.rule_miner.classification.naive_bayes.naive_bayes_test_data import assert_equal_probabilities
+from prolothar_tests.prolothar_rule_mining.rule_miner.classification.naive_bayes.naive_bayes_test_data import check_mine_rules_differentiate_three_simple_classes
+from prolothar_tests.prolothar_rule_mining.rule_miner.classification.naive_bayes.naive_bayes_test_data import check_partial_fit_and_merge_equal_mine_rules
+from prolothar_tests.prolothar_rule_mining.rule_miner.classification.naive_bayes.naive_bayes_test_data import create_noisy_dataset
 
 class TestCategoricalNaiveBayesClassifier(unittest.TestCase):
 
     def test_mine_rules_differentiate_three_simple_classes(self):
-        dataset = ClassificationDataset(['category'], ['size'])
-        for i in range(25):
-            dataset.add_instance(ClassificationInstance(
-                'A%d' % i, {'category': 'A', 'size': 5}, 'A'))
-        for i in range(50):
-            dataset.add_instance(ClassificationInstance(
-                'B%d' % i, {'category': 'B', 'size': 17}, 'B'))
-        for i in range(21):
-            dataset.add_instance(ClassificationInstance(
-                'Csmall%d' % i, {'category': 'C', 'size': 7}, 'CS'))
-        for i in range(20):
-            dataset.add_instance(ClassificationInstance(
-                'Clarge%d' % i, {'category': 'C', 'size': 21}, 'CL'))
+        check_mine_rules_differentiate_three_simple_classes(
+            self, CategoricalNaiveBayesClassifier())
+
+    def test_partial_fit_and_merge_equal_mine_rules(self):
+        check_partial_fit_and_merge_equal_mine_rules(self, CategoricalNaiveBayesClassifier())
 
-        miner = CategoricalNaiveBayesClassifier()
-        rule = miner.mine_rules(dataset)
-        self.assertTrue(rule is not None)
+    def test_count_tables_grow_with_new_bins(self):
+        dataset = create_noisy_dataset()
+        bins = pd.IntervalIndex.from_breaks([-1, 5, 10, 15, 25])
+        label_encoder = LabelEncoder()
+        label_encoder.fit([instance.get_class() for instance in dataset])
+        def create_model():
+            #without min_categories, the count tables only cover the bins
+            #that have been seen so far
+            return TrainedCategoricalNaiveBayes(
+                ['category'], ['size'], CategoricalNB(), label_encoder,
+                TrainableQuantileBasedDiscretization({'size': bins}),
+                LabelEncoding({
+                    'category': {'A', 'B', 'C'},
+                    'size': set(str(b) for b in bins)
+                }))
+        expected_model = create_model().partial_fit(dataset)
+        small_sizes = [instance for instance in dataset if instance['size'] <= 5]
+        large_sizes = [instance for instance in dataset if instance['size'] > 5]
 
-        for instance in dataset:
-            predicted_class = rule.predict(instance)
-            self.assertEqual(instance.get_class(), predicted_class)
-            predicted_class = max(rule.predict_proba(instance).items(), key=lambda x: x[1])[0]
-            self.assertEqual(instance.get_class(), predicted_class)
+        incremental = create_model().partial_fit(dataset.get_subdataset(small_sizes))
+        incremental.partial_fit(dataset.get_subdataset(large_sizes))
+        merged = create_model().partial_fit(dataset.get_subdataset(small_sizes)).merge(
+            create_model().partial_fit(dataset.get_subdataset(large_sizes)))
+        reversed_merged = create_model().partial_fit(dataset.get_subdataset(large_sizes)).merge(
+            create_model().partial_fit(dataset.get_subdataset(small_sizes)))
+        assert_equal_probabilities(
+            self, expected_model, [incremental, merged, reversed_merged], dataset)
 
     # def test_mine_rules_differentiate_three_simple_classes(self):
     #     dataset = ClassificationDataset(['category'], ['size'])
@@ -76,4 +96,4 @@ class TestCategoricalNaiveBayesClassifier(unittest.TestCase):
     #         self.assertEqual(instance.get_class(), predicted_class)
 
 if __name__ == '__main__':
-    unittest.main()
\ No newline at end of file
+    unittest.main()
@@ -17,35 +17,38 @@
 import unittest
 
 from prolothar_common.models.dataset import ClassificationDataset
-from prolothar_common.models.dataset.instance import ClassificationInstance
 from prolothar_rule_mining.rule_miner.classification.naive_bayes import MixedNaiveBayesClassifier
 
+from prolothar_tests.prolothar_rule_mining.rule_miner.classification.naive_bayes.naive_bayes_test_data import assert_equal_probabilities
+from prolothar_tests.prolothar_rule_mining.rule_miner.classification.naive_bayes.naive_bayes_test_data import check_mine_rules_differentiate_three_simple_classes
+from prolothar_tests.prolothar_rule_mining.rule_miner.classification.naive_bayes.naive_bayes_test_data import check_partial_fit_and_merge_equal_mine_rules
+from prolothar_tests.prolothar_rule_mining.rule_miner.classification.naive_bayes.naive_bayes_test_data import create_noisy_dataset
+
 class TestMixedNaiveBayesClassifier(unittest.TestCase):
 
     def test_mine_rules_differentiate_three_simple_classes(self):
-        dataset = ClassificationDataset(['category'], ['size'])
-        for i in range(25):
-            dataset.add_instance(ClassificationInstance(
-                'A%d' % i, {'category': 'A', 'size': 5}, 'A'))
-        for i in range(50):
-            dataset.add_instance(ClassificationInstance(
-                'B%d' % i, {'category': 'B', 'size': 17}, 'B'))
-        for i in range(21):
-            dataset.add_instance(ClassificationInstance(
-                'Csmall%d' % i, {'category': 'C', 'size': 7}, 'CS'))
-        for i in range(20):
-            dataset.add_instance(ClassificationInstance(
-                'Clarge%d' % i, {'category': 'C', 'size': 21}, 'CL'))
-
-        miner = MixedNaiveBayesClassifier()
-        rule = miner.mine_rules(dataset)
-        self.assertTrue(rule is not None)
-
-        for instance in dataset:
-            predicted_class = rule.predict(instance)
-            self.assertEqual(instance.get_class(), predicted_class)
-            predicted_class = max(rule.predict_proba(instance).items(), key=lambda x: x[1])[0]
-            self.assertEqual(instance.get_class(), predicted_class)
+        check_mine_rules_differentiate_three_simple_classes(self, MixedNaiveBayesClassifier())
+
+    def test_partial_fit_and_merge_equal_mine_rules(self):
+        check_partial_fit_and_merge_equal_mine_rules(self, MixedNaiveBayesClassifier())
+
+    def test_merge_with_empty_class_partitions(self):
+        dataset = create_noisy_dataset()
+        rule = MixedNaiveBayesClassifier().mine_rules(dataset)
+        #every partition misses at least one class
+        partitions = [
+            [instance for instance in dataset if instance.get_class() == 'x'],
+            [instance for instance in dataset if instance.get_class() != 'x'],
+        ]
+        merged = rule.create_empty_copy()
+        for partition in partitions:
+            merged.merge(rule.create_empty_copy().partial_fit(
+                dataset.get_subdataset(partition)))
+        #models without any data do not change the result
+        merged.merge(rule.create_empty_copy())
+        merged_into_empty = rule.create_empty_copy().merge(merged)
+        merged_into_empty.partial_fit(ClassificationDataset(['category'], ['size']))
+        assert_equal_probabilities(self, rule, [merged, merged_into_empty], dataset)
 
 if __name__ == '__main__':
-    unittest.main()
\ No newline at end of file
+    unittest.main()
@@ -15,12 +15,34 @@
     along with Prolothar-Rule-Mining. If not, see <https://www.gnu.org/licenses/>.
 '''
 import unittest
+from random import Random
 
 from prolothar_common.models.dataset import ClassificationDataset
 from prolothar_common.models.dataset.instance import ClassificationInstance
+from prolothar_common.parallel.threading import ThreadingComputationEngine
 from prolothar_rule_mining.models.conditions import EqualsCondition
 from prolothar_rule_mining.rule_miner.classification.rce.strategy.beam_search import BeamSearch
 
+class BeamSearchWithoutPruning(BeamSearch):
+    def _estimate_causal_effect_upper_bound(self, *args) -> float:
+        return float('inf')
+
+def create_noisy_dataset() -> ClassificationDataset:
+    random = Random(42)
+    dataset = ClassificationDataset(['a', 'b', 'c'], ['x'])
+    for i in range(300):
+        values = {
+            'a': random.choice('ABCD'), 'b': random.choice('XYZ'),
+            'c': random.choice('123456'), 'x': random.randint(0, 10)}
+        if random.random() < 0.2:
+            class_label = random.choice('PQ')
+        elif values['a'] in 'AB' and (values['b'] == 'X' or values['x'] > 5):
+            class_label = 'P'
+        else:
+            class_label = 'Q'
+        dataset.add_instance(ClassificationInstance(i, values, class_label))
+    return dataset
+
 class TestBeamSearch(unittest.TestCase):
 
     def test_mine_rules_differentiate_three_simple_classes(self):
@@ -38,13 +60,40 @@ class TestBeamSearch(unittest.TestCase):
             dataset.add_instance(ClassificationInstance(
                 'Clarge%d' % i, {'category': 'C', 'size': 20}, 'CL'))
 
-        miner = BeamSearch()
-        candidate_condition = miner.create_next_condition(dataset)
-        self.assertTrue(candidate_condition is not None)
-        self.assertEqual(
-            EqualsCondition(dataset.get_attribute_by_name('category'), 'A'),
-            candidate_condition.condition
-        )
+        for miner in [BeamSearch(), BeamSearch(computation_engine=ThreadingComputationEngine(2))]:
+            candidate_condition = miner.create_next_condition(dataset)
+            self.assertTrue(candidate_condition is not None)
+            self.assertEqual(
+                EqualsCondition(dataset.get_attribute_by_name('category'), 'A'),
+                candidate_condition.condition
+            )
+
+    def test_pruning_does_not_change_result(self):
+        dataset = create_noisy_dataset()
+        log_messages = []
+        for beam_width in [1, 3, 5]:
+            expected_candidate = BeamSearchWithoutPruning(
+                beam_width=beam_width).create_next_condition(dataset)
+            miner = BeamSearch(beam_width=beam_width)
+            miner.set_logger(log_messages.append)
+            actual_candidate = miner.create_next_condition(dataset)
+            self.assertEqual(expected_candidate.condition, actual_candidate.condition)
+            self.assertAlmostEqual(expected_candidate.causal_effect, actual_candidate.causal_effect)
+        nr_of_pruned_extensions = sum(
+            int(message.split()[1]) for message in log_messages if message.startswith('pruned'))
+        self.assertGreater(nr_of_pruned_extensions, 0)
+
+    def test_sparse_matrix_products_do_not_change_result(self):
+        dataset = create_noisy_dataset()
+        for beta in [0, 2]:
+            for beam_width in [1, 3, 5]:
+                expected_candidate = BeamSearch(
+                    beta=beta, beam_width=beam_width).create_next_condition(dataset)
+                actual_candidate = BeamSearch(
+                    beta=beta, beam_width=beam_width, use_sparse_matrix_products=True
+                ).create_next_condition(dataset)
+                self.assertEqual(expected_candidate.condition, actual_candidate.condition)
+                self.assertEqual(expected_candidate.causal_effect, actual_candidate.causal_effect)
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,79 @@
+'''
+    This file is part of Prolothar-Rule-Mining (More Info: https://github.com/shs-it/prolothar-rule-mining).
+
+    Prolothar-Rule-Mining is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    Prolothar-Rule-Mining is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with Prolothar-Rule-Mining. If not, see <https://www.gnu.org/licenses/>.
+'''
+import unittest
+
+import numpy as np
+
+from prolothar_rule_mining.rule_miner.classification.rce import bitvector
+
+class TestBitvector(unittest.TestCase):
+
+    def test_kernels_match_numpy_bool_vectors(self):
+        random = np.random.default_rng(42)
+        for length in [0, 1, 63, 64, 65, 1000]:
+            a, b, c = (random.random(length) < 0.5 for _ in range(3))
+            packed_a, packed_b, packed_c = map(bitvector.pack, (a, b, c))
+            self.assertListEqual(a.tolist(), bitvector.unpack(packed_a, length).tolist())
+            self.assertEqual(np.count_nonzero(a), bitvector.popcount(packed_a))
+            self.assertEqual(np.count_nonzero(a & b), bitvector.popcount_and(packed_a, packed_b))
+            self.assertEqual(np.count_nonzero(a | b), bitvector.popcount_or(packed_a, packed_b))
+            self.assertEqual(np.count_nonzero(a & ~b), bitvector.popcount_andnot(packed_a, packed_b))
+            self.assertEqual(
+                np.count_nonzero(a & b & c),
+                bitvector.popcount_and_and(packed_a, packed_b, packed_c))
+            self.assertEqual(
+                np.count_nonzero((a | b) & c),
+                bitvector.popcount_or_and(packed_a, packed_b, packed_c))
+            self.assertListEqual(
+                (a & ~b).tolist(),
+                bitvector.unpack(bitvector.bitwise_andnot(packed_a, packed_b), length).tolist())
+            self.assertListEqual(
+                (a | b).tolist(),
+                bitvector.unpack(bitvector.bitwise_or(packed_a, packed_b), length).tolist())
+
+    def test_weighted_kernels_match_numpy_bool_vectors(self):
+        random = np.random.default_rng(42)
+        for length in [0, 1, 63, 64, 65, 1000]:
+            a, b, c = (random.random(length) < 0.5 for _ in range(3))
+            weights = random.integers(1, 10, length)
+            packed_a, packed_b, packed_c = map(bitvector.pack, (a, b, c))
+            self.assertEqual(weights[a].sum(), bitvector.weighted_popcount(packed_a, weights))
+            self.assertEqual(
+                weights[a & b].sum(),
+                bitvector.weighted_popcount_and(packed_a, packed_b, weights))
+            self.assertEqual(
+                weights[a | b].sum(),
+                bitvector.weighted_popcount_or(packed_a, packed_b, weights))
+            self.assertEqual(
+                weights[a & b & c].sum(),
+                bitvector.weighted_popcount_and_and(packed_a, packed_b, packed_c, weights))
+            self.assertEqual(
+                weights[(a | b) & c].sum(),
+                bitvector.weighted_popcount_or_and(packed_a, packed_b, packed_c, weights))
+
+    def test_kernels_reject_vectors_of_different_lengths(self):
+        a = bitvector.pack(np.ones(100, dtype=bool))
+        b = bitvector.pack(np.ones(200, dtype=bool))
+        self.assertRaises(ValueError, bitvector.popcount_and, a, b)
+        self.assertRaises(ValueError, bitvector.popcount_or_and, a, a, b)
+        self.assertRaises(ValueError, bitvector.weighted_popcount_and, a, b, np.ones(100, dtype=np.int64))
+        self.assertRaises(ValueError, bitvector.weighted_popcount, a, np.ones(10, dtype=np.int64))
+        self.assertRaises(ValueError, bitvector.weighted_popcount, a, np.ones(200, dtype=np.int64))
+        self.assertEqual(100, bitvector.weighted_popcount(a, np.ones(100, dtype=np.int64)))
+
+if __name__ == '__main__':
+    unittest.main()
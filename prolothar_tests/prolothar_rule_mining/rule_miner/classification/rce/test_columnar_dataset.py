@@ -0,0 +1,167 @@
+'''
+    This file is part of Prolothar-Rule-Mining (More Info: https://github.com/shs-it/prolothar-rule-mining).
+
+    Prolothar-Rule-Mining is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    Prolothar-Rule-Mining is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with Prolothar-Rule-Mining. If not, see <https://www.gnu.org/licenses/>.
+'''
+import unittest
+from random import Random
+
+import numpy as np
+
+from prolothar_common.models.dataset import ClassificationDataset
+from prolothar_common.models.dataset.instance import ClassificationInstance
+from prolothar_rule_mining.models.conditions import EqualsCondition
+from prolothar_rule_mining.models.conditions import InCondition
+from prolothar_rule_mining.models.conditions import InRangeCondition
+from prolothar_rule_mining.models.conditions import GreaterThanCondition
+from prolothar_rule_mining.models.conditions import LessOrEqualCondition
+from prolothar_rule_mining.models.conditions import NotCondition
+from prolothar_rule_mining.models.conditions import AndCondition
+from prolothar_rule_mining.models.conditions import OrCondition
+from prolothar_rule_mining.rule_miner.classification.rce.columnar_dataset import ColumnarDataset
+from prolothar_rule_mining.rule_miner.classification.rce import bitvector
+
+class TestColumnarDataset(unittest.TestCase):
+
+    def setUp(self):
+        self.dataset = ClassificationDataset(['category'], ['size'])
+        random = Random(42)
+        for i in range(50):
+            self.dataset.add_instance(ClassificationInstance(
+                i, {'category': random.choice('ABC'), 'size': random.randint(0, 10)},
+                random.choice(['X', 'Y'])))
+
+    def test_compute_condition_hold_vector(self):
+        category = self.dataset.get_attribute_by_name('category')
+        size = self.dataset.get_attribute_by_name('size')
+        conditions = [
+            EqualsCondition(category, 'A'),
+            EqualsCondition(category, 'D'),
+            InCondition(category, {'A', 'C'}),
+            InRangeCondition(size, 2, 7),
+            GreaterThanCondition(size, 4.5),
+            LessOrEqualCondition(size, 3),
+            NotCondition(EqualsCondition(category, 'B')),
+            AndCondition([EqualsCondition(category, 'B'), GreaterThanCondition(size, 4.5)]),
+            OrCondition([EqualsCondition(category, 'B'), LessOrEqualCondition(size, 3)]),
+        ]
+        columnar_dataset = ColumnarDataset(self.dataset)
+        for condition in conditions:
+            self.assertListEqual(
+                [condition.check_instance(instance) for instance in columnar_dataset.instances],
+                columnar_dataset.compute_condition_hold_vector(condition).tolist(),
+                msg=str(condition))
+
+    def test_compute_class_label_hold_vector(self):
+        columnar_dataset = ColumnarDataset(self.dataset)
+        self.assertListEqual(['X', 'Y'], columnar_dataset.get_class_labels())
+        for class_label in ['X', 'Y', 'Z']:
+            self.assertListEqual(
+                [instance.get_class() == class_label for instance in columnar_dataset.instances],
+                columnar_dataset.compute_class_label_hold_vector(class_label).tolist())
+
+    def test_compute_contingency_table(self):
+        columnar_dataset = ColumnarDataset(self.dataset)
+        condition = EqualsCondition(self.dataset.get_attribute_by_name('category'), 'A')
+        for view in [columnar_dataset, columnar_dataset.select_rows(
+                ~columnar_dataset.compute_condition_hold_vector(condition))]:
+            contingency_table = view.compute_contingency_table('category')
+            self.assertEqual((3, 2), contingency_table.shape)
+            for value_code, category in enumerate(view.get_categories('category')):
+                for class_code, class_label in enumerate(view.get_class_labels()):
+                    self.assertEqual(
+                        sum(1 for instance, selected in zip(view.instances, view.get_row_mask())
+                            if selected and instance['category'] == category
+                            and instance.get_class() == class_label),
+                        contingency_table[value_code, class_code])
+
+    def test_instance_weights(self):
+        instance_weights = {i: 1 + i % 4 for i in range(0, 50, 3)}
+        columnar_dataset = ColumnarDataset(self.dataset, instance_weights=instance_weights)
+        weights = np.array([
+            instance_weights.get(instance.get_id(), 1) for instance in columnar_dataset.instances])
+        self.assertListEqual(weights.tolist(), columnar_dataset.get_instance_weights().tolist())
+        category = self.dataset.get_attribute_by_name('category')
+        condition = EqualsCondition(category, 'A')
+        for view in [columnar_dataset, columnar_dataset.select_rows(
+                ~columnar_dataset.compute_condition_hold_vector(condition))]:
+            row_mask = view.get_row_mask()
+            self.assertEqual(weights[row_mask].sum(), view.get_total_weight())
+            for class_label in ['X', 'Y']:
+                class_hold_vector = view.compute_class_label_hold_vector(class_label)
+                self.assertEqual(weights[class_hold_vector].sum(), view.get_class_count(class_label))
+                other_condition = EqualsCondition(category, 'B')
+                hold_vector = view.compute_condition_hold_vector(other_condition)
+                packed_hold_vector = view.compute_packed_condition_hold_vector(other_condition)
+                self.assertEqual(weights[hold_vector].sum(), view.count(packed_hold_vector))
+                self.assertEqual(
+                    weights[hold_vector & class_hold_vector].sum(),
+                    view.count_and(
+                        packed_hold_vector, view.compute_packed_class_label_hold_vector(class_label)))
+            contingency_table = view.compute_contingency_table('category')
+            for value_code, value in enumerate(view.get_categories('category')):
+                for class_code, class_label in enumerate(view.get_class_labels()):
+                    self.assertEqual(
+                        weights[row_mask & view.compute_condition_hold_vector(
+                            EqualsCondition(category, value))
+                            & view.compute_class_label_hold_vector(class_label)].sum(),
+                        contingency_table[value_code, class_code])
+
+        self.assertRaises(ValueError, ColumnarDataset, self.dataset, instance_weights={0: 0})
+        self.assertRaises(ValueError, ColumnarDataset, self.dataset, instance_weights={0: 1.5})
+
+    def test_select_rows(self):
+        columnar_dataset = ColumnarDataset(self.dataset)
+        sorted_row_indices = columnar_dataset.get_sorted_row_indices('size')
+        self.assertTrue(all(
+            a <= b for a,b in zip(
+                columnar_dataset.get_column('size')[sorted_row_indices],
+                columnar_dataset.get_column('size')[sorted_row_indices[1:]])))
+
+        category = self.dataset.get_attribute_by_name('category')
+        condition = EqualsCondition(category, 'A')
+        remaining_dataset = condition.divide_dataset(self.dataset)[1]
+        selected_dataset = columnar_dataset.select_rows(
+            ~columnar_dataset.compute_condition_hold_vector(condition))
+
+        self.assertEqual(len(remaining_dataset), len(selected_dataset))
+        self.assertEqual(len(self.dataset), len(columnar_dataset))
+        self.assertSetEqual(set(remaining_dataset), set(
+            instance for instance, selected in zip(
+                selected_dataset.instances, selected_dataset.get_row_mask()) if selected))
+        self.assertListEqual(
+            sorted(instance['size'] for instance in remaining_dataset),
+            selected_dataset.get_column('size')[
+                selected_dataset.get_sorted_row_indices('size')].tolist())
+        self.assertListEqual(['B', 'C'], sorted(selected_dataset.get_unique_values('category')))
+        for class_label in ['X', 'Y']:
+            self.assertEqual(
+                remaining_dataset.get_class_count(class_label),
+                selected_dataset.get_class_count(class_label))
+
+        #hold vectors are False outside of the view, also if they are cached
+        other_condition = EqualsCondition(category, 'B')
+        for use_cache in [False, True, True]:
+            self.assertListEqual(
+                (columnar_dataset.compute_condition_hold_vector(other_condition)
+                 & selected_dataset.get_row_mask()).tolist(),
+                bitvector.unpack(
+                    selected_dataset.compute_packed_condition_hold_vector(
+                        other_condition, use_cache=use_cache),
+                    len(self.dataset)).tolist())
+        self.assertFalse(selected_dataset.compute_condition_hold_vector(
+            NotCondition(other_condition))[~selected_dataset.get_row_mask()].any())
+
+if __name__ == '__main__':
+    unittest.main()
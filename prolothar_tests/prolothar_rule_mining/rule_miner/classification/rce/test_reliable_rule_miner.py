@@ -20,6 +20,7 @@ from random import Random
 from prolothar_common.models.dataset import ClassificationDataset
 from prolothar_common.models.dataset.instance import ClassificationInstance
 from prolothar_rule_mining.rule_miner.classification.rce import ReliableRuleMiner
+from prolothar_rule_mining.rule_miner.classification.rce.strategy.best_first import BestFirstCandidateSearch
 
 class TestGreedyReliableCausalRuleMiner(unittest.TestCase):
 
@@ -90,14 +91,43 @@ class TestGreedyReliableCausalRuleMiner(unittest.TestCase):
             dataset.add_instance(ClassificationInstance(
                 'Clarge%d' % i, {'category': 'C', 'size': 20 + random.random()}, 'CL'))
 
-        miner = ReliableRuleMiner()
-        rule = miner.mine_rules(dataset)
-        self.assertTrue(rule is not None)
-        self.assertTrue(str(rule))
+        for miner in [
+                ReliableRuleMiner(),
+                ReliableRuleMiner(search_strategy=BestFirstCandidateSearch(n_bins=3))]:
+            rule = miner.mine_rules(dataset)
+            self.assertTrue(rule is not None)
+            self.assertTrue(str(rule))
 
-        for instance in dataset:
-            predicted_class = rule.predict(instance)
-            self.assertEqual(instance.get_class(), predicted_class)
+            for instance in dataset:
+                predicted_class = rule.predict(instance)
+                self.assertEqual(instance.get_class(), predicted_class)
+
+    def test_mine_rules_with_instance_weights(self):
+        dataset = ClassificationDataset(['category'], ['size'])
+        collapsed_dataset = ClassificationDataset(['category'], ['size'])
+        instance_weights = {}
+        collapsed_instance_ids = {}
+        random = Random(42)
+        for i in range(500):
+            features = {'category': random.choice('ABC'), 'size': random.randint(0, 5)}
+            if features['category'] == 'A' or features['size'] > 3:
+                class_label = 'X'
+            else:
+                class_label = random.choice(['Y', 'Y', 'Z'])
+            instance = ClassificationInstance(i, features, class_label)
+            dataset.add_instance(instance)
+            key = (features['category'], features['size'], class_label)
+            instance_id = collapsed_instance_ids.setdefault(key, i)
+            if instance_id == i:
+                collapsed_dataset.add_instance(instance)
+            instance_weights[instance_id] = instance_weights.get(instance_id, 0) + 1
+        self.assertLess(len(collapsed_dataset), len(dataset))
+
+        for search_strategy in [BestFirstCandidateSearch(), BestFirstCandidateSearch(n_bins=3)]:
+            miner = ReliableRuleMiner(search_strategy=search_strategy, logger=None)
+            rule = miner.mine_rules(dataset)
+            weighted_rule = miner.mine_rules(collapsed_dataset, instance_weights=instance_weights)
+            self.assertEqual(str(rule), str(weighted_rule))
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
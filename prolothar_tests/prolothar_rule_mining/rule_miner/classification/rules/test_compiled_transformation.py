@@ -0,0 +1,102 @@
+'''
+    This file is part of Prolothar-Rule-Mining (More Info: https://github.com/shs-it/prolothar-rule-mining).
+
+    Prolothar-Rule-Mining is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    Prolothar-Rule-Mining is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with Prolothar-Rule-Mining. If not, see <https://www.gnu.org/licenses/>.
+'''
+import unittest
+
+from random import Random
+
+import numpy as np
+
+from prolothar_common.models.dataset import Dataset
+from prolothar_common.models.dataset.instance import Instance
+from prolothar_common.models.dataset.transformer.one_hot_encoding import OneHotEncoding
+from prolothar_common.models.dataset.transformer.label_encoding import LabelEncoding
+from prolothar_common.models.dataset.transformer import TrainableQuantileBasedDiscretization
+
+from prolothar_rule_mining.rule_miner.classification.rules.compiled_transformation import compile_transformation
+
+class TestCompiledTransformation(unittest.TestCase):
+
+    def setUp(self):
+        random = Random(42)
+        self.categorical_attribute_names = ['color', 'flag', 'level']
+        self.numerical_attribute_names = ['size', 'price']
+        self.dataset = self.create_dataset(random, 50, ['red', 'green', 'blue'])
+        #contains an unknown color and numerical values outside of all bins
+        self.query_dataset = self.create_dataset(random, 20, ['red', 'yellow'], scale=2)
+
+    def create_dataset(self, random: Random, nr_of_instances: int, colors, scale=1) -> Dataset:
+        dataset = Dataset(self.categorical_attribute_names, self.numerical_attribute_names)
+        for i in range(nr_of_instances):
+            dataset.add_instance(Instance(i, {
+                'color': random.choice(colors),
+                'flag': random.randrange(2),
+                'level': random.randrange(3),
+                'size': random.random() * 10 * scale,
+                'price': random.randrange(20) * scale
+            }))
+        return dataset
+
+    def assert_compiled_equals_transformers(self, create_transformers):
+        transformers = create_transformers(self.dataset)
+        compiled_transformation = compile_transformation(
+            self.categorical_attribute_names, self.numerical_attribute_names,
+            transformers)
+        self.assertIsNotNone(compiled_transformation)
+        for dataset in (self.dataset, self.query_dataset):
+            expected = dataset.copy()
+            for transformer in transformers:
+                transformer.transform(expected, inplace=True)
+            expected = expected.to_dataframe().sort_index().values
+            actual = compiled_transformation.transform(
+                sorted(dataset, key=lambda instance: instance.get_id()))
+            self.assertEqual(expected.shape, actual.shape)
+            np.testing.assert_array_equal(expected.astype(float), actual.astype(float))
+
+    def get_possible_values(self, dataset: Dataset):
+        return {
+            attribute.get_name(): attribute.get_unique_values()
+            for attribute in dataset.get_attributes()
+            if attribute.is_categorical()
+        }
+
+    def test_one_hot_encoding(self):
+        self.assert_compiled_equals_transformers(lambda dataset: [
+            OneHotEncoding(self.get_possible_values(dataset))])
+
+    def test_label_encoding(self):
+        def create_transformers(dataset: Dataset):
+            possible_values = self.get_possible_values(dataset)
+            possible_values['color'] = possible_values['color'].union({'yellow'})
+            return [LabelEncoding(possible_values)]
+        self.assert_compiled_equals_transformers(create_transformers)
+
+    def test_discretization_and_label_encoding(self):
+        def create_transformers(dataset: Dataset):
+            discretization = TrainableQuantileBasedDiscretization.train(dataset, 4)
+            discretized_dataset = discretization.transform(dataset)
+            possible_values = self.get_possible_values(discretized_dataset)
+            possible_values['color'] = possible_values['color'].union({'yellow'})
+            return [discretization, LabelEncoding(possible_values)]
+        self.assert_compiled_equals_transformers(create_transformers)
+
+    def test_transformer_without_possible_values_is_not_compiled(self):
+        self.assertIsNone(compile_transformation(
+            self.categorical_attribute_names, self.numerical_attribute_names,
+            [OneHotEncoding()]))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,107 @@
+'''
+    This file is part of Prolothar-Rule-Mining (More Info: https://github.com/shs-it/prolothar-rule-mining).
+
+    Prolothar-Rule-Mining is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    Prolothar-Rule-Mining is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with Prolothar-Rule-Mining. If not, see <https://www.gnu.org/licenses/>.
+'''
+import unittest
+import pickle
+
+from prolothar_common.models.dataset.instance import Instance
+from prolothar_common.models.dataset.attributes import CategoricalAttribute
+from prolothar_common.models.dataset.attributes import NumericalAttribute
+from prolothar_rule_mining.models.conditions import EqualsCondition
+from prolothar_rule_mining.models.conditions import GreaterThanCondition
+
+from prolothar_rule_mining.rule_miner.classification.rules import Rule
+from prolothar_rule_mining.rule_miner.classification.rules import IfThenElseRule
+from prolothar_rule_mining.rule_miner.classification.rules import ListOfRules
+from prolothar_rule_mining.rule_miner.classification.rules import ReturnClassRule
+
+class RenamableRule(Rule):
+    """rule that uses the cached string hash of the base class"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.nr_of_to_string_calls = 0
+
+    def rename(self, name: str):
+        self.name = name
+        self._invalidate_hash()
+
+    def predict(self, instance: Instance) -> str:
+        return self.name
+
+    def to_string(self, prefix='') -> str:
+        self.nr_of_to_string_calls += 1
+        return prefix + self.name
+
+    def to_html(self) -> str:
+        return self.to_string()
+
+    def get_set_of_output_classes(self):
+        return {self.name}
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, RenamableRule) and self.name == other.name
+
+    __hash__ = Rule.__hash__
+
+class TestRules(unittest.TestCase):
+
+    def setUp(self):
+        self.color_attribute = CategoricalAttribute('Color', {'red', 'green', 'blue'})
+        self.size_attribute = NumericalAttribute('Size', list(range(120, 210)))
+
+    def create_rule(self) -> IfThenElseRule:
+        return IfThenElseRule(
+            EqualsCondition(self.color_attribute, 'red'),
+            if_branch=ListOfRules([ReturnClassRule('a')]),
+            else_branch=ListOfRules([ReturnClassRule('b')]))
+
+    def test_hash_and_equality_after_mutation(self):
+        rule = self.create_rule()
+        self.assertEqual(self.create_rule(), rule)
+        self.assertEqual(hash(self.create_rule()), hash(rule))
+
+        rule.set_condition(GreaterThanCondition(self.size_attribute, 150))
+        self.assertNotEqual(self.create_rule(), rule)
+        self.assertEqual(2, len({rule, self.create_rule()}))
+        rule.set_condition(EqualsCondition(self.color_attribute, 'red'))
+        self.assertEqual(self.create_rule(), rule)
+        self.assertEqual(hash(self.create_rule()), hash(rule))
+
+        rule.get_else_branch().append_rule(ReturnClassRule('c'))
+        other_rule = self.create_rule()
+        self.assertNotEqual(other_rule, rule)
+        other_rule.get_else_branch().append_rule(ReturnClassRule('c'))
+        self.assertEqual(other_rule, rule)
+        self.assertEqual(hash(other_rule), hash(rule))
+
+    def test_string_hash_is_cached(self):
+        rule = RenamableRule('a')
+        hash_value = hash(rule)
+        self.assertEqual(hash_value, hash(rule))
+        self.assertEqual(1, rule.nr_of_to_string_calls)
+
+        rule.rename('b')
+        self.assertEqual(hash(RenamableRule('b')), hash(rule))
+        self.assertEqual(RenamableRule('b'), rule)
+        self.assertNotEqual(RenamableRule('a'), rule)
+
+        unpickled_rule = pickle.loads(pickle.dumps(rule))
+        self.assertIsNone(unpickled_rule._hash_value)
+        self.assertEqual(hash(rule), hash(unpickled_rule))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -75,5 +75,60 @@ class TestKnnClassifier(unittest.TestCase):
                 print('-------------------')
             self.assertEqual(instance.get_class(), predicted_class)
 
+    def test_predict_many(self):
+        dataset = ClassificationDataset(['category'], ['size'])
+        for i in range(15):
+            dataset.add_instance(ClassificationInstance(
+                'A%d' % i, {'category': 'A', 'size': 5}, 'A'))
+        for i in range(14):
+            dataset.add_instance(ClassificationInstance(
+                'B%d' % i, {'category': 'B', 'size': 7}, 'B'))
+        for i in range(13):
+            dataset.add_instance(ClassificationInstance(
+                'Csmall%d' % i, {'category': 'C', 'size': 7}, 'CS'))
+        for i in range(12):
+            dataset.add_instance(ClassificationInstance(
+                'Clarge%d' % i, {'category': 'C', 'size': 20}, 'CL'))
+
+        miner = KnnClassifier(knn_algorithm='brute', k=3, nr_of_jobs=1)
+        rule = miner.mine_rules(dataset)
+
+        instances = list(dataset)
+        self.assertListEqual(
+            [rule.predict(instance) for instance in instances],
+            rule.predict_many(instances))
+        self.assertListEqual(
+            [rule.predict_proba(instance) for instance in instances],
+            rule.predict_proba_many(instances))
+        self.assertListEqual([], rule.predict_many([]))
+
+    def test_batches_and_random_projection(self):
+        dataset = ClassificationDataset(['category', 'flag'], ['size'])
+        for i in range(15):
+            dataset.add_instance(ClassificationInstance(
+                'A%d' % i, {'category': 'A', 'flag': 0, 'size': 5}, 'A'))
+        for i in range(14):
+            dataset.add_instance(ClassificationInstance(
+                'B%d' % i, {'category': 'B', 'flag': 1, 'size': 7}, 'B'))
+        for i in range(13):
+            dataset.add_instance(ClassificationInstance(
+                'Csmall%d' % i, {'category': 'C', 'flag': 0, 'size': 7}, 'CS'))
+        for i in range(12):
+            dataset.add_instance(ClassificationInstance(
+                'Clarge%d' % i, {'category': 'C', 'flag': 1, 'size': 20}, 'CL'))
+        instances = list(dataset)
+
+        rule = KnnClassifier(k=3, nr_of_jobs=1, batch_size=7).mine_rules(dataset)
+        self.assertEqual((len(instances), 5), rule.transform_instances(instances).shape)
+        self.assertListEqual(
+            [instance.get_class() for instance in instances],
+            rule.predict_many(instances))
+
+        approximate_rule = KnnClassifier(
+            k=3, nr_of_jobs=1, knn_algorithm='kd_tree', batch_size=7,
+            nr_of_projected_dimensions=4, random_seed=42).mine_rules(dataset)
+        self.assertEqual((len(instances), 4), approximate_rule.transform_instances(instances).shape)
+        self.assertEqual(len(instances), len(approximate_rule.predict_proba_many(instances)))
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
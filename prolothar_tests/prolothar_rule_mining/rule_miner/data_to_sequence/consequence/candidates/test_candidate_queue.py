@@ -0,0 +1,61 @@
+'''
+    This file is part of Prolothar-Rule-Mining (More Info: https://github.com/shs-it/prolothar-rule-mining).
+
+    Prolothar-Rule-Mining is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    Prolothar-Rule-Mining is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with Prolothar-Rule-Mining. If not, see <https://www.gnu.org/licenses/>.
+'''
+import unittest
+
+from prolothar_rule_mining.models.event_flow_graph import EventFlowGraph
+from prolothar_rule_mining.rule_miner.data_to_sequence.consequence.candidates import AddSequencePathCandidate
+from prolothar_rule_mining.rule_miner.data_to_sequence.consequence.candidates import CandidateQueue
+from prolothar_rule_mining.rule_miner.data_to_sequence.consequence.candidates import RemoveEdgeCandidate
+
+class TestCandidateQueue(unittest.TestCase):
+
+    def setUp(self):
+        self.graph = EventFlowGraph()
+        a = self.graph.add_node('A')
+        b = self.graph.add_node('B')
+        c = self.graph.add_node('C')
+        self.edges = [
+            self.graph.add_edge(self.graph.source, a),
+            self.graph.add_edge(a, b),
+            self.graph.add_edge(b, c),
+            self.graph.add_edge(c, self.graph.sink)
+        ]
+        for edge, nr_of_instances in zip(self.edges, [4, 1, 3, 1]):
+            edge.attributes['nr_of_instances'] = nr_of_instances
+
+    def test_pop_candidates_by_priority(self):
+        queue = CandidateQueue()
+        candidates = [RemoveEdgeCandidate(self.graph, edge) for edge in self.edges]
+        for candidate in candidates:
+            queue.add(candidate)
+        popped = []
+        while queue.is_not_empty():
+            popped.append(queue.pop())
+        self.assertListEqual(
+            [candidates[1], candidates[3], candidates[2], candidates[0]], popped)
+        self.assertEqual(1.0, candidates[1].get_priority_value())
+        self.assertLess(candidates[3], candidates[2])
+
+    def test_candidate_without_priority_cannot_be_queued(self):
+        candidate = AddSequencePathCandidate(self.graph, ('A', 'C'))
+        with self.assertRaises(ValueError):
+            candidate.get_priority_value()
+        with self.assertRaises(ValueError):
+            CandidateQueue().add(candidate)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -21,6 +21,7 @@ from random import Random
 from prolothar_common.parallel.multiprocess.multiprocess import MultiprocessComputationEngine
 
 from prolothar_rule_mining.models.dataset_generator import TargetSequenceDatasetGenerator as DatasetGenerator
+from prolothar_rule_mining.models.event_flow_graph.alignment.alignment_cache import AlignmentCache
 from prolothar_rule_mining.rule_miner.data_to_sequence.consequence.consequence import ConSequence
 from prolothar_rule_mining.rule_miner.data_to_sequence.consequence.event_flow_graph_miner import OracleEventFlowGraphMiner
 
@@ -61,5 +62,24 @@ class TestConSequence(unittest.TestCase):
         mined_rules = miner.mine_rules(dataset)
         self.assertIsNotNone(mined_rules)
 
+    def test_mine_rules_with_shared_alignment_cache(self):
+        generator = DatasetGenerator(nr_of_categorical_features=2,
+                                     nr_of_numerical_features=3,
+                                     nr_of_categories=5,
+                                     nr_of_instances=40,
+                                     random=Random(42),
+                                     max_rule_depth=2,
+                                     nr_of_sequence_symbols=5)
+        dataset, _ = generator.generate()
+
+        alignment_cache = AlignmentCache()
+        miner = ConSequence(logger=lambda x: None, alignment_cache=alignment_cache)
+        self.assertIsNotNone(miner.mine_rules(dataset))
+        statistics = alignment_cache.get_statistics()
+        self.assertGreater(statistics['misses'], 0)
+        self.assertGreater(statistics['hits'], 0)
+        #a cache that is passed in is not cleared
+        self.assertGreater(len(alignment_cache), 0)
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
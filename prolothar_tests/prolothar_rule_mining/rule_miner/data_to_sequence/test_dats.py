@@ -43,6 +43,11 @@ class TestDats(unittest.TestCase):
         target_sequence = mined_rules.execute(next(iter(dataset)))
         self.assertIsNotNone(target_sequence)
 
+        instances = list(dataset)
+        self.assertListEqual(
+            [mined_rules.execute(instance) for instance in instances],
+            mined_rules.execute_many(instances))
+
     def test_mine_rules_on_simple_dataset(self):
         dataset = TargetSequenceDataset(['color'],['size'])
         for i in range(40):
@@ -49,7 +49,9 @@ if os.path.exists('prolothar_rule_mining/rule_miner/data_to_sequence/rules/mdl.p
         make_extension_from_pyx("prolothar_rule_mining/rule_miner/data_to_sequence/rules/rule.pyx"),
         make_extension_from_pyx("prolothar_rule_mining/rule_miner/data_to_sequence/rules/list_of_rules.pyx"),
         make_extension_from_pyx("prolothar_rule_mining/rule_miner/classification/rce/strategy/abstract.pyx"),
+        make_extension_from_pyx("prolothar_rule_mining/rule_miner/classification/rce/bitvector.pyx"),
         make_extension_from_pyx("prolothar_rule_mining/models/event_flow_graph/node.pyx"),
+        make_extension_from_pyx("prolothar_rule_mining/models/event_flow_graph/min_max_heap.pyx"),
         #alignment
         make_extension_from_pyx("prolothar_rule_mining/models/event_flow_graph/alignment/alignment_finder.pyx"),
         make_extension_from_pyx("prolothar_rule_mining/models/event_flow_graph/alignment/a_star.pyx"),